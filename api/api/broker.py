@@ -22,9 +22,11 @@ from typing_extensions import override
 from api.common import setup
 from api.errors import configure_scope_for_error
 from api.services.analytics import close_analytics, start_analytics
+from api.services.run_stats_aggregator import close_run_stats_aggregator, enable_run_stats_aggregation
 from api.utils import close_metrics, setup_metrics
 from core.domain.errors import InternalError
 from core.domain.metrics import Metric
+from core.storage.clickhouse.clickhouse_client import ClickhouseClient
 from core.utils.background import wait_for_background_tasks
 
 setup()
@@ -134,14 +136,40 @@ async def schedule_job(job: AsyncTaskiqDecoratedTask[[Any], Coroutine[Any, Any,
     await job.kiq(*args)
 
 
+def _setup_clickhouse_run_batching():
+    # Workers that store a lot of runs can batch the inserts in clickhouse
+    if os.environ.get("CLICKHOUSE_RUN_BATCHING_ENABLED") != "true":
+        return
+    ClickhouseClient.enable_run_batching(
+        max_rows=int(os.environ.get("CLICKHOUSE_RUN_BATCH_MAX_ROWS", "500")),
+        max_bytes=int(os.environ.get("CLICKHOUSE_RUN_BATCH_MAX_BYTES", str(8 * 1024 * 1024))),
+        flush_interval_seconds=float(os.environ.get("CLICKHOUSE_RUN_BATCH_INTERVAL_SECONDS", "1")),
+    )
+
+
+def _setup_run_stats_aggregation():
+    # Run counts, last active dates and credits are written behind instead of once per run
+    if os.environ.get("RUN_STATS_AGGREGATION_ENABLED") != "true":
+        return
+    enable_run_stats_aggregation(
+        flush_interval_seconds=float(os.environ.get("RUN_STATS_AGGREGATION_INTERVAL_SECONDS", "1")),
+        max_pending_credits=float(os.environ.get("RUN_STATS_AGGREGATION_MAX_PENDING_CREDITS", "1")),
+    )
+
+
 @broker.on_event(TaskiqEvents.WORKER_STARTUP)
 async def worker_startup(state: TaskiqState):
     await start_analytics()
     state.metrics_service = await setup_metrics()
+    _setup_clickhouse_run_batching()
+    _setup_run_stats_aggregation()
 
 
 @broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
 async def worker_shutdown(state: TaskiqState):
+    # Draining the pending runs first
+    await ClickhouseClient.close_run_batch_writers()
+    await close_run_stats_aggregator()
     await close_metrics(state.metrics_service)
     await close_analytics()
     await wait_for_background_tasks()
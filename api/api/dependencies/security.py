@@ -11,6 +11,7 @@ from api.services.analytics import analytics_service
 from api.services.api_keys import APIKeyService
 from api.services.event_handler import system_event_router
 from api.services.security_service import SecurityService, UserClaims
+from api.services.tenant_cache import shared_tenant_cache
 from api.utils import set_tenant_slug
 from core.domain.consts import WORKFLOWAI_APP_URL
 from core.domain.errors import InvalidToken
@@ -137,6 +138,7 @@ def security_service_dependency(org_storage: OrgSystemStorageDep) -> SecuritySer
         org_storage,
         system_event_router(),
         analytics_service(user_properties=None, organization_properties=None, task_properties=None),
+        shared_tenant_cache(),
     )
 
 
@@ -3,6 +3,7 @@ from typing import Annotated, Literal, Optional
 
 from fastapi import Depends, Query
 
+from core.domain.run_cursor import RunCursor
 from core.domain.task_run_query import (
     SerializableTaskRunField,
     SerializableTaskRunQuery,
@@ -36,6 +37,10 @@ def task_run_query_dependency(
         default=None,
         description="The status of the task run. By default, only successful runs are returned",
     ),
+    cursor: str | None = Query(
+        default=None,
+        description="The next_cursor returned by a previous page. When provided, the offset is ignored",
+    ),
 ) -> SerializableTaskRunQuery:
     return SerializableTaskRunQuery(
         task_input_hashes={task_input_hash} if task_input_hash else None,
@@ -46,6 +51,7 @@ def task_run_query_dependency(
         include_fields=set(include_fields) if include_fields else None,
         created_after=created_after,
         status={"success"} if not status else set(status),
+        cursor=RunCursor.decode(cursor) if cursor else None,
         **page_query.model_dump(),
         **task_query.model_dump(),
     )
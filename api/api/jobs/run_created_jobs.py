@@ -1,3 +1,7 @@
+import asyncio
+import inspect
+import logging
+import os
 import random
 from datetime import datetime, timezone
 
@@ -10,11 +14,17 @@ from api.jobs.common import (
     StorageDep,
 )
 from api.jobs.utils.jobs_utils import get_task_run_str
+from api.services.run_stats_aggregator import shared_run_stats_aggregator
 from api.services.slack_notifications import get_user_and_org_str
 from core.domain.events import RunCreatedEvent
 from core.domain.task_group_update import TaskGroupUpdate
 from core.storage.models import TaskUpdate
 
+_logger = logging.getLogger(__name__)
+
+# When enabled, a single message is sent per run and all jobs are dispatched by the worker
+FAN_OUT_ENABLED = os.environ.get("RUN_CREATED_JOBS_FAN_OUT") == "true"
+
 
 def _is_run_external(event: RunCreatedEvent) -> bool:
     return event.run.author_tenant is not None and event.run.author_tenant != event.tenant
@@ -40,6 +50,10 @@ async def evaluate_run_review(event: RunCreatedEvent, reviews_service: ReviewsSe
 @broker.task(retry_on_error=False)
 async def decrement_credits(event: RunCreatedEvent, payment_service: PaymentSystemServiceDep):
     if cost := event.run.credits_used:
+        if aggregator := shared_run_stats_aggregator():
+            aggregator.decrement_credits(event.run.author_tenant or event.tenant, cost, payment_service)
+            return
+
         await payment_service.decrement_credits(
             event.run.author_tenant or event.tenant,
             cost,
@@ -48,6 +62,16 @@ async def decrement_credits(event: RunCreatedEvent, payment_service: PaymentSyst
 
 @broker.task(retry_on_error=False)
 async def increment_run_count(event: RunCreatedEvent, storage: StorageDep):
+    if aggregator := shared_run_stats_aggregator():
+        aggregator.increment_run_count(
+            event.tenant,
+            storage.task_groups,
+            event.run.task_id,
+            event.run.task_schema_id,
+            event.run.group.iteration,
+        )
+        return
+
     await storage.task_groups.increment_run_count(
         event.run.task_id,
         event.run.task_schema_id,
@@ -61,6 +85,17 @@ async def update_task_group_last_active_at(event: RunCreatedEvent, storage: Stor
     if not event.run.is_active:
         return
 
+    if aggregator := shared_run_stats_aggregator():
+        aggregator.update_task_group_last_active_at(
+            event.tenant,
+            storage.task_groups,
+            event.run.task_id,
+            event.run.task_schema_id,
+            event.run.group.iteration,
+            datetime.now(timezone.utc),
+        )
+        return
+
     await storage.task_groups.update_task_group(
         task_id=event.run.task_id,
         task_schema_id=event.run.task_schema_id,
@@ -78,6 +113,15 @@ async def update_task_schema_last_active_at(
     if not event.run.is_active:
         return
 
+    aggregator = shared_run_stats_aggregator()
+    if aggregator and not aggregator.should_update_task_schema_last_active_at(
+        event.tenant,
+        event.run.task_id,
+        event.run.task_schema_id,
+    ):
+        # The schema was already marked as active recently
+        return
+
     before_update = await storage.tasks.update_task(
         task_id=event.run.task_id,
         update=TaskUpdate(schema_last_active_at=(event.run.task_schema_id, datetime.now(timezone.utc))),
@@ -124,3 +168,61 @@ JOBS = [
     update_task_schema_last_active_at,
     run_task_run_moderation,
 ]
+
+# The dependencies of each job are passed by name when the jobs are run from a single message
+_JOB_PARAMETERS = [(job, list(inspect.signature(job.original_func).parameters)) for job in JOBS]
+
+
+@broker.task(retry_on_error=False)
+async def handle_run_created(
+    event: RunCreatedEvent,
+    payment_service: PaymentSystemServiceDep,
+    storage: StorageDep,
+    reviews_service: ReviewsServiceDep,
+    customer_service: CustomerServiceDep,
+    internal_service: InternalTasksServiceDep,
+):
+    """Runs all the run created jobs from a single message. Jobs are independent so a failing job
+    does not prevent the others from running"""
+    dependencies = {
+        "event": event,
+        "payment_service": payment_service,
+        "storage": storage,
+        "reviews_service": reviews_service,
+        "customer_service": customer_service,
+        "internal_service": internal_service,
+    }
+    results = await asyncio.gather(
+        *(
+            job.original_func(**{name: dependencies[name] for name in parameters})
+            for job, parameters in _JOB_PARAMETERS
+        ),
+        return_exceptions=True,
+    )
+    for job, result in zip(JOBS, results):
+        if isinstance(result, BaseException):
+            _logger.error(
+                "Run created job failed",
+                exc_info=result,
+                extra={"job": job.task_name, "run_id": event.run.id},
+            )
+
+
+def compact_event(event: RunCreatedEvent) -> RunCreatedEvent:
+    """Strips the run from the fields that are not used by the jobs, mostly the messages
+    of the LLM completions, before the event is serialized"""
+    run = event.run.model_copy(
+        update={
+            "task_output": None,
+            "reasoning_steps": None,
+            "tool_calls": None,
+            "tool_call_requests": None,
+            "llm_completions": [
+                completion.model_copy(update={"messages": [], "response": None, "tool_calls": None})
+                for completion in event.run.llm_completions
+            ]
+            if event.run.llm_completions
+            else None,
+        },
+    )
+    return event.model_copy(update={"run": run})
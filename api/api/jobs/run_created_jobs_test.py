@@ -1,11 +1,23 @@
+import inspect
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from api.jobs.run_created_jobs import (
+    _JOB_PARAMETERS,  # pyright: ignore[reportPrivateUsage]
     _should_run_task_run_moderation,  # pyright: ignore[reportPrivateUsage]
+    compact_event,
+    handle_run_created,
+    increment_run_count,
     run_task_run_moderation,
+    update_task_group_last_active_at,
+    update_task_schema_last_active_at,
 )
+from core.domain.events import RunCreatedEvent
+from core.domain.llm_completion import LLMCompletion
+from core.domain.llm_usage import LLMUsage
+from core.domain.models import Provider
+from tests import models as test_models
 
 
 async def test_run_task_run_moderation_skips_when_should_not_run() -> None:
@@ -39,3 +51,72 @@ def test_should_run_task_run_moderation_sampling_rate() -> None:
     # We expect 1% (0.01) with some margin of error
     # Using a tolerance of ±0.4% to account for random variation
     assert pytest.approx(actual_rate, abs=0.004) == 0.01  # pyright: ignore [reportUnknownMemberType]
+
+
+class TestHandleRunCreated:
+    async def test_all_jobs_run_when_one_fails(self):
+        event = RunCreatedEvent(tenant="tenant", run=test_models.task_run_ser(is_active=False))
+        payment_service = AsyncMock()
+        payment_service.decrement_credits.side_effect = Exception("boom")
+        storage = AsyncMock()
+        reviews_service = AsyncMock()
+
+        with patch("api.jobs.run_created_jobs._should_run_task_run_moderation", return_value=False):
+            await handle_run_created(event, payment_service, storage, reviews_service, AsyncMock(), AsyncMock())
+
+        storage.task_groups.increment_run_count.assert_awaited_once_with("task_id", 1, 1, increment=1)
+        reviews_service.evaluate_runs_by_hash_if_needed.assert_awaited_once()
+
+    def test_all_job_dependencies_are_provided(self):
+        # Parameters of handle_run_created are passed by name to the jobs
+        available = set(inspect.signature(handle_run_created.original_func).parameters)
+        for job, parameters in _JOB_PARAMETERS:
+            assert set(parameters) <= available, job.task_name
+
+
+class TestCompactEvent:
+    def test_completion_messages_are_removed(self):
+        run = test_models.task_run_ser(
+            llm_completions=[
+                LLMCompletion(
+                    messages=[{"role": "user", "content": "a very long prompt"}],
+                    response="a very long response",
+                    usage=LLMUsage(prompt_cost_usd=1, completion_cost_usd=0.5),
+                    provider=Provider.OPEN_AI,
+                ),
+            ],
+        )
+        event = RunCreatedEvent(tenant="tenant", run=run)
+
+        compacted = compact_event(event)
+
+        assert compacted.run.task_output is None
+        assert compacted.run.llm_completions
+        assert compacted.run.llm_completions[0].messages == []
+        assert compacted.run.llm_completions[0].response is None
+        # Fields that are used by the jobs are preserved
+        assert compacted.run.credits_used == 1.5
+        assert compacted.run.task_input == run.task_input
+        assert compacted.tenant == "tenant"
+        # The original event is not modified
+        assert event.run.llm_completions and event.run.llm_completions[0].messages
+
+
+class TestRunStatsAggregation:
+    async def test_counters_are_aggregated(self):
+        event = RunCreatedEvent(tenant="tenant", run=test_models.task_run_ser(is_active=True))
+        storage = AsyncMock()
+        aggregator = Mock()
+        aggregator.should_update_task_schema_last_active_at.return_value = False
+
+        with patch("api.jobs.run_created_jobs.shared_run_stats_aggregator", return_value=aggregator):
+            await increment_run_count(event, storage)
+            await update_task_group_last_active_at(event, storage)
+            await update_task_schema_last_active_at(event, storage, AsyncMock())
+
+        aggregator.increment_run_count.assert_called_once_with("tenant", storage.task_groups, "task_id", 1, 1)
+        aggregator.update_task_group_last_active_at.assert_called_once()
+        storage.task_groups.increment_run_count.assert_not_called()
+        storage.task_groups.update_task_group.assert_not_called()
+        # The schema was marked as active by a previous run
+        storage.tasks.update_task.assert_not_called()
@@ -4,6 +4,7 @@ from api.jobs.common import CustomerServiceDep, InternalTasksServiceDep, Storage
 from api.jobs.utils.jobs_utils import get_task_str_for_slack
 from api.services.internal_tasks.moderation_service import ModerationService
 from api.services.slack_notifications import get_user_and_org_str
+from api.services.tenant_cache import invalidate_tenant_cache
 from core.domain.events import TaskSchemaCreatedEvent
 from core.storage import ObjectNotFoundException
 
@@ -23,6 +24,8 @@ async def add_credits_for_first_task(event: TaskSchemaCreatedEvent, storage: Sto
         await storage.organizations.add_5_credits_for_first_task()
     except ObjectNotFoundException:
         logger.info("Organization not found, skipping credit addition")
+        return
+    await invalidate_tenant_cache(tenant=storage.tenant)
 
 
 @broker.task(retry_on_error=True)
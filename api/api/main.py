@@ -14,7 +14,9 @@ from api.errors import configure_scope_for_error
 from api.routers import models_router
 from api.routers.openai_proxy import openai_proxy_router
 from api.services.analytics import close_analytics, start_analytics
+from api.services.deployments_cache import shared_deployments_cache
 from api.services.storage import storage_for_tenant
+from api.services.tenant_cache import shared_tenant_cache
 from api.tags import RouteTags
 from api.utils import (
     close_metrics,
@@ -29,10 +31,12 @@ from api.utils import (
 from core.domain.errors import DefaultError
 from core.providers.base.httpx_provider_base import HTTPXProviderBase
 from core.providers.base.provider_error import ProviderError
+from core.providers.base.rate_limit_budget import shared_rate_limit_budget
 from core.storage import ObjectNotFoundException
 from core.storage.mongo.migrations.migrate import check_migrations, migrate
 from core.utils import no_op
 from core.utils.background import wait_for_background_tasks
+from core.utils.file_utils.pdf_rasterizer import shared_pdf_rasterizer
 from core.utils.uuid import uuid7
 
 from .common import setup
@@ -103,15 +107,39 @@ async def _lifespan(app: FastAPI):
     factory = shared_provider_factory()
     logger.info(f"Prepared providers {', '.join(list(factory.available_providers()))}")  # noqa: G004
 
+    if os.environ.get("HTTPX_PREWARM_ENABLED", "true") == "true":
+        logger.info("Prewarming provider connections")
+        await HTTPXProviderBase.prewarm(
+            provider
+            for provider_type in factory.available_providers()
+            for provider in factory.get_providers(provider_type)
+        )
+    HTTPXProviderBase.client_pool().start_metrics()
+
     logger.info("Starting services")
 
+    if tenant_cache := shared_tenant_cache():
+        await tenant_cache.start()
+    if deployments_cache := shared_deployments_cache():
+        await deployments_cache.start()
+    if rate_limit_budget := shared_rate_limit_budget():
+        rate_limit_budget.start()
+
     yield
 
+    if tenant_cache:
+        await tenant_cache.close()
+    if deployments_cache:
+        await deployments_cache.close()
+    if rate_limit_budget:
+        rate_limit_budget.close()
+
     # Closing the metrics service to send whatever is left in the buffer
     await close_metrics(metrics_service)
     await close_analytics()
     await wait_for_background_tasks()
     await HTTPXProviderBase.close()
+    shared_pdf_rasterizer().close()
 
 
 if mcp_app:
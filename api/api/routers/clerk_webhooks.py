@@ -10,6 +10,7 @@ from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
 from api.dependencies.security import OrgSystemStorageDep
+from api.services.tenant_cache import invalidate_tenant_cache
 from core.domain.errors import InternalError
 from core.storage.organization_storage import OrganizationSystemStorage
 
@@ -141,9 +142,11 @@ async def _clerk_organization_webhook(
                 slug=organization.slug,
                 display_name=organization.name,
             )
+            await invalidate_tenant_cache(org_id=organization.id)
             # TODO: update slack channel name
         case "organization.deleted":
             await system_storage.delete_organization(organization.id)
+            await invalidate_tenant_cache(org_id=organization.id)
         case _:
             pass
 
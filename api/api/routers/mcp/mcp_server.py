@@ -35,6 +35,7 @@ from api.services.run import RunService
 from api.services.runs.runs_service import RunsService
 from api.services.security_service import SecurityService
 from api.services.task_deployments import TaskDeploymentsService
+from api.services.tenant_cache import shared_tenant_cache
 from api.services.versions import VersionsService
 from core.domain.analytics_events.analytics_events import OrganizationProperties, UserProperties
 from core.domain.users import UserIdentifier
@@ -56,6 +57,7 @@ async def get_mcp_service() -> MCPService:
         _system_storage.organizations,
         system_event_router(),
         analytics_service(user_properties=None, organization_properties=None, task_properties=None),
+        shared_tenant_cache(),
     )
     tenant = await security_service.tenant_from_credentials(auth_header.split(" ")[1])
     if not tenant:
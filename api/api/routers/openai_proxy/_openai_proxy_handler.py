@@ -5,6 +5,7 @@ from typing import Any, NamedTuple
 from fastapi import Request
 from fastapi.responses import JSONResponse, StreamingResponse
 
+from api.services.deployments_cache import DeploymentsCache
 from api.services.feedback_svc import FeedbackTokenGenerator
 from api.services.groups import GroupService
 from api.services.messages.messages_utils import json_schema_for_template
@@ -50,12 +51,14 @@ class OpenAIProxyHandler:
         run_service: RunService,
         event_router: EventRouter,
         feedback_generator: FeedbackTokenGenerator,
+        deployments_cache: DeploymentsCache | None = None,
     ):
         self._group_service = group_service
         self._storage = storage
         self._run_service = run_service
         self._event_router = event_router
         self._feedback_generator = feedback_generator
+        self._deployments_cache = deployments_cache
 
     @classmethod
     def _raw_string_mapper(cls, output: Any) -> str | None:
@@ -174,15 +177,52 @@ class OpenAIProxyHandler:
                 "should be omitted from the messages array (it's ok to send an empty message array if needed !)",
             )
 
-    async def _prepare_for_deployment(
+    async def _variant_by_id(self, agent_id: str, variant_id: str) -> SerializableTaskVariant:
+        if not self._deployments_cache:
+            return await self._storage.task_version_resource_by_id(agent_id, variant_id)
+
+        if cached := self._deployments_cache.get_variant(self._storage.tenant, agent_id, variant_id):
+            return cached
+        generation = self._deployments_cache.generation(self._storage.tenant, agent_id)
+        variant = await self._storage.task_version_resource_by_id(agent_id, variant_id)
+        self._deployments_cache.set_variant(self._storage.tenant, variant, generation)
+        return variant
+
+    async def _store_variant(self, variant: SerializableTaskVariant) -> tuple[SerializableTaskVariant, bool]:
+        """Returns the stored variant and whether it was created"""
+        if not self._deployments_cache:
+            return await self._storage.store_task_resource(variant)
+
+        if cached := self._deployments_cache.get_variant(self._storage.tenant, variant.task_id, variant.id):
+            return cached, False
+        generation = self._deployments_cache.generation(self._storage.tenant, variant.task_id)
+        stored, created = await self._storage.store_task_resource(variant)
+        self._deployments_cache.set_variant(self._storage.tenant, stored, generation)
+        return stored, created
+
+    async def _resolve_deployment(
         self,
+        agent_id: str,
         agent_ref: EnvironmentRef,
         tenant_data: PublicOrganizationData,
         messages: Messages,
         input: dict[str, Any] | None,
         response_format: OpenAIProxyResponseFormat | None,
-    ) -> PreparedRun:
-        agent_id = slugify(agent_ref.agent_id)
+    ) -> tuple[TaskGroupProperties, SerializableTaskVariant]:
+        if self._deployments_cache and (
+            cached := self._deployments_cache.get_deployment(
+                self._storage.tenant,
+                agent_id,
+                agent_ref.schema_id,
+                agent_ref.environment,
+            )
+        ):
+            return cached
+
+        # Read before fetching so that a deployment that happens during the fetch invalidates the entry
+        generation = (
+            self._deployments_cache.generation(self._storage.tenant, agent_id) if self._deployments_cache else 0
+        )
         try:
             deployment = await self._storage.task_deployments.get_task_deployment(
                 agent_id,
@@ -195,19 +235,45 @@ class OpenAIProxyHandler:
                 f"environment {agent_ref.environment}. Check your deployments "
                 f"at {tenant_data.app_deployments_url(agent_id, agent_ref.schema_id)}",
             )
-        properties = deployment.properties
         if variant_id := deployment.properties.task_variant_id:
-            variant = await self._storage.task_version_resource_by_id(
-                agent_id,
-                variant_id,
-            )
+            variant = await self._variant_by_id(agent_id, variant_id)
+            if self._deployments_cache:
+                self._deployments_cache.set_deployment(
+                    self._storage.tenant,
+                    agent_id,
+                    agent_ref.schema_id,
+                    agent_ref.environment,
+                    deployment.properties,
+                    variant,
+                    generation,
+                )
         else:
+            # Not caching here since the variant depends on the request
             _logger.warning(
                 "No variant id found for deployment, building a new variant",
                 extra={"agent_ref": agent_ref},
             )
             variant, _ = self._build_variant(messages, agent_ref.agent_id, input, response_format)
-            variant, _ = await self._storage.store_task_resource(variant)
+            variant, _ = await self._store_variant(variant)
+        return deployment.properties, variant
+
+    async def _prepare_for_deployment(
+        self,
+        agent_ref: EnvironmentRef,
+        tenant_data: PublicOrganizationData,
+        messages: Messages,
+        input: dict[str, Any] | None,
+        response_format: OpenAIProxyResponseFormat | None,
+    ) -> PreparedRun:
+        agent_id = slugify(agent_ref.agent_id)
+        properties, variant = await self._resolve_deployment(
+            agent_id,
+            agent_ref,
+            tenant_data,
+            messages,
+            input,
+            response_format,
+        )
         self._update_task_properties(tenant_data, variant)
 
         if not properties.messages:
@@ -244,10 +310,7 @@ class OpenAIProxyHandler:
         input: dict[str, Any] | None,
         tenant_data: PublicOrganizationData,
     ) -> PreparedRun:
-        variant = await self._storage.task_version_resource_by_id(
-            agent_id,
-            variant_id,
-        )
+        variant = await self._variant_by_id(agent_id, variant_id)
         properties = TaskGroupProperties(model=model, messages=version_messages)
         properties.task_variant_id = variant.id
         self._update_task_properties(tenant_data, variant)
@@ -268,7 +331,7 @@ class OpenAIProxyHandler:
             input=input,
             response_format=response_format,
         )
-        variant, new_variant_created = await self._storage.store_task_resource(raw_variant)
+        variant, new_variant_created = await self._store_variant(raw_variant)
         self._update_task_properties(tenant_data, variant)
 
         if new_variant_created:
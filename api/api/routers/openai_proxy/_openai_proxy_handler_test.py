@@ -14,6 +14,7 @@ from api.routers.openai_proxy._openai_proxy_models import (
     OpenAIProxyTool,
     OpenAIProxyToolDefinition,
 )
+from api.services.deployments_cache import DeploymentsCache
 from api.services.feedback_svc import FeedbackTokenGenerator
 from core.domain.consts import INPUT_KEY_MESSAGES
 from core.domain.errors import BadRequestError
@@ -276,6 +277,78 @@ class TestPrepareRunForDeployment:
         assert result.final_input == Messages.with_messages(Message.with_text("Hello, world!"))
 
 
+class TestPrepareRunWithDeploymentsCache:
+    @pytest.fixture
+    def cached_proxy_handler(
+        self,
+        mock_group_service: Mock,
+        mock_storage: Mock,
+        mock_run_service: Mock,
+        mock_event_router: Mock,
+    ):
+        mock_storage.tenant = "tenant"
+        return OpenAIProxyHandler(
+            group_service=mock_group_service,
+            storage=mock_storage,
+            run_service=mock_run_service,
+            event_router=mock_event_router,
+            feedback_generator=Mock(spec=FeedbackTokenGenerator),
+            deployments_cache=DeploymentsCache(deployment_ttl_seconds=10),
+        )
+
+    async def _prepare(self, handler: OpenAIProxyHandler):
+        return await handler._prepare_for_deployment(
+            agent_ref=EnvironmentRef(agent_id="my-agent", schema_id=1, environment=VersionEnvironment.PRODUCTION),
+            tenant_data=PublicOrganizationData(),
+            messages=Messages.with_messages(Message.with_text("Hello, world!")),
+            input=None,
+            response_format=None,
+        )
+
+    async def test_deployment_is_cached(self, cached_proxy_handler: OpenAIProxyHandler, mock_storage: Mock):
+        mock_storage.task_deployments.get_task_deployment.return_value = test_models.task_deployment(
+            properties=TaskGroupProperties(model="gpt-4o", task_variant_id="my-variant"),  # type: ignore
+        )
+        mock_storage.task_version_resource_by_id.return_value = test_models.task_variant()
+
+        first = await self._prepare(cached_proxy_handler)
+        # Mutating the returned properties should not affect the cache
+        first.properties.temperature = 1
+        second = await self._prepare(cached_proxy_handler)
+
+        assert second.properties.temperature is None
+        assert second.variant == first.variant
+        mock_storage.task_deployments.get_task_deployment.assert_called_once()
+        mock_storage.task_version_resource_by_id.assert_called_once()
+
+    async def test_deployment_cache_invalidated(self, cached_proxy_handler: OpenAIProxyHandler, mock_storage: Mock):
+        mock_storage.task_deployments.get_task_deployment.return_value = test_models.task_deployment(
+            properties=TaskGroupProperties(model="gpt-4o", task_variant_id="my-variant"),  # type: ignore
+        )
+        mock_storage.task_version_resource_by_id.return_value = test_models.task_variant()
+
+        await self._prepare(cached_proxy_handler)
+        assert cached_proxy_handler._deployments_cache
+        await cached_proxy_handler._deployments_cache.invalidate("tenant", "my-agent")
+        await self._prepare(cached_proxy_handler)
+
+        assert mock_storage.task_deployments.get_task_deployment.call_count == 2
+
+    async def test_stored_variant_is_cached(self, cached_proxy_handler: OpenAIProxyHandler, mock_storage: Mock):
+        mock_storage.store_task_resource.side_effect = lambda value: (value, True)  # pyright: ignore [reportUnknownLambdaType]
+
+        for _ in range(2):
+            await cached_proxy_handler._prepare_for_model(
+                agent_ref=ModelRef(model=Model.GPT_4O_LATEST, agent_id="my-agent"),
+                tenant_data=PublicOrganizationData(),
+                messages=Messages.with_messages(Message.with_text("Hello, world!")),
+                input=None,
+                response_format=None,
+            )
+
+        mock_storage.store_task_resource.assert_called_once()
+
+
 class TestPrepareRunForModel:
     @pytest.fixture(autouse=True)
     def mock_storage_with_variant(self, mock_storage: Mock):
@@ -5,6 +5,7 @@ from api.dependencies.security import RequiredUserOrganizationDep
 from api.dependencies.services import FeedbackTokenGeneratorDep, GroupServiceDep, RunServiceDep
 from api.dependencies.storage import StorageDep
 from api.routers.openai_proxy._openai_proxy_handler import OpenAIProxyHandler
+from api.services.deployments_cache import shared_deployments_cache
 
 from ._openai_proxy_models import (
     OpenAIProxyChatCompletionChunk,
@@ -46,5 +47,6 @@ async def chat_completions(
         run_service=run_service,
         event_router=event_router,
         feedback_generator=feedback_generator,
+        deployments_cache=shared_deployments_cache(),
     )
     return await handler.handle(body, request, user_org)
@@ -7,6 +7,7 @@ from pydantic import BaseModel, ConfigDict, TypeAdapter
 from api.dependencies.provider_factory import ProviderFactoryDep
 from api.dependencies.security import RequiredUserOrganizationDep
 from api.dependencies.storage import OrganizationStorageDep
+from api.services.tenant_cache import invalidate_tenant_cache
 from api.tags import RouteTags
 from core.domain.models.providers import Provider
 from core.domain.tenant_data import (
@@ -123,9 +124,12 @@ async def add_provider_settings(
     if not is_valid:
         raise HTTPException(400, "Invalid provider config")
 
-    return await storage.add_provider_config(config, preserve_credits=request.preserve_credits)
+    settings = await storage.add_provider_config(config, preserve_credits=request.preserve_credits)
+    await invalidate_tenant_cache(tenant=storage.tenant)
+    return settings
 
 
 @router.delete("/settings/providers/{provider_id}", description="Delete a provider config")
 async def delete_provider_settings(provider_id: str, storage: OrganizationStorageDep) -> None:
     await storage.delete_provider_config(provider_id)
+    await invalidate_tenant_cache(tenant=storage.tenant)
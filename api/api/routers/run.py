@@ -31,6 +31,7 @@ from api.errors import prettify_errors
 from api.routers._common import DeprecatedVersionReference
 from api.schemas.api_tool_call_request import APIToolCallRequest
 from api.schemas.reasoning_step import ReasoningStep
+from api.services.reserved_credits import shared_reserved_credits
 from api.tags import RouteTags
 from api.utils import get_start_time
 from core.domain.agent_run import AgentRun
@@ -303,8 +304,12 @@ _RUN_RESPONSE_V1: dict[int | str, dict[str, Any]] = {
 _BLOCK_RUN_FOR_NO_CREDITS = os.getenv("BLOCK_RUN_FOR_NO_CREDITS", "true").lower() != "false"
 
 
-def check_enough_credits(org_settings: TenantData):
-    if _BLOCK_RUN_FOR_NO_CREDITS and org_settings.current_credits_usd < 0:
+async def check_enough_credits(org_settings: TenantData):
+    if not _BLOCK_RUN_FOR_NO_CREDITS:
+        return org_settings
+    # Credits consumed by runs that workers have not decremented yet
+    reserved = await shared_reserved_credits().get(org_settings.tenant)
+    if org_settings.current_credits_usd - reserved < 0:
         if org_settings.payment_failure and org_settings.payment_failure.failure_code == "internal":
             _logger.error(
                 "An organization has no credits because of an internal error",
@@ -322,8 +327,8 @@ def check_enough_credits(org_settings: TenantData):
     return org_settings
 
 
-def author_tenant(org_settings: RequiredUserOrganizationDep, url_public_org: URLPublicOrganizationDep):
-    check_enough_credits(org_settings)
+async def author_tenant(org_settings: RequiredUserOrganizationDep, url_public_org: URLPublicOrganizationDep):
+    await check_enough_credits(org_settings)
 
     # author_tenant is only set if the owner of the task and the current logged in user
     # are different. This is used to determine if the run should be counted towards the
@@ -52,6 +52,10 @@ class SearchTaskRunsRequest(BaseModel):
 
     limit: int = 20
     offset: int = 0
+    cursor: str | None = Field(
+        default=None,
+        description="The next_cursor returned by a previous search. When provided, the offset is ignored",
+    )
 
 
 class _BaseRunV1(BaseModel):
@@ -150,6 +154,7 @@ async def search_runs(
         request.limit,
         request.offset,
         lambda run: RunItemV1.from_domain(run, feedback_token_generator(run.id)),
+        cursor=request.cursor,
     )
 
 
@@ -24,6 +24,7 @@ from api.schemas.build_task_request import (
     BuildAgentRequest,
 )
 from api.services import tasks
+from api.services.deployments_cache import invalidate_deployments_cache
 from api.services.task_deployments import DeployedVersionsResponse, VersionsResponse
 from api.services.task_gen import get_new_task_input_from_request
 from core.agents.chat_task_schema_generation.chat_task_schema_generation_task import AgentSchemaJson
@@ -542,6 +543,7 @@ async def delete_task(
     storage: StorageDep,
 ) -> None:
     await storage.delete_task(agent_id)
+    await invalidate_deployments_cache(storage.tenant, agent_id)
 
 
 class TaskStats(BaseModel):
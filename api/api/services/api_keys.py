@@ -4,6 +4,7 @@ from typing import List
 
 from pydantic import BaseModel
 
+from api.services.tenant_cache import invalidate_tenant_cache
 from core.domain.api_key import APIKey
 from core.domain.errors import DuplicateValueError
 from core.domain.users import UserIdentifier
@@ -58,7 +59,11 @@ class APIKeyService:
         raise DuplicateValueError("API key generation failed")
 
     async def delete_key(self, key_id: str) -> bool:
-        return await self.storage.delete_api_key_for_organization(key_id)
+        deleted = await self.storage.delete_api_key_for_organization(key_id)
+        if deleted:
+            # Making sure the deleted key is no longer accepted by any process
+            await invalidate_tenant_cache(tenant=self.storage.tenant)
+        return deleted
 
     async def get_keys(self) -> List[APIKey]:
         return [key for key in await self.storage.get_api_keys_for_organization()]
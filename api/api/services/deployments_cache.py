@@ -0,0 +1,176 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from redis.asyncio import Redis
+
+from core.domain.task_group_properties import TaskGroupProperties
+from core.domain.task_variant import SerializableTaskVariant
+from core.domain.version_environment import VersionEnvironment
+from core.utils.lru.lru_cache import LRUCache
+from core.utils.redis_pubsub import RedisSubscriber, publish_json
+
+_INVALIDATION_CHANNEL = "deployments_cache:invalidate"
+
+
+class _DeploymentEntry(NamedTuple):
+    expires_at: float
+    generation: int
+    properties: TaskGroupProperties
+    variant: SerializableTaskVariant
+
+
+class _VariantEntry(NamedTuple):
+    generation: int
+    variant: SerializableTaskVariant
+
+
+class DeploymentsCache:
+    """A versioned in-process cache of the deployments and variants resolved on the OpenAI proxy path.
+
+    Every (tenant, agent) pair has a generation that is bumped when a version is deployed or
+    when the agent is deleted. Entries stored with an older generation are ignored, which makes
+    invalidating all the deployments of an agent O(1). Generation bumps are broadcasted to all
+    processes via a redis pub/sub channel.
+
+    Generations must be read before fetching the value to cache so that an invalidation that happens
+    during the fetch is not missed. Generations are taken from a process wide counter and only the most
+    recently bumped ones are kept. Agents without a generation use the highest evicted generation, so
+    entries stored before an eviction are conservatively invalidated.
+
+    Variants are immutable once stored, so they are only dropped with the agent generation.
+    Values are copied in and out of the cache since callers mutate the returned properties.
+    """
+
+    def __init__(
+        self,
+        deployment_ttl_seconds: float,
+        capacity: int = 10_000,
+        redis_client: Redis | None = None,
+    ):
+        self._deployment_ttl_seconds = deployment_ttl_seconds
+        self._deployments = LRUCache[tuple[str, str, int, VersionEnvironment], _DeploymentEntry](capacity)
+        self._variants = LRUCache[tuple[str, str, str], _VariantEntry](capacity)
+        self._generations = OrderedDict[tuple[str, str], int]()
+        self._generations_capacity = capacity
+        self._last_generation = 0
+        self._evicted_generation = 0
+        self._redis_client = redis_client
+        self._subscriber: RedisSubscriber | None = None
+
+    def generation(self, tenant: str, task_id: str) -> int:
+        return self._generations.get((tenant, task_id), self._evicted_generation)
+
+    def get_deployment(
+        self,
+        tenant: str,
+        task_id: str,
+        schema_id: int,
+        environment: VersionEnvironment,
+    ) -> tuple[TaskGroupProperties, SerializableTaskVariant] | None:
+        try:
+            entry = self._deployments[(tenant, task_id, schema_id, environment)]
+        except KeyError:
+            return None
+        if entry.generation != self.generation(tenant, task_id) or entry.expires_at < time.monotonic():
+            return None
+        return entry.properties.model_copy(deep=True), entry.variant.model_copy()
+
+    def set_deployment(
+        self,
+        tenant: str,
+        task_id: str,
+        schema_id: int,
+        environment: VersionEnvironment,
+        properties: TaskGroupProperties,
+        variant: SerializableTaskVariant,
+        # The generation read before fetching the deployment
+        generation: int,
+    ):
+        self._deployments[(tenant, task_id, schema_id, environment)] = _DeploymentEntry(
+            expires_at=time.monotonic() + self._deployment_ttl_seconds,
+            generation=generation,
+            properties=properties.model_copy(deep=True),
+            variant=variant.model_copy(),
+        )
+
+    def get_variant(self, tenant: str, task_id: str, variant_id: str) -> SerializableTaskVariant | None:
+        try:
+            entry = self._variants[(tenant, task_id, variant_id)]
+        except KeyError:
+            return None
+        if entry.generation != self.generation(tenant, task_id):
+            return None
+        return entry.variant.model_copy()
+
+    def set_variant(self, tenant: str, variant: SerializableTaskVariant, generation: int):
+        self._variants[(tenant, variant.task_id, variant.id)] = _VariantEntry(
+            generation=generation,
+            variant=variant.model_copy(),
+        )
+
+    def _bump_generation(self, tenant: str, task_id: str):
+        self._last_generation += 1
+        key = (tenant, task_id)
+        self._generations[key] = self._last_generation
+        self._generations.move_to_end(key)
+        if len(self._generations) > self._generations_capacity:
+            _, evicted = self._generations.popitem(last=False)
+            self._evicted_generation = max(self._evicted_generation, evicted)
+
+    async def invalidate(self, tenant: str, task_id: str):
+        """Invalidate all the cached deployments and variants of an agent in every process"""
+        self._bump_generation(tenant, task_id)
+        if self._redis_client:
+            await publish_json(self._redis_client, _INVALIDATION_CHANNEL, {"tenant": tenant, "task_id": task_id})
+
+    def _on_invalidation_message(self, payload: dict[str, Any]):
+        self._bump_generation(payload["tenant"], payload["task_id"])
+
+    def _clear(self):
+        self._deployments.cache.clear()
+        self._variants.cache.clear()
+
+    async def start(self):
+        if self._redis_client and not self._subscriber:
+            self._subscriber = RedisSubscriber(
+                self._redis_client,
+                _INVALIDATION_CHANNEL,
+                on_message=self._on_invalidation_message,
+                # Entries we may have missed invalidations for are dropped
+                on_reset=self._clear,
+            )
+            self._subscriber.start()
+
+    async def close(self):
+        if self._subscriber:
+            await self._subscriber.close()
+            self._subscriber = None
+
+
+def _build_shared_deployments_cache() -> DeploymentsCache | None:
+    # A TTL of 0 disables the cache altogether
+    ttl_seconds = float(os.environ.get("DEPLOYMENTS_CACHE_TTL_SECONDS", "60"))
+    if ttl_seconds <= 0:
+        return None
+
+    from core.utils.redis_cache import shared_redis_client
+
+    return DeploymentsCache(
+        deployment_ttl_seconds=ttl_seconds,
+        capacity=int(os.environ.get("DEPLOYMENTS_CACHE_CAPACITY", "10000")),
+        redis_client=shared_redis_client,
+    )
+
+
+_shared_deployments_cache = _build_shared_deployments_cache()
+
+
+def shared_deployments_cache() -> DeploymentsCache | None:
+    return _shared_deployments_cache
+
+
+async def invalidate_deployments_cache(tenant: str, task_id: str):
+    if _shared_deployments_cache:
+        await _shared_deployments_cache.invalidate(tenant=tenant, task_id=task_id)
@@ -0,0 +1,115 @@
+import json
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from api.services.deployments_cache import DeploymentsCache
+from core.domain.task_group_properties import TaskGroupProperties
+from core.domain.version_environment import VersionEnvironment
+from tests import models as test_models
+
+
+@pytest.fixture
+def mock_redis():
+    return AsyncMock()
+
+
+@pytest.fixture
+def deployments_cache(mock_redis: AsyncMock):
+    return DeploymentsCache(deployment_ttl_seconds=10, redis_client=mock_redis)
+
+
+class TestDeployments:
+    def test_get_set(self, deployments_cache: DeploymentsCache):
+        assert deployments_cache.get_deployment("t1", "task_id", 1, VersionEnvironment.PRODUCTION) is None
+
+        properties = TaskGroupProperties(model="gpt-4o")
+        variant = test_models.task_variant()
+        deployments_cache.set_deployment("t1", "task_id", 1, VersionEnvironment.PRODUCTION, properties, variant, 0)
+
+        assert deployments_cache.get_deployment("t1", "task_id", 1, VersionEnvironment.PRODUCTION) == (
+            properties,
+            variant,
+        )
+        assert deployments_cache.get_deployment("t1", "task_id", 1, VersionEnvironment.STAGING) is None
+        assert deployments_cache.get_deployment("t2", "task_id", 1, VersionEnvironment.PRODUCTION) is None
+
+    def test_expiration(self, deployments_cache: DeploymentsCache, frozen_time: FrozenDateTimeFactory):
+        deployments_cache.set_deployment(
+            "t1",
+            "task_id",
+            1,
+            VersionEnvironment.PRODUCTION,
+            TaskGroupProperties(model="gpt-4o"),
+            test_models.task_variant(),
+            0,
+        )
+        frozen_time.tick(timedelta(seconds=11))
+        assert deployments_cache.get_deployment("t1", "task_id", 1, VersionEnvironment.PRODUCTION) is None
+
+
+class TestInvalidate:
+    async def test_invalidate(self, deployments_cache: DeploymentsCache, mock_redis: AsyncMock):
+        variant = test_models.task_variant(task_id="task_id")
+        deployments_cache.set_variant("t1", variant, 0)
+        deployments_cache.set_deployment(
+            "t1",
+            "task_id",
+            1,
+            VersionEnvironment.PRODUCTION,
+            TaskGroupProperties(model="gpt-4o"),
+            variant,
+            0,
+        )
+
+        await deployments_cache.invalidate("t1", "task_id")
+
+        assert deployments_cache.get_deployment("t1", "task_id", 1, VersionEnvironment.PRODUCTION) is None
+        assert deployments_cache.get_variant("t1", "task_id", variant.id) is None
+        assert json.loads(mock_redis.publish.call_args.args[1]) == {"tenant": "t1", "task_id": "task_id"}
+
+        # Entries stored after the invalidation are returned
+        deployments_cache.set_variant("t1", variant, deployments_cache.generation("t1", "task_id"))
+        assert deployments_cache.get_variant("t1", "task_id", variant.id) == variant
+
+    def test_invalidation_message(self, deployments_cache: DeploymentsCache):
+        variant = test_models.task_variant(task_id="task_id")
+        deployments_cache.set_variant("t1", variant, 0)
+
+        deployments_cache._on_invalidation_message({"tenant": "t1", "task_id": "task_id"})  # pyright: ignore [reportPrivateUsage]
+
+        assert deployments_cache.get_variant("t1", "task_id", variant.id) is None
+
+    async def test_invalidate_during_fetch(self, deployments_cache: DeploymentsCache):
+        # The generation is read before the fetch, the deployment changes while fetching
+        generation = deployments_cache.generation("t1", "task_id")
+        await deployments_cache.invalidate("t1", "task_id")
+        deployments_cache.set_deployment(
+            "t1",
+            "task_id",
+            1,
+            VersionEnvironment.PRODUCTION,
+            TaskGroupProperties(model="gpt-4o"),
+            test_models.task_variant(),
+            generation,
+        )
+
+        assert deployments_cache.get_deployment("t1", "task_id", 1, VersionEnvironment.PRODUCTION) is None
+
+    async def test_evicted_generations(self):
+        deployments_cache = DeploymentsCache(deployment_ttl_seconds=10, capacity=2)
+        variant = test_models.task_variant(task_id="task_id")
+        deployments_cache.set_variant("t1", variant, deployments_cache.generation("t1", "task_id"))
+
+        await deployments_cache.invalidate("t1", "task_id")
+        await deployments_cache.invalidate("t1", "other1")
+        await deployments_cache.invalidate("t1", "other2")
+
+        # The generation of the agent was evicted but the entry stored before the invalidation is still ignored
+        assert len(deployments_cache._generations) == 2  # pyright: ignore [reportPrivateUsage]
+        assert deployments_cache.get_variant("t1", "task_id", variant.id) is None
+
+        deployments_cache.set_variant("t1", variant, deployments_cache.generation("t1", "task_id"))
+        assert deployments_cache.get_variant("t1", "task_id", variant.id) == variant
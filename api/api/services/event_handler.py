@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Concatenate, Coroutine, Generic, NamedTuple, Sequence, TypeVar
+from typing import Any, Callable, Concatenate, Coroutine, Generic, NamedTuple, Sequence, TypeVar
 
 from taskiq import AsyncTaskiqDecoratedTask
 
@@ -44,6 +44,8 @@ T = TypeVar("T", bound=Event)
 class _JobListing(NamedTuple, Generic[T]):
     event: type[T]
     jobs: Sequence[AsyncTaskiqDecoratedTask[Concatenate[T, ...], Coroutine[Any, Any, None]] | WithDelay[T]]  # Run ASAP
+    # Applied once to the event before it is sent to reduce the size of the messages
+    compact: Callable[[T], T] | None = None
 
 
 def _jobs():
@@ -76,7 +78,11 @@ def _jobs():
 
     # We use an array to have correct typing
     return [
-        _JobListing(RunCreatedEvent, run_created_jobs.JOBS),
+        _JobListing(
+            RunCreatedEvent,
+            [run_created_jobs.handle_run_created] if run_created_jobs.FAN_OUT_ENABLED else run_created_jobs.JOBS,
+            run_created_jobs.compact_event,
+        ),
         _JobListing(
             TaskSchemaCreatedEvent,
             task_schema_created_jobs.JOBS,
@@ -153,6 +159,8 @@ class _EventRouter:
     def __call__(self, event: Event, retry_after: datetime | None = None) -> None:
         try:
             listing = self._handlers[type(event)]
+            if listing.compact:
+                event = listing.compact(event)
             now = datetime.now()
             for job in listing.jobs:
                 if isinstance(job, WithDelay):
@@ -15,6 +15,8 @@ def _default_file_storage() -> FileStorage:
         return AzureBlobFileStorage(
             os.getenv("WORKFLOWAI_STORAGE_CONNECTION_STRING", ""),
             os.getenv("WORKFLOWAI_STORAGE_TASK_RUNS_CONTAINER", "workflowai-task-runs"),
+            max_connections=int(os.getenv("FILE_STORAGE_MAX_CONNECTIONS", "100")),
+            max_concurrent_uploads=int(os.getenv("FILE_STORAGE_MAX_CONCURRENT_UPLOADS", "20")),
         )
 
     if connection_string.startswith("s3://"):
@@ -23,6 +25,8 @@ def _default_file_storage() -> FileStorage:
         return S3FileStorage(
             connection_string,
             os.getenv("WORKFLOWAI_STORAGE_TASK_RUNS_CONTAINER", ""),
+            max_connections=int(os.getenv("FILE_STORAGE_MAX_CONNECTIONS", "100")),
+            max_concurrent_uploads=int(os.getenv("FILE_STORAGE_MAX_CONCURRENT_UPLOADS", "20")),
         )
 
     logging.getLogger(__name__).warning(
@@ -25,6 +25,7 @@ from core.domain.users import UserIdentifier
 from core.domain.version_environment import VersionEnvironment
 from core.domain.version_reference import VersionReference
 from core.runners.abstract_runner import AbstractRunner
+from core.runners.single_flight import shared_run_single_flight
 from core.runners.workflowai.noop_external_runner import NoopExternalRunner
 from core.runners.workflowai.workflowai_runner import WorkflowAIRunner
 from core.storage import ObjectNotFoundException
@@ -272,6 +273,7 @@ class GroupService:
             custom_configs=custom_configs,
             stream_deltas=stream_deltas,
             use_fallback=use_fallback,
+            single_flight=shared_run_single_flight(),
         )
         await runner.validate_run_options()
         return runner
@@ -7,6 +7,7 @@ from typing import Literal, NamedTuple
 import stripe
 from pydantic import BaseModel, field_serializer, field_validator
 
+from api.services.tenant_cache import invalidate_tenant_cache
 from core.domain.errors import BadRequestError, DefaultError, InternalError, ObjectNotFoundError
 from core.domain.tenant_data import TenantData
 from core.services.emails.email_service import EmailService
@@ -97,6 +98,7 @@ class PaymentService:
 
         # Clear a payment failure if any
         await self._org_storage.clear_payment_failure()
+        await invalidate_tenant_cache(tenant=org_settings.tenant)
 
         return payment_method.id
 
@@ -125,6 +127,7 @@ class PaymentService:
         )
 
         await self._org_storage.update_customer_id(stripe_customer_id=customer.id)
+        await invalidate_tenant_cache(tenant=org_settings.tenant)
         return customer.id
 
     @classmethod
@@ -230,6 +233,7 @@ class PaymentService:
 
         # Opt-out from automatic payments
         await self._org_storage.update_automatic_payment(opt_in=False, threshold=None, balance_to_maintain=None)
+        await invalidate_tenant_cache(tenant=org_settings.tenant)
 
         _logger.info("Deleted payment method", extra={"payment_method_id": payment_method.payment_method_id})
 
@@ -252,6 +256,7 @@ class PaymentService:
             )
 
         await self._org_storage.update_automatic_payment(opt_in, threshold, balance_to_maintain)
+        await invalidate_tenant_cache(tenant=org_settings.tenant)
 
 
 class PaymentSystemService:
@@ -342,6 +347,8 @@ class PaymentSystemService:
             code=code,
             failure_reason=failure_reason,
         )
+        # Runs are blocked based on the cached payment failure
+        await invalidate_tenant_cache(tenant=tenant)
 
         add_background_task(self._email_service.send_payment_failure_email(tenant))
 
@@ -397,6 +404,8 @@ class PaymentSystemService:
 
     async def decrement_credits(self, event_tenant: str, credits: float) -> None:
         org_doc = await self._org_storage.decrement_credits(tenant=event_tenant, credits=credits)
+        # Runs are blocked based on the cached credits so the cache must be refreshed
+        await invalidate_tenant_cache(tenant=event_tenant)
 
         if (
             org_doc.automatic_payment_enabled
@@ -428,9 +437,11 @@ class PaymentSystemService:
             parsed_metadata = _IntentMetadata.model_validate(metadata)
             if parsed_metadata.trigger == "automatic":
                 await self._org_storage.unlock_payment_for_success(parsed_metadata.tenant, amount)
-                return
-            # Otherwise we just need to add the credits
-            await self._org_storage.add_credits_to_tenant(parsed_metadata.tenant, amount)
+            else:
+                # Otherwise we just need to add the credits
+                await self._org_storage.add_credits_to_tenant(parsed_metadata.tenant, amount)
+            # Runs are blocked based on the cached credits so the cache must be refreshed
+            await invalidate_tenant_cache(tenant=parsed_metadata.tenant)
         except Exception as e:
             # Wrap everything in an InternalError to make sure it's easy to spot
             raise InternalError(
@@ -528,6 +539,7 @@ class PaymentSystemService:
         except ObjectNotFoundException:
             # The email was already sent so we can just ignore
             return
+        await invalidate_tenant_cache(tenant=org_data.tenant)
 
         try:
             await self._email_service.send_low_credits_email(org_data.tenant)
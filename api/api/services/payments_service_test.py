@@ -376,6 +376,19 @@ class TestDecrementCredits:
         # No attempt to lock since credits are above threshold
         mock_storage.organizations.attempt_lock_for_payment.assert_not_called()
 
+    async def test_decrement_credits_invalidates_tenant_cache(
+        self,
+        payment_system_service: PaymentSystemService,
+        test_org: TenantData,
+    ):
+        test_org.automatic_payment_enabled = False
+
+        with patch("api.services.payments_service.invalidate_tenant_cache") as mock_invalidate:
+            await payment_system_service.decrement_credits("test-tenant", 1.0)
+
+        # The credit check on the run path reads the cached organization
+        mock_invalidate.assert_awaited_once_with(tenant="test-tenant")
+
     async def test_decrement_credits_triggers_automatic_payment(
         self,
         payment_system_service: PaymentSystemService,
@@ -0,0 +1,67 @@
+import logging
+import os
+
+from redis.asyncio import Redis
+
+from core.utils.coroutines import capture_errors
+
+_logger = logging.getLogger(__name__)
+
+_REDIS_KEY_PREFIX = "reserved_credits"
+
+
+def _redis_key(tenant: str) -> str:
+    return f"{_REDIS_KEY_PREFIX}:{tenant}"
+
+
+class ReservedCredits:
+    """A conservative per tenant counter of the credits that were consumed by runs but not yet decremented
+    from the organization, shared across processes via redis.
+
+    Workers that write credits behind reserve the cost of every run and release it once the credits are
+    decremented. The counter expires ttl_seconds after the last reservation so that the amounts held by
+    a worker that died are eventually dropped."""
+
+    def __init__(self, redis_client: Redis | None, ttl_seconds: float = 60):
+        self._redis_client = redis_client
+        self._ttl_seconds = ttl_seconds
+
+    async def _incr(self, tenant: str, credits: float):
+        if not self._redis_client:
+            return
+        with capture_errors(_logger, "Failed to update reserved credits"):
+            pipeline = self._redis_client.pipeline(transaction=False)
+            pipeline.incrbyfloat(_redis_key(tenant), credits)  # pyright: ignore [reportUnknownMemberType]
+            pipeline.expire(_redis_key(tenant), int(self._ttl_seconds))  # pyright: ignore [reportUnknownMemberType]
+            await pipeline.execute()  # pyright: ignore [reportUnknownMemberType]
+
+    async def reserve(self, tenant: str, credits: float):
+        await self._incr(tenant, credits)
+
+    async def release(self, tenant: str, credits: float):
+        await self._incr(tenant, -credits)
+
+    async def get(self, tenant: str) -> float:
+        if not self._redis_client:
+            return 0
+        with capture_errors(_logger, "Failed to get reserved credits"):
+            raw: bytes | None = await self._redis_client.get(_redis_key(tenant))  # pyright: ignore [reportUnknownMemberType]
+            # A release can land after the key expired
+            return max(float(raw), 0) if raw else 0
+        return 0
+
+
+def _build_shared_reserved_credits() -> ReservedCredits:
+    from core.utils.redis_cache import shared_redis_client
+
+    return ReservedCredits(
+        redis_client=shared_redis_client,
+        ttl_seconds=float(os.environ.get("RESERVED_CREDITS_TTL_SECONDS", "60")),
+    )
+
+
+_shared_reserved_credits = _build_shared_reserved_credits()
+
+
+def shared_reserved_credits() -> ReservedCredits:
+    return _shared_reserved_credits
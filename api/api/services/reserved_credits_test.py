@@ -0,0 +1,33 @@
+from unittest.mock import AsyncMock, Mock
+
+from api.services.reserved_credits import ReservedCredits
+
+
+class TestReservedCredits:
+    async def test_reserve(self):
+        pipeline = Mock(execute=AsyncMock())
+        mock_redis = Mock(pipeline=Mock(return_value=pipeline))
+        reserved_credits = ReservedCredits(redis_client=mock_redis, ttl_seconds=30)
+
+        await reserved_credits.reserve("tenant", 1.5)
+
+        pipeline.incrbyfloat.assert_called_once_with("reserved_credits:tenant", 1.5)
+        pipeline.expire.assert_called_once_with("reserved_credits:tenant", 30)
+        pipeline.execute.assert_awaited_once()
+
+    async def test_get(self):
+        mock_redis = Mock(get=AsyncMock(return_value=b"2.5"))
+        assert await ReservedCredits(redis_client=mock_redis).get("tenant") == 2.5
+
+        # Releases that landed after the key expired are ignored
+        mock_redis.get.return_value = b"-1"
+        assert await ReservedCredits(redis_client=mock_redis).get("tenant") == 0
+
+    async def test_redis_errors_are_ignored(self):
+        mock_redis = Mock(get=AsyncMock(side_effect=Exception("boom")))
+        assert await ReservedCredits(redis_client=mock_redis).get("tenant") == 0
+
+    async def test_no_redis(self):
+        reserved_credits = ReservedCredits(redis_client=None)
+        await reserved_credits.reserve("tenant", 1)
+        assert await reserved_credits.get("tenant") == 0
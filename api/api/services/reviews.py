@@ -1,4 +1,8 @@
+import asyncio
 import logging
+import os
+from collections.abc import Iterable
+from datetime import timedelta
 from typing import Any, Literal, NamedTuple, Protocol, TypedDict, cast
 
 from core.domain.agent_run import TaskRunIO
@@ -30,7 +34,11 @@ from core.evaluators.input_task_evaluator import (
 )
 from core.storage import ObjectNotFoundException, TaskTuple
 from core.storage.backend_storage import BackendStorage
-from core.storage.review_benchmark_storage import RunReviewAggregateWithIteration
+from core.storage.review_benchmark_storage import (
+    ReviewBenchmarkAggregationState,
+    RunReviewAggregateWithIteration,
+    RunReviewSlice,
+)
 from core.storage.reviews_storage import AIReviewerFilter
 from core.storage.task_run_storage import RunAggregate
 from core.utils.fields import datetime_factory
@@ -65,6 +73,16 @@ class _RunReviewAggregate(TypedDict):
 
 
 class ReviewsService:
+    # When enabled, benchmark updates that are triggered by a single run or review are applied as deltas
+    # to the stored aggregates. All versions are aggregated from scratch when a delta can not be applied
+    # or when the last full aggregation is older than the reconcile interval
+    incremental_benchmark = os.environ.get("REVIEW_BENCHMARK_INCREMENTAL") == "true"
+    benchmark_reconcile_interval = timedelta(
+        seconds=float(os.environ.get("REVIEW_BENCHMARK_RECONCILE_INTERVAL_SECONDS", "3600")),
+    )
+    _MAX_BENCHMARK_DELTA_ATTEMPTS = 3
+    _BENCHMARK_PENDING_SLICES_DELAY_SECONDS = 0.05
+
     def __init__(
         self,
         backend_storage: BackendStorage,
@@ -1122,6 +1140,17 @@ class ReviewsService:
             ):
                 return
 
+        if self.incremental_benchmark:
+            if not await self._apply_review_benchmark_delta(
+                task_tuple,
+                task_schema_id,
+                iterations,
+                run_id or cached_run_id,
+                input_hashes,
+            ):
+                await self._reconcile_review_benchmark(task_tuple, task_schema_id)
+            return
+
         version_ids = await self._find_versions_to_aggregate(task_tuple, task_schema_id, iterations, input_hashes)
         if not version_ids:
             self._logger.info("Skipping recompute review benchmark since no iterations to aggregate")
@@ -1153,6 +1182,161 @@ class ReviewsService:
         ]
         await self._storage.review_benchmarks.update_benchmark(task_id, task_schema_id, aggregates, now)
 
+    async def _benchmark_delta_input_hash(
+        self,
+        task_id: TaskTuple,
+        run_id: str | None,
+        input_hashes: tuple[str, str] | None,
+    ) -> str | None:
+        if input_hashes:
+            return input_hashes[0]
+        if not run_id:
+            return None
+        try:
+            run = await self._storage.task_runs.fetch_task_run_resource(task_id, run_id, include={"task_input_hash"})
+        except ObjectNotFoundException:
+            return None
+        return run.task_input_hash
+
+    def _should_reconcile(self, state: ReviewBenchmarkAggregationState):
+        return not state.reconciled_at or datetime_factory() - state.reconciled_at > self.benchmark_reconcile_interval
+
+    async def _apply_review_benchmark_delta(  # noqa: C901
+        self,
+        task_id: TaskTuple,
+        task_schema_id: int,
+        iterations: set[int] | None,
+        run_id: str | None,
+        input_hashes: tuple[str, str] | None,
+    ) -> bool:
+        """Re-aggregates the runs of the single input hash affected by a run or a review and applies
+        the difference with the stored slice to the benchmark aggregates.
+
+        Returns False when the benchmark should be reconciled instead"""
+        input_hash = await self._benchmark_delta_input_hash(task_id, run_id, input_hashes)
+        if not input_hash:
+            return False
+
+        for _ in range(self._MAX_BENCHMARK_DELTA_ATTEMPTS):
+            state = await self._storage.review_benchmarks.get_aggregation_state(
+                task_id[0],
+                task_schema_id,
+                input_hash,
+            )
+            if not state or self._should_reconcile(state):
+                return False
+            if state.slices_pending:
+                # Another update of the same input hash is still writing its slices
+                await asyncio.sleep(self._BENCHMARK_PENDING_SLICES_DELAY_SECONDS)
+                continue
+
+            benchmark_iterations = set(state.slices)
+            if iterations:
+                benchmark_iterations.intersection_update(iterations)
+            if not benchmark_iterations:
+                return True
+
+            iter_id_map = await self._storage.task_groups.map_iterations(
+                task_id[0],
+                task_schema_id,
+                benchmark_iterations,
+            )
+            tracked: dict[int, dict[str, RunReviewSlice]] = {}
+            for iteration in iter_id_map:
+                iteration_slices = state.slices.get(iteration)
+                if iteration_slices is None:
+                    # The version was added after the last reconciliation
+                    return False
+                tracked[iteration] = iteration_slices
+
+            by_version = await self._aggregate_review_slices(
+                task_id,
+                task_schema_id,
+                {input_hash},
+                set(iter_id_map.values()),
+            )
+            fresh = {it: by_version.get(v, {}).get(input_hash) for it, v in iter_id_map.items()}
+            # Runs only count towards the benchmark once their input has been reviewed
+            included = (
+                input_hashes is not None
+                or any(s is not None and input_hash in s for s in state.slices.values())
+                or any(s is not None and s.has_reviews() for s in fresh.values())
+            )
+
+            aggregates: list[RunReviewAggregateWithIteration] = []
+            slices: dict[int, dict[str, RunReviewSlice | None]] = {}
+            for iteration, iteration_slices in tracked.items():
+                previous = iteration_slices.get(input_hash)
+                current = fresh[iteration] if included else None
+                if previous != current:
+                    aggregates.append(state.totals[iteration].add(previous, -1).add(current).to_aggregate(iteration))
+                    slices[iteration] = {input_hash: current}
+
+            if not aggregates:
+                return True
+
+            if await self._storage.review_benchmarks.apply_aggregate_deltas(
+                task_id[0],
+                task_schema_id,
+                state.revision,
+                aggregates,
+                slices,
+                datetime_factory(),
+            ):
+                return True
+
+        self._logger.warning(
+            "Could not apply review benchmark delta",
+            extra={"task_id": task_id[0], "task_schema_id": task_schema_id, "input_hash": input_hash},
+        )
+        return False
+
+    async def _reconcile_review_benchmark(self, task_id: TaskTuple, task_schema_id: int):
+        """Aggregates all benchmarked versions from scratch and stores the slices per input hash
+        that are used by incremental updates"""
+        version_ids = await self._find_versions_to_aggregate(task_id, task_schema_id, None, None)
+        if not version_ids:
+            self._logger.info("Skipping review benchmark reconciliation since no iterations to aggregate")
+            return
+
+        for _ in range(self._MAX_BENCHMARK_DELTA_ATTEMPTS):
+            # Read before aggregating so that deltas applied in the meantime are not overwritten
+            revision = await self._storage.review_benchmarks.get_aggregates_revision(task_id[0], task_schema_id)
+            if revision is None:
+                return
+
+            hashes = await self._reviews_storage.find_unique_input_hashes(
+                task_id=task_id[0],
+                task_schema_id=task_schema_id,
+            )
+            now = datetime_factory()
+
+            by_version = await self._aggregate_review_slices(task_id, task_schema_id, set(hashes), set(version_ids))
+            slices = {iteration: by_version.get(version_id, {}) for version_id, iteration in version_ids.items()}
+
+            aggregates: list[RunReviewAggregateWithIteration] = []
+            for iteration, iteration_slices in slices.items():
+                total = RunReviewSlice()
+                for s in iteration_slices.values():
+                    total = total.add(s)
+                aggregates.append(total.to_aggregate(iteration))
+
+            if await self._storage.review_benchmarks.update_benchmark(
+                task_id[0],
+                task_schema_id,
+                aggregates,
+                now,
+                slices=slices,
+                revision=revision,
+            ):
+                return
+
+        # The next update will trigger a new reconciliation
+        self._logger.warning(
+            "Could not reconcile review benchmark",
+            extra={"task_id": task_id[0], "task_schema_id": task_schema_id},
+        )
+
     async def assign_review_to_runs(
         self,
         task_id: str,
@@ -1468,20 +1652,15 @@ class ReviewsService:
 
         return await self._add_input_to_evaluation(task_tuple, task_schema_id, created_input_evaluation)
 
-    # TODO: test, right now only tested throw
-    def _merge_aggregate(  # noqa: C901
-        self,
-        version_id: str,
-        agg: RunAggregate,
-        reviews_by_eval_hash: dict[str, Review],
-    ):
+    def _count_reviews(self, eval_hashes: Iterable[str], reviews_by_eval_hash: dict[str, Review]):  # noqa: C901
+        """Returns a slice that only contains the review counts"""
         in_progress_review_count = 0
         positive_review_count = 0
         positive_user_review_count = 0
         negative_review_count = 0
         negative_user_review_count = 0
         unsure_review_count = 0
-        for eval_hash in agg["eval_hashes"]:
+        for eval_hash in eval_hashes:
             review = reviews_by_eval_hash.get(eval_hash)
             if not review:
                 continue
@@ -1505,14 +1684,31 @@ class ReviewsService:
                 case None:
                     self._logger.warning("Review has no outcome", extra={"review": safe_dump_pydantic_model(review)})
 
-        return _RunReviewAggregate(
-            version_id=version_id,
+        return RunReviewSlice(
             in_progress_review_count=in_progress_review_count,
             positive_review_count=positive_review_count,
             positive_user_review_count=positive_user_review_count,
             negative_review_count=negative_review_count,
             negative_user_review_count=negative_user_review_count,
             unsure_review_count=unsure_review_count,
+        )
+
+    # TODO: test, right now only tested throw
+    def _merge_aggregate(
+        self,
+        version_id: str,
+        agg: RunAggregate,
+        reviews_by_eval_hash: dict[str, Review],
+    ):
+        counts = self._count_reviews(agg["eval_hashes"], reviews_by_eval_hash)
+        return _RunReviewAggregate(
+            version_id=version_id,
+            in_progress_review_count=counts.in_progress_review_count,
+            positive_review_count=counts.positive_review_count,
+            positive_user_review_count=counts.positive_user_review_count,
+            negative_review_count=counts.negative_review_count,
+            negative_user_review_count=counts.negative_user_review_count,
+            unsure_review_count=counts.unsure_review_count,
             average_cost_usd=agg.get("average_cost_usd"),
             average_duration_seconds=agg.get("average_duration_seconds"),
             total_run_count=agg["total_run_count"],
@@ -1536,12 +1732,51 @@ class ReviewsService:
         for r in run_aggs.values():
             eval_hashes.update(r["eval_hashes"])
 
+        reviews_by_eval_hash = await self._reviews_by_eval_hash(task_id[0], eval_hashes)
+
+        for version_id, run_agg in run_aggs.items():
+            yield self._merge_aggregate(version_id, run_agg, reviews_by_eval_hash)
+
+    async def _reviews_by_eval_hash(self, task_id: str, eval_hashes: set[str]):
         reviews_by_eval_hash: dict[str, Review] = {}
-        async for review in self._storage.reviews.reviews_for_eval_hashes(task_id[0], eval_hashes):
+        async for review in self._storage.reviews.reviews_for_eval_hashes(task_id, eval_hashes):
             # Supposedly the first review should be the good one
             # But just in case, we only override the review for a given hash if it is a user review
             if review.eval_hash not in reviews_by_eval_hash or review.reviewer.reviewer_type == "user":
                 reviews_by_eval_hash[review.eval_hash] = review
+        return reviews_by_eval_hash
 
-        for version_id, run_agg in run_aggs.items():
-            yield self._merge_aggregate(version_id, run_agg, reviews_by_eval_hash)
+    async def _aggregate_review_slices(
+        self,
+        task_id: TaskTuple,
+        task_schema_id: int,
+        task_input_hashes: set[str],
+        group_ids: set[str],
+    ) -> dict[str, dict[str, RunReviewSlice]]:
+        """Returns the review slices by version id and input hash"""
+        run_aggs = await self._storage.task_runs.aggregate_runs_by_input_hash(
+            task_id,
+            task_schema_id,
+            task_input_hashes,
+            group_ids,
+        )
+        eval_hashes: set[str] = set()
+        for by_input in run_aggs.values():
+            for r in by_input.values():
+                eval_hashes.update(r["eval_hashes"])
+
+        reviews_by_eval_hash = await self._reviews_by_eval_hash(task_id[0], eval_hashes)
+
+        def _slice(agg: RunAggregate):
+            total_run_count = agg["total_run_count"]
+            return self._count_reviews(agg["eval_hashes"], reviews_by_eval_hash)._replace(
+                total_run_count=total_run_count,
+                failed_run_count=agg.get("failed_run_count") or 0,
+                total_cost_usd=(agg.get("average_cost_usd") or 0) * total_run_count,
+                total_duration_seconds=(agg.get("average_duration_seconds") or 0) * total_run_count,
+            )
+
+        return {
+            version_id: {input_hash: _slice(agg) for input_hash, agg in by_input.items()}
+            for version_id, by_input in run_aggs.items()
+        }
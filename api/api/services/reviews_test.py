@@ -1,3 +1,4 @@
+from datetime import timedelta
 from typing import Any, cast
 from unittest.mock import AsyncMock, Mock
 
@@ -15,7 +16,11 @@ from core.domain.review import Review, ReviewOutcome
 from core.domain.task_evaluation import TaskEvaluation
 from core.domain.users import UserIdentifier
 from core.evaluators.abstract_evaluator import AbstractEvaluator
-from core.storage.review_benchmark_storage import RunReviewAggregateWithIteration
+from core.storage.review_benchmark_storage import (
+    ReviewBenchmarkAggregationState,
+    RunReviewAggregateWithIteration,
+    RunReviewSlice,
+)
 from core.storage.task_run_storage import RunAggregate
 from core.utils.fields import datetime_factory
 from tests.models import task_variant
@@ -212,6 +217,180 @@ class TestRecomputeReviewBenchmark:
         mock_storage.task_groups.map_iterations.assert_awaited_once_with("task_id", 1, {1})
 
 
+class TestIncrementalReviewBenchmark:
+    @pytest.fixture(autouse=True)
+    def incremental(self, reviews_service: ReviewsService, mock_storage: Mock, frozen_time: FrozenDateTimeFactory):
+        reviews_service.incremental_benchmark = True
+        mock_storage.get_task_tuple.return_value = ("task_id", 1)
+        mock_storage.review_benchmarks.get_benchmark_versions.return_value = {1}
+        mock_storage.task_groups.map_iterations.return_value = {1: "v1"}
+        mock_storage.review_benchmarks.get_aggregates_revision.return_value = 3
+        mock_storage.review_benchmarks.update_benchmark.return_value = True
+
+    def _state(
+        self,
+        input_hash: str,
+        reconciled_at_delta: timedelta = timedelta(minutes=1),
+        slices_pending: bool = False,
+    ):
+        stored = {
+            "a": RunReviewSlice(total_run_count=1, positive_review_count=1),
+            "b": RunReviewSlice(total_run_count=1),
+        }
+        return ReviewBenchmarkAggregationState(
+            revision=3,
+            reconciled_at=datetime_factory() - reconciled_at_delta,
+            totals={1: RunReviewSlice(total_run_count=2, positive_review_count=1)},
+            # Only the slices of the requested input hash are returned
+            slices={1: {input_hash: stored[input_hash]} if input_hash in stored else {}},
+            slices_pending=slices_pending,
+        )
+
+    async def test_reconcile_without_state(self, reviews_service: ReviewsService, mock_storage: Mock):
+        mock_storage.review_benchmarks.get_aggregation_state.return_value = None
+        mock_storage.reviews.find_unique_input_hashes.return_value = {"a", "b"}
+        mock_storage.task_runs.aggregate_runs_by_input_hash.return_value = {
+            "v1": {
+                "a": _run_agg(["e1"]),
+                "b": _run_agg(["e2"], total_run_count=2, average_cost_usd=2),
+            },
+        }
+        mock_storage.reviews.reviews_for_eval_hashes.return_value = mock_aiter(_review(eval_hash="e1", user=True))
+
+        await reviews_service.recompute_review_benchmark("task_id", 1, input_hashes=("a", "o"))
+
+        mock_storage.task_runs.aggregate_runs_by_input_hash.assert_awaited_once_with(
+            ("task_id", 1),
+            1,
+            {"a", "b"},
+            {"v1"},
+        )
+        mock_storage.review_benchmarks.update_benchmark.assert_awaited_once_with(
+            "task_id",
+            1,
+            [
+                _review_agg(
+                    1,
+                    total_run_count=3,
+                    average_cost_usd=pytest.approx(4 / 3),  # pyright: ignore [reportUnknownMemberType]
+                    positive_review_count=1,
+                    positive_user_review_count=1,
+                ),
+            ],
+            datetime_factory(),
+            slices={
+                1: {
+                    "a": RunReviewSlice(total_run_count=1, positive_review_count=1, positive_user_review_count=1),
+                    "b": RunReviewSlice(total_run_count=2, total_cost_usd=4),
+                },
+            },
+            revision=3,
+        )
+        mock_storage.task_runs.aggregate_runs.assert_not_called()
+
+    async def test_apply_review_delta(self, reviews_service: ReviewsService, mock_storage: Mock):
+        mock_storage.review_benchmarks.get_aggregation_state.return_value = self._state("b")
+        mock_storage.task_runs.aggregate_runs_by_input_hash.return_value = {"v1": {"b": _run_agg(["e2"])}}
+        mock_storage.reviews.reviews_for_eval_hashes.return_value = mock_aiter(
+            _review(eval_hash="e2", outcome="negative"),
+        )
+        mock_storage.review_benchmarks.apply_aggregate_deltas.return_value = True
+
+        await reviews_service.recompute_review_benchmark("task_id", 1, input_hashes=("b", "o"))
+
+        mock_storage.review_benchmarks.get_aggregation_state.assert_awaited_once_with("task_id", 1, "b")
+        mock_storage.task_runs.aggregate_runs_by_input_hash.assert_awaited_once_with(("task_id", 1), 1, {"b"}, {"v1"})
+        mock_storage.review_benchmarks.apply_aggregate_deltas.assert_awaited_once_with(
+            "task_id",
+            1,
+            3,
+            [_review_agg(1, total_run_count=2, positive_review_count=1, negative_review_count=1)],
+            {1: {"b": RunReviewSlice(total_run_count=1, negative_review_count=1)}},
+            datetime_factory(),
+        )
+        mock_storage.review_benchmarks.update_benchmark.assert_not_called()
+        mock_storage.reviews.find_unique_input_hashes.assert_not_called()
+
+    async def test_run_for_unreviewed_input(self, reviews_service: ReviewsService, mock_storage: Mock):
+        mock_storage.review_benchmarks.get_aggregation_state.return_value = self._state("c")
+        mock_storage.task_runs.fetch_task_run_resource.return_value = Mock(task_input_hash="c")
+        mock_storage.task_runs.aggregate_runs_by_input_hash.return_value = {"v1": {"c": _run_agg(["e3"])}}
+        mock_storage.reviews.reviews_for_eval_hashes.return_value = mock_aiter()
+
+        await reviews_service.recompute_review_benchmark("task_id", 1, iterations={1}, run_id="run_id")
+
+        mock_storage.review_benchmarks.complete_run.assert_awaited_once_with("task_id", 1, 1, "run_id")
+        mock_storage.review_benchmarks.apply_aggregate_deltas.assert_not_called()
+        mock_storage.review_benchmarks.update_benchmark.assert_not_called()
+
+    async def test_retry_on_conflict(self, reviews_service: ReviewsService, mock_storage: Mock):
+        mock_storage.review_benchmarks.get_aggregation_state.return_value = self._state("a")
+        mock_storage.task_runs.fetch_task_run_resource.return_value = Mock(task_input_hash="a")
+        mock_storage.task_runs.aggregate_runs_by_input_hash.return_value = {"v1": {"a": _run_agg(["e1"])}}
+        mock_storage.reviews.reviews_for_eval_hashes.side_effect = lambda *_: mock_aiter(  # pyright: ignore
+            _review(eval_hash="e1", outcome="unsure"),
+        )
+        mock_storage.review_benchmarks.apply_aggregate_deltas.side_effect = [False, True]
+
+        await reviews_service.recompute_review_benchmark("task_id", 1, iterations={1}, run_id="run_id")
+
+        assert mock_storage.review_benchmarks.get_aggregation_state.await_count == 2
+        assert mock_storage.review_benchmarks.apply_aggregate_deltas.await_count == 2
+        mock_storage.review_benchmarks.update_benchmark.assert_not_called()
+
+    async def test_wait_for_pending_slices(self, reviews_service: ReviewsService, mock_storage: Mock):
+        reviews_service._BENCHMARK_PENDING_SLICES_DELAY_SECONDS = 0  # pyright: ignore [reportPrivateUsage]
+        mock_storage.review_benchmarks.get_aggregation_state.side_effect = [
+            self._state("b", slices_pending=True),
+            self._state("b"),
+        ]
+        mock_storage.task_runs.aggregate_runs_by_input_hash.return_value = {"v1": {"b": _run_agg(["e2"])}}
+        mock_storage.reviews.reviews_for_eval_hashes.return_value = mock_aiter(
+            _review(eval_hash="e2", outcome="negative"),
+        )
+        mock_storage.review_benchmarks.apply_aggregate_deltas.return_value = True
+
+        await reviews_service.recompute_review_benchmark("task_id", 1, input_hashes=("b", "o"))
+
+        # The delta is only computed once the slices of the hash match the aggregates
+        assert mock_storage.review_benchmarks.get_aggregation_state.await_count == 2
+        mock_storage.task_runs.aggregate_runs_by_input_hash.assert_awaited_once()
+        mock_storage.review_benchmarks.apply_aggregate_deltas.assert_awaited_once()
+        mock_storage.review_benchmarks.update_benchmark.assert_not_called()
+
+    async def test_reconcile_when_stale(self, reviews_service: ReviewsService, mock_storage: Mock):
+        mock_storage.review_benchmarks.get_aggregation_state.return_value = self._state("a", timedelta(days=1))
+        mock_storage.reviews.find_unique_input_hashes.return_value = {"a"}
+        mock_storage.task_runs.aggregate_runs_by_input_hash.return_value = {}
+        mock_storage.reviews.reviews_for_eval_hashes.return_value = mock_aiter()
+
+        await reviews_service.recompute_review_benchmark("task_id", 1, input_hashes=("a", "o"))
+
+        mock_storage.review_benchmarks.apply_aggregate_deltas.assert_not_called()
+        mock_storage.review_benchmarks.update_benchmark.assert_awaited_once_with(
+            "task_id",
+            1,
+            [RunReviewSlice().to_aggregate(1)],
+            datetime_factory(),
+            slices={1: {}},
+            revision=3,
+        )
+
+    async def test_reconcile_retries_on_conflict(self, reviews_service: ReviewsService, mock_storage: Mock):
+        mock_storage.review_benchmarks.get_aggregation_state.return_value = None
+        mock_storage.review_benchmarks.get_aggregates_revision.side_effect = [3, 4]
+        # A delta was applied while the first reconciliation was aggregating
+        mock_storage.review_benchmarks.update_benchmark.side_effect = [False, True]
+        mock_storage.reviews.find_unique_input_hashes.return_value = {"a"}
+        mock_storage.task_runs.aggregate_runs_by_input_hash.return_value = {}
+        mock_storage.reviews.reviews_for_eval_hashes.side_effect = lambda *_: mock_aiter()  # pyright: ignore
+
+        await reviews_service.recompute_review_benchmark("task_id", 1, input_hashes=("a", "o"))
+
+        assert mock_storage.review_benchmarks.update_benchmark.await_count == 2
+        assert mock_storage.review_benchmarks.update_benchmark.call_args.kwargs["revision"] == 4
+
+
 class TestTriggerRunsForBenchmark:
     async def test_no_iterations(
         self,
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from collections.abc import Coroutine
+from datetime import datetime
+from typing import Any
+
+from api.services.payments_service import PaymentSystemService
+from api.services.reserved_credits import ReservedCredits, shared_reserved_credits
+from core.domain.task_group_update import TaskGroupRunStats
+from core.storage.task_group_storage import TaskGroupStorage
+from core.utils.coroutines import capture_errors
+
+_logger = logging.getLogger(__name__)
+
+_TaskGroupKey = tuple[str, int, int]
+
+
+class _PendingTaskGroups:
+    __slots__ = ("stats", "storage")
+
+    def __init__(self, storage: TaskGroupStorage):
+        self.storage = storage
+        self.stats: dict[_TaskGroupKey, TaskGroupRunStats] = {}
+
+
+class _PendingCredits:
+    __slots__ = ("credits", "payment_service")
+
+    def __init__(self, payment_service: PaymentSystemService):
+        self.payment_service = payment_service
+        self.credits = 0.0
+
+
+class RunStatsAggregator:
+    """Merges the counter updates that are triggered by every run and writes them behind, at a fixed interval.
+
+    - run counts and last active dates are merged per tenant and task group and flushed as a single
+    bulk write per tenant
+    - credits are summed per tenant and decremented once per flush, or right away once they reach
+    max_pending_credits. Every run also reserves its cost in the shared reserved credits counter, which is
+    released once the credits are decremented, so that the balance checked by the API accounts for the
+    credits that are still pending
+    - a task schema only needs to be marked as active once per flush interval
+
+    Updates that are pending when the process dies are lost, close must be called at shutdown."""
+
+    def __init__(
+        self,
+        flush_interval_seconds: float = 1,
+        max_pending_credits: float = 1,
+        reserved_credits: ReservedCredits | None = None,
+    ):
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_pending_credits = max_pending_credits
+        self._reserved_credits = reserved_credits
+        self._task_groups: dict[str, _PendingTaskGroups] = {}
+        self._credits: dict[str, _PendingCredits] = {}
+        self._active_schemas: set[tuple[str, str, int]] = set()
+        self._schedule_task: asyncio.Task[None] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def _start(self):
+        if not self._schedule_task:
+            self._schedule_task = asyncio.create_task(self._scheduled_flush())
+
+    async def _scheduled_flush(self):
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            self._add_task(self.flush())
+
+    def _add_task(self, coro: Coroutine[Any, Any, None]):
+        t = asyncio.create_task(coro)
+        self._tasks.add(t)
+        t.add_done_callback(self._tasks.remove)
+
+    def _update_task_group(
+        self,
+        tenant: str,
+        storage: TaskGroupStorage,
+        task_id: str,
+        task_schema_id: int,
+        iteration: int,
+        run_count: int = 0,
+        last_active_at: datetime | None = None,
+    ):
+        self._start()
+        pending = self._task_groups.get(tenant)
+        if pending is None:
+            pending = self._task_groups[tenant] = _PendingTaskGroups(storage)
+
+        key = (task_id, task_schema_id, iteration)
+        current = pending.stats.get(key) or TaskGroupRunStats(task_id, task_schema_id, iteration)
+        if current.last_active_at and (not last_active_at or current.last_active_at > last_active_at):
+            last_active_at = current.last_active_at
+        pending.stats[key] = current._replace(
+            run_count=current.run_count + run_count,
+            last_active_at=last_active_at,
+        )
+
+    def increment_run_count(
+        self,
+        tenant: str,
+        storage: TaskGroupStorage,
+        task_id: str,
+        task_schema_id: int,
+        iteration: int,
+    ):
+        self._update_task_group(tenant, storage, task_id, task_schema_id, iteration, run_count=1)
+
+    def update_task_group_last_active_at(
+        self,
+        tenant: str,
+        storage: TaskGroupStorage,
+        task_id: str,
+        task_schema_id: int,
+        iteration: int,
+        last_active_at: datetime,
+    ):
+        self._update_task_group(tenant, storage, task_id, task_schema_id, iteration, last_active_at=last_active_at)
+
+    def should_update_task_schema_last_active_at(self, tenant: str, task_id: str, task_schema_id: int) -> bool:
+        """Returns true only for the first run of a task schema in the current flush interval"""
+        self._start()
+        key = (tenant, task_id, task_schema_id)
+        if key in self._active_schemas:
+            return False
+        self._active_schemas.add(key)
+        return True
+
+    def decrement_credits(self, tenant: str, credits: float, payment_service: PaymentSystemService):
+        self._start()
+        pending = self._credits.get(tenant)
+        if pending is None:
+            pending = self._credits[tenant] = _PendingCredits(payment_service)
+        pending.credits += credits
+        if self._reserved_credits:
+            self._add_task(self._reserved_credits.reserve(tenant, credits))
+
+        if pending.credits >= self._max_pending_credits:
+            del self._credits[tenant]
+            self._add_task(self._flush_credits(tenant, pending))
+
+    async def _flush_task_groups(self, tenant: str, pending: _PendingTaskGroups):
+        with capture_errors(_logger, "Failed to flush task group run stats"):
+            await pending.storage.bulk_update_run_stats(list(pending.stats.values()))
+
+    async def _flush_credits(self, tenant: str, pending: _PendingCredits):
+        try:
+            with capture_errors(_logger, "Failed to flush credits"):
+                await pending.payment_service.decrement_credits(tenant, pending.credits)
+        finally:
+            if self._reserved_credits:
+                await self._reserved_credits.release(tenant, pending.credits)
+
+    async def flush(self):
+        task_groups, self._task_groups = self._task_groups, {}
+        credits, self._credits = self._credits, {}
+        self._active_schemas = set()
+
+        await asyncio.gather(
+            *(self._flush_task_groups(tenant, pending) for tenant, pending in task_groups.items()),
+            *(self._flush_credits(tenant, pending) for tenant, pending in credits.items()),
+        )
+
+    async def close(self):
+        """Stop the periodic flush and write whatever is pending"""
+        if self._schedule_task:
+            self._schedule_task.cancel()
+            self._schedule_task = None
+        await asyncio.gather(*self._tasks)
+        await self.flush()
+
+
+_shared_run_stats_aggregator: RunStatsAggregator | None = None
+
+
+def enable_run_stats_aggregation(flush_interval_seconds: float, max_pending_credits: float):
+    """Should be called at worker startup, and close_run_stats_aggregator at shutdown"""
+    global _shared_run_stats_aggregator
+    _shared_run_stats_aggregator = RunStatsAggregator(
+        flush_interval_seconds,
+        max_pending_credits,
+        reserved_credits=shared_reserved_credits(),
+    )
+
+
+def shared_run_stats_aggregator() -> RunStatsAggregator | None:
+    return _shared_run_stats_aggregator
+
+
+async def close_run_stats_aggregator():
+    global _shared_run_stats_aggregator
+    if _shared_run_stats_aggregator:
+        aggregator = _shared_run_stats_aggregator
+        _shared_run_stats_aggregator = None
+        await aggregator.close()
@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from api.services.run_stats_aggregator import RunStatsAggregator
+from core.domain.task_group_update import TaskGroupRunStats
+
+
+@pytest.fixture
+def aggregator():
+    # The periodic flush is not triggered during tests
+    return RunStatsAggregator(flush_interval_seconds=100, max_pending_credits=10)
+
+
+@pytest.fixture
+def mock_task_group_storage():
+    return Mock(bulk_update_run_stats=AsyncMock())
+
+
+@pytest.fixture
+def mock_payment_service():
+    return Mock(decrement_credits=AsyncMock())
+
+
+class TestTaskGroups:
+    async def test_merged_per_task_group(self, aggregator: RunStatsAggregator, mock_task_group_storage: Mock):
+        t1 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        t2 = datetime(2025, 1, 2, tzinfo=timezone.utc)
+
+        aggregator.increment_run_count("tenant", mock_task_group_storage, "task", 1, 1)
+        aggregator.increment_run_count("tenant", mock_task_group_storage, "task", 1, 1)
+        aggregator.update_task_group_last_active_at("tenant", mock_task_group_storage, "task", 1, 1, t2)
+        aggregator.update_task_group_last_active_at("tenant", mock_task_group_storage, "task", 1, 1, t1)
+        aggregator.increment_run_count("tenant", mock_task_group_storage, "task", 1, 2)
+
+        await aggregator.close()
+
+        mock_task_group_storage.bulk_update_run_stats.assert_awaited_once_with(
+            [
+                TaskGroupRunStats("task", 1, 1, run_count=2, last_active_at=t2),
+                TaskGroupRunStats("task", 1, 2, run_count=1),
+            ],
+        )
+
+    async def test_one_bulk_write_per_tenant(self, aggregator: RunStatsAggregator):
+        storages = [Mock(bulk_update_run_stats=AsyncMock()) for _ in range(2)]
+        aggregator.increment_run_count("tenant1", storages[0], "task", 1, 1)
+        aggregator.increment_run_count("tenant2", storages[1], "task", 1, 1)
+
+        await aggregator.flush()
+
+        for storage in storages:
+            storage.bulk_update_run_stats.assert_awaited_once_with([TaskGroupRunStats("task", 1, 1, run_count=1)])
+
+        # Nothing is left to flush
+        await aggregator.close()
+        for storage in storages:
+            storage.bulk_update_run_stats.assert_awaited_once()
+
+    async def test_failures_are_not_propagated(self, aggregator: RunStatsAggregator, mock_task_group_storage: Mock):
+        mock_task_group_storage.bulk_update_run_stats.side_effect = Exception("boom")
+        aggregator.increment_run_count("tenant", mock_task_group_storage, "task", 1, 1)
+
+        await aggregator.close()
+
+
+class TestCredits:
+    async def test_summed_per_tenant(self, aggregator: RunStatsAggregator, mock_payment_service: Mock):
+        aggregator.decrement_credits("tenant", 1, mock_payment_service)
+        aggregator.decrement_credits("tenant", 2, mock_payment_service)
+        await asyncio.sleep(0)
+        mock_payment_service.decrement_credits.assert_not_awaited()
+
+        await aggregator.close()
+
+        mock_payment_service.decrement_credits.assert_awaited_once_with("tenant", 3)
+
+    async def test_flushed_above_max_pending(self, aggregator: RunStatsAggregator, mock_payment_service: Mock):
+        aggregator.decrement_credits("tenant", 4, mock_payment_service)
+        aggregator.decrement_credits("tenant", 7, mock_payment_service)
+        # The tenant is flushed without waiting for the interval
+        await asyncio.sleep(0)
+        mock_payment_service.decrement_credits.assert_awaited_once_with("tenant", 11)
+
+        await aggregator.close()
+        mock_payment_service.decrement_credits.assert_awaited_once()
+
+    async def test_credits_are_reserved_until_flushed(self, mock_payment_service: Mock):
+        reserved_credits = Mock(reserve=AsyncMock(), release=AsyncMock())
+        aggregator = RunStatsAggregator(
+            flush_interval_seconds=100,
+            max_pending_credits=10,
+            reserved_credits=reserved_credits,
+        )
+        aggregator.decrement_credits("tenant", 1, mock_payment_service)
+        aggregator.decrement_credits("tenant", 2, mock_payment_service)
+        await asyncio.sleep(0)
+
+        assert reserved_credits.reserve.await_count == 2
+        reserved_credits.release.assert_not_awaited()
+
+        await aggregator.close()
+
+        reserved_credits.release.assert_awaited_once_with("tenant", 3)
+
+
+class TestShouldUpdateTaskSchemaLastActiveAt:
+    async def test_once_per_flush(self, aggregator: RunStatsAggregator):
+        assert aggregator.should_update_task_schema_last_active_at("tenant", "task", 1)
+        assert not aggregator.should_update_task_schema_last_active_at("tenant", "task", 1)
+        assert aggregator.should_update_task_schema_last_active_at("tenant", "task", 2)
+
+        await aggregator.flush()
+
+        assert aggregator.should_update_task_schema_last_active_at("tenant", "task", 1)
+        await aggregator.close()
@@ -0,0 +1,63 @@
+import hashlib
+import logging
+from datetime import timedelta
+
+from pydantic import BaseModel, ValidationError
+
+from core.storage.key_value_storage import KeyValueStorage
+from core.utils.coroutines import capture_errors
+
+_logger = logging.getLogger(__name__)
+
+_EXPIRY_TIME = timedelta(days=1)
+
+
+class IndexedURL(BaseModel):
+    etag: str
+    storage_url: str
+    content_type: str | None = None
+
+
+class FileIndex:
+    """Maps files to their storage urls so that files that were already stored in a folder are not
+    downloaded and uploaded again.
+
+    Stored files are indexed by the sha256 of their content. URLs are indexed with the ETag that was
+    returned when they were downloaded so that a file that did not change can be skipped with a
+    conditional request. Failures are logged and treated as misses."""
+
+    def __init__(self, kv_storage: KeyValueStorage, folder_path: str):
+        self._kv_storage = kv_storage
+        self._folder_path = folder_path
+
+    def _key(self, key: str) -> str:
+        return f"files:{self._folder_path}:{key}"
+
+    def _url_key(self, url: str) -> str:
+        return self._key(f"url:{hashlib.sha256(url.encode()).hexdigest()}")
+
+    def _content_key(self, content_hash: str, content_type: str | None) -> str:
+        # The content type is part of the blob name
+        return self._key(f"sha256:{content_hash}:{content_type or ''}")
+
+    async def get_url(self, url: str) -> IndexedURL | None:
+        with capture_errors(_logger, "Could not get indexed url"):
+            if raw := await self._kv_storage.get(self._url_key(url)):
+                try:
+                    return IndexedURL.model_validate_json(raw)
+                except ValidationError:
+                    _logger.warning("Invalid indexed url", extra={"url": url})
+        return None
+
+    async def set_url(self, url: str, indexed: IndexedURL):
+        with capture_errors(_logger, "Could not index url"):
+            await self._kv_storage.set(self._url_key(url), indexed.model_dump_json(), _EXPIRY_TIME)
+
+    async def get_content(self, content_hash: str, content_type: str | None) -> str | None:
+        with capture_errors(_logger, "Could not get indexed file"):
+            return await self._kv_storage.get(self._content_key(content_hash, content_type))
+        return None
+
+    async def set_content(self, content_hash: str, content_type: str | None, storage_url: str):
+        with capture_errors(_logger, "Could not index file"):
+            await self._kv_storage.set(self._content_key(content_hash, content_type), storage_url, _EXPIRY_TIME)
@@ -1,20 +1,25 @@
 import asyncio
+import hashlib
 import logging
 from collections.abc import Iterable
 from typing import Any
 
+from api.services.runs._file_index import FileIndex, IndexedURL
 from api.services.runs._stored_message import StoredMessages
 from core.domain.agent_run import TaskRunIO
 from core.domain.fields.file import File
 from core.domain.task_io import SerializableTaskIO
 from core.domain.task_variant import VariantIO
 from core.runners.workflowai.utils import (
+    FetchedFile,
     FileWithKeyPath,
-    download_file,
+    assign_file_content,
     extract_files,
+    fetch_file,
 )
 from core.storage.azure.azure_blob_file_storage import FileStorage
 from core.storage.file_storage import FileData
+from core.storage.key_value_storage import KeyValueStorage
 from core.utils.coroutines import sentry_wrap
 from core.utils.dicts import InvalidKeyPathError, set_at_keypath
 
@@ -22,9 +27,10 @@ _logger = logging.getLogger("RunsService")
 
 
 class FileHandler:
-    def __init__(self, file_storage: FileStorage, folder_path: str):
+    def __init__(self, file_storage: FileStorage, folder_path: str, kv_storage: KeyValueStorage | None = None):
         self._file_storage = file_storage
         self._folder_path = folder_path
+        self._index = FileIndex(kv_storage, folder_path) if kv_storage else None
 
     @classmethod
     def _extract_files(
@@ -55,13 +61,46 @@ class FileHandler:
             self._apply_files(raw_input_dict, input_files, include={"content_type", "url", "storage_url"})
         self._apply_files(run.task_output, output_files, include={"content_type", "url", "storage_url"})
 
+    async def _download_file(self, file: File, url: str) -> FetchedFile | None:
+        """Downloads the file unless it was already stored and did not change, in which case
+        the storage url is set and None is returned"""
+        indexed = await self._index.get_url(url) if self._index else None
+        fetched = await fetch_file(url, if_none_match=indexed.etag if indexed else None)
+        if not fetched:
+            if indexed:
+                if file.content_type is None:
+                    file.content_type = indexed.content_type
+                self._set_storage_url(file, indexed.storage_url)
+            return None
+
+        assign_file_content(file, fetched.content)
+        return fetched
+
+    async def _store_file(self, bts: bytes, content_type: str | None) -> str:
+        # Files are stored by content hash so identical files share the same storage url
+        content_hash = hashlib.sha256(bts).hexdigest()
+        if self._index and (storage_url := await self._index.get_content(content_hash, content_type)):
+            return storage_url
+
+        storage_url = await self._file_storage.store_file(
+            FileData(contents=bts, content_type=content_type),
+            folder_path=self._folder_path,
+        )
+        if self._index and storage_url:
+            await self._index.set_content(content_hash, content_type, storage_url)
+        return storage_url
+
     async def _handle_file(self, file: File):
         if not file.url and not file.data:
             # Skipping, only reason a file might not have data is if it's private
             return
 
+        etag: str | None = None
         if file.url and not file.data:
-            await download_file(file)
+            fetched = await self._download_file(file, file.url)
+            if not fetched:
+                return
+            etag = fetched.etag
 
         bts = file.content_bytes()
         if not bts:
@@ -71,10 +110,16 @@ class FileHandler:
 
         # Here we can just set the storage url.
         # if we have a file with keypath it will be assigned to the model, but if we have a file it will be stored in extras
-        storage_url = await self._file_storage.store_file(
-            FileData(contents=bts, content_type=file.content_type),
-            folder_path=self._folder_path,
-        )
+        storage_url = await self._store_file(bts, file.content_type)
+        if self._index and etag and file.url and storage_url:
+            await self._index.set_url(
+                file.url,
+                IndexedURL(etag=etag, storage_url=storage_url, content_type=file.content_type),
+            )
+        self._set_storage_url(file, storage_url)
+
+    @classmethod
+    def _set_storage_url(cls, file: File, storage_url: str):
         file.storage_url = storage_url  # pyright: ignore [reportAttributeAccessIssue]
 
         if file.url and file.url.startswith("data:"):
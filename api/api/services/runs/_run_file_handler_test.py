@@ -1,16 +1,19 @@
 from copy import deepcopy
 from dataclasses import dataclass
 from typing import Any
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
+import pytest
 from pytest_httpx import HTTPXMock
 
 from api.services.runs._stored_message import StoredMessages
 from core.domain.consts import INPUT_KEY_MESSAGES
+from core.domain.fields.file import File
 from core.domain.task_io import SerializableTaskIO
 from core.runners.workflowai.utils import (
     FileWithKeyPath,
 )
+from core.storage.key_value_storage import KeyValueStorage
 
 from ._run_file_handler import FileHandler
 
@@ -175,3 +178,63 @@ class TestHandleRun:
                 },
             ],
         }
+
+
+class TestHandleFileIndex:
+    @pytest.fixture
+    def kv_storage(self):
+        store: dict[str, str] = {}
+        mock = AsyncMock(spec=KeyValueStorage)
+        mock.get.side_effect = lambda key: store.get(key)  # pyright: ignore [reportUnknownLambdaType]
+        mock.set.side_effect = lambda key, value, expires_in: store.__setitem__(key, value)  # pyright: ignore [reportUnknownLambdaType]
+        return mock
+
+    @pytest.fixture
+    def file_handler(self, mock_file_storage: Mock, kv_storage: AsyncMock):
+        mock_file_storage.store_file.return_value = "https://storage/bla.jpg"
+        return FileHandler(file_storage=mock_file_storage, folder_path="1/task", kv_storage=kv_storage)
+
+    async def test_unmodified_url_is_not_downloaded(
+        self,
+        httpx_mock: HTTPXMock,
+        mock_file_storage: Mock,
+        file_handler: FileHandler,
+    ):
+        httpx_mock.add_response(url="https://test-url.com/bla.jpg", content=b"1234", headers={"ETag": '"abc"'})
+        file = File(url="https://test-url.com/bla.jpg")
+        await file_handler._handle_file(file)  # pyright: ignore [reportPrivateUsage]
+        assert file.storage_url == "https://storage/bla.jpg"  # pyright: ignore [reportAttributeAccessIssue]
+
+        httpx_mock.add_response(
+            url="https://test-url.com/bla.jpg",
+            status_code=304,
+            match_headers={"If-None-Match": '"abc"'},
+        )
+        file = File(url="https://test-url.com/bla.jpg")
+        await file_handler._handle_file(file)  # pyright: ignore [reportPrivateUsage]
+        assert file.storage_url == "https://storage/bla.jpg"  # pyright: ignore [reportAttributeAccessIssue]
+        assert file.content_type == "image/jpeg"
+        assert file.data is None
+
+        mock_file_storage.store_file.assert_awaited_once()
+
+    async def test_modified_url_is_downloaded(
+        self,
+        httpx_mock: HTTPXMock,
+        mock_file_storage: Mock,
+        file_handler: FileHandler,
+    ):
+        httpx_mock.add_response(url="https://test-url.com/bla.jpg", content=b"1234", headers={"ETag": '"abc"'})
+        httpx_mock.add_response(url="https://test-url.com/bla.jpg", content=b"5678", headers={"ETag": '"def"'})
+        for _ in range(2):
+            await file_handler._handle_file(File(url="https://test-url.com/bla.jpg"))  # pyright: ignore [reportPrivateUsage]
+
+        assert mock_file_storage.store_file.await_count == 2
+
+    async def test_same_content_is_stored_once(self, mock_file_storage: Mock, file_handler: FileHandler):
+        for _ in range(2):
+            file = File(data="MTIzNA==", content_type="image/jpeg")
+            await file_handler._handle_file(file)  # pyright: ignore [reportPrivateUsage]
+            assert file.url == "https://storage/bla.jpg"
+
+        mock_file_storage.store_file.assert_awaited_once()
@@ -23,6 +23,7 @@ from core.domain.llm_completion import LLMCompletion
 from core.domain.llm_usage import LLMUsage
 from core.domain.models import Model, Provider
 from core.domain.page import Page
+from core.domain.run_cursor import next_cursor
 from core.domain.task_run_query import SerializableTaskRunField, SerializableTaskRunQuery
 from core.domain.task_variant import SerializableTaskVariant
 from core.domain.users import UserIdentifier
@@ -110,7 +111,7 @@ class RunsService:
 
         res = [self._sanitize_run(a) async for a in storage.fetch_task_run_resources(task_uid, query)]
         await apply_reviews(self._storage.reviews, query.task_id, res, _logger)
-        return Page(items=res)
+        return Page(items=res, next_cursor=next_cursor(res, query.limit))
 
     # TODO[test]: add tests for max wait ms
     async def run_by_id(
@@ -311,7 +312,7 @@ class RunsService:
                 await conversation_handler.handle_run(task_run, messages)
 
         # Replace base64 and outside urls with storage urls in payloads
-        file_handler = FileHandler(file_storage, f"{storage.tenant}/{task_run.task_id}")
+        file_handler = FileHandler(file_storage, f"{storage.tenant}/{task_run.task_id}", kv_storage=storage.kv)
         await file_handler.handle_run(task_run, task_variant, messages)
 
         # Removing LLM completions if there are private fields
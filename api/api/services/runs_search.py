@@ -10,6 +10,7 @@ from core.domain.errors import BadRequestError
 from core.domain.major_minor import MajorMinor
 from core.domain.models import Model
 from core.domain.page import Page
+from core.domain.run_cursor import RunCursor, next_cursor
 from core.domain.search_query import (
     FieldQuery,
     ReviewSearchOptions,
@@ -499,7 +500,12 @@ class RunsSearchService:
         offset: int,
         map: Callable[[AgentRun], BM],
         exclude_fields: set[SerializableTaskRunField] | None = None,
+        cursor: str | None = None,
     ) -> Page[BM]:
+        """Search runs, newest first. When a cursor is provided the offset is ignored and the page
+        starts right after the run the cursor points to. The returned page contains the cursor of the
+        next page when it is full."""
+        decoded_cursor = RunCursor.decode(cursor) if cursor else None
         fields = [f async for f in self._process_field_query(task_uid[0], field_queries)] if field_queries else None
 
         task_runs_storage = self._storage.task_runs
@@ -516,11 +522,12 @@ class RunsSearchService:
                     limit,
                     offset,
                     exclude=exclude_fields,
+                    cursor=decoded_cursor,
                 )
             ]
             # TODO[test]: add dedicated tests, for not it is tested through the runs service
             await apply_reviews(self._storage.reviews, task_uid[0], runs, self._logger)
-            return [map(item) for item in runs]
+            return [map(item) for item in runs], next_cursor(runs, limit)
 
-        items, count = await asyncio.gather(_fetch_runs(), _fetch_count())
-        return Page(items=items, count=count)
+        (items, cursor_after), count = await asyncio.gather(_fetch_runs(), _fetch_count())
+        return Page(items=items, count=count, next_cursor=cursor_after)
@@ -11,6 +11,7 @@ from pydantic import Field
 from api.services.analytics._analytics_service import AnalyticsService
 from api.services.api_keys import APIKeyService
 from api.services.keys import JWK, Claims, KeyRing
+from api.services.tenant_cache import TenantCache, TenantCacheKind
 from core.domain.analytics_events.analytics_events import (
     OrganizationCreatedProperties,
     OrganizationProperties,
@@ -50,10 +51,30 @@ class SecurityService:
         org_storage: OrganizationSystemStorage,
         event_router: EventRouter,
         analytics_service: AnalyticsService,
+        tenant_cache: TenantCache | None = None,
     ):
         self._org_storage = org_storage
         self._analytics_service = analytics_service
         self._event_router = event_router
+        self._tenant_cache = tenant_cache
+
+    async def _cached_tenant(
+        self,
+        kind: TenantCacheKind,
+        value: str,
+        fetch: Callable[[], Awaitable[TenantData]],
+    ) -> TenantData:
+        if not self._tenant_cache:
+            return await fetch()
+        if cached := self._tenant_cache.get(kind, value):
+            return cached
+        tenant = await fetch()
+        self._tenant_cache.set(kind, value, tenant)
+        return tenant
+
+    async def _invalidate_cached_tenant(self, tenant: str):
+        if self._tenant_cache:
+            await self._tenant_cache.invalidate(tenant=tenant)
 
     def _send_tenant_created_analytics(self, org: TenantData):
         with capture_errors(_logger, "Error sending created org event"):
@@ -144,6 +165,7 @@ class SecurityService:
                 org,
                 lambda: TenantMigratedEvent(migrated_to="organization", from_anon_id=anon_id, from_user_id=user_id),
             )
+            await self._invalidate_cached_tenant(org.tenant)
 
             return org
         except ObjectNotFoundException:
@@ -190,6 +212,7 @@ class SecurityService:
                 migrated,
                 lambda: TenantMigratedEvent(migrated_to="user", from_anon_id=anon_id),
             )
+            await self._invalidate_cached_tenant(migrated.tenant)
             return migrated
         except ObjectNotFoundException:
             return None
@@ -214,12 +237,19 @@ class SecurityService:
         )
 
     async def _find_tenant_for_api_key(self, credentials: str):
+        hashed_key = secure_hash(credentials)
         try:
             # We split the find and the update, the find is on the critical path
-            res = await self._org_storage.find_tenant_for_api_key(secure_hash(credentials))
-            add_background_task(
-                self._org_storage.update_api_key_last_used_at(secure_hash(credentials), datetime.now(timezone.utc)),
+            res = await self._cached_tenant(
+                "api_key",
+                hashed_key,
+                lambda: self._org_storage.find_tenant_for_api_key(hashed_key),
             )
+            # Last used at updates are coalesced into a single write per key per interval
+            if not self._tenant_cache or self._tenant_cache.should_update_last_used_at(hashed_key):
+                add_background_task(
+                    self._org_storage.update_api_key_last_used_at(hashed_key, datetime.now(timezone.utc)),
+                )
             return res
         except ObjectNotFoundException:
             raise InvalidToken.from_invalid_api_key(credentials)
@@ -239,21 +269,33 @@ class SecurityService:
         )
 
     async def _find_tenant_for_user(self, user: User) -> TenantData | None:
-        if user.org_id:
-            return await self._find_tenant_for_org_id(
-                user.org_id,
-                org_slug=user.slug,
-                user_id=user.user_id,
-                anon_id=user.unknown_user_id,
+        if org_id := user.org_id:
+            return await self._cached_tenant(
+                "org_id",
+                org_id,
+                lambda: self._find_tenant_for_org_id(
+                    org_id,
+                    org_slug=user.slug,
+                    user_id=user.user_id,
+                    anon_id=user.unknown_user_id,
+                ),
+            )
+        if user_id := user.user_id:
+            return await self._cached_tenant(
+                "owner_id",
+                user_id,
+                lambda: self._find_tenant_for_owner_id(
+                    owner_id=user_id,
+                    org_slug=user.slug,
+                    anon_id=user.unknown_user_id,
+                ),
             )
-        if user.user_id:
-            return await self._find_tenant_for_owner_id(
-                owner_id=user.user_id,
-                org_slug=user.slug,
-                anon_id=user.unknown_user_id,
+        if unknown_user_id := user.unknown_user_id:
+            return await self._cached_tenant(
+                "anon_id",
+                unknown_user_id,
+                lambda: self._find_anonymous_tenant(unknown_user_id=unknown_user_id),
             )
-        if user.unknown_user_id:
-            return await self._find_anonymous_tenant(unknown_user_id=user.unknown_user_id)
 
         # TODO[org]: remove, we should just throw a 401 here
         if user.tenant:
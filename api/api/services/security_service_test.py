@@ -9,6 +9,7 @@ from fastapi import HTTPException
 from api.dependencies.security import UserClaims
 from api.services.analytics._analytics_service import AnalyticsService
 from api.services.security_service import SecurityService, _default_key_ring
+from api.services.tenant_cache import TenantCache
 from core.domain.errors import InvalidToken
 from core.domain.events import EventRouter
 from core.domain.tenant_data import TenantData
@@ -392,6 +393,61 @@ class TestUserOrganization:
         assert result == expected_org
 
 
+class TestTenantCache:
+    @pytest.fixture
+    def cached_security_service(
+        self,
+        mock_org_storage: Mock,
+        mock_event_router: EventRouter,
+        mock_analytics_service: Mock,
+    ):
+        return SecurityService(
+            mock_org_storage,
+            event_router=mock_event_router,
+            analytics_service=mock_analytics_service,
+            tenant_cache=TenantCache(ttl_seconds=10),
+        )
+
+    async def test_api_key_is_cached(self, mock_org_storage: Mock, cached_security_service: SecurityService):
+        org_settings = TenantData(tenant="test_tenant")
+        mock_org_storage.find_tenant_for_api_key.return_value = org_settings
+
+        for _ in range(3):
+            result = await cached_security_service.find_tenant(None, "wai-aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa")
+            assert result == org_settings
+
+        mock_org_storage.find_tenant_for_api_key.assert_called_once()
+        # Last used at updates are coalesced
+        mock_org_storage.update_api_key_last_used_at.assert_called_once()
+
+    async def test_invalid_api_key_is_not_cached(
+        self,
+        mock_org_storage: Mock,
+        cached_security_service: SecurityService,
+    ):
+        mock_org_storage.find_tenant_for_api_key.side_effect = ObjectNotFoundException()
+
+        for _ in range(2):
+            with pytest.raises(InvalidToken):
+                await cached_security_service.find_tenant(None, "wai-aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa")
+
+        assert mock_org_storage.find_tenant_for_api_key.call_count == 2
+
+    async def test_user_is_cached(
+        self,
+        mock_org_storage: Mock,
+        new_user: User,
+        cached_security_service: SecurityService,
+    ):
+        org_settings = TenantData(tenant="1", org_id=new_user.org_id)
+        mock_org_storage.find_tenant_for_org_id.return_value = org_settings
+
+        assert await cached_security_service.find_tenant(new_user, None) == org_settings
+        assert await cached_security_service.find_tenant(new_user, None) == org_settings
+
+        mock_org_storage.find_tenant_for_org_id.assert_called_once_with(new_user.org_id)
+
+
 class TestDefaultKeyRing:
     @pytest.fixture(scope="function", autouse=True)
     def patch_jwks_url(self):
@@ -5,6 +5,7 @@ from pydantic import BaseModel
 
 from api.jobs.common import StorageDep
 from api.services.analytics import AnalyticsService
+from api.services.deployments_cache import invalidate_deployments_cache
 from api.services.groups import GroupService
 from api.services.run import RunService
 from core.domain.analytics_events.analytics_events import DeployedTaskVersionProperties, VersionProperties
@@ -88,6 +89,7 @@ class TaskDeploymentsService:
         )
 
         updated_doc = await self._storage_deployments.deploy_task_version(task_deployment)
+        await invalidate_deployments_cache(self._storage.tenant, task_id[0])
         return updated_doc.to_resource()
 
     async def _collect_groups(self, task_id: str, deployed_versions_ids: set[int]) -> list[TaskGroup]:
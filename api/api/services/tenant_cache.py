@@ -0,0 +1,122 @@
+import os
+import time
+from typing import Any, Literal
+
+from redis.asyncio import Redis
+
+from core.domain.tenant_data import TenantData
+from core.utils.lru.lru_cache import LRUCache
+from core.utils.redis_pubsub import RedisSubscriber, publish_json
+
+TenantCacheKind = Literal["api_key", "org_id", "owner_id", "anon_id"]
+
+_INVALIDATION_CHANNEL = "tenant_cache:invalidate"
+
+
+class TenantCache:
+    """A bounded, TTL'd in-process cache of the tenant data used on the authentication path.
+
+    Entries are keyed by the hashed API key or by the org / owner / anonymous user id found
+    in a JWT. Changes to an organization are broadcasted to all processes via a redis
+    pub/sub channel so that every process drops its local copy."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        capacity: int = 10_000,
+        last_used_at_interval_seconds: float = 60,
+        redis_client: Redis | None = None,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._entries = LRUCache[tuple[TenantCacheKind, str], tuple[float, TenantData]](capacity)
+        self._last_used_at_interval_seconds = last_used_at_interval_seconds
+        self._last_used_at_writes = LRUCache[str, float](capacity)
+        self._redis_client = redis_client
+        self._subscriber: RedisSubscriber | None = None
+
+    def get(self, kind: TenantCacheKind, value: str) -> TenantData | None:
+        try:
+            expires_at, tenant = self._entries[(kind, value)]
+        except KeyError:
+            return None
+        if expires_at < time.monotonic():
+            del self._entries[(kind, value)]
+            return None
+        return tenant
+
+    def set(self, kind: TenantCacheKind, value: str, tenant: TenantData):
+        self._entries[(kind, value)] = (time.monotonic() + self._ttl_seconds, tenant)
+
+    def should_update_last_used_at(self, hashed_key: str) -> bool:
+        """Returns true at most once per interval for a given key so that the last used at
+        updates are coalesced into a single write"""
+        now = time.monotonic()
+        last = self._last_used_at_writes.peek(hashed_key)
+        if last is not None and now - last < self._last_used_at_interval_seconds:
+            return False
+        self._last_used_at_writes[hashed_key] = now
+        return True
+
+    def _invalidate_local(self, tenant: str | None, org_id: str | None):
+        to_remove = [
+            key
+            for key, (_, data) in self._entries.cache.items()
+            if (tenant and data.tenant == tenant) or (org_id and data.org_id == org_id)
+        ]
+        for key in to_remove:
+            del self._entries[key]
+
+    async def invalidate(self, tenant: str | None = None, org_id: str | None = None):
+        """Remove all entries for a tenant or an org id in this process and notify other processes"""
+        self._invalidate_local(tenant, org_id)
+        if self._redis_client:
+            await publish_json(self._redis_client, _INVALIDATION_CHANNEL, {"tenant": tenant, "org_id": org_id})
+
+    def _on_invalidation_message(self, payload: dict[str, Any]):
+        self._invalidate_local(payload.get("tenant"), payload.get("org_id"))
+
+    def _clear(self):
+        self._entries.cache.clear()
+
+    async def start(self):
+        if self._redis_client and not self._subscriber:
+            self._subscriber = RedisSubscriber(
+                self._redis_client,
+                _INVALIDATION_CHANNEL,
+                on_message=self._on_invalidation_message,
+                # Entries we may have missed invalidations for are dropped
+                on_reset=self._clear,
+            )
+            self._subscriber.start()
+
+    async def close(self):
+        if self._subscriber:
+            await self._subscriber.close()
+            self._subscriber = None
+
+
+def _build_shared_tenant_cache() -> TenantCache | None:
+    # A TTL of 0 disables the cache altogether
+    ttl_seconds = float(os.environ.get("TENANT_CACHE_TTL_SECONDS", "30"))
+    if ttl_seconds <= 0:
+        return None
+
+    from core.utils.redis_cache import shared_redis_client
+
+    return TenantCache(
+        ttl_seconds=ttl_seconds,
+        capacity=int(os.environ.get("TENANT_CACHE_CAPACITY", "10000")),
+        redis_client=shared_redis_client,
+    )
+
+
+_shared_tenant_cache = _build_shared_tenant_cache()
+
+
+def shared_tenant_cache() -> TenantCache | None:
+    return _shared_tenant_cache
+
+
+async def invalidate_tenant_cache(tenant: str | None = None, org_id: str | None = None):
+    if _shared_tenant_cache:
+        await _shared_tenant_cache.invalidate(tenant=tenant, org_id=org_id)
@@ -0,0 +1,79 @@
+import json
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from api.services.tenant_cache import TenantCache
+from core.domain.tenant_data import TenantData
+
+
+@pytest.fixture
+def mock_redis():
+    return AsyncMock()
+
+
+@pytest.fixture
+def tenant_cache(mock_redis: AsyncMock):
+    return TenantCache(ttl_seconds=10, capacity=3, redis_client=mock_redis)
+
+
+class TestGetSet:
+    def test_get_set(self, tenant_cache: TenantCache):
+        tenant = TenantData(tenant="t1")
+        assert tenant_cache.get("api_key", "hash") is None
+
+        tenant_cache.set("api_key", "hash", tenant)
+        assert tenant_cache.get("api_key", "hash") == tenant
+        # Kinds are not mixed
+        assert tenant_cache.get("org_id", "hash") is None
+
+    def test_expiration(self, tenant_cache: TenantCache, frozen_time: FrozenDateTimeFactory):
+        tenant_cache.set("org_id", "org_1", TenantData(tenant="t1"))
+        frozen_time.tick(timedelta(seconds=11))
+        assert tenant_cache.get("org_id", "org_1") is None
+
+    def test_capacity(self, tenant_cache: TenantCache):
+        for i in range(4):
+            tenant_cache.set("owner_id", f"user_{i}", TenantData(tenant=f"t{i}"))
+        assert tenant_cache.get("owner_id", "user_0") is None
+        assert tenant_cache.get("owner_id", "user_3") == TenantData(tenant="t3")
+
+
+class TestInvalidate:
+    async def test_invalidate_tenant(self, tenant_cache: TenantCache, mock_redis: AsyncMock):
+        tenant_cache.set("api_key", "hash", TenantData(tenant="t1"))
+        tenant_cache.set("org_id", "org_1", TenantData(tenant="t1", org_id="org_1"))
+        tenant_cache.set("org_id", "org_2", TenantData(tenant="t2", org_id="org_2"))
+
+        await tenant_cache.invalidate(tenant="t1")
+
+        assert tenant_cache.get("api_key", "hash") is None
+        assert tenant_cache.get("org_id", "org_1") is None
+        assert tenant_cache.get("org_id", "org_2") is not None
+        mock_redis.publish.assert_awaited_once()
+        assert json.loads(mock_redis.publish.call_args.args[1]) == {"tenant": "t1", "org_id": None}
+
+    async def test_invalidate_org_id(self, tenant_cache: TenantCache):
+        tenant_cache.set("org_id", "org_1", TenantData(tenant="t1", org_id="org_1"))
+
+        await tenant_cache.invalidate(org_id="org_1")
+
+        assert tenant_cache.get("org_id", "org_1") is None
+
+    def test_invalidation_message(self, tenant_cache: TenantCache):
+        tenant_cache.set("api_key", "hash", TenantData(tenant="t1"))
+
+        tenant_cache._on_invalidation_message({"tenant": "t1", "org_id": None})  # pyright: ignore [reportPrivateUsage]
+        assert tenant_cache.get("api_key", "hash") is None
+
+
+class TestShouldUpdateLastUsedAt:
+    def test_coalesced(self, tenant_cache: TenantCache, frozen_time: FrozenDateTimeFactory):
+        assert tenant_cache.should_update_last_used_at("hash")
+        assert not tenant_cache.should_update_last_used_at("hash")
+        assert tenant_cache.should_update_last_used_at("other_hash")
+
+        frozen_time.tick(timedelta(seconds=61))
+        assert tenant_cache.should_update_last_used_at("hash")
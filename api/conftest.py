@@ -101,6 +101,29 @@ if "MISTRAL_API_KEY" not in os.environ:
 if "ANTHROPIC_API_KEY" not in os.environ:
     os.environ["ANTHROPIC_API_KEY"] = "sk-proj-1234"
 
+# Tenants and deployments are re-fetched on every request in tests
+if "TENANT_CACHE_TTL_SECONDS" not in os.environ:
+    os.environ["TENANT_CACHE_TTL_SECONDS"] = "0"
+if "DEPLOYMENTS_CACHE_TTL_SECONDS" not in os.environ:
+    os.environ["DEPLOYMENTS_CACHE_TTL_SECONDS"] = "0"
+if "RUN_CACHE_TTL_SECONDS" not in os.environ:
+    os.environ["RUN_CACHE_TTL_SECONDS"] = "0"
+if "PROVIDER_HEALTH_ENABLED" not in os.environ:
+    os.environ["PROVIDER_HEALTH_ENABLED"] = "false"
+if "PROVIDER_RATE_LIMIT_BUDGET_ENABLED" not in os.environ:
+    os.environ["PROVIDER_RATE_LIMIT_BUDGET_ENABLED"] = "false"
+if "HTTPX_PREWARM_ENABLED" not in os.environ:
+    os.environ["HTTPX_PREWARM_ENABLED"] = "false"
+# The database is reset between tests
+if "RUN_GROUP_CACHE_SIZE" not in os.environ:
+    os.environ["RUN_GROUP_CACHE_SIZE"] = "0"
+# Test variants share ids across different schemas
+if "PREPARED_PROMPT_CACHE_SIZE" not in os.environ:
+    os.environ["PREPARED_PROMPT_CACHE_SIZE"] = "0"
+# PDFs are rasterized in a thread so that pdf2image can be patched
+if "PDF_RASTERIZER_PROCESSES" not in os.environ:
+    os.environ["PDF_RASTERIZER_PROCESSES"] = "0"
+
 if "WORKFLOWAI_API_URL" not in os.environ:
     os.environ["WORKFLOWAI_API_URL"] = "http://0.0.0.0:8000"
 if "WORKFLOWAI_API_KEY" not in os.environ:
@@ -181,6 +204,9 @@ def mock_storage() -> AsyncMock:
     mock.task_deployments = AsyncMock(spec=TaskDeploymentsStorage)
     mock.input_evaluations = AsyncMock(spec=InputEvaluationStorage)
     mock.kv = AsyncMock(spec=KeyValueStorage)
+    # An empty key value storage by default
+    mock.kv.get.return_value = None
+    mock.kv.pop.return_value = None
     return mock
 
 
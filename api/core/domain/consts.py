@@ -11,6 +11,8 @@ METADATA_KEY_INFERENCE_SECONDS = "workflowai.inference_seconds"
 METADATA_KEY_FILE_DOWNLOAD_SECONDS = "workflowai.file_download_seconds"
 METADATA_KEY_DEPLOYMENT_ENVIRONMENT_DEPRECATED = "used_alias"
 METADATA_KEY_INTEGRATION = "workflowai.integration"
+# Set when the run output was shared with an identical concurrent run
+METADATA_KEY_COALESCED = "workflowai.coalesced"
 
 
 INPUT_KEY_MESSAGES = "workflowai.messages"
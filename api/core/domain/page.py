@@ -8,3 +8,5 @@ T = TypeVar("T", bound=BaseModel)
 class Page(BaseModel, Generic[T]):
     items: list[T]
     count: Optional[int] = None
+    # An opaque cursor to pass to fetch the next page, for endpoints that support it
+    next_cursor: Optional[str] = None
@@ -0,0 +1,44 @@
+import base64
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Self
+
+from pydantic import BaseModel, Field
+
+from core.domain.agent_run import AgentRunBase
+from core.domain.errors import BadRequestError
+from core.utils.strings import b64_urldecode
+
+
+class RunCursor(BaseModel):
+    """The position of a run in the newest first ordering used to list runs.
+
+    A page that starts at a cursor only contains runs that are strictly older than the cursor,
+    which allows storages to seek in their sort key instead of skipping rows."""
+
+    created_at: datetime = Field(alias="c")
+    task_uid: int = Field(alias="t")
+    run_id: str = Field(alias="r")
+
+    @classmethod
+    def from_run(cls, run: AgentRunBase) -> Self:
+        return cls(c=run.created_at, t=run.task_uid, r=run.id)
+
+    def encode(self) -> str:
+        """Returns an opaque url safe string"""
+        dumped = self.model_dump_json(by_alias=True).encode()
+        return base64.urlsafe_b64encode(dumped).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> Self:
+        try:
+            return cls.model_validate_json(b64_urldecode(cursor))
+        except ValueError as e:
+            raise BadRequestError("Invalid cursor") from e
+
+
+def next_cursor(items: Sequence[AgentRunBase], limit: int | None) -> str | None:
+    """The cursor of the next page, if the page was full"""
+    if not items or not limit or len(items) < limit:
+        return None
+    return RunCursor.from_run(items[-1]).encode()
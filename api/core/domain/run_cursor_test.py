@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.domain.errors import BadRequestError
+from core.domain.run_cursor import RunCursor, next_cursor
+from tests.models import task_run_ser
+
+
+class TestRunCursor:
+    def test_encode_decode(self):
+        cursor = RunCursor(c=datetime(2025, 2, 24, 19, 50, 21, tzinfo=timezone.utc), t=3, r="run_id")
+        encoded = cursor.encode()
+        assert "=" not in encoded
+        assert RunCursor.decode(encoded) == cursor
+
+    @pytest.mark.parametrize("value", ["", "not a cursor", "e30"])
+    def test_decode_invalid(self, value: str):
+        with pytest.raises(BadRequestError):
+            RunCursor.decode(value)
+
+
+class TestNextCursor:
+    def test_full_page(self):
+        runs = [task_run_ser(id="1", task_uid=2), task_run_ser(id="2", task_uid=2)]
+        cursor = next_cursor(runs, 2)
+        assert cursor
+        decoded = RunCursor.decode(cursor)
+        assert decoded.run_id == "2"
+        assert decoded.task_uid == 2
+        assert decoded.created_at == runs[1].created_at
+
+    def test_partial_page(self):
+        assert next_cursor([task_run_ser(id="1")], 2) is None
+        assert next_cursor([], 2) is None
+        assert next_cursor([task_run_ser(id="1")], None) is None
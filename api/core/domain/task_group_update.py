@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Self
+from typing import NamedTuple, Self
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -36,3 +36,13 @@ class TaskGroupUpdate(BaseModel):
         if not self.model_dump(exclude_none=True):
             raise ValueError("At least one of is_favorite, or notes must be set")
         return self
+
+
+class TaskGroupRunStats(NamedTuple):
+    """Run statistics of a task group that were aggregated over several runs"""
+
+    task_id: str
+    task_schema_id: int
+    iteration: int
+    run_count: int = 0
+    last_active_at: datetime | None = None
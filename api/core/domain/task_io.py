@@ -1,14 +1,18 @@
+import os
 from copy import deepcopy
 from typing import Any
 
-from jsonschema import SchemaError, validate
+from jsonschema import SchemaError
 from jsonschema import ValidationError as SchemaValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
 from jsonschema.validators import validator_for  # pyright: ignore[reportUnknownVariableType]
 from pydantic import BaseModel, Field
 
 from core.domain.consts import FILE_DEFS
 from core.domain.errors import JSONSchemaValidationError
 from core.utils.hash import compute_obj_hash
+from core.utils.lru.lru_cache import LRUCache
 from core.utils.schema_sanitation import streamline_schema
 from core.utils.schemas import (
     JsonSchema,
@@ -18,12 +22,31 @@ from core.utils.schemas import (
     strip_metadata,
 )
 
+# Compiled validators are shared by all the task IOs that have the same schema, keyed by the schema hash
+_compiled_validators = LRUCache[str, Validator](int(os.environ.get("JSON_SCHEMA_VALIDATOR_CACHE_SIZE", "1000")))
+
+
+def compiled_validator(schema: dict[str, Any]) -> Validator:
+    """Returns a validator for the schema, checking and compiling the schema only once per process"""
+    key = compute_obj_hash(schema)
+    try:
+        return _compiled_validators[key]
+    except KeyError:
+        pass
+    cls: type[Validator] = validator_for(schema)  # pyright: ignore [reportUnknownVariableType]
+    cls.check_schema(schema)
+    validator = cls(schema)
+    _compiled_validators[key] = validator
+    return validator
+
 
 class SerializableTaskIO(BaseModel):
     version: str = Field(..., description="the version of the schema definition. Titles and descriptions are ignored.")
     json_schema: dict[str, Any] = Field(..., description="A json schema")
 
     _optional_json_schema: dict[str, Any] | None = None
+    # Validators by partial and files_as_strings, to avoid hashing the schema on every call
+    _validators: dict[tuple[bool, bool], Validator] | None = None
 
     @classmethod
     def _add_files_as_strings(cls, schema: dict[str, Any]) -> dict[str, Any]:
@@ -54,14 +77,8 @@ class SerializableTaskIO(BaseModel):
     ) -> None:
         """Enforce validates that an object matches the schema. Object is updated in place."""
 
-        if partial:
-            if self._optional_json_schema is None:
-                self._optional_json_schema = make_optional(self.json_schema)
-            schema = self._optional_json_schema
-        else:
-            schema = self.json_schema
-        if files_as_strings:
-            schema = self._add_files_as_strings(schema)
+        validator = self._validator(partial, files_as_strings)
+        schema: dict[str, Any] = validator.schema  # pyright: ignore [reportAssignmentType]
 
         navigators: list[JsonSchema.Navigator] = []
         if strip_opt_none_and_empty_strings:
@@ -72,12 +89,31 @@ class SerializableTaskIO(BaseModel):
         if navigators:
             JsonSchema(schema).navigate(obj, navigators=navigators)
 
-        try:
-            validate(obj, schema)
-        except SchemaValidationError as e:
+        # Same error as jsonschema.validate, without re-checking the schema
+        if e := best_match(validator.iter_errors(obj)):
             kp = ".".join([str(p) for p in e.path])
             raise JSONSchemaValidationError(f"at [{kp}], {e.message}")
 
+    def _validator(self, partial: bool, files_as_strings: bool) -> Validator:
+        if self._validators is None:
+            self._validators = {}
+        key = (partial, files_as_strings)
+        if validator := self._validators.get(key):
+            return validator
+
+        if partial:
+            if self._optional_json_schema is None:
+                self._optional_json_schema = make_optional(self.json_schema)
+            schema = self._optional_json_schema
+        else:
+            schema = self.json_schema
+        if files_as_strings:
+            schema = self._add_files_as_strings(schema)
+
+        validator = compiled_validator(schema)
+        self._validators[key] = validator
+        return validator
+
     def sanitize(self, obj: Any) -> Any:
         """Duplicate and enforce an object to match the schema"""
         obj = deepcopy(obj)
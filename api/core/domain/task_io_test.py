@@ -3,8 +3,10 @@ from typing import Any
 from unittest import mock
 
 import pytest
+from jsonschema.validators import validator_for  # pyright: ignore[reportUnknownVariableType]
 
 from core.domain.errors import JSONSchemaValidationError
+from core.utils.lru.lru_cache import LRUCache
 from tests.utils import fixtures_json
 
 from .task_io import RawJSONMessageSchema, RawMessagesSchema, RawStringMessageSchema, SerializableTaskIO
@@ -415,6 +417,23 @@ class TestEnforce:
             files_as_strings=False,
         )
 
+    def test_validators_are_compiled_once(self):
+        schema = {"type": "object", "properties": {"a": {"type": "integer"}}, "required": ["a"]}
+        task_ios = [SerializableTaskIO.from_json_schema(deepcopy(schema)) for _ in range(2)]
+
+        with (
+            mock.patch("core.domain.task_io._compiled_validators", LRUCache[str, Any](10)),
+            mock.patch("core.domain.task_io.validator_for", wraps=validator_for) as mock_validator_for,
+        ):
+            for task_io in task_ios:
+                task_io.enforce({"a": 1})
+                task_io.enforce({}, partial=True)
+                with pytest.raises(JSONSchemaValidationError, match="'a' is a required property"):
+                    task_io.enforce({})
+
+        # One validator for the full schema and one for the optional schema, shared by both task IOs
+        assert mock_validator_for.call_count == 2
+
 
 class TestUsesMessages:
     @pytest.mark.parametrize(
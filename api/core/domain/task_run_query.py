@@ -3,6 +3,7 @@ from typing import Literal, Optional
 
 from pydantic import Field
 
+from core.domain.run_cursor import RunCursor
 from core.domain.search_query import FieldQuery, SpecialFieldQueryName
 
 from .page_query_mixin import PageQueryMixin
@@ -67,6 +68,11 @@ class SerializableTaskRunQuery(TaskQueryMixin, PageQueryMixin):
 
     metadata: Optional[dict[str, str]] = None
 
+    cursor: RunCursor | None = Field(
+        default=None,
+        description="Only return runs that come after the cursor, takes precedence over the offset",
+    )
+
     def _assign_value_from_special_fields(self, field: FieldQuery):
         try:
             special_field_name = SpecialFieldQueryName(field.field_name)
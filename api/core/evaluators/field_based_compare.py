@@ -1,5 +1,5 @@
 import logging
-from itertools import permutations
+from itertools import chain
 from numbers import Real
 from typing import Any, Optional, Sequence, TypeVar
 
@@ -149,13 +149,55 @@ class FieldBasedCompare(ExampleBasedEvaluator[FieldBasedCompareOptions]):
         item_config: FieldComparisonOptions | None,
         schema: JsonSchema,
         path: list[str] = [],
+        matches: dict[tuple[int, int], bool] | None = None,
     ) -> list[EvaluationError]:
         errors: dict[str, EvaluationError] = {}
         for i in range(len(expected)):
             sub_errors = await self.compare(expected[i], actual[i], item_config, schema, path + [str(i)])
+            if matches is not None:
+                matches[(i, i)] = not sub_errors
             self._add_errors(errors, sub_errors)
         return list(errors.values())
 
+    async def _match_unordered_list_items(
+        self,
+        expected: Sequence[Any],
+        actual: Sequence[Any],
+        item_config: FieldComparisonOptions | None,
+        schema: JsonSchema,
+        path: list[str],
+        matches: dict[tuple[int, int], bool],
+    ) -> bool:
+        """Returns true if every expected item can be paired with a distinct matching actual item.
+
+        Pairs are found with augmenting paths (Kuhn's bipartite matching). Item comparisons are
+        memoized in matches so each (expected, actual) pair is compared at most once, i.e. at most n^2
+        comparisons instead of trying the n! orderings of the actual list."""
+        size = len(expected)
+        expected_for_actual: list[int | None] = [None] * size
+
+        async def _matches(i: int, j: int) -> bool:
+            if (i, j) not in matches:
+                matches[(i, j)] = not await self.compare(expected[i], actual[j], item_config, schema, path + [str(i)])
+            return matches[(i, j)]
+
+        async def _augment(i: int, visited: set[int]) -> bool:
+            # Trying the item at the same index first since lists are often almost ordered
+            for j in chain((i,), range(size)):
+                if j in visited or not await _matches(i, j):
+                    continue
+                visited.add(j)
+                matched = expected_for_actual[j]
+                if matched is None or await _augment(matched, visited):
+                    expected_for_actual[j] = i
+                    return True
+            return False
+
+        for i in range(size):
+            if not await _augment(i, set()):
+                return False
+        return True
+
     async def _compare_lists(
         self,
         expected: list[Any],
@@ -175,8 +217,18 @@ class FieldBasedCompare(ExampleBasedEvaluator[FieldBasedCompareOptions]):
                 ),
             ]
 
+        # Results of item comparisons, keyed by (expected index, actual index)
+        matches: dict[tuple[int, int], bool] = {}
+
         # First we try comparing the same order no matter what
-        same_order_errors = await self._compare_list_items(expected, actual, item_config, schema.child_schema(0), path)
+        same_order_errors = await self._compare_list_items(
+            expected,
+            actual,
+            item_config,
+            schema.child_schema(0),
+            path,
+            matches,
+        )
         if not same_order_errors:
             # Evaluation succeeded with the same order, so we are good
             return []
@@ -185,22 +237,14 @@ class FieldBasedCompare(ExampleBasedEvaluator[FieldBasedCompareOptions]):
             # Order is important, so we return the error
             return same_order_errors
 
-        # TODO: we should cache the results of item comparisons to avoid recalculating them
-        for perm in permutations(actual):
-            perm_errors = await self._compare_list_items(expected, perm, item_config, schema.child_schema(0), path)
-            if not perm_errors:
-                return []
-
-        # We try every permutation of the list, this can be pretty expensive
-        # We could try sorting based on deterministic fields to reduce the number of permutations
-        for perm in permutations(actual):
-            if list(perm) == actual:
-                # Skipping the same order since we already checked above
-                continue
-
-            # if compare_list_items returns a truthy value, we will continue to check the next permutation
-            if await self._compare_list_items(expected, perm, item_config, schema.child_schema(0), path):
-                continue
+        if await self._match_unordered_list_items(
+            expected,
+            actual,
+            item_config,
+            schema.child_schema(0),
+            path,
+            matches,
+        ):
             return []
 
         return [EvaluationError("Could not find a list ordering that matches.", path), *same_order_errors]
@@ -490,3 +490,54 @@ class TestEvaluateWithExample:
         assert evaluation.comment == ""
         assert evaluation.model_dump()["error_details"] == []
         assert len(evaluation.model_dump()["error_details"]) == 0
+
+
+class TestCompareListsIgnoreOrder:
+    @pytest.fixture()
+    def list_evaluator(self):
+        return FieldBasedCompare(
+            task_variant(),
+            config=FieldBasedEvaluationConfig(options=ArrayComparisonOptions(ignore_order=True)),
+            name="test_name",
+            id="test_id",
+        )
+
+    async def _compare(self, evaluator: FieldBasedCompare, expected: list[Any], actual: list[Any]):
+        return await evaluator.compare(
+            expected,
+            actual,
+            ArrayComparisonOptions(ignore_order=True),
+            JsonSchema(
+                {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"a": {"type": "integer"}, "b": {"type": "integer"}, "c": {"type": "integer"}},
+                    },
+                },
+            ),
+        )
+
+    async def test_requires_reassigning_items(self, list_evaluator: FieldBasedCompare):
+        # Extra keys are allowed in actual objects, so the first expected item matches both actual items
+        # but the second one only matches the first actual item
+        expected = [{"a": 1}, {"a": 1, "b": 2}]
+        actual = [{"a": 1, "b": 2}, {"a": 1, "c": 3}]
+
+        assert await self._compare(list_evaluator, expected, actual) == []
+
+    async def test_large_list(self, list_evaluator: FieldBasedCompare):
+        expected = [{"a": i} for i in range(50)]
+
+        assert await self._compare(list_evaluator, expected, list(reversed(expected))) == []
+
+    async def test_large_list_fail(self, list_evaluator: FieldBasedCompare):
+        expected = [{"a": i} for i in range(50)]
+        # Only one item does not have a match
+        actual = list(reversed(expected))
+        actual[0] = {"a": 100}
+
+        errors = await self._compare(list_evaluator, expected, actual)
+        assert str(errors[0]) == "Difference at : Could not find a list ordering that matches."
+        # The errors of the same order comparison are returned
+        assert len(errors) == 51
@@ -27,7 +27,7 @@ from core.providers.google.google_provider_domain import (
 )
 from core.utils.dicts import TwoWayDict
 from core.utils.json_utils import safe_extract_dict_from_json
-from core.utils.token_utils import tokens_from_string
+from core.utils.token_utils import count_tokens_many, tokens_from_string
 
 AmazonBedrockRole = Literal["system", "user", "assistant"]
 
@@ -195,13 +195,9 @@ class AmazonBedrockMessage(BaseModel):
         return cls(content=content, role=role)
 
     def token_count(self, model: Model) -> int:
-        token_count = 0
-        for block in self.content:
-            if block.text:
-                token_count += tokens_from_string(block.text, model)
-            if block.image:
-                raise UnpriceableRunError("Token counting for images is not implemented")
-        return token_count
+        if any(block.image for block in self.content):
+            raise UnpriceableRunError("Token counting for images is not implemented")
+        return sum(count_tokens_many((block.text for block in self.content if block.text), model))
 
     def to_standard(self) -> StandardMessage:
         content: list[
@@ -191,7 +191,9 @@ class AmazonBedrockProvider(HTTPXProvider[AmazonBedrockConfig, CompletionRespons
         prefix = "The model returned the following errors: "
         raise error_cls(msg=bedrock_error.message.removeprefix(prefix), response=response, capture=capture)
 
-    async def wrap_sse(self, raw: AsyncIterator[bytes], termination_chars: bytes = b""):
+    @override
+    async def wrap_sse(self, raw: AsyncIterator[bytes]):
+        # Bedrock streams use the binary AWS event stream encoding and not server sent events
         from botocore.eventstream import EventStreamBuffer  # pyright: ignore [reportMissingTypeStubs]
 
         event_stream_buffer = EventStreamBuffer()
@@ -42,6 +42,7 @@ from core.providers.base.utils import get_provider_config_env
 from core.providers.google.google_provider_domain import (
     native_tool_name_to_internal,
 )
+from core.utils.streams import standard_wrap_sse
 
 DEFAULT_MAX_TOKENS = 8192
 
@@ -170,28 +171,11 @@ class AnthropicProvider(HTTPXProvider[AnthropicConfig, CompletionResponse]):
             return [{"role": "system", "content": request_json["system"]}, *messages]
         return messages
 
-    async def wrap_sse(self, raw: AsyncIterator[bytes], termination_chars: bytes = b""):
-        """Custom SSE wrapper for Anthropic's event stream format"""
-        acc = b""
-        async for chunk in raw:
-            acc += chunk
-            lines = acc.split(b"\n")
-            include_last = chunk.endswith(b"\n")
-            if not include_last:
-                acc = lines[-1]
-                lines = lines[:-1]
-            else:
-                acc = b""
-
-            for line in lines:
-                if line.startswith(b"data: "):
-                    yield line[6:]  # Strip "data: " prefix
-                elif line.startswith(b"event: "):
-                    continue  # Skip event lines
-                elif not line.strip():
-                    continue  # Skip
-                else:
-                    self.logger.error("Unexpected line in SSE stream", extra={"line": line, "acc": acc})
+    @override
+    async def wrap_sse(self, raw: AsyncIterator[bytes]):
+        # Anthropic does not always separate events with a blank line so each data line is an event
+        async for data in standard_wrap_sse(raw, self.logger, line_events=True):
+            yield data
 
     def _handle_message_delta(self, chunk: CompletionChunk, raw_completion: RawCompletion):
         if chunk.usage:
@@ -35,11 +35,12 @@ from core.domain.tool import Tool
 from core.providers.base.models import RawCompletion, StandardMessage
 from core.providers.base.provider_error import InvalidGenerationError, ProviderError
 from core.providers.base.provider_options import ProviderOptions
+from core.providers.base.rate_limit_budget import RateLimitBudgetKey, shared_rate_limit_budget
 from core.runners.builder_context import builder_context
 from core.runners.workflowai.templates import TemplateName
 from core.tools import ToolKind
 from core.utils.fields import datetime_factory
-from core.utils.token_utils import tokens_from_string
+from core.utils.token_utils import OFF_LOOP_MIN_CHARS, tokens_from_string
 
 
 class ProviderConfigInterface(Protocol):
@@ -194,12 +195,22 @@ class AbstractProvider(ABC, Generic[ProviderConfigVar, ProviderRequestVar]):
         if llm_usage.prompt_token_count is None:
             # Send metric so we can see how many runs are missing the prompt token count
             await self._send_no_prompt_token_count_metric(llm_usage, model)
-            # Compute the prompt token count
-            llm_usage.prompt_token_count = self._compute_prompt_token_count(messages, model)
+            # Compute the prompt token count in a thread since prompts can be very long
+            llm_usage.prompt_token_count = await asyncio.to_thread(self._compute_prompt_token_count, messages, model)
 
-    def feed_completion_token_count(self, llm_usage: LLMUsage, response: str | None, model: Model) -> None:
-        if llm_usage.completion_token_count is None:
-            llm_usage.completion_token_count = self._compute_completion_token_count(response, model) if response else 0
+    async def feed_completion_token_count(self, llm_usage: LLMUsage, response: str | None, model: Model) -> None:
+        if llm_usage.completion_token_count is not None:
+            return
+        if not response:
+            llm_usage.completion_token_count = 0
+        elif len(response) < OFF_LOOP_MIN_CHARS:
+            llm_usage.completion_token_count = self._compute_completion_token_count(response, model)
+        else:
+            llm_usage.completion_token_count = await asyncio.to_thread(
+                self._compute_completion_token_count,
+                response,
+                model,
+            )
 
     def feed_prompt_image_count(self, llm_usage: LLMUsage, messages: list[dict[str, Any]]) -> None:
         if llm_usage.prompt_image_count is None:
@@ -301,7 +312,7 @@ class AbstractProvider(ABC, Generic[ProviderConfigVar, ProviderRequestVar]):
         await self.feed_prompt_audio_token_count(llm_usage, completion.messages)
         self.feed_prompt_image_count(llm_usage, completion.messages)
         await self.feed_prompt_token_count(llm_usage, completion.messages, model)
-        self.feed_completion_token_count(llm_usage, completion.response, model)
+        await self.feed_completion_token_count(llm_usage, completion.response, model)
 
         self._set_llm_usage_model_context_window_size(llm_usage, model)
         await self._compute_llm_completion_cost(model, llm_usage, completion)
@@ -626,6 +637,13 @@ class AbstractProvider(ABC, Generic[ProviderConfigVar, ProviderRequestVar]):
         e.task_run_id = self._run_id()
         return e
 
+    def config_key(self) -> str:
+        """A key that identifies the config of the provider within a process"""
+        return self._config_id or f"workflowai_{self._index}"
+
+    def rate_limit_budget_key(self, model: Model) -> RateLimitBudgetKey:
+        return (self.name(), self.config_key(), model.value)
+
     def _config_label(self, tenant: str | None):
         """A label that describes the config"""
         if self._config_id:
@@ -834,3 +852,6 @@ class AbstractProvider(ABC, Generic[ProviderConfigVar, ProviderRequestVar]):
             return
 
         await self._log_rate_limit(limit_name, 1 - (remaining / total), options)
+
+        if budget := shared_rate_limit_budget():
+            await budget.observe(self.rate_limit_budget_key(options.model), limit_name, remaining, total)
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from typing import Any, NamedTuple
+
+import httpx
+
+from core.domain.metrics import send_gauge
+from core.utils.coroutines import capture_errors
+
+_logger = logging.getLogger(__name__)
+
+
+def _origin(url: str) -> str:
+    parsed = httpx.URL(url)
+    port = f":{parsed.port}" if parsed.port else ""
+    return f"{parsed.scheme}://{parsed.host}{port}"
+
+
+class PoolStats(NamedTuple):
+    active: int
+    idle: int
+    waiters: int
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # pyright: ignore [reportMissingImports, reportUnusedImport] # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTPXClientPool:
+    """A pool of httpx clients, one per origin, so that a slow origin holding all its connections
+    does not starve requests to other origins.
+
+    Limits apply per origin and can be overridden for a given host. HTTP/2 is opt-in and only used
+    when the h2 package is installed.
+
+    Origins come from user provided configs so at most max_clients clients are kept, the least recently
+    used one being closed once the requests that leased it are done."""
+
+    def __init__(
+        self,
+        timeout: httpx.Timeout,
+        limits: httpx.Limits,
+        http2: bool = False,
+        host_limits: dict[str, httpx.Limits] | None = None,
+        max_clients: int = 100,
+    ):
+        self._timeout = timeout
+        self._limits = limits
+        self._host_limits = host_limits or {}
+        if http2 and not _http2_available():
+            _logger.warning("HTTP/2 is enabled but the h2 package is not installed, falling back to HTTP/1.1")
+            http2 = False
+        self._http2 = http2
+        self._clients = OrderedDict[str, httpx.AsyncClient]()
+        self._max_clients = max_clients
+        # Number of requests being sent with each client, including streams that are being read
+        self._in_flight: dict[httpx.AsyncClient, int] = {}
+        # Evicted clients that are waiting for their in flight requests to complete
+        self._evicted: set[httpx.AsyncClient] = set()
+        self._closing: set[asyncio.Task[None]] = set()
+        self._metrics_task: asyncio.Task[None] | None = None
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """The client for the origin of the url. Use lease instead when the client is used for a request
+        so that it is not closed while the request is in flight"""
+        origin = _origin(url)
+        if client := self._clients.get(origin):
+            self._clients.move_to_end(origin)
+            return client
+        client = httpx.AsyncClient(
+            timeout=self._timeout,
+            limits=self._host_limits.get(httpx.URL(url).host, self._limits),
+            http2=self._http2,
+        )
+        self._clients[origin] = client
+        while len(self._clients) > self._max_clients:
+            _, evicted = self._clients.popitem(last=False)
+            if self._in_flight.get(evicted):
+                self._evicted.add(evicted)
+            else:
+                self._close_evicted(evicted)
+        return client
+
+    @asynccontextmanager
+    async def lease(self, url: str) -> AsyncIterator[httpx.AsyncClient]:
+        """Yields the client for the origin of the url. The client is not closed before the context exits,
+        even if it is evicted in the meantime"""
+        client = self.client(url)
+        self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            count = self._in_flight[client] - 1
+            if count:
+                self._in_flight[client] = count
+            else:
+                del self._in_flight[client]
+                if client in self._evicted:
+                    self._evicted.remove(client)
+                    self._close_evicted(client)
+
+    def _close_evicted(self, client: httpx.AsyncClient):
+        async def _close():
+            with capture_errors(_logger, "Failed to close evicted httpx client"):
+                await client.aclose()
+
+        task = asyncio.create_task(_close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def prewarm(self, urls: Iterable[str], timeout_seconds: float = 5):
+        """Open a connection to each origin so that the first requests do not pay for the TCP and TLS
+        handshakes. Any response, even an error status, leaves a connection in the pool"""
+
+        async def _prewarm(origin: str):
+            try:
+                async with self.lease(origin) as client:
+                    await client.head(origin, timeout=timeout_seconds)
+            except httpx.HTTPError as e:
+                _logger.warning("Failed to prewarm connection", extra={"origin": origin, "error": str(e)})
+
+        origins = {_origin(url) for url in urls}
+        await asyncio.gather(*(_prewarm(origin) for origin in origins))
+
+    def stats(self) -> dict[str, PoolStats]:
+        stats: dict[str, PoolStats] = {}
+        for origin, client in self._clients.items():
+            # httpx does not expose its pool, so we rely on httpcore's internals
+            pool: Any = getattr(client._transport, "_pool", None)  # pyright: ignore [reportPrivateUsage]
+            if pool is None:
+                continue
+            try:
+                connections = pool.connections
+                idle = sum(1 for c in connections if c.is_idle())
+                waiters = sum(1 for r in pool._requests if r.is_queued())
+            except AttributeError:
+                continue
+            stats[origin] = PoolStats(active=len(connections) - idle, idle=idle, waiters=waiters)
+        return stats
+
+    async def send_metrics(self):
+        for origin, stats in self.stats().items():
+            for name, value in stats._asdict().items():
+                await send_gauge("httpx_pool_connections", value, origin=origin, state=name)
+
+    async def _metrics_loop(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            with capture_errors(_logger, "Failed to send httpx pool metrics"):
+                await self.send_metrics()
+
+    def start_metrics(self, interval_seconds: float = 10):
+        if not self._metrics_task:
+            self._metrics_task = asyncio.create_task(self._metrics_loop(interval_seconds))
+
+    async def close(self):
+        if self._metrics_task:
+            self._metrics_task.cancel()
+            self._metrics_task = None
+        clients = [*self._clients.values(), *self._evicted]
+        self._clients.clear()
+        self._evicted.clear()
+        await asyncio.gather(*(client.aclose() for client in clients), *self._closing)
+
+
+def _limits_from_dict(d: dict[str, Any]) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=d.get("max_connections"),
+        max_keepalive_connections=d.get("max_keepalive_connections"),
+        keepalive_expiry=d.get("keepalive_expiry", 5),
+    )
+
+
+def build_httpx_client_pool(timeout: httpx.Timeout) -> HTTPXClientPool:
+    host_limits_raw: dict[str, dict[str, Any]] = json.loads(os.environ.get("HTTPX_POOL_HOST_LIMITS") or "{}")
+    return HTTPXClientPool(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=int(os.environ.get("HTTPX_POOL_MAX_CONNECTIONS", "500")),
+            max_keepalive_connections=int(os.environ.get("HTTPX_POOL_MAX_KEEPALIVE_CONNECTIONS", "100")),
+            keepalive_expiry=float(os.environ.get("HTTPX_POOL_KEEPALIVE_EXPIRY_SECONDS", "5")),
+        ),
+        http2=os.environ.get("HTTPX_HTTP2_ENABLED") == "true",
+        host_limits={host: _limits_from_dict(limits) for host, limits in host_limits_raw.items()},
+        max_clients=int(os.environ.get("HTTPX_POOL_MAX_CLIENTS", "100")),
+    )
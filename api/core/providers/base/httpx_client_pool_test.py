@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from core.providers.base.httpx_client_pool import HTTPXClientPool, PoolStats
+
+
+@pytest.fixture
+def pool():
+    return HTTPXClientPool(
+        timeout=httpx.Timeout(10),
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        host_limits={"api.slow.com": httpx.Limits(max_connections=2)},
+    )
+
+
+class TestClient:
+    async def test_one_client_per_origin(self, pool: HTTPXClientPool):
+        client = pool.client("https://api.openai.com/v1/chat/completions")
+        assert pool.client("https://api.openai.com/v1/responses") is client
+        assert pool.client("https://api.anthropic.com/v1/messages") is not client
+        assert pool.client("https://api.openai.com:8443/v1/responses") is not client
+
+    async def test_host_limits(self, pool: HTTPXClientPool):
+        pool_ = pool.client("https://api.slow.com/v1")._transport._pool  # pyright: ignore [reportPrivateUsage, reportUnknownMemberType, reportAttributeAccessIssue]
+        assert pool_._max_connections == 2  # pyright: ignore [reportUnknownMemberType]
+
+    async def test_http2_fallback(self):
+        # h2 is not a dependency so http2 is only used when it is installed
+        pool = HTTPXClientPool(timeout=httpx.Timeout(10), limits=httpx.Limits(), http2=True)
+        assert pool.client("https://api.openai.com")
+
+    async def test_close(self, pool: HTTPXClientPool):
+        client = pool.client("https://api.openai.com/v1/chat/completions")
+        await pool.close()
+        assert client.is_closed
+        assert pool.client("https://api.openai.com/v1/chat/completions") is not client
+
+    async def test_evicts_least_recently_used(self):
+        pool = HTTPXClientPool(
+            timeout=httpx.Timeout(10),
+            limits=httpx.Limits(),
+            max_clients=2,
+        )
+        openai = pool.client("https://api.openai.com")
+        anthropic = pool.client("https://api.anthropic.com")
+        assert pool.client("https://api.openai.com") is openai
+
+        pool.client("https://api.mistral.ai")
+        # The evicted client is closed in the background
+        await asyncio.sleep(0.01)
+        assert anthropic.is_closed
+        assert not openai.is_closed
+        assert pool.client("https://api.anthropic.com") is not anthropic
+        await pool.close()
+
+    async def test_leased_client_closed_after_lease(self):
+        pool = HTTPXClientPool(timeout=httpx.Timeout(10), limits=httpx.Limits(), max_clients=1)
+        async with pool.lease("https://api.openai.com") as openai:
+            pool.client("https://api.anthropic.com")
+            await asyncio.sleep(0.01)
+            # The evicted client is still serving a request, like a long running stream
+            assert not openai.is_closed
+
+        await asyncio.sleep(0.01)
+        assert openai.is_closed
+        await pool.close()
+
+    async def test_close_leased_evicted(self):
+        pool = HTTPXClientPool(timeout=httpx.Timeout(10), limits=httpx.Limits(), max_clients=1)
+        async with pool.lease("https://api.openai.com") as openai:
+            pool.client("https://api.anthropic.com")
+            await pool.close()
+            assert openai.is_closed
+
+    async def test_close_evicted(self):
+        pool = HTTPXClientPool(timeout=httpx.Timeout(10), limits=httpx.Limits(), max_clients=1)
+        openai = pool.client("https://api.openai.com")
+        pool.client("https://api.anthropic.com")
+        assert not openai.is_closed
+
+        await pool.close()
+        assert openai.is_closed
+
+
+class TestPrewarm:
+    async def test_prewarm(self, pool: HTTPXClientPool, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url="https://api.openai.com", method="HEAD", status_code=404)
+        httpx_mock.add_exception(httpx.ConnectError("failed"), url="https://api.anthropic.com", method="HEAD")
+
+        await pool.prewarm(
+            [
+                "https://api.openai.com/v1/chat/completions",
+                "https://api.openai.com/v1/responses",
+                "https://api.anthropic.com/v1/messages",
+            ],
+        )
+
+        assert len(httpx_mock.get_requests()) == 2
+
+
+class TestStats:
+    async def test_stats(self, pool: HTTPXClientPool):
+        pool.client("https://api.openai.com/v1/chat/completions")
+        assert pool.stats() == {"https://api.openai.com": PoolStats(active=0, idle=0, waiters=0)}
@@ -45,6 +45,10 @@ class HTTPXProvider(HTTPXProviderBase[ProviderConfigVar, dict[str, Any]], Generi
     def _request_url(self, model: Model, stream: bool) -> str:
         pass
 
+    @override
+    def prewarm_url(self) -> str | None:
+        return self._request_url(self.default_model(), stream=False)
+
     @abstractmethod
     def _response_model_cls(self) -> type[ResponseModel]:
         pass
@@ -212,8 +216,8 @@ class HTTPXProvider(HTTPXProviderBase[ProviderConfigVar, dict[str, Any]], Generi
             response.raise_for_status()
             return response
 
-    async def wrap_sse(self, raw: AsyncIterator[bytes], termination_chars: bytes = b"\n\n"):
-        async for chunk in standard_wrap_sse(raw, termination_chars, self.logger):
+    async def wrap_sse(self, raw: AsyncIterator[bytes]):
+        async for chunk in standard_wrap_sse(raw, self.logger):
             yield chunk
 
     @classmethod
@@ -325,6 +329,7 @@ class HTTPXProvider(HTTPXProviderBase[ProviderConfigVar, dict[str, Any]], Generi
         context.last_chunk = delta
         if not delta:
             return False
+        context.received_chars += len(delta.content)
 
         should_yield = self._handle_chunk_output(context, delta.content)
         should_yield |= self._handle_chunk_reasoning_steps(context, delta.reasoning_steps)
@@ -366,11 +371,12 @@ class HTTPXProvider(HTTPXProviderBase[ProviderConfigVar, dict[str, Any]], Generi
                         raw_completion,
                         json=options.output_schema is not None,
                         stream_deltas=options.stream_deltas,
+                        emission_policy=options.stream_emission,
                     )
                     async for chunk in self.wrap_sse(response.aiter_bytes()):
                         should_yield = self._handle_chunk(streaming_context, chunk)
 
-                        if should_yield:
+                        if should_yield and streaming_context.should_emit():
                             yield self._partial_structured_output(
                                 partial_output_factory,
                                 streaming_context,
@@ -1,7 +1,7 @@
 from abc import abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from contextlib import asynccontextmanager, contextmanager
-from typing import TypeVar
+from typing import Any, TypeVar
 
 import httpx
 from httpx import USE_CLIENT_DEFAULT, Response
@@ -13,6 +13,7 @@ from core.domain.llm_usage import LLMUsage
 from core.domain.message import MessageDeprecated
 from core.domain.structured_output import StructuredOutput
 from core.providers.base.abstract_provider import AbstractProvider, ProviderConfigVar, ProviderRequestVar, RawCompletion
+from core.providers.base.httpx_client_pool import HTTPXClientPool, build_httpx_client_pool
 from core.providers.base.provider_error import (
     ContentModerationError,
     FailedGenerationError,
@@ -43,16 +44,37 @@ def _timeout_object(value: float):
 # TODO: The fact that the HTTPXProvider class uses a plain dict as a request is blocking for OpenAIImageProvider
 # Ultimately HTTPXProvider should also use a templated request type
 class HTTPXProviderBase(AbstractProvider[ProviderConfigVar, ProviderRequestVar]):
-    _shared_client = httpx.AsyncClient(
-        # 5 minutes timeout by default
-        timeout=_timeout_object(300.0),
-        # max_connections are per origin
-        limits=httpx.Limits(max_connections=500, max_keepalive_connections=100),
-    )
+    # 5 minutes timeout by default
+    _client_pool = build_httpx_client_pool(timeout=_timeout_object(300.0))
+
+    @classmethod
+    def client_pool(cls) -> HTTPXClientPool:
+        return cls._client_pool
 
     @classmethod
     async def close(cls):
-        await cls._shared_client.aclose()
+        await cls._client_pool.close()
+
+    def prewarm_url(self) -> str | None:
+        """The url that is opened at startup to prewarm the connection pool, None if the provider
+        should not be prewarmed"""
+        return None
+
+    @classmethod
+    async def prewarm(cls, providers: Iterable[AbstractProvider[Any, Any]]):
+        """Open a connection to the origin of each provider"""
+        urls: list[str] = []
+        for provider in providers:
+            if not isinstance(provider, HTTPXProviderBase):
+                continue
+            try:
+                url = provider.prewarm_url()
+            except Exception:
+                provider.logger.exception("Failed to compute prewarm url")
+                continue
+            if url:
+                urls.append(url)
+        await cls._client_pool.prewarm(urls)
 
     @classmethod
     def _invalid_json_error(
@@ -181,8 +203,10 @@ class HTTPXProviderBase(AbstractProvider[ProviderConfigVar, ProviderRequestVar])
     @asynccontextmanager
     async def _open_client(self, url: str):
         # We don't open or close the client here
-        # Since we re-use them from a shared pool
-        yield self._shared_client
+        # Since we re-use them from a shared pool, with one client per origin
+        # The lease keeps the client open until the request or the stream is done
+        async with self._client_pool.lease(url) as client:
+            yield client
 
     @classmethod
     def timeout_or_default(cls, value: float | None):
@@ -31,7 +31,7 @@ from core.providers.base.provider_error import (
     ReadTimeOutError,
     UnknownProviderError,
 )
-from core.providers.base.provider_options import ProviderOptions
+from core.providers.base.provider_options import ProviderOptions, StreamEmissionPolicy
 from core.providers.base.streaming_context import ParsedResponse, ToolCallRequestBuffer
 from core.providers.openai.openai_provider import OpenAIProvider
 from tests.utils import mock_aiter
@@ -1053,6 +1053,50 @@ class TestStreamingHandlers:
         assert outputs[2].delta is None
         assert outputs[2].output == "Hello world"
 
+    @pytest.mark.parametrize(
+        ("policy", "expected_partials"),
+        [
+            (StreamEmissionPolicy(min_new_chars=20), [{"key": "value", "key2": "val"}]),
+            (
+                StreamEmissionPolicy(complete_values_only=True),
+                [{"key": "value"}, {"key": "value", "key2": "value2"}],
+            ),
+            (StreamEmissionPolicy(min_interval_seconds=60), [{"key": "value"}]),
+        ],
+    )
+    async def test_stream_emission_policy(
+        self,
+        mocked_provider: MockedProvider,
+        httpx_mock: HTTPXMock,
+        policy: StreamEmissionPolicy,
+        expected_partials: list[dict[str, Any]],
+    ):
+        httpx_mock.add_response(
+            url="https://api.openai.com/v1/chat/completions",
+            stream=IteratorStream([b"data: 1\n\n", b"data: 2\n\n", b"data: 3\n\n", b"data: [DONE]\n\n"]),
+            status_code=200,
+        )
+        mocked_provider.mock._extract_stream_delta.side_effect = [
+            ParsedResponse(content='{"key": "value",'),
+            ParsedResponse(content='"key2": "val'),
+            ParsedResponse(content='ue2"}'),
+            None,
+        ]
+
+        outputs: list[StructuredOutput] = []
+        async for output in mocked_provider._single_stream(  # pyright: ignore[reportPrivateUsage]
+            request={},
+            output_factory=lambda x, _: StructuredOutput(output=json.loads(x)),
+            partial_output_factory=lambda x: StructuredOutput(output=x),
+            raw_completion=RawCompletion(response="", usage=LLMUsage()),
+            options=ProviderOptions(model=Model.GPT_4O_2024_05_13, output_schema={}, stream_emission=policy),
+        ):
+            outputs.append(copy.deepcopy(output))  # noqa: PERF401
+
+        assert [o.output for o in outputs[:-1]] == expected_partials
+        # The final output is always exact
+        assert outputs[-1].output == {"key": "value", "key2": "value2"}
+
 
 class TestBuildStructuredOutput:
     def test_basic_output(self, mocked_provider: MockedProvider):
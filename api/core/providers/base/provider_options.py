@@ -1,3 +1,4 @@
+import os
 from typing import Any, Optional
 
 from pydantic import BaseModel
@@ -7,6 +8,29 @@ from core.domain.task_group_properties import ToolChoice
 from core.domain.tool import Tool
 
 
+class StreamEmissionPolicy(BaseModel):
+    """Limits how often partial outputs are built and yielded when streaming. The final output is always
+    yielded and deltas are never throttled since skipping one would lose content."""
+
+    min_interval_seconds: float = 0
+    min_new_chars: int = 0
+    # Only yield partial outputs when the stream is not in the middle of a JSON string
+    complete_values_only: bool = False
+
+    @property
+    def is_noop(self) -> bool:
+        return self.min_interval_seconds <= 0 and self.min_new_chars <= 0 and not self.complete_values_only
+
+    @classmethod
+    def from_env(cls) -> "StreamEmissionPolicy | None":
+        policy = cls(
+            min_interval_seconds=float(os.environ.get("STREAM_EMISSION_MIN_INTERVAL_SECONDS", "0")),
+            min_new_chars=int(os.environ.get("STREAM_EMISSION_MIN_NEW_CHARS", "0")),
+            complete_values_only=os.environ.get("STREAM_EMISSION_COMPLETE_VALUES_ONLY") == "true",
+        )
+        return None if policy.is_noop else policy
+
+
 class ProviderOptions(BaseModel):
     model: Model
     output_schema: dict[str, Any] | None = None
@@ -18,6 +42,7 @@ class ProviderOptions(BaseModel):
     enabled_tools: list[Tool] | None = None
     tenant: str | None = None
     stream_deltas: bool = False
+    stream_emission: StreamEmissionPolicy | None = None
     tool_choice: ToolChoice | None = None
     top_p: float | None = None
     presence_penalty: float | None = None
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import os
+import time
+
+from redis.asyncio import Redis
+
+from core.domain.metrics import send_gauge
+from core.utils.coroutines import capture_errors
+from core.utils.lru.lru_cache import LRUCache
+
+_logger = logging.getLogger(__name__)
+
+# provider, config key, model
+RateLimitBudgetKey = tuple[str, str, str]
+
+_REDIS_KEY_PREFIX = "rate_limit_budgets"
+
+
+def _redis_key(key: RateLimitBudgetKey) -> str:
+    return ":".join((_REDIS_KEY_PREFIX, *key))
+
+
+class _Budget:
+    __slots__ = ("observed_at", "remaining", "total")
+
+    def __init__(self, remaining: float, total: float, observed_at: float):
+        self.remaining = remaining
+        self.total = total
+        # Wall clock time so that observations can be compared across workers
+        self.observed_at = observed_at
+
+
+class RateLimitBudget:
+    """Client side estimate of the rate limit budgets of each provider config and model, fed by the
+    rate limit headers that providers return.
+
+    Each limit (requests, tokens, ...) is modeled as a token bucket that refills linearly over a window,
+    a minute by default since it is what most providers use. Requests consume the request budget locally
+    so that concurrent requests do not all see the same remaining quota.
+
+    Observations are shared across workers through a redis hash per provider config and model, which expires
+    once the budgets are fully refilled. The hashes of the keys this worker knows about are read back in the
+    background every sync_interval_seconds so checks are synchronous and only use the local state. The estimated
+    remaining ratio of each limit is reported as a gauge after every sync."""
+
+    def __init__(
+        self,
+        redis_client: Redis | None,
+        window_seconds: float = 60,
+        sync_interval_seconds: float = 1,
+        max_delay_seconds: float = 1,
+        min_remaining_ratio: float = 0.01,
+        capacity: int = 1000,
+    ):
+        self._redis_client = redis_client
+        self._window_seconds = window_seconds
+        self._sync_interval_seconds = sync_interval_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._min_remaining_ratio = min_remaining_ratio
+        self._budgets = LRUCache[RateLimitBudgetKey, dict[str, _Budget]](capacity)
+        self._sync_task: asyncio.Task[None] | None = None
+
+    def _threshold(self, budget: _Budget) -> float:
+        return max(1, budget.total * self._min_remaining_ratio)
+
+    def _estimate(self, budget: _Budget, now: float) -> float:
+        refilled = max(0, now - budget.observed_at) * budget.total / self._window_seconds
+        return min(budget.total, budget.remaining + refilled)
+
+    def _set(self, key: RateLimitBudgetKey, limit_name: str, budget: _Budget):
+        try:
+            limits = self._budgets[key]
+        except KeyError:
+            limits = {}
+            self._budgets[key] = limits
+        current = limits.get(limit_name)
+        # Observations can arrive out of order, especially when they come from other workers
+        if current is None or current.observed_at <= budget.observed_at:
+            limits[limit_name] = budget
+
+    def estimated_remaining_ratio(self, key: RateLimitBudgetKey, limit_name: str) -> float | None:
+        limits = self._budgets.peek(key)
+        if not limits or not (budget := limits.get(limit_name)) or budget.total <= 0:
+            return None
+        return self._estimate(budget, time.time()) / budget.total
+
+    def refill_delay(self, key: RateLimitBudgetKey) -> float:
+        """The number of seconds until every limit of the key is above its threshold, 0 if none is exhausted"""
+        limits = self._budgets.peek(key)
+        if limits is None:
+            # Registering the key so that the observations of other workers are synced
+            self._budgets[key] = {}
+            return 0
+        now = time.time()
+        delay = 0.0
+        for budget in limits.values():
+            if budget.total <= 0:
+                continue
+            missing = self._threshold(budget) - self._estimate(budget, now)
+            if missing > 0:
+                delay = max(delay, missing * self._window_seconds / budget.total)
+        return delay
+
+    def is_exhausted(self, key: RateLimitBudgetKey) -> bool:
+        return self.refill_delay(key) > 0
+
+    def consume(self, key: RateLimitBudgetKey, limit_name: str = "requests", amount: float = 1):
+        limits = self._budgets.peek(key)
+        if not limits or not (budget := limits.get(limit_name)):
+            return
+        now = time.time()
+        limits[limit_name] = _Budget(self._estimate(budget, now) - amount, budget.total, now)
+
+    async def observe(self, key: RateLimitBudgetKey, limit_name: str, remaining: float, total: float):
+        budget = _Budget(remaining, total, time.time())
+        self._set(key, limit_name, budget)
+
+        if not self._redis_client:
+            return
+        with capture_errors(_logger, "Failed to store rate limit budget"):
+            redis_key = _redis_key(key)
+            pipeline = self._redis_client.pipeline(transaction=False)
+            pipeline.hset(  # pyright: ignore [reportUnknownMemberType]
+                redis_key,
+                limit_name,
+                json.dumps([budget.remaining, budget.total, budget.observed_at]),
+            )
+            # Budgets are fully refilled after a window so older observations are useless
+            pipeline.expire(redis_key, int(self._window_seconds * 2))  # pyright: ignore [reportUnknownMemberType]
+            await pipeline.execute()  # pyright: ignore [reportUnknownMemberType]
+
+    async def sync(self):
+        """Read the observations made by other workers for the keys this worker knows about"""
+        if not self._redis_client or not self._budgets.cache:
+            return
+
+        with capture_errors(_logger, "Failed to sync rate limit budgets"):
+            keys: list[RateLimitBudgetKey] = list(self._budgets.cache.keys())
+            pipeline = self._redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.hgetall(_redis_key(key))  # pyright: ignore [reportUnknownMemberType]
+            results: list[dict[bytes, bytes]] = await pipeline.execute()  # pyright: ignore [reportUnknownMemberType]
+            for key, raw in zip(keys, results):
+                for limit_name, value in raw.items():
+                    remaining, total, observed_at = json.loads(value)
+                    self._set(key, limit_name.decode(), _Budget(remaining, total, observed_at))
+
+    async def send_remaining_ratios(self):
+        for (provider, config, model), limits in list(self._budgets.cache.items()):
+            for limit_name in list(limits):
+                ratio = self.estimated_remaining_ratio((provider, config, model), limit_name)
+                if ratio is None:
+                    continue
+                await send_gauge(
+                    "provider_rate_limit_remaining_ratio",
+                    ratio,
+                    provider=provider,
+                    config=config,
+                    model=model,
+                    limit=limit_name,
+                )
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self._sync_interval_seconds)
+            await self.sync()
+            await self.send_remaining_ratios()
+
+    def start(self):
+        # The loop also runs without redis since it reports the remaining ratios
+        if not self._sync_task:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    def close(self):
+        if self._sync_task:
+            self._sync_task.cancel()
+            self._sync_task = None
+
+
+def _build_shared_rate_limit_budget() -> RateLimitBudget | None:
+    if os.environ.get("PROVIDER_RATE_LIMIT_BUDGET_ENABLED", "true") != "true":
+        return None
+
+    from core.utils.redis_cache import shared_redis_client
+
+    return RateLimitBudget(
+        redis_client=shared_redis_client,
+        window_seconds=float(os.environ.get("PROVIDER_RATE_LIMIT_BUDGET_WINDOW_SECONDS", "60")),
+        max_delay_seconds=float(os.environ.get("PROVIDER_RATE_LIMIT_BUDGET_MAX_DELAY_SECONDS", "1")),
+    )
+
+
+_shared_rate_limit_budget = _build_shared_rate_limit_budget()
+
+
+def shared_rate_limit_budget() -> RateLimitBudget | None:
+    return _shared_rate_limit_budget
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from core.providers.base.rate_limit_budget import RateLimitBudget
+
+_KEY = ("openai", "workflowai_0", "gpt-4o")
+
+
+@pytest.fixture
+def mock_redis_pipeline():
+    mock = Mock()
+    mock.execute = AsyncMock(return_value=[])
+    return mock
+
+
+@pytest.fixture
+def mock_redis(mock_redis_pipeline: Mock):
+    mock = Mock()
+    mock.pipeline.return_value = mock_redis_pipeline
+    return mock
+
+
+@pytest.fixture
+def budget(mock_redis: AsyncMock):
+    return RateLimitBudget(redis_client=mock_redis, window_seconds=60, sync_interval_seconds=1)
+
+
+class TestObserve:
+    async def test_exhausted(self, budget: RateLimitBudget, mock_redis_pipeline: Mock):
+        assert not budget.is_exhausted(_KEY)
+
+        await budget.observe(_KEY, "requests", remaining=0, total=60)
+        assert budget.is_exhausted(_KEY)
+        # 1 request refills every second
+        assert budget.refill_delay(_KEY) == pytest.approx(1, abs=0.01)  # pyright: ignore [reportUnknownMemberType]
+
+        # Each provider config has its own hash that expires after 2 windows
+        mock_redis_pipeline.hset.assert_called_once()
+        redis_key, field, value = mock_redis_pipeline.hset.call_args.args
+        assert redis_key == "rate_limit_budgets:openai:workflowai_0:gpt-4o"
+        assert field == "requests"
+        assert json.loads(value)[:2] == [0, 60]
+        mock_redis_pipeline.expire.assert_called_once_with(redis_key, 120)
+        mock_redis_pipeline.execute.assert_awaited_once()
+
+    async def test_refill(self, budget: RateLimitBudget):
+        await budget.observe(_KEY, "requests", remaining=0, total=60)
+        with patch("time.time", return_value=time.time() + 2):
+            assert not budget.is_exhausted(_KEY)
+            assert budget.estimated_remaining_ratio(_KEY, "requests") == pytest.approx(2 / 60, abs=0.01)  # pyright: ignore [reportUnknownMemberType]
+
+    async def test_token_threshold(self, budget: RateLimitBudget):
+        # Under 1% of the token budget is considered exhausted
+        await budget.observe(_KEY, "tokens", remaining=500, total=100_000)
+        assert budget.is_exhausted(_KEY)
+        await budget.observe(_KEY, "tokens", remaining=5000, total=100_000)
+        assert not budget.is_exhausted(_KEY)
+
+    async def test_consume(self, budget: RateLimitBudget):
+        await budget.observe(_KEY, "requests", remaining=2, total=60)
+        assert not budget.is_exhausted(_KEY)
+        budget.consume(_KEY)
+        budget.consume(_KEY)
+        assert budget.is_exhausted(_KEY)
+
+    async def test_redis_failure(self, budget: RateLimitBudget, mock_redis_pipeline: Mock):
+        mock_redis_pipeline.execute.side_effect = Exception("redis is down")
+        await budget.observe(_KEY, "requests", remaining=0, total=60)
+        assert budget.is_exhausted(_KEY)
+
+
+class TestSync:
+    async def test_sync(self, budget: RateLimitBudget, mock_redis_pipeline: Mock):
+        # Nothing to sync until a key is used
+        await budget.sync()
+        mock_redis_pipeline.execute.assert_not_awaited()
+
+        assert not budget.is_exhausted(_KEY)
+        mock_redis_pipeline.execute.return_value = [{b"requests": json.dumps([0, 60, time.time()]).encode()}]
+        await budget.sync()
+        mock_redis_pipeline.hgetall.assert_called_once_with("rate_limit_budgets:openai:workflowai_0:gpt-4o")
+        assert budget.is_exhausted(_KEY)
+
+    async def test_older_observation_ignored(self, budget: RateLimitBudget, mock_redis_pipeline: Mock):
+        await budget.observe(_KEY, "requests", remaining=60, total=60)
+        mock_redis_pipeline.execute.return_value = [{b"requests": json.dumps([0, 60, time.time() - 1]).encode()}]
+        await budget.sync()
+        assert not budget.is_exhausted(_KEY)
+
+    async def test_background_sync(self, mock_redis: Mock, mock_redis_pipeline: Mock):
+        budget = RateLimitBudget(redis_client=mock_redis, sync_interval_seconds=0.01)
+        assert not budget.is_exhausted(_KEY)
+        mock_redis_pipeline.execute.return_value = [{b"requests": json.dumps([0, 60, time.time()]).encode()}]
+
+        budget.start()
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            budget.close()
+        assert budget.is_exhausted(_KEY)
+
+
+class TestSendRemainingRatios:
+    async def test_send_remaining_ratios(self, budget: RateLimitBudget):
+        await budget.observe(_KEY, "requests", remaining=30, total=60)
+        # Keys without observations are not reported
+        budget.refill_delay(("openai", "workflowai_0", "gpt-4o-mini"))
+
+        with patch("core.providers.base.rate_limit_budget.send_gauge", new_callable=AsyncMock) as mock_send_gauge:
+            await budget.send_remaining_ratios()
+
+        mock_send_gauge.assert_awaited_once()
+        assert mock_send_gauge.call_args.args[0] == "provider_rate_limit_remaining_ratio"
+        assert mock_send_gauge.call_args.args[1] == pytest.approx(0.5, abs=0.01)  # pyright: ignore [reportUnknownMemberType]
+        assert mock_send_gauge.call_args.kwargs == {
+            "provider": "openai",
+            "config": "workflowai_0",
+            "model": "gpt-4o",
+            "limit": "requests",
+        }
+
+    async def test_sent_from_sync_loop(self):
+        budget = RateLimitBudget(redis_client=None, sync_interval_seconds=0.01)
+        await budget.observe(_KEY, "requests", remaining=30, total=60)
+
+        with patch("core.providers.base.rate_limit_budget.send_gauge", new_callable=AsyncMock) as mock_send_gauge:
+            budget.start()
+            try:
+                await asyncio.sleep(0.05)
+            finally:
+                budget.close()
+
+        mock_send_gauge.assert_awaited()
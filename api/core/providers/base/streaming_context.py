@@ -1,3 +1,4 @@
+import time
 from typing import Any, NamedTuple
 
 from pydantic import BaseModel
@@ -5,6 +6,7 @@ from pydantic import BaseModel
 from core.domain.fields.internal_reasoning_steps import InternalReasoningStep
 from core.domain.tool_call import ToolCallRequestWithID
 from core.providers.base.models import RawCompletion
+from core.providers.base.provider_options import StreamEmissionPolicy
 from core.utils.streams import JSONStreamParser, RawStreamParser
 
 
@@ -22,7 +24,13 @@ class ParsedResponse(NamedTuple):
 
 
 class StreamingContext:
-    def __init__(self, raw_completion: RawCompletion, json: bool, stream_deltas: bool = False):
+    def __init__(
+        self,
+        raw_completion: RawCompletion,
+        json: bool,
+        stream_deltas: bool = False,
+        emission_policy: StreamEmissionPolicy | None = None,
+    ):
         self.json = json
         self.streamer = JSONStreamParser() if json else RawStreamParser()
         self.agg_output: dict[str, Any] = {}
@@ -34,3 +42,31 @@ class StreamingContext:
 
         self.last_chunk: ParsedResponse | None = None
         self.stream_deltas = stream_deltas
+
+        # Deltas can't be throttled without losing content
+        self.emission_policy = (
+            emission_policy if emission_policy and not emission_policy.is_noop and not stream_deltas else None
+        )
+        self.received_chars = 0
+        self._emitted_chars = 0
+        self._emitted_at = 0.0
+
+    def should_emit(self) -> bool:
+        """Whether a partial output should be yielded for an update, according to the emission policy"""
+        if not self.emission_policy:
+            return True
+        policy = self.emission_policy
+        if self.received_chars - self._emitted_chars < policy.min_new_chars:
+            return False
+        if (
+            policy.complete_values_only
+            and isinstance(self.streamer, JSONStreamParser)
+            and self.streamer.is_within_quotes
+        ):
+            return False
+        now = time.monotonic()
+        if now - self._emitted_at < policy.min_interval_seconds:
+            return False
+        self._emitted_chars = self.received_chars
+        self._emitted_at = now
+        return True
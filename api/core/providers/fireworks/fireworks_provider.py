@@ -352,11 +352,11 @@ class FireworksAIProvider(HTTPXProvider[FireworksConfig, CompletionResponse]):
         return True
 
     @override
-    async def wrap_sse(self, raw: AsyncIterator[bytes], termination_chars: bytes = b"\n\n"):
+    async def wrap_sse(self, raw: AsyncIterator[bytes]):
         self._thinking_tag_context.set(None)
 
         # Call parent's wrap_sse implementation
-        async for chunk in super().wrap_sse(raw, termination_chars):
+        async for chunk in super().wrap_sse(raw):
             yield chunk
 
     def _check_for_closing_thinking_tag(self, content: str, tool_calls: list[ToolCallRequestWithID] | None):
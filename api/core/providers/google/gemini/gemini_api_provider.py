@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Literal
 
 from pydantic import BaseModel
@@ -95,7 +96,8 @@ class GoogleGeminiAPIProvider(GoogleProviderBase[GoogleGeminiAPIProviderConfig])
     @override
     async def feed_prompt_token_count(self, llm_usage: LLMUsage, messages: list[dict[str, Any]], model: Model) -> None:
         if llm_usage.prompt_token_count is None:
-            llm_usage.prompt_token_count = self._compute_prompt_token_count(messages, model)
+            # Prompts can be very long so the count is computed in a thread
+            llm_usage.prompt_token_count = await asyncio.to_thread(self._compute_prompt_token_count, messages, model)
             if llm_usage.prompt_audio_token_count is not None:
                 llm_usage.prompt_token_count += llm_usage.prompt_audio_token_count
 
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Literal
 
 from typing_extensions import override
@@ -155,16 +156,16 @@ class GoogleProvider(GoogleProviderBase[GoogleProviderConfig]):
             return
         # For other models, we have to compute the number of characters
 
-        llm_usage.prompt_token_count = self._compute_prompt_token_count(messages, model)
+        llm_usage.prompt_token_count = await asyncio.to_thread(self._compute_prompt_token_count, messages, model)
         # the prompt token count should include the total number of tokens
         if llm_usage.prompt_audio_token_count is not None:
             llm_usage.prompt_token_count += llm_usage.prompt_audio_token_count
 
     @override
-    def feed_completion_token_count(self, llm_usage: LLMUsage, response: str | None, model: Model) -> None:
+    async def feed_completion_token_count(self, llm_usage: LLMUsage, response: str | None, model: Model) -> None:
         if model in PER_TOKEN_MODELS:
             # For per token models, we just return the number of tokens
-            super().feed_completion_token_count(llm_usage, response, model)
+            await super().feed_completion_token_count(llm_usage, response, model)
             return
 
         llm_usage.completion_token_count = len(response.replace(" ", "")) / GOOGLE_CHARS_PER_TOKEN if response else 0
@@ -1,7 +1,7 @@
 import asyncio
 from abc import abstractmethod
 from json import JSONDecodeError
-from typing import Any, AsyncIterator, Generic, Protocol, TypeVar
+from typing import Any, Generic, Protocol, TypeVar
 
 import httpx
 from pydantic import BaseModel
@@ -206,10 +206,6 @@ class GoogleProviderBase(HTTPXProvider[_GoogleConfigVar, CompletionResponse], Ge
 
         return raw_messages
 
-    async def wrap_sse(self, raw: AsyncIterator[bytes], termination_chars: bytes = b"\r\n\r\n"):
-        async for data in super().wrap_sse(raw, termination_chars):
-            yield data
-
     @abstractmethod
     def _request_url(self, model: Model, stream: bool) -> str:
         pass
@@ -29,7 +29,7 @@ from core.utils.audio import audio_duration_seconds
 from core.utils.dicts import TwoWayDict
 from core.utils.json_utils import safe_extract_dict_from_json
 from core.utils.schemas import JsonSchema
-from core.utils.token_utils import tokens_from_string
+from core.utils.token_utils import count_tokens_many
 
 logger = logging.getLogger(__name__)
 
@@ -273,13 +273,7 @@ class GoogleMessage(BaseModel):
         return output_message
 
     def text_token_count(self, model: Model) -> int:
-        token_count = 0
-
-        for part in self.parts:
-            if part.text:
-                token_count += tokens_from_string(part.text, model)
-
-        return token_count
+        return sum(count_tokens_many((part.text for part in self.parts if part.text), model))
 
     def text_char_count(self) -> int:
         char_count = 0
@@ -357,12 +351,7 @@ class GoogleSystemMessage(BaseModel):
         )
 
     def text_token_count(self, model: Model) -> int:
-        token_count = 0
-
-        for part in self.parts:
-            if part.text:
-                token_count += tokens_from_string(part.text, model)
-        return token_count
+        return sum(count_tokens_many((part.text for part in self.parts if part.text), model))
 
     def text_char_count(self) -> int:
         char_count = 0
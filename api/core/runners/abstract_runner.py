@@ -7,6 +7,7 @@ from typing import Any, Generic, Literal, Optional, Protocol, TypeVar
 from pydantic import BaseModel, ValidationError
 
 from core.domain.agent_run import AgentRun
+from core.domain.consts import METADATA_KEY_COALESCED
 from core.domain.errors import InvalidRunnerOptionsError, MissingCacheError
 from core.domain.message import Messages
 from core.domain.metrics import measure_time, send_counter
@@ -18,6 +19,7 @@ from core.domain.task_variant import SerializableTaskVariant
 from core.domain.types import AgentInput, CacheUsage
 from core.providers.base.provider_error import ProviderError
 from core.runners.builder_context import builder_context
+from core.runners.single_flight import RunSingleFlight
 from core.storage import TaskTuple
 from core.utils.tags import compute_tags
 from core.utils.uuid import uuid7
@@ -57,6 +59,7 @@ class AbstractRunner(
         options: Optional[RunnerOptionsVar] = None,
         cache_fetcher: Optional[CacheFetcher] = None,
         metadata: dict[str, Any] | None = None,
+        single_flight: RunSingleFlight | None = None,
     ):
         self.task = task
         # Since properties are very open, options act as an intermediary object
@@ -79,6 +82,7 @@ class AbstractRunner(
         self.properties = self._build_properties(self._options, original=properties)
         self.cache_fetcher = cache_fetcher
         self.metadata = metadata
+        self.single_flight = single_flight
         # Set from the outside for analytics
         self.metric_tags: dict[str, int | str | float | bool | None] = {}
 
@@ -237,6 +241,43 @@ class AbstractRunner(
     def _get_builder_context(self):
         return builder_context.get()
 
+    def _single_flight_key(self, builder: TaskRunBuilder, cache: CacheUsage) -> str | None:
+        """Identical runs can only be coalesced when their output could have been served from the cache"""
+        if not self.single_flight or builder.reply is not None or not self._should_use_cache(cache):
+            return None
+        input = builder.task_input
+        input_hash = self.task.compute_input_hash(input.to_input_dict() if isinstance(input, Messages) else input)
+        group_hash = self.properties.model_hash()
+        return f"{self.task.tenant}:{self.task.task_id}:{self.task.task_schema_id}:{input_hash}:{group_hash}"
+
+    async def _coalesced_task_output(self, builder: TaskRunBuilder, key: str) -> RunOutput:
+        assert self.single_flight, "single flight is required"
+        leader = False
+
+        async def _build():
+            nonlocal leader
+            leader = True
+            return await self._build_task_output(builder.task_input)
+
+        output = await self.single_flight.run(key, _build)
+        if not leader:
+            self._set_metadata(METADATA_KEY_COALESCED, "true")
+        return output
+
+    async def _coalesced_stream_task_output(self, builder: TaskRunBuilder, key: str) -> AsyncIterator[RunOutput]:
+        assert self.single_flight, "single flight is required"
+        leader = False
+
+        def _stream():
+            nonlocal leader
+            leader = True
+            return self._stream_task_output(builder.task_input)
+
+        async for o in self.single_flight.stream(key, _stream):
+            if not leader:
+                self._set_metadata(METADATA_KEY_COALESCED, "true")
+            yield o
+
     async def _prepare_builder(
         self,
         builder: TaskRunBuilder,
@@ -291,7 +332,10 @@ class AbstractRunner(
             return cached
 
         async with self._wrap_for_metric():
-            chunk = await self._build_task_output(builder.task_input)
+            if key := self._single_flight_key(builder, cache):
+                chunk = await self._coalesced_task_output(builder, key)
+            else:
+                chunk = await self._build_task_output(builder.task_input)
             return builder.build(chunk)
 
     async def stream(
@@ -305,7 +349,11 @@ class AbstractRunner(
             return
 
         async with self._wrap_for_metric():
-            async for o in self._stream_task_output(builder.task_input):
+            if key := self._single_flight_key(builder, cache):
+                it = self._coalesced_stream_task_output(builder, key)
+            else:
+                it = self._stream_task_output(builder.task_input)
+            async for o in it:
                 yield o
 
     @classmethod
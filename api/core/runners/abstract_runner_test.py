@@ -1,8 +1,10 @@
+import asyncio
 from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
 
+from core.domain.consts import METADATA_KEY_COALESCED
 from core.domain.errors import JSONSchemaValidationError, MissingCacheError
 from core.domain.run_output import RunOutput
 from core.domain.task_group_properties import TaskGroupProperties
@@ -10,6 +12,7 @@ from core.domain.task_run_builder import TaskRunBuilder
 from core.domain.task_variant import SerializableTaskVariant
 from core.domain.types import CacheUsage
 from core.runners.builder_context import builder_context
+from core.runners.single_flight import RunSingleFlight
 from core.tools import ToolKind
 from tests.dummy_runner import DummyRunner
 from tests.models import task_run_ser
@@ -244,3 +247,41 @@ class TestTaskRunBuilder:
 
         builder = await dummy_runner.task_run_builder(input=task_input, start_time=0)
         assert builder.task_input == task_input
+
+
+class TestSingleFlight:
+    async def test_identical_runs_are_coalesced(self, hello_task: SerializableTaskVariant, mock_cache_fetcher: Mock):
+        mock_cache_fetcher.return_value = None
+        runner = DummyRunner(
+            task=hello_task,
+            cache_fetcher=mock_cache_fetcher,
+            single_flight=RunSingleFlight(redis_client=None),
+        )
+        release = asyncio.Event()
+
+        async def _build(*args: Any, **kwargs: Any):
+            await release.wait()
+            return RunOutput({"say_hello": "bla"})
+
+        def _builder():
+            return TaskRunBuilder(task=hello_task, task_input={}, properties=runner.properties, start_time=0)
+
+        with patch.object(runner, "_build_task_output", side_effect=_build) as mock:
+            tasks = [asyncio.create_task(runner.run(_builder(), cache="always")) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            release.set()
+            runs = await asyncio.gather(*tasks)
+
+        mock.assert_called_once()
+        assert [r.task_output for r in runs] == [{"say_hello": "bla"}] * 2
+        assert runs[0].id != runs[1].id
+        assert [bool(r.metadata and METADATA_KEY_COALESCED in r.metadata) for r in runs] == [False, True]
+
+    async def test_not_coalesced_when_cache_is_not_used(self, hello_task: SerializableTaskVariant):
+        runner = DummyRunner(
+            task=hello_task,
+            single_flight=RunSingleFlight(redis_client=None),
+        )
+        builder = TaskRunBuilder(task=hello_task, task_input={}, properties=runner.properties, start_time=0)
+        assert runner._single_flight_key(builder, "never") is None  # pyright: ignore [reportPrivateUsage]
+        assert runner._single_flight_key(builder, "always") is not None  # pyright: ignore [reportPrivateUsage]
@@ -22,4 +22,37 @@ class BuilderInterface(Protocol):
     def record_file_download_seconds(self, seconds: float) -> None: ...
 
 
+class AttemptBuilder:
+    """Wraps a builder for an attempt that runs concurrently with others. Completions are kept
+    aside so that only the ones of attempts that were not cancelled are added to the run"""
+
+    def __init__(self, parent: BuilderInterface):
+        self.parent = parent
+        self._llm_completions: list[LLMCompletion] = []
+
+    @property
+    def id(self) -> str:
+        return self.parent.id
+
+    @property
+    def llm_completions(self) -> list[LLMCompletion]:
+        return self._llm_completions
+
+    @property
+    def reply(self) -> RunReply | None:
+        return self.parent.reply
+
+    def add_metadata(self, key: str, value: Any) -> None:
+        self.parent.add_metadata(key, value)
+
+    def get_metadata(self, key: str) -> Any | None:
+        return self.parent.get_metadata(key)
+
+    def record_file_download_seconds(self, seconds: float) -> None:
+        self.parent.record_file_download_seconds(seconds)
+
+    def merge(self):
+        self.parent.llm_completions.extend(self._llm_completions)
+
+
 builder_context = ContextVar[Optional[BuilderInterface]]("builder_context", default=None)
@@ -0,0 +1,210 @@
+import asyncio
+import copy
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+
+from core.domain.errors import InternalError
+from core.domain.run_output import RunOutput
+from core.utils.background import add_background_task
+from core.utils.coroutines import capture_errors
+
+_logger = logging.getLogger(__name__)
+
+_run_output_adapter = TypeAdapter(RunOutput)
+
+
+class _Flight:
+    """The chunks produced by the leader of a flight, replayed to every follower"""
+
+    def __init__(self):
+        self.chunks: list[RunOutput] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self._condition = asyncio.Condition()
+
+    async def push(self, chunk: RunOutput):
+        async with self._condition:
+            self.chunks.append(chunk)
+            self._condition.notify_all()
+
+    async def finish(self, error: BaseException | None = None):
+        async with self._condition:
+            self.done = True
+            self.error = error
+            self._condition.notify_all()
+
+    async def follow(self) -> AsyncIterator[RunOutput]:
+        idx = 0
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: idx < len(self.chunks) or self.done)
+                new_chunks = self.chunks[idx:]
+                done = self.done
+            idx += len(new_chunks)
+            for chunk in new_chunks:
+                # Chunks can contain mutable tool calls so every follower gets its own copy
+                yield copy.deepcopy(chunk)
+            if done:
+                return
+
+
+class RunSingleFlight:
+    """Coalesces identical in-flight runs so that they share a single completion.
+
+    The first caller for a key in a process starts a flight that executes the run in a background
+    task, with a copy of the caller's context so that the builder context stays its own. Every caller
+    in the process, including the first one, follows the flight and receives every chunk it produces,
+    so a caller that disconnects does not interrupt the others. Across processes, the flight takes a
+    redis lock and publishes its final output. Callers in other processes wait for that output and
+    only get the final chunk.
+
+    Callers fall back to running on their own when the flight is cancelled before producing anything
+    or when the wait times out. Errors raised by the run are propagated to every caller."""
+
+    def __init__(
+        self,
+        redis_client: Redis | None,
+        lock_ttl_seconds: float = 60,
+        wait_timeout_seconds: float = 30,
+        poll_interval_seconds: float = 0.05,
+    ):
+        self._redis_client = redis_client
+        self._lock_ttl_seconds = lock_ttl_seconds
+        self._wait_timeout_seconds = wait_timeout_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._flights: dict[str, _Flight] = {}
+
+    @classmethod
+    def _lock_key(cls, key: str):
+        return f"single_flight:lock:{key}"
+
+    @classmethod
+    def _result_key(cls, key: str):
+        return f"single_flight:result:{key}"
+
+    async def _acquire(self, key: str) -> bool:
+        """Returns true if the lock was acquired or if redis is not available"""
+        if not self._redis_client:
+            return True
+        with capture_errors(_logger, "Failed to acquire single flight lock"):
+            return bool(
+                await self._redis_client.set(  # pyright: ignore [reportUnknownMemberType]
+                    self._lock_key(key),
+                    "1",
+                    nx=True,
+                    px=int(self._lock_ttl_seconds * 1000),
+                ),
+            )
+        return True
+
+    async def _release(self, key: str, output: RunOutput | None):
+        if not self._redis_client:
+            return
+        with capture_errors(_logger, "Failed to release single flight lock"):
+            if output is not None:
+                await self._redis_client.set(  # pyright: ignore [reportUnknownMemberType]
+                    self._result_key(key),
+                    _run_output_adapter.dump_json(output),
+                    px=int(self._wait_timeout_seconds * 1000),
+                )
+            await self._redis_client.delete(self._lock_key(key))  # pyright: ignore [reportUnknownMemberType]
+
+    async def _wait_for_remote(self, key: str) -> RunOutput | None:
+        """Wait for the leader in another process to publish its output. Returns None if the leader
+        released the lock without an output or if the wait timed out"""
+        if not self._redis_client:
+            return None
+        deadline = time.monotonic() + self._wait_timeout_seconds
+        with capture_errors(_logger, "Failed to wait for single flight result"):
+            while time.monotonic() < deadline:
+                raw: bytes | None = await self._redis_client.get(self._result_key(key))  # pyright: ignore [reportUnknownMemberType]
+                if raw is not None:
+                    return _run_output_adapter.validate_json(raw)
+                if not await self._redis_client.exists(self._lock_key(key)):  # pyright: ignore [reportUnknownMemberType]
+                    return None
+                await asyncio.sleep(self._poll_interval_seconds)
+        return None
+
+    async def _fly(self, key: str, flight: _Flight, fn: Callable[[], AsyncIterator[RunOutput]]):
+        # The flight only reports a cancellation when its own task is cancelled, e.g. on shutdown
+        error: BaseException | None = asyncio.CancelledError()
+        acquired = False
+        last: RunOutput | None = None
+        try:
+            acquired = await self._acquire(key)
+            if not acquired and (output := await self._wait_for_remote(key)) is not None:
+                await flight.push(output)
+                error = None
+                return
+            # Either we are the leader or the remote leader failed or is too slow, so we run ourselves
+            async for chunk in fn():
+                last = chunk
+                await flight.push(chunk)
+            error = None
+        except Exception as e:
+            # Propagated to every caller of the flight
+            error = e
+        finally:
+            self._flights.pop(key, None)
+            if acquired:
+                await self._release(key, last if error is None else None)
+            await flight.finish(error)
+
+    async def stream(self, key: str, fn: Callable[[], AsyncIterator[RunOutput]]) -> AsyncIterator[RunOutput]:
+        if (flight := self._flights.get(key)) is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            # The flight runs in its own task so that it outlives the client that started it
+            add_background_task(self._fly(key, flight, fn))
+
+        received = False
+        async for chunk in flight.follow():
+            received = True
+            yield chunk
+
+        if flight.error is None:
+            return
+        if not isinstance(flight.error, asyncio.CancelledError):
+            raise flight.error
+        if received:
+            raise InternalError("Coalesced run was interrupted")
+        # The flight was cancelled before producing anything
+        async for chunk in fn():
+            yield chunk
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[RunOutput]]) -> RunOutput:
+        async def _as_stream():
+            yield await fn()
+
+        last: RunOutput | None = None
+        async for chunk in self.stream(key, _as_stream):
+            last = chunk
+        if last is None:
+            raise ValueError("Single flight run did not produce any output")
+        return last
+
+
+def _build_shared_run_single_flight() -> RunSingleFlight | None:
+    # Coalescing is opt-in
+    if os.environ.get("RUN_SINGLE_FLIGHT_ENABLED") != "true":
+        return None
+
+    from core.utils.redis_cache import shared_redis_client
+
+    return RunSingleFlight(
+        redis_client=shared_redis_client,
+        lock_ttl_seconds=float(os.environ.get("RUN_SINGLE_FLIGHT_LOCK_TTL_SECONDS", "60")),
+        wait_timeout_seconds=float(os.environ.get("RUN_SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS", "30")),
+    )
+
+
+_shared_run_single_flight = _build_shared_run_single_flight()
+
+
+def shared_run_single_flight() -> RunSingleFlight | None:
+    return _shared_run_single_flight
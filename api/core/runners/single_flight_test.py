@@ -0,0 +1,170 @@
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.domain.run_output import RunOutput
+from core.providers.base.provider_error import ProviderError
+from core.runners.single_flight import RunSingleFlight
+
+
+@pytest.fixture
+def single_flight():
+    return RunSingleFlight(redis_client=None)
+
+
+class TestRun:
+    async def test_concurrent_runs_are_coalesced(self, single_flight: RunSingleFlight):
+        calls = 0
+        release = asyncio.Event()
+
+        async def _build():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return RunOutput({"a": 1})
+
+        tasks = [asyncio.create_task(single_flight.run("key", _build)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        outputs = await asyncio.gather(*tasks)
+        assert outputs == [RunOutput({"a": 1})] * 3
+        assert calls == 1
+
+        # The flight is over so the next run is executed
+        await single_flight.run("key", _build)
+        assert calls == 2
+
+    async def test_different_keys(self, single_flight: RunSingleFlight):
+        build = AsyncMock(return_value=RunOutput({"a": 1}))
+        await asyncio.gather(single_flight.run("key1", build), single_flight.run("key2", build))
+        assert build.call_count == 2
+
+    async def test_leader_error_is_propagated(self, single_flight: RunSingleFlight):
+        release = asyncio.Event()
+
+        async def _build():
+            await release.wait()
+            raise ProviderError("failed")
+
+        tasks = [asyncio.create_task(single_flight.run("key", _build)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, ProviderError) for r in results)
+
+    async def test_leader_cancelled(self, single_flight: RunSingleFlight):
+        calls = 0
+        release = asyncio.Event()
+
+        async def _build():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return RunOutput({"a": calls})
+
+        leader = asyncio.create_task(single_flight.run("key", _build))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.run("key", _build))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        release.set()
+        # The flight outlives the caller that started it
+        assert await follower == RunOutput({"a": 1})
+        assert calls == 1
+
+
+class TestStream:
+    async def test_chunks_are_fanned_out(self, single_flight: RunSingleFlight):
+        calls = 0
+        release = asyncio.Event()
+
+        async def _stream() -> AsyncIterator[RunOutput]:
+            nonlocal calls
+            calls += 1
+            for i in range(3):
+                await release.wait()
+                yield RunOutput({"a": i}, delta=str(i))
+
+        async def _consume():
+            return [c async for c in single_flight.stream("key", _stream)]
+
+        tasks = [asyncio.create_task(_consume()) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks)
+        assert results[0] == results[1]
+        assert [c.delta for c in results[0]] == ["0", "1", "2"]
+        assert calls == 1
+
+    async def test_leader_stops_consuming(self, single_flight: RunSingleFlight):
+        release = asyncio.Event()
+
+        async def _stream() -> AsyncIterator[RunOutput]:
+            for i in range(3):
+                await release.wait()
+                yield RunOutput({"a": i}, delta=str(i))
+
+        async def _consume_first():
+            async for c in single_flight.stream("key", _stream):
+                return c
+            return None
+
+        async def _consume():
+            return [c async for c in single_flight.stream("key", _stream)]
+
+        leader = asyncio.create_task(_consume_first())
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(_consume())
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await leader == RunOutput({"a": 0}, delta="0")
+        # The follower still receives every chunk
+        assert [c.delta for c in await follower] == ["0", "1", "2"]
+
+
+class TestRemote:
+    async def test_waits_for_remote_result(self):
+        output = RunOutput({"a": 1})
+        mock_redis = AsyncMock()
+        # The lock is held by another process
+        mock_redis.set.return_value = False
+        mock_redis.get.side_effect = [None, b'[{"a": 1}, null, null, null, null]']
+        mock_redis.exists.return_value = True
+
+        single_flight = RunSingleFlight(redis_client=mock_redis, poll_interval_seconds=0)
+        build = AsyncMock(return_value=RunOutput({"a": 2}))
+
+        assert await single_flight.run("key", build) == output
+        build.assert_not_called()
+        mock_redis.delete.assert_not_called()
+
+    async def test_remote_leader_failed(self):
+        mock_redis = AsyncMock()
+        mock_redis.set.return_value = False
+        mock_redis.get.return_value = None
+        # The lock was released without a result
+        mock_redis.exists.return_value = False
+
+        single_flight = RunSingleFlight(redis_client=mock_redis, poll_interval_seconds=0)
+        build = AsyncMock(return_value=RunOutput({"a": 2}))
+
+        assert await single_flight.run("key", build) == RunOutput({"a": 2})
+        build.assert_awaited_once()
+
+    async def test_leader_publishes_result(self):
+        mock_redis = AsyncMock()
+        mock_redis.set.return_value = True
+
+        single_flight = RunSingleFlight(redis_client=mock_redis)
+        await single_flight.run("key", AsyncMock(return_value=RunOutput({"a": 1})))
+
+        assert mock_redis.set.call_count == 2
+        assert mock_redis.set.call_args_list[1].args[0] == "single_flight:result:key"
+        mock_redis.delete.assert_awaited_once_with("single_flight:lock:key")
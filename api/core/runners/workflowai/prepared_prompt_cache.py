@@ -0,0 +1,42 @@
+import os
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar, cast
+
+from core.utils.lru.lru_cache import LRUCache
+
+_T = TypeVar("_T")
+
+
+class PreparedPromptCache:
+    """Process level cache of the parts of a prompt that only depend on the version, i.e. the task
+    variant and the group properties, and not on the run input: the prepared output schema, the tool
+    definitions and the rendered system message.
+
+    Cached values are shared between runners and must not be mutated."""
+
+    def __init__(self, capacity: int):
+        self._cache = LRUCache[Hashable, Any](capacity)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], _T]) -> _T:
+        try:
+            return cast(_T, self._cache[key])
+        except KeyError:
+            pass
+
+        value = build()
+        self._cache[key] = value
+        return value
+
+
+def _build_shared_prepared_prompt_cache() -> PreparedPromptCache | None:
+    capacity = int(os.environ.get("PREPARED_PROMPT_CACHE_SIZE", "1000"))
+    if capacity <= 0:
+        return None
+    return PreparedPromptCache(capacity)
+
+
+_shared_prepared_prompt_cache = _build_shared_prepared_prompt_cache()
+
+
+def shared_prepared_prompt_cache() -> PreparedPromptCache | None:
+    return _shared_prepared_prompt_cache
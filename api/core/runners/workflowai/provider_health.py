@@ -0,0 +1,141 @@
+import math
+import os
+import time
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+from core.domain.models.models import Model
+from core.domain.models.providers import Provider
+from core.utils.lru.lru_cache import LRUCache
+
+_T = TypeVar("_T")
+
+# The key of a provider config for a given model. A config of None is the aggregate
+# of all the configs for a provider type
+ProviderHealthKey = tuple[Provider, str | None, Model]
+
+# z-score of the 95th percentile of a normal distribution
+_P95_Z_SCORE = 1.645
+
+
+class _ProviderStats:
+    __slots__ = ("calls", "error_rate", "latency_mean", "latency_var", "rate_limited_until", "samples")
+
+    def __init__(self):
+        self.latency_mean = 0.0
+        self.latency_var = 0.0
+        # Number of successful calls, used for latencies
+        self.samples = 0
+        self.error_rate = 0.0
+        # Number of calls, used for the error rate
+        self.calls = 0
+        self.rate_limited_until = 0.0
+
+
+class ProviderHealthTracker:
+    """Tracks the latency and errors of provider calls per (provider, config, model).
+
+    Latencies are tracked with an exponentially weighted mean and variance, from which a p95
+    is estimated. Error rates are exponentially weighted as well and a rate limit error puts the
+    config in a cool down period. The tracker is process local and only used to order providers,
+    it never excludes a provider."""
+
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        min_samples: int = 5,
+        rate_limit_cooldown_seconds: float = 30,
+        max_error_rate: float = 0.5,
+        slow_factor: float = 2,
+        capacity: int = 1000,
+    ):
+        self._alpha = alpha
+        self._min_samples = min_samples
+        self._rate_limit_cooldown_seconds = rate_limit_cooldown_seconds
+        self._max_error_rate = max_error_rate
+        self._slow_factor = slow_factor
+        self._stats = LRUCache[ProviderHealthKey, _ProviderStats](capacity)
+
+    def _get_or_create(self, key: ProviderHealthKey) -> _ProviderStats:
+        try:
+            return self._stats[key]
+        except KeyError:
+            stats = _ProviderStats()
+            self._stats[key] = stats
+            return stats
+
+    def _keys(self, provider: Provider, config: str, model: Model) -> tuple[ProviderHealthKey, ProviderHealthKey]:
+        return (provider, config, model), (provider, None, model)
+
+    def record_success(self, provider: Provider, config: str, model: Model, duration_seconds: float):
+        for key in self._keys(provider, config, model):
+            stats = self._get_or_create(key)
+            if stats.samples == 0:
+                stats.latency_mean = duration_seconds
+            else:
+                # Incremental exponentially weighted mean and variance
+                diff = duration_seconds - stats.latency_mean
+                incr = self._alpha * diff
+                stats.latency_mean += incr
+                stats.latency_var = (1 - self._alpha) * (stats.latency_var + diff * incr)
+            stats.error_rate *= 1 - self._alpha
+            stats.samples += 1
+            stats.calls += 1
+
+    def record_error(self, provider: Provider, config: str, model: Model, code: str):
+        config_key, aggregate_key = self._keys(provider, config, model)
+        for key in (config_key, aggregate_key):
+            stats = self._get_or_create(key)
+            stats.error_rate = stats.error_rate * (1 - self._alpha) + self._alpha
+            stats.calls += 1
+        # Only the config is rate limited, other configs for the same provider can still be used
+        if code == "rate_limit":
+            self._get_or_create(config_key).rate_limited_until = time.monotonic() + self._rate_limit_cooldown_seconds
+
+    def p95_latency(self, key: ProviderHealthKey) -> float | None:
+        """The estimated 95th percentile of the latency in seconds, None if there is not enough data"""
+        stats = self._stats.peek(key)
+        if stats is None or stats.samples < self._min_samples:
+            return None
+        return stats.latency_mean + _P95_Z_SCORE * math.sqrt(stats.latency_var)
+
+    def is_degraded(self, key: ProviderHealthKey) -> bool:
+        stats = self._stats.peek(key)
+        if stats is None:
+            return False
+        if stats.rate_limited_until > time.monotonic():
+            return True
+        return stats.calls >= self._min_samples and stats.error_rate > self._max_error_rate
+
+    def order(self, items: Sequence[_T], key: Callable[[_T], ProviderHealthKey]) -> list[_T]:
+        """Stable sort that moves degraded providers last and slow providers, whose p95 is more than
+        slow_factor times the best p95, right before them. The original order is otherwise preserved"""
+        keys = [key(item) for item in items]
+        p95s = [self.p95_latency(k) for k in keys]
+        best_p95 = min((p for p in p95s if p is not None), default=None)
+
+        def _rank(idx: int) -> int:
+            if self.is_degraded(keys[idx]):
+                return 2
+            p95 = p95s[idx]
+            if best_p95 is not None and p95 is not None and p95 > best_p95 * self._slow_factor:
+                return 1
+            return 0
+
+        ranks = [_rank(i) for i in range(len(items))]
+        return [items[i] for i in sorted(range(len(items)), key=lambda i: ranks[i])]
+
+
+def _build_shared_provider_health() -> ProviderHealthTracker | None:
+    if os.environ.get("PROVIDER_HEALTH_ENABLED", "true") != "true":
+        return None
+    return ProviderHealthTracker(
+        rate_limit_cooldown_seconds=float(os.environ.get("PROVIDER_HEALTH_RATE_LIMIT_COOLDOWN_SECONDS", "30")),
+    )
+
+
+_shared_provider_health = _build_shared_provider_health()
+
+
+def shared_provider_health() -> ProviderHealthTracker | None:
+    return _shared_provider_health
@@ -0,0 +1,83 @@
+import pytest
+
+from core.domain.models import Model, Provider
+from core.runners.workflowai.provider_health import ProviderHealthTracker
+
+
+@pytest.fixture
+def tracker():
+    return ProviderHealthTracker(min_samples=3)
+
+
+_MODEL = Model.GPT_4O_MINI_2024_07_18
+
+
+class TestP95Latency:
+    def test_not_enough_samples(self, tracker: ProviderHealthTracker):
+        tracker.record_success(Provider.OPEN_AI, "config_1", _MODEL, 1)
+        tracker.record_success(Provider.OPEN_AI, "config_1", _MODEL, 1)
+        assert tracker.p95_latency((Provider.OPEN_AI, "config_1", _MODEL)) is None
+
+    def test_constant_latency(self, tracker: ProviderHealthTracker):
+        for _ in range(3):
+            tracker.record_success(Provider.OPEN_AI, "config_1", _MODEL, 2)
+        assert tracker.p95_latency((Provider.OPEN_AI, "config_1", _MODEL)) == pytest.approx(2)  # pyright: ignore [reportUnknownMemberType]
+        # The aggregate is updated as well
+        assert tracker.p95_latency((Provider.OPEN_AI, None, _MODEL)) == pytest.approx(2)  # pyright: ignore [reportUnknownMemberType]
+
+    def test_variance_increases_p95(self, tracker: ProviderHealthTracker):
+        for duration in (1, 3, 1, 3):
+            tracker.record_success(Provider.OPEN_AI, "config_1", _MODEL, duration)
+        p95 = tracker.p95_latency((Provider.OPEN_AI, "config_1", _MODEL))
+        assert p95 is not None
+        assert p95 > 2
+
+
+class TestIsDegraded:
+    def test_unknown(self, tracker: ProviderHealthTracker):
+        assert not tracker.is_degraded((Provider.OPEN_AI, "config_1", _MODEL))
+
+    def test_rate_limited(self, tracker: ProviderHealthTracker):
+        tracker.record_error(Provider.OPEN_AI, "config_1", _MODEL, "rate_limit")
+        assert tracker.is_degraded((Provider.OPEN_AI, "config_1", _MODEL))
+        # Only the config is rate limited
+        assert not tracker.is_degraded((Provider.OPEN_AI, "config_2", _MODEL))
+        assert not tracker.is_degraded((Provider.OPEN_AI, None, _MODEL))
+
+    def test_rate_limit_cooldown_expires(self):
+        tracker = ProviderHealthTracker(rate_limit_cooldown_seconds=0)
+        tracker.record_error(Provider.OPEN_AI, "config_1", _MODEL, "rate_limit")
+        assert not tracker.is_degraded((Provider.OPEN_AI, "config_1", _MODEL))
+
+    def test_error_rate(self):
+        tracker = ProviderHealthTracker(min_samples=3, alpha=0.5)
+        for _ in range(3):
+            tracker.record_error(Provider.OPEN_AI, "config_1", _MODEL, "unknown_provider_error")
+        assert tracker.is_degraded((Provider.OPEN_AI, "config_1", _MODEL))
+        assert tracker.is_degraded((Provider.OPEN_AI, None, _MODEL))
+
+        # Successes bring the error rate back down
+        for _ in range(3):
+            tracker.record_success(Provider.OPEN_AI, "config_1", _MODEL, 1)
+        assert not tracker.is_degraded((Provider.OPEN_AI, "config_1", _MODEL))
+
+
+class TestOrder:
+    def test_no_data_preserves_order(self, tracker: ProviderHealthTracker):
+        items = ["config_1", "config_2", "config_3"]
+        assert tracker.order(items, lambda c: (Provider.OPEN_AI, c, _MODEL)) == items
+
+    def test_degraded_and_slow_last(self, tracker: ProviderHealthTracker):
+        tracker.record_error(Provider.OPEN_AI, "config_1", _MODEL, "rate_limit")
+        for _ in range(3):
+            tracker.record_success(Provider.OPEN_AI, "config_2", _MODEL, 10)
+            tracker.record_success(Provider.OPEN_AI, "config_3", _MODEL, 1)
+
+        items = ["config_1", "config_2", "config_3", "config_4"]
+        assert tracker.order(items, lambda c: (Provider.OPEN_AI, c, _MODEL)) == [
+            # config_4 has no data so it is not considered slow
+            "config_3",
+            "config_4",
+            "config_2",
+            "config_1",
+        ]
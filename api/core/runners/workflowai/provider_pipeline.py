@@ -1,5 +1,8 @@
+import asyncio
+import copy
 import logging
 import random
+import time
 from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
 from typing import Any, Literal, NoReturn, Protocol
@@ -15,7 +18,9 @@ from core.domain.tenant_data import ProviderSettings
 from core.providers.base.abstract_provider import AbstractProvider
 from core.providers.base.provider_error import ProviderError, StructuredGenerationError
 from core.providers.base.provider_options import ProviderOptions
+from core.providers.base.rate_limit_budget import RateLimitBudget
 from core.providers.factory.abstract_provider_factory import AbstractProviderFactory
+from core.runners.workflowai.provider_health import ProviderHealthKey, ProviderHealthTracker
 from core.runners.workflowai.templates import TemplateName
 from core.runners.workflowai.workflowai_options import WorkflowAIRunnerOptions
 from core.utils.models.dumps import safe_dump_pydantic_model
@@ -58,6 +63,9 @@ class ProviderPipeline:
         builder: ProviderPipelineBuilder,
         typology: TaskTypology,
         use_fallback: Literal["auto", "never"] | list[Model] | None = None,
+        health: ProviderHealthTracker | None = None,
+        hedging: bool = False,
+        budget: RateLimitBudget | None = None,
     ):
         self._factory = factory
         self._options = options
@@ -71,6 +79,10 @@ class ProviderPipeline:
         self._has_used_model_fallback: bool = False
         self._model_fallback_disabled = use_fallback == "never"
         self._fallback_models = use_fallback if isinstance(use_fallback, list) else None
+        self._health = health
+        self.hedging = hedging
+        self._budget = budget
+        self._forked_error_count = 0
 
     @property
     def _retry_on_same_provider(self) -> bool:
@@ -145,10 +157,49 @@ class ProviderPipeline:
 
         return fallback_model_data
 
+    def fork(self) -> "ProviderPipeline":
+        """A copy of the pipeline for an attempt that runs concurrently with others. The errors and
+        structured generation state of the attempt are only reported to this pipeline via merge"""
+        forked = copy.copy(self)
+        forked.errors = list(self.errors)
+        forked._forked_error_count = len(self.errors)
+        forked._last_error_was_structured_generation = False
+        return forked
+
+    def merge(self, forked: "ProviderPipeline"):
+        """Reports the state of a forked pipeline whose attempt has finished"""
+        # Other attempts may have been merged since the fork so only the new errors are added
+        self.errors.extend(forked.errors[forked._forked_error_count :])
+        self._last_error_was_structured_generation |= forked._last_error_was_structured_generation
+
+    def hedge_delay(self, provider: AbstractProvider[Any, Any], model: Model) -> float | None:
+        """The delay in seconds after which a second provider should be started in parallel,
+        None if the request should not be hedged"""
+        if not self.hedging or not self._health or provider.is_custom_config:
+            # Hedging custom configs would double the spend on the user's keys
+            return None
+        return self._health.p95_latency(self._provider_health_key(provider, model))
+
+    def _record_health(
+        self,
+        provider: AbstractProvider[Any, Any],
+        model: Model | None,
+        start: float,
+        error: str | None,
+    ):
+        if not self._health or not model:
+            return
+        if error:
+            self._health.record_error(provider.name(), provider.config_key(), model, error)
+        else:
+            self._health.record_success(provider.name(), provider.config_key(), model, time.monotonic() - start)
+
     @contextmanager
-    def wrap_provider_call(self, provider: AbstractProvider[Any, Any]):
+    def wrap_provider_call(self, provider: AbstractProvider[Any, Any], model: Model | None = None):
+        start = time.monotonic()
         try:
             yield
+            self._record_health(provider, model, start, None)
         except StructuredGenerationError as e:
             self._last_error_was_structured_generation = True
             e.capture_if_needed()
@@ -159,6 +210,7 @@ class ProviderPipeline:
         except ProviderError as e:
             e.capture_if_needed()
             self.errors.append(e)
+            self._record_health(provider, model, start, e.code)
 
             if provider.is_custom_config:
                 # In case of custom configs, we always retry
@@ -206,7 +258,7 @@ class ProviderPipeline:
         model_data: FinalModelData,
         provider_type: Provider,
     ) -> Iterator[PipelineProviderData]:
-        providers = iter(providers)
+        providers = iter(self._order_by_health(providers, model_data.model))
         if provider_type not in _round_robin_similar_providers:
             # We yield the first provider first in order to max out quotas
             try:
@@ -221,12 +273,10 @@ class ProviderPipeline:
                 return
 
         # Then we shuffle the rest
-        shuffled = list(providers)
+        shuffled = self._shuffle_by_health(list(providers), model_data.model)
         if not shuffled:
             return
 
-        random.shuffle(shuffled)
-
         for provider in shuffled:
             # We can safely call _iter_with_structured_gen multiple times
             # if the structured generation fails the first time, the retries
@@ -237,6 +287,79 @@ class ProviderPipeline:
             if not self._retry_on_same_provider:
                 return
 
+    def _provider_health_key(self, provider: AbstractProvider[Any, Any], model: Model) -> ProviderHealthKey:
+        return (provider.name(), provider.config_key(), model)
+
+    def _is_budget_exhausted(self, provider: AbstractProvider[Any, Any], model: Model) -> bool:
+        return bool(self._budget and self._budget.is_exhausted(provider.rate_limit_budget_key(model)))
+
+    def _is_provider_type_exhausted(self, provider_type: Provider, model: Model) -> bool:
+        providers = list(self._factory.get_providers(provider_type))
+        return bool(providers) and all(self._is_budget_exhausted(p, model) for p in providers)
+
+    def _is_degraded(self, provider: AbstractProvider[Any, Any], model: Model) -> bool:
+        if self._health and self._health.is_degraded(self._provider_health_key(provider, model)):
+            return True
+        return self._is_budget_exhausted(provider, model)
+
+    async def wait_for_budget(self, provider: AbstractProvider[Any, Any], model: Model):
+        """Waits for the rate limit budget of the provider to refill if it is about to, and consumes a request.
+        Exhausted configs are only reached once all the others were tried so the request is sent anyway
+        when the refill is too far away."""
+        if not self._budget:
+            return
+        key = provider.rate_limit_budget_key(model)
+        delay = self._budget.refill_delay(key)
+        if delay > 0:
+            action = "delayed" if delay <= self._budget.max_delay_seconds else "sent_exhausted"
+            send_counter("provider_rate_limit_budget", action=action, provider=provider.name(), model=model)
+            if action == "delayed":
+                await asyncio.sleep(delay)
+        self._budget.consume(key)
+
+    def _order_by_health(
+        self,
+        providers: Iterable[AbstractProvider[Any, Any]],
+        model: Model,
+    ) -> Iterable[AbstractProvider[Any, Any]]:
+        """Moves the degraded or slow configs after the healthy ones and the configs with an exhausted
+        rate limit budget last, preserving the order otherwise"""
+        if self._health:
+            providers = self._health.order(list(providers), lambda p: self._provider_health_key(p, model))
+        if not self._budget:
+            return providers
+        available: list[AbstractProvider[Any, Any]] = []
+        exhausted: list[AbstractProvider[Any, Any]] = []
+        for provider in providers:
+            if self._is_budget_exhausted(provider, model):
+                send_counter(
+                    "provider_rate_limit_budget",
+                    action="deprioritized",
+                    provider=provider.name(),
+                    model=model,
+                )
+                exhausted.append(provider)
+            else:
+                available.append(provider)
+        return available + exhausted
+
+    def _shuffle_by_health(
+        self,
+        providers: list[AbstractProvider[Any, Any]],
+        model: Model,
+    ) -> list[AbstractProvider[Any, Any]]:
+        """Shuffles the providers while keeping the degraded or exhausted ones last"""
+        if not self._health and not self._budget:
+            random.shuffle(providers)
+            return providers
+        healthy: list[AbstractProvider[Any, Any]] = []
+        degraded: list[AbstractProvider[Any, Any]] = []
+        for provider in providers:
+            (degraded if self._is_degraded(provider, model) else healthy).append(provider)
+        random.shuffle(healthy)
+        random.shuffle(degraded)
+        return healthy + degraded
+
     def _build_custom_providers(self, configs: list[ProviderSettings]) -> Iterable[AbstractProvider[Any, Any]]:
         for config in configs:
             try:
@@ -271,8 +394,17 @@ class ProviderPipeline:
             )
             return
 
-        # Iterating over providers
-        for provider, provider_data in self.model_data.providers:
+        # Iterating over providers, the least healthy last
+        model_providers = self.model_data.providers
+        if self._health:
+            model_providers = self._health.order(model_providers, lambda p: (p[0], None, self.model_data.model))
+        if self._budget:
+            # Provider types for which every config is exhausted go last
+            model_providers = sorted(
+                model_providers,
+                key=lambda p: self._is_provider_type_exhausted(p[0], self.model_data.model),
+            )
+        for provider, provider_data in model_providers:
             # We only use the override for the default pipeline
             # We assume that
             provider_model_data = provider_data.override(self.model_data)
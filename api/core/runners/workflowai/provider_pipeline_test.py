@@ -20,8 +20,10 @@ from core.providers.base.provider_error import (
     ProviderRateLimitError,
     UnknownProviderError,
 )
+from core.providers.base.rate_limit_budget import RateLimitBudget
 from core.providers.factory.abstract_provider_factory import AbstractProviderFactory
 from core.providers.factory.local_provider_factory import LocalProviderFactory
+from core.runners.workflowai.provider_health import ProviderHealthTracker
 from core.runners.workflowai.provider_pipeline import ProviderPipeline, ProviderPipelineBuilder
 from core.runners.workflowai.workflowai_options import WorkflowAIRunnerOptions
 from tests import models as test_models
@@ -150,6 +152,65 @@ class TestProviderIterator:
         provider_2 = provider_builder.call_args_list[1].args[0]
         assert provider_2 == mock_provider2
 
+    def test_forced_provider_degraded_config_last(self, provider_builder: Mock):
+        mock_provider_factory = Mock(spec=AbstractProviderFactory)
+        mock_provider1 = _mock_provider(Provider.OPEN_AI)
+        mock_provider1.config_key.return_value = "config_1"
+        mock_provider2 = _mock_provider(Provider.OPEN_AI)
+        mock_provider2.config_key.return_value = "config_2"
+        mock_provider_factory.get_providers.return_value = [mock_provider1, mock_provider2]
+
+        health = ProviderHealthTracker()
+        health.record_error(Provider.OPEN_AI, "config_1", Model.GPT_4O_MINI_2024_07_18, "rate_limit")
+
+        pipeline = ProviderPipeline(
+            options=WorkflowAIRunnerOptions(
+                model=Model.GPT_4O_MINI_2024_07_18,
+                provider=Provider.OPEN_AI,
+                is_structured_generation_enabled=None,
+                instructions="",
+            ),
+            custom_configs=None,
+            builder=provider_builder,
+            factory=mock_provider_factory,
+            typology=TaskTypology(),
+            health=health,
+        )
+
+        pipeline.errors = [ProviderRateLimitError()]
+        providers = [p for p, _, _, _ in pipeline.provider_iterator()]
+        # The rate limited config is tried last
+        assert providers == [mock_provider2, mock_provider1]
+
+    async def test_forced_provider_exhausted_budget_last(self, provider_builder: Mock):
+        mock_provider_factory = Mock(spec=AbstractProviderFactory)
+        mock_provider1 = _mock_provider(Provider.OPEN_AI)
+        mock_provider1.rate_limit_budget_key.return_value = ("openai", "config_1", "gpt-4o-mini")
+        mock_provider2 = _mock_provider(Provider.OPEN_AI)
+        mock_provider2.rate_limit_budget_key.return_value = ("openai", "config_2", "gpt-4o-mini")
+        mock_provider_factory.get_providers.return_value = [mock_provider1, mock_provider2]
+
+        budget = RateLimitBudget(redis_client=None)
+        await budget.observe(("openai", "config_1", "gpt-4o-mini"), "requests", remaining=0, total=100)
+
+        pipeline = ProviderPipeline(
+            options=WorkflowAIRunnerOptions(
+                model=Model.GPT_4O_MINI_2024_07_18,
+                provider=Provider.OPEN_AI,
+                is_structured_generation_enabled=None,
+                instructions="",
+            ),
+            custom_configs=None,
+            builder=provider_builder,
+            factory=mock_provider_factory,
+            typology=TaskTypology(),
+            budget=budget,
+        )
+
+        pipeline.errors = [ProviderRateLimitError()]
+        providers = [p for p, _, _, _ in pipeline.provider_iterator()]
+        assert providers == [mock_provider2, mock_provider1]
+
     @patch("random.shuffle")
     def test_round_robin_providers(
         self,
@@ -453,3 +514,102 @@ class TestProviderIterator:
             (Provider.ANTHROPIC, Model.CLAUDE_4_OPUS_20250514),
         ]
         mock_provider1.complete.assert_not_called()
+
+
+class TestHedgeDelay:
+    def _pipeline(self, provider_builder: Mock, health: ProviderHealthTracker | None, hedging: bool):
+        return ProviderPipeline(
+            options=WorkflowAIRunnerOptions(
+                model=Model.GPT_4O_MINI_2024_07_18,
+                provider=None,
+                is_structured_generation_enabled=None,
+                instructions="",
+            ),
+            custom_configs=None,
+            builder=provider_builder,
+            factory=LocalProviderFactory(),
+            typology=TaskTypology(),
+            health=health,
+            hedging=hedging,
+        )
+
+    def _provider(self, is_custom_config: bool = False):
+        provider = _mock_provider(Provider.OPEN_AI)
+        provider.config_key.return_value = "config_1"
+        provider.is_custom_config = is_custom_config
+        return provider
+
+    @pytest.fixture
+    def health(self):
+        health = ProviderHealthTracker(min_samples=1)
+        health.record_success(Provider.OPEN_AI, "config_1", Model.GPT_4O_MINI_2024_07_18, 2)
+        return health
+
+    def test_hedge_delay(self, provider_builder: Mock, health: ProviderHealthTracker):
+        pipeline = self._pipeline(provider_builder, health, hedging=True)
+        assert pipeline.hedge_delay(self._provider(), Model.GPT_4O_MINI_2024_07_18) == pytest.approx(2)  # pyright: ignore [reportUnknownMemberType]
+
+    def test_no_hedging(self, provider_builder: Mock, health: ProviderHealthTracker):
+        pipeline = self._pipeline(provider_builder, health, hedging=False)
+        assert pipeline.hedge_delay(self._provider(), Model.GPT_4O_MINI_2024_07_18) is None
+
+    def test_custom_config_not_hedged(self, provider_builder: Mock, health: ProviderHealthTracker):
+        pipeline = self._pipeline(provider_builder, health, hedging=True)
+        assert pipeline.hedge_delay(self._provider(is_custom_config=True), Model.GPT_4O_MINI_2024_07_18) is None
+
+    def test_records_health(self, provider_builder: Mock):
+        health = ProviderHealthTracker(min_samples=1)
+        pipeline = self._pipeline(provider_builder, health, hedging=True)
+        provider = self._provider()
+
+        with pipeline.wrap_provider_call(provider, Model.GPT_4O_MINI_2024_07_18):
+            pass
+        assert health.p95_latency((Provider.OPEN_AI, "config_1", Model.GPT_4O_MINI_2024_07_18)) is not None
+
+        with pipeline.wrap_provider_call(provider, Model.GPT_4O_MINI_2024_07_18):
+            raise ProviderRateLimitError()
+        assert health.is_degraded((Provider.OPEN_AI, "config_1", Model.GPT_4O_MINI_2024_07_18))
+
+
+class TestWaitForBudget:
+    def _pipeline(self, provider_builder: Mock, budget: RateLimitBudget):
+        return ProviderPipeline(
+            options=WorkflowAIRunnerOptions(
+                model=Model.GPT_4O_MINI_2024_07_18,
+                provider=None,
+                is_structured_generation_enabled=None,
+                instructions="",
+            ),
+            custom_configs=None,
+            builder=provider_builder,
+            factory=LocalProviderFactory(),
+            typology=TaskTypology(),
+            budget=budget,
+        )
+
+    @pytest.fixture
+    def provider(self):
+        provider = _mock_provider(Provider.OPEN_AI)
+        provider.rate_limit_budget_key.return_value = ("openai", "config_1", "gpt-4o-mini")
+        return provider
+
+    @patch("asyncio.sleep")
+    async def test_delayed_when_refill_is_close(self, mock_sleep: Mock, provider_builder: Mock, provider: Mock):
+        budget = RateLimitBudget(redis_client=None, max_delay_seconds=1)
+        # 1 request every 0.6 seconds
+        await budget.observe(("openai", "config_1", "gpt-4o-mini"), "requests", remaining=0, total=100)
+        pipeline = self._pipeline(provider_builder, budget)
+
+        await pipeline.wait_for_budget(provider, Model.GPT_4O_MINI_2024_07_18)
+        mock_sleep.assert_awaited_once()
+        assert 0 < mock_sleep.call_args.args[0] <= 0.6
+
+    @patch("asyncio.sleep")
+    async def test_not_delayed_when_refill_is_far(self, mock_sleep: Mock, provider_builder: Mock, provider: Mock):
+        budget = RateLimitBudget(redis_client=None, max_delay_seconds=1)
+        # 1 request every 6 seconds
+        await budget.observe(("openai", "config_1", "gpt-4o-mini"), "requests", remaining=0, total=10)
+        pipeline = self._pipeline(provider_builder, budget)
+
+        await pipeline.wait_for_budget(provider, Model.GPT_4O_MINI_2024_07_18)
+        mock_sleep.assert_not_called()
@@ -1,9 +1,11 @@
 import asyncio
 import base64
 import copy
+import io
 import logging
-from io import BytesIO
-from typing import Any, cast
+import os
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, NamedTuple, cast
 
 import httpx
 from pydantic import ValidationError
@@ -26,7 +28,9 @@ from core.runners.workflowai.internal_tool import InternalTool
 from core.tools import ToolKind
 from core.utils.dicts import set_at_keypath
 from core.utils.file_utils.file_utils import guess_content_type
+from core.utils.file_utils.pdf_rasterizer import shared_pdf_rasterizer
 from core.utils.iter_utils import safe_map_optional
+from core.utils.lru.lru_cache import LRUCache
 from core.utils.schema_sanitation import get_file_format
 from core.utils.schemas import JsonSchema
 from core.utils.strings import clean_unicode_chars
@@ -232,15 +236,83 @@ def assign_files(schema: dict[str, Any], files: list[File], output: AgentOutput)
     return files
 
 
-_download_client = httpx.AsyncClient()
+_MAX_DOWNLOAD_SIZE = int(os.environ.get("FILE_DOWNLOAD_MAX_SIZE_BYTES", str(100 * 1024 * 1024)))
+# Downloaded files are kept in memory up to this size and then spooled to disk
+_DOWNLOAD_SPOOL_SIZE = 5 * 1024 * 1024
+# A multiple of 3 so that base64 encoded chunks can be concatenated
+_BASE64_CHUNK_SIZE = 3 * 256 * 1024
+
+_download_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(float(os.environ.get("FILE_DOWNLOAD_TIMEOUT_SECONDS", "60")), connect=10),
+    limits=httpx.Limits(max_connections=int(os.environ.get("FILE_DOWNLOAD_MAX_CONNECTIONS", "100"))),
+)
+_max_concurrent_downloads_per_host = int(os.environ.get("FILE_DOWNLOAD_MAX_CONCURRENT_PER_HOST", "10"))
+_host_semaphores = LRUCache[str, asyncio.Semaphore](1000)
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = httpx.URL(url).host
+    try:
+        return _host_semaphores[host]
+    except KeyError:
+        semaphore = asyncio.Semaphore(_max_concurrent_downloads_per_host)
+        _host_semaphores[host] = semaphore
+        return semaphore
+
+
+def _file_too_large(url: str, size: int):
+    return InvalidFileError(
+        f"File is too large, the maximum size is {_MAX_DOWNLOAD_SIZE} bytes",
+        file_url=url,
+        details={"size": size},
+        capture=False,
+    )
 
 
-async def _fetch_file_with_retries(url: str, retries: int = 2) -> httpx.Response:
+async def _spool_response(url: str, response: httpx.Response) -> SpooledTemporaryFile[bytes]:
+    if (content_length := response.headers.get("content-length")) and int(content_length) > _MAX_DOWNLOAD_SIZE:
+        raise _file_too_large(url, int(content_length))
+
+    spooled = SpooledTemporaryFile[bytes](max_size=_DOWNLOAD_SPOOL_SIZE)
+    try:
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > _MAX_DOWNLOAD_SIZE:
+                raise _file_too_large(url, size)
+            if size > _DOWNLOAD_SPOOL_SIZE:
+                # The file has rolled over to disk so writing could block the event loop
+                await asyncio.to_thread(spooled.write, chunk)
+            else:
+                spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+
+class _Download(NamedTuple):
+    response: httpx.Response
+    # Only set for successful responses, must be closed by the caller
+    body: SpooledTemporaryFile[bytes] | None
+
+
+async def _fetch_file_with_retries(
+    url: str,
+    retries: int = 2,
+    headers: dict[str, str] | None = None,
+) -> _Download:
     try:
-        return await _download_client.get(url)
+        async with _host_semaphore(url), _download_client.stream("GET", url, headers=headers) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return _Download(response, None)
+            return _Download(response, await _spool_response(url, response))
     except (
         httpx.ConnectTimeout,
         httpx.ReadTimeout,
+        httpx.PoolTimeout,
         httpx.ReadError,
         httpx.ConnectError,
         httpx.RemoteProtocolError,
@@ -250,30 +322,68 @@ async def _fetch_file_with_retries(url: str, retries: int = 2) -> httpx.Response
                 f"Failed to download file: {e}",
                 capture=False,
             )
-        return await _fetch_file_with_retries(url, retries - 1)
+        return await _fetch_file_with_retries(url, retries - 1, headers)
 
 
-async def download_file(file: File):
-    if not file.url:
-        raise InvalidFileError("File url is required when data is not provided")
-
-    response = await _fetch_file_with_retries(file.url)
-
-    if response.status_code != 200:
+def _raise_for_file_status(url: str, download: _Download) -> SpooledTemporaryFile[bytes]:
+    if download.body is None:
         raise InvalidFileError(
-            f"Failed to file image: {response.status_code}",
-            file_url=file.url,
-            details={"response_status_code": response.status_code, "response_body": response.text},
+            f"Failed to file image: {download.response.status_code}",
+            file_url=url,
+            details={"response_status_code": download.response.status_code, "response_body": download.response.text},
         )
+    return download.body
+
+
+class FetchedFile(NamedTuple):
+    content: bytes
+    etag: str | None
+
+
+async def fetch_file(url: str, if_none_match: str | None = None) -> FetchedFile | None:
+    """Downloads the content of a file. When if_none_match is provided and the remote file still has
+    the same ETag, None is returned and the content is not downloaded"""
+    download = await _fetch_file_with_retries(
+        url,
+        headers={"If-None-Match": if_none_match} if if_none_match else None,
+    )
+    if if_none_match and download.response.status_code == 304:
+        return None
+
+    with _raise_for_file_status(url, download) as body:
+        return FetchedFile(content=body.read(), etag=download.response.headers.get("etag"))
 
-    file.data = base64.b64encode(response.content).decode("utf-8")
 
+def _guess_file_content_type(file: File, header: bytes):
     if file.content_type is None:
-        file.content_type = guess_content_type(response.content)
+        file.content_type = guess_content_type(header)
         if file.content_type is None:
             _logger.warning("Could not guess content type of url", extra={"url": file.url})
 
-    return response.content
+
+def assign_file_content(file: File, content: bytes):
+    file.data = base64.b64encode(content).decode("utf-8")
+    _guess_file_content_type(file, content)
+
+
+def _b64encode_file(f: IO[bytes]) -> str:
+    # Encoding by chunks avoids holding the raw content and its encoded copy in memory at the same time
+    encoded = io.StringIO()
+    for chunk in iter(lambda: f.read(_BASE64_CHUNK_SIZE), b""):
+        encoded.write(base64.b64encode(chunk).decode("utf-8"))
+    return encoded.getvalue()
+
+
+async def download_file(file: File):
+    if not file.url:
+        raise InvalidFileError("File url is required when data is not provided")
+
+    download = await _fetch_file_with_retries(file.url)
+    with _raise_for_file_status(file.url, download) as body:
+        # Signatures used to guess content types are all in the first bytes
+        _guess_file_content_type(file, body.read(512))
+        body.seek(0)
+        file.data = _b64encode_file(body)
 
 
 def sanitize_model_and_provider(model_str: str | None, provider_str: str | None) -> tuple[Model, Provider | None]:
@@ -329,31 +439,15 @@ def split_tools(
 async def convert_pdf_to_images(pdf_file: FileWithKeyPath) -> list[FileWithKeyPath]:
     # No need to wrap in a try-except block
     # The error will be caught upstream
-    from pdf2image import convert_from_bytes  # pyright: ignore[reportUnknownVariableType]
-    from PIL import Image
-
     if not pdf_file.data:
-        pdf_data = await download_file(pdf_file)
-    else:
-        pdf_data = base64.b64decode(pdf_file.data)
-
-    images = await asyncio.to_thread(convert_from_bytes, pdf_file=pdf_data, fmt="jpg", dpi=150)  # pyright: ignore[reportUnknownArgumentType]
-
-    def _map(image: Image.Image, idx: int):
-        # Convert PIL Image to bytes and encode as base64
-        buffer = BytesIO()
-        image.save(
-            buffer,
-            format="JPEG",
-            quality=60,
-            optimize=True,
-            progressive=True,
-        )
-        image_bytes = buffer.getvalue()
-        image_base64 = base64.b64encode(image_bytes).decode("utf-8")
-        return FileWithKeyPath(data=image_base64, content_type="image/jpeg", key_path=pdf_file.key_path + [idx])
-
-    return [_map(image, i) for i, image in enumerate(images)]
+        await download_file(pdf_file)
+    pdf_data = base64.b64decode(pdf_file.data or "")
+
+    pages = await shared_pdf_rasterizer().to_images(pdf_data, dpi=150)
+    return [
+        FileWithKeyPath(data=page, content_type="image/jpeg", key_path=pdf_file.key_path + [idx])
+        for idx, page in enumerate(pages)
+    ]
 
 
 def cleanup_provider_json(obj: Any) -> Any:
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import json
 from logging import Logger
@@ -408,6 +409,36 @@ class TestDownloadImage:
         await download_file(image)
         assert image.content_type == "image/webp"
 
+    async def test_download_large_file(self, httpx_mock: HTTPXMock):
+        # Bigger than the base64 chunk size and not a multiple of 3
+        content = bytes(range(256)) * 4000 + b"1"
+        httpx_mock.add_response(status_code=200, content=content)
+
+        file = File(url="https://bla.com/file")
+        await download_file(file)
+        assert file.data == base64.b64encode(content).decode()
+
+    async def test_download_rolled_over_file(self, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(status_code=200, content=b"hello world")
+
+        file = File(url="https://bla.com/file")
+        with (
+            patch("core.runners.workflowai.utils._DOWNLOAD_SPOOL_SIZE", 10),
+            patch("asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread,
+        ):
+            await download_file(file)
+        # Writes to the file on disk are made in a thread
+        mock_to_thread.assert_awaited_once()
+        assert file.data == base64.b64encode(b"hello world").decode()
+
+    @pytest.mark.parametrize("headers", [{"Content-Length": "11"}, {}])
+    async def test_download_file_too_large(self, httpx_mock: HTTPXMock, headers: dict[str, str]):
+        httpx_mock.add_response(status_code=200, stream=httpx.ByteStream(b"hello world"), headers=headers)
+
+        with patch("core.runners.workflowai.utils._MAX_DOWNLOAD_SIZE", 10):
+            with pytest.raises(InvalidFileError, match="File is too large"):
+                await download_file(File(url="https://bla.com/file"))
+
 
 async def test_retry_download_file(httpx_mock: HTTPXMock):
     httpx_mock.add_exception(httpx.ConnectTimeout("Test exception"), is_reusable=True)
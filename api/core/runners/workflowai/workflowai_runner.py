@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import os
 import re
 import time
 from collections.abc import Sequence
@@ -48,12 +49,17 @@ from core.providers.base.provider_error import (
     MaxToolCallIterationError,
     ModelDoesNotSupportMode,
 )
-from core.providers.base.provider_options import ProviderOptions
+from core.providers.base.provider_options import ProviderOptions, StreamEmissionPolicy
+from core.providers.base.rate_limit_budget import shared_rate_limit_budget
 from core.runners.abstract_runner import AbstractRunner, CacheFetcher
-from core.runners.workflowai.internal_tool import build_all_internal_tools
+from core.runners.builder_context import AttemptBuilder, builder_context
+from core.runners.single_flight import RunSingleFlight
+from core.runners.workflowai.internal_tool import InternalTool, build_all_internal_tools
 from core.runners.workflowai.message_builder import MessageBuilder
 from core.runners.workflowai.message_fixer import MessageAutofixer
-from core.runners.workflowai.provider_pipeline import ProviderPipeline
+from core.runners.workflowai.prepared_prompt_cache import shared_prepared_prompt_cache
+from core.runners.workflowai.provider_health import shared_provider_health
+from core.runners.workflowai.provider_pipeline import PipelineProviderData, ProviderPipeline
 from core.runners.workflowai.templates import (
     TemplateName,
     get_template_content,
@@ -111,6 +117,24 @@ class PreparedOutputSchema(NamedTuple):
         return self.prepared_schema is None or not self.prepared_schema.get("properties", {})
 
 
+class PreparedVariant(NamedTuple):
+    output_schema: PreparedOutputSchema
+    enabled_internal_tools: dict[str, InternalTool]
+    external_tools: dict[str, Tool]
+
+
+class HedgedAttempt(NamedTuple):
+    provider_data: PipelineProviderData
+    pipeline: ProviderPipeline
+    builder: AttemptBuilder | None
+    output: RunOutput | None
+
+    def merge(self, pipeline: ProviderPipeline):
+        pipeline.merge(self.pipeline)
+        if self.builder:
+            self.builder.merge()
+
+
 class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
     """
     A runner that generates a prompt based on:
@@ -125,10 +149,19 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
     # TODO: this should be injected
     provider_factory = shared_provider_factory()
 
+    provider_health = shared_provider_health()
+    rate_limit_budget = shared_rate_limit_budget()
+    # Hedging is opt-in since a hedged request can be billed twice
+    hedging_enabled = os.environ.get("PROVIDER_HEDGING_ENABLED") == "true"
+    # Deployment wide, configured through the environment
+    stream_emission_policy = StreamEmissionPolicy.from_env()
+
     internal_tools = build_all_internal_tools()
 
     template_manager = TemplateManager()
 
+    prepared_prompt_cache = shared_prepared_prompt_cache()
+
     def __init__(
         self,
         task: SerializableTaskVariant,
@@ -141,6 +174,7 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
         # TODO: this is not set anywhere for now
         timeout: float | None = None,
         use_fallback: Literal["auto", "never"] | list[Model] | None = None,
+        single_flight: RunSingleFlight | None = None,
     ):
         super().__init__(
             task=task,
@@ -148,6 +182,7 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
             options=options,
             cache_fetcher=cache_fetcher,
             metadata=metadata,
+            single_flight=single_flight,
         )
 
         if self._options.provider:
@@ -162,21 +197,35 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
         # For external tools we still use a cache to ensure the unicity of tool calls
         # Even though we won't cache the result
         self._external_tool_cache = ToolCache()
-        self._enabled_internal_tools, self._external_tools = split_tools(
+        self._typology = self.task.typology()
+        # Variants that are not stored yet do not have an id and are never cached
+        self._prepared_prompt_key = (self.task.id, self.properties.model_hash()) if self.task.id else None
+        prepared_variant = self._cached_prompt_part(("variant",), self._prepare_variant)
+        self._prepared_output_schema = prepared_variant.output_schema
+        # Tool dicts are copied since they are shared with other runners
+        self._enabled_internal_tools = dict(prepared_variant.enabled_internal_tools)
+        self._external_tools = dict(prepared_variant.external_tools)
+        self._timeout = timeout
+        # Not sure why pyright looses the literal if not specified here
+        self._use_fallback: Literal["auto", "never"] | list[Model] | None = use_fallback
+
+    def _cached_prompt_part(self, key: tuple[Any, ...], build: Callable[[], T]) -> T:
+        if not self.prepared_prompt_cache or not self._prepared_prompt_key:
+            return build()
+        return self.prepared_prompt_cache.get_or_build((*self._prepared_prompt_key, *key), build)
+
+    def _prepare_variant(self) -> PreparedVariant:
+        enabled_internal_tools, external_tools = split_tools(
             self.internal_tools,
             self.properties.enabled_tools,
         )
-
-        self._typology = self.task.typology()
-        self._prepared_output_schema = self._prepare_output_schema(
+        prepared_output_schema = self._prepare_output_schema(
             self.task.output_schema,
             self.properties.is_chain_of_thought_enabled or False,
             self.is_tool_use_enabled,
             self._typology,
         )
-        self._timeout = timeout
-        # Not sure why pyright looses the literal if not specified here
-        self._use_fallback: Literal["auto", "never"] | list[Model] | None = use_fallback
+        return PreparedVariant(prepared_output_schema, enabled_internal_tools, external_tools)
 
     @override
     def version(self) -> str:
@@ -679,21 +728,39 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
             has_inlined_files,
         )
 
-        system_template = template_config.system_template
-        if user_message_content.should_remove_input_schema:
-            # when the input schema only contains one file property, we do not need t the input schema in the system template without input schema
-            system_template = get_template_without_input_schema(template_name).system_template
+        def _system_message() -> str:
+            system_template = template_config.system_template
+            if user_message_content.should_remove_input_schema:
+                # when the input schema only contains one file property, we do not need t the input schema in the system template without input schema
+                system_template = get_template_without_input_schema(template_name).system_template
+
+            return self._system_message_content(
+                template=system_template,
+                instructions=instructions or "",
+                input_schema=input_schema,
+                output_schema=self._prepared_output_schema.prepared_schema
+                if not self._prepared_output_schema.no_schema
+                else None,
+            )
+
+        if self._options.has_templated_instructions or keys_to_remove1:
+            # The instructions or the input schema depend on the input
+            system_message = _system_message()
+        else:
+            system_message = self._cached_prompt_part(
+                (
+                    "system_message",
+                    template_name,
+                    use_structured_output,
+                    type(provider),
+                    user_message_content.should_remove_input_schema,
+                ),
+                _system_message,
+            )
 
         messages = [
             MessageDeprecated(
-                content=self._system_message_content(
-                    template=system_template,
-                    instructions=instructions or "",
-                    input_schema=input_schema,
-                    output_schema=self._prepared_output_schema.prepared_schema
-                    if not self._prepared_output_schema.no_schema
-                    else None,
-                ),
+                content=system_message,
                 role=MessageDeprecated.Role.SYSTEM,
                 image_options=image_options,
             ),
@@ -1056,6 +1123,7 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
             structured_generation=is_structured_generation_enabled,
             tenant=self.task.tenant,
             stream_deltas=self._stream_deltas,
+            stream_emission=self.stream_emission_policy,
             top_p=self._options.top_p,
             presence_penalty=self._options.presence_penalty,
             frequency_penalty=self._options.frequency_penalty,
@@ -1280,6 +1348,10 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
             builder=self._build_provider_data,
             typology=self._typology,
             use_fallback=self._use_fallback,
+            health=self.provider_health,
+            # Tools can have side effects so runs that use them are never hedged
+            hedging=self.hedging_enabled and not self.is_tool_use_enabled,
+            budget=self.rate_limit_budget,
         )
 
         if pipeline.model_data.model != self._options.model:
@@ -1287,19 +1359,96 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
 
         return pipeline
 
+    async def _attempt_provider(
+        self,
+        pipeline: ProviderPipeline,
+        provider_data: PipelineProviderData,
+        input: AgentInput | Messages,
+    ) -> RunOutput | None:
+        """Returns None when the pipeline swallowed the error and the next provider should be tried"""
+        provider, template_name, options, model_data = provider_data
+        self._append_metadata(METADATA_KEY_USED_PROVIDERS, provider.name())
+        self._set_metadata(METADATA_KEY_PROVIDER_NAME, provider.name())
+        with pipeline.wrap_provider_call(provider, options.model):
+            messages = await self._build_messages(template_name, input, provider, model_data)
+            await pipeline.wait_for_budget(provider, options.model)
+            return await self._build_task_output_from_messages(provider, options, messages)
+        return None
+
+    async def _hedged_attempt(
+        self,
+        pipeline: ProviderPipeline,
+        provider_data: PipelineProviderData,
+        input: AgentInput | Messages,
+    ) -> HedgedAttempt:
+        """Runs an attempt with its own pipeline state and completions. The state of attempts that finish
+        without an output is merged right away, the winner's is merged by _race_attempts and the state
+        of cancelled attempts is dropped"""
+        forked = pipeline.fork()
+        builder = AttemptBuilder(parent) if (parent := self._get_builder_context()) else None
+        if builder:
+            # Attempts run in their own task so the builder is only set for this attempt
+            builder_context.set(builder)
+        try:
+            output = await self._attempt_provider(forked, provider_data, input)
+        except Exception:
+            HedgedAttempt(provider_data, forked, builder, None).merge(pipeline)
+            raise
+        attempt = HedgedAttempt(provider_data, forked, builder, output)
+        if output is None:
+            attempt.merge(pipeline)
+        return attempt
+
+    async def _race_attempts(
+        self,
+        pipeline: ProviderPipeline,
+        attempts: set[asyncio.Task[HedgedAttempt]],
+    ) -> RunOutput | None:
+        """Returns the first successful output and cancels the other attempts"""
+        try:
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                # Raises if the pipeline decided to stop
+                results = [attempt.result() for attempt in done]
+                if winner := next((r for r in results if r.output is not None), None):
+                    # Merged last so that the winner's completion is the last one of the run
+                    winner.merge(pipeline)
+                    self._set_metadata(METADATA_KEY_PROVIDER_NAME, winner.provider_data[0].name())
+                    return winner.output
+            return None
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def _hedged_build_task_output(self, pipeline: ProviderPipeline, input: AgentInput | Messages) -> RunOutput:
+        """Starts the next provider in the pipeline in parallel when the current one takes longer than
+        its estimated p95 latency, and returns the output of the first one to succeed"""
+        # Not raising from the iterator since it could happen while an attempt is still running
+        iterator = pipeline.provider_iterator(raise_at_end=False)
+        for provider_data in iterator:
+            attempts = {asyncio.create_task(self._hedged_attempt(pipeline, provider_data, input))}
+            delay = pipeline.hedge_delay(provider_data[0], provider_data[2].model)
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if not done and (hedge_data := next(iterator, None)) is not None:
+                    attempts.add(asyncio.create_task(self._hedged_attempt(pipeline, hedge_data, input)))
+            if (output := await self._race_attempts(pipeline, attempts)) is not None:
+                return output
+
+        return pipeline.raise_on_end(self.task.task_id)
+
     @override
     async def _build_task_output(self, input: AgentInput | Messages) -> RunOutput:
         """
         Calls _build_task_output_from_messages with the messages generated _build_messages
         """
         pipeline = self._build_pipeline()
+        if pipeline.hedging:
+            return await self._hedged_build_task_output(pipeline, input)
 
-        for provider, template_name, options, model_data in pipeline.provider_iterator():
-            self._append_metadata(METADATA_KEY_USED_PROVIDERS, provider.name())
-            self._set_metadata(METADATA_KEY_PROVIDER_NAME, provider.name())
-            with pipeline.wrap_provider_call(provider):
-                messages = await self._build_messages(template_name, input, provider, model_data)
-                return await self._build_task_output_from_messages(provider, options, messages)
+        for provider_data in pipeline.provider_iterator():
+            if (output := await self._attempt_provider(pipeline, provider_data, input)) is not None:
+                return output
 
         return pipeline.raise_on_end(self.task.task_id)
 
@@ -1313,8 +1462,9 @@ class WorkflowAIRunner(AbstractRunner[WorkflowAIRunnerOptions]):
             self._append_metadata(METADATA_KEY_USED_PROVIDERS, provider.name())
             self._set_metadata(METADATA_KEY_PROVIDER_NAME, provider.name())
 
-            with pipeline.wrap_provider_call(provider):
+            with pipeline.wrap_provider_call(provider, options.model):
                 messages = await self._build_messages(template_name, input, provider, model_data)
+                await pipeline.wait_for_budget(provider, options.model)
                 async for o in self._stream_task_output_from_messages(
                     provider,
                     options,
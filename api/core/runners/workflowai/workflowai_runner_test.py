@@ -1,5 +1,6 @@
 # pyright: reportPrivateUsage=false
 
+import asyncio
 import json
 import re
 from collections.abc import Awaitable, Callable
@@ -19,6 +20,8 @@ from core.domain.errors import (
 from core.domain.fields.file import File
 from core.domain.fields.image_options import ImageOptions
 from core.domain.fields.internal_reasoning_steps import InternalReasoningStep
+from core.domain.llm_completion import LLMCompletion
+from core.domain.llm_usage import LLMUsage
 from core.domain.message import Message, MessageContent, MessageDeprecated, Messages
 from core.domain.metrics import Metric
 from core.domain.models import Model, Provider
@@ -42,7 +45,10 @@ from core.providers.base.provider_error import (
     StructuredGenerationError,
 )
 from core.providers.base.provider_options import ProviderOptions
+from core.runners.builder_context import BuilderInterface, builder_context
 from core.runners.workflowai.internal_tool import InternalTool
+from core.runners.workflowai.prepared_prompt_cache import PreparedPromptCache
+from core.runners.workflowai.provider_health import ProviderHealthTracker
 from core.runners.workflowai.templates import TemplateName
 from core.runners.workflowai.utils import FileWithKeyPath, ToolCallRecursionError
 from core.runners.workflowai.workflowai_options import WorkflowAIRunnerOptions
@@ -1437,6 +1443,75 @@ class TestInit:
         assert runner.properties.model == Model.GPT_4O_LATEST  # pyright: ignore[reportPrivateUsage]
 
 
+class TestPreparedPromptCache:
+    @pytest.fixture()
+    def prepared_prompt_cache(self):
+        with patch.object(WorkflowAIRunner, "prepared_prompt_cache", new=PreparedPromptCache(10)) as cache:
+            yield cache
+
+    async def test_prompt_parts_are_shared_between_runners(
+        self,
+        prepared_prompt_cache: PreparedPromptCache,
+        mock_provider: Mock,
+        model_data: ModelData,
+    ):
+        task = test_models.task_variant()
+        runner1 = _build_runner(task=task)
+        runner2 = _build_runner(task=task)
+        assert runner1._prepared_output_schema is runner2._prepared_output_schema
+
+        with patch.object(WorkflowAIRunner, "_system_message_content", return_value="system") as mock_system_message:
+            messages1 = await runner1._build_messages(
+                TemplateName.V2_DEFAULT,
+                {"input": "hello"},
+                mock_provider,
+                model_data,
+            )
+            messages2 = await runner2._build_messages(
+                TemplateName.V2_DEFAULT,
+                {"input": "world"},
+                mock_provider,
+                model_data,
+            )
+
+        mock_system_message.assert_called_once()
+        assert messages1[0].content == messages2[0].content == "system"
+        # The user message is still built for each input
+        assert messages1[1].content != messages2[1].content
+
+    async def test_templated_instructions_are_not_cached(
+        self,
+        prepared_prompt_cache: PreparedPromptCache,
+        mock_provider_factory: Mock,
+        mock_provider: Mock,
+        model_data: ModelData,
+    ):
+        def _runner():
+            return _build_runner2(
+                mock_provider_factory,
+                input_schema={"type": "object", "properties": {"name": {"type": "string"}}},
+                output_schema={"type": "object", "properties": {"greeting": {"type": "string"}}},
+                instructions="Greet {{name}}",
+                has_templated_instructions=True,
+            )
+
+        messages1 = await _runner()._build_messages(
+            TemplateName.V2_DEFAULT,
+            {"name": "John"},
+            mock_provider,
+            model_data,
+        )
+        messages2 = await _runner()._build_messages(
+            TemplateName.V2_DEFAULT,
+            {"name": "Jane"},
+            mock_provider,
+            model_data,
+        )
+
+        assert "Greet John" in messages1[0].content
+        assert "Greet Jane" in messages2[0].content
+
+
 @pytest.fixture()
 def mock_provider_factory_full(mock_provider_factory: Mock):
     from core.providers.base.abstract_provider import AbstractProvider
@@ -1594,6 +1669,91 @@ class TestBuildTaskOutput:
         assert isinstance(first_opts, ProviderOptions), "sanity check"
         assert first_opts.structured_generation is False
 
+    async def test_hedged_provider(
+        self,
+        patched_runner: WorkflowAIRunner,
+        patched_provider_factory: Mock,
+    ):
+        patched_runner._options.model = Model.GEMINI_1_5_FLASH_002  # pyright: ignore[reportPrivateUsage]
+        patched_runner._options.provider = None  # pyright: ignore[reportPrivateUsage]
+
+        google = patched_provider_factory.google
+        google.is_custom_config = False
+        google.config_key.return_value = "google_config"
+        # The google p95 is 10ms, so gemini is started while google is still running
+        health = ProviderHealthTracker(min_samples=1)
+        health.record_success(Provider.GOOGLE, "google_config", Model.GEMINI_1_5_FLASH_002, 0.01)
+
+        google_started = asyncio.Event()
+
+        async def _slow_complete(*args: Any, **kwargs: Any):
+            google_started.set()
+            await asyncio.sleep(10)
+            return StructuredOutput({"output": "slow"})
+
+        google.complete.side_effect = _slow_complete
+        patched_provider_factory.gemini.complete.return_value = StructuredOutput({"output": "fast"})
+
+        with (
+            patch.object(patched_runner, "provider_health", health),
+            patch.object(patched_runner, "hedging_enabled", True),
+        ):
+            result = await patched_runner._build_task_output({"input": "test"})  # pyright: ignore[reportPrivateUsage]
+
+        assert result == RunOutput({"output": "fast"})
+        assert google_started.is_set()
+        patched_provider_factory.gemini.complete.assert_awaited_once()
+
+    async def test_hedged_provider_only_keeps_winner_completion(
+        self,
+        patched_runner: WorkflowAIRunner,
+        patched_provider_factory: Mock,
+        mock_builder_context: BuilderInterface,
+    ):
+        patched_runner._options.model = Model.GEMINI_1_5_FLASH_002  # pyright: ignore[reportPrivateUsage]
+        patched_runner._options.provider = None  # pyright: ignore[reportPrivateUsage]
+
+        google = patched_provider_factory.google
+        google.is_custom_config = False
+        google.config_key.return_value = "google_config"
+        health = ProviderHealthTracker(min_samples=1)
+        health.record_success(Provider.GOOGLE, "google_config", Model.GEMINI_1_5_FLASH_002, 0.01)
+
+        def _append_completion(provider: Provider):
+            ctx = builder_context.get()
+            assert ctx is not None
+            ctx.llm_completions.append(LLMCompletion(messages=[], usage=LLMUsage(), provider=provider))
+
+        gemini_appended = asyncio.Event()
+        google_appended = asyncio.Event()
+
+        async def _slow_complete(*args: Any, **kwargs: Any):
+            # The slower attempt appends its completion after the winner
+            await gemini_appended.wait()
+            _append_completion(Provider.GOOGLE)
+            google_appended.set()
+            await asyncio.sleep(10)
+            return StructuredOutput({"output": "slow"})
+
+        async def _fast_complete(*args: Any, **kwargs: Any):
+            _append_completion(Provider.GOOGLE_GEMINI)
+            gemini_appended.set()
+            await google_appended.wait()
+            return StructuredOutput({"output": "fast"})
+
+        google.complete.side_effect = _slow_complete
+        patched_provider_factory.gemini.complete.side_effect = _fast_complete
+
+        with (
+            patch.object(patched_runner, "provider_health", health),
+            patch.object(patched_runner, "hedging_enabled", True),
+        ):
+            result = await patched_runner._build_task_output({"input": "test"})  # pyright: ignore[reportPrivateUsage]
+
+        assert result == RunOutput({"output": "fast"})
+        assert google_appended.is_set()
+        assert [c.provider for c in mock_builder_context.llm_completions] == [Provider.GOOGLE_GEMINI]
+
     async def test_provider_sanitizes_template(
         self,
         patched_runner: WorkflowAIRunner,
@@ -13,6 +13,7 @@ from api.services import tasks
 from api.services.customer_assessment_service import CustomerAssessmentService
 from api.services.features import FeatureService
 from api.services.storage import storage_for_tenant
+from api.services.tenant_cache import invalidate_tenant_cache
 from core.agents.customer_success_helper_chat import (
     CustomerSuccessHelperChatAgentInput,
     CustomerSuccessHelperChatAgentOutput,
@@ -146,6 +147,11 @@ class CustomerService:
             },
         )
 
+    async def _set_slack_channel_id(self, channel_id: str | None, force: bool = False):
+        await self._storage.organizations.set_slack_channel_id(channel_id, force=force)
+        # The organization settings are served from the tenant cache
+        await invalidate_tenant_cache(tenant=self._storage.tenant)
+
     async def _get_or_create_slack_channel(self, clt: SlackApiClient, retries: int = 3):
         org = await self._get_organization()
         if org.slack_channel_id:
@@ -153,7 +159,7 @@ class CustomerService:
 
         # Locking
         try:
-            await self._storage.organizations.set_slack_channel_id("")
+            await self._set_slack_channel_id("")
         except ObjectNotFoundException:
             # Slack channel already set so we can just try to get it again
             for _ in range(retries):
@@ -167,10 +173,10 @@ class CustomerService:
         try:
             channel_id = await clt.create_channel(self._channel_name(org.slug, org.uid))
         except Exception as e:
-            await self._storage.organizations.set_slack_channel_id(None)
+            await self._set_slack_channel_id(None)
             raise InternalError("Failed to create slack channel", extra={"org_id": org.uid, "slug": org.slug}) from e
 
-        await self._storage.organizations.set_slack_channel_id(channel_id, force=True)
+        await self._set_slack_channel_id(channel_id, force=True)
         add_background_task(self._on_channel_created(channel_id, org.slug, org.org_id, org.owner_id))
         return channel_id
 
@@ -1,27 +1,47 @@
+import asyncio
 import hashlib
 import logging
 import mimetypes
 from typing import override
 
+import aiohttp
 from azure.core.exceptions import ResourceExistsError
 from azure.core.pipeline.transport import AioHttpTransport
 from azure.storage.blob.aio import BlobClient, BlobServiceClient
 
-from core.storage.file_storage import CouldNotStoreFileError, FileData, FileStorage
+from core.storage.file_storage import CouldNotStoreFileError, FileData, FileStorage, UploadLimiter
+from core.utils.coroutines import capture_errors
+
+# Blob service clients are shared by all storages with the same connection string and pool size.
+# aiohttp sessions are bound to an event loop so the loop is stored alongside the client
+_shared_clients: dict[tuple[str, int], tuple[asyncio.AbstractEventLoop, BlobServiceClient]] = {}
 
 
 class AzureBlobFileStorage(FileStorage):
-    def __init__(self, connection_string: str, container_name: str):
+    def __init__(
+        self,
+        connection_string: str,
+        container_name: str,
+        max_connections: int = 100,
+        max_concurrent_uploads: int = 20,
+    ):
         self.connection_string = connection_string
         self.container_name = container_name
+        self._max_connections = max_connections
+        self._upload_limiter = UploadLimiter("azure", max_concurrent_uploads)
 
         self._logger = logging.getLogger(__name__)
 
-    async def _get_blob_service_client(self) -> BlobServiceClient:
+    def _build_blob_service_client(self) -> BlobServiceClient:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._max_connections, keepalive_timeout=30),
+        )
         return BlobServiceClient.from_connection_string(
             self.connection_string,
             # TODO: refine these settings after monitoring performance
             transport=AioHttpTransport(
+                session=session,
+                session_owner=True,
                 connection_timeout=300.0,
                 read_timeout=300.0,
                 retries=3,
@@ -29,6 +49,22 @@ class AzureBlobFileStorage(FileStorage):
             ),
         )
 
+    async def _get_blob_service_client(self) -> BlobServiceClient:
+        """Returns the shared client for the connection string, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        key = (self.connection_string, self._max_connections)
+        shared = _shared_clients.get(key)
+        if shared and shared[0] is loop:
+            return shared[1]
+
+        client = self._build_blob_service_client()
+        _shared_clients[key] = (loop, client)
+        if shared:
+            # The client of the previous event loop would otherwise leak its aiohttp session
+            with capture_errors(self._logger, "Failed to close the blob service client of a previous event loop"):
+                await shared[1].close()
+        return client
+
     @override
     async def store_file(self, file: FileData, folder_path: str) -> str:
         # folder_path is like /{tenant}/{task_id}
@@ -37,7 +73,8 @@ class AzureBlobFileStorage(FileStorage):
         extension = mimetypes.guess_extension(file.content_type) if file.content_type else None
         blob_name = f"{folder_path}/{content_hash}{extension or ''}"
 
-        async with await self._get_blob_service_client() as blob_service_client:
+        blob_service_client = await self._get_blob_service_client()
+        async with self._upload_limiter.slot():
             try:
                 blob_client: BlobClient = blob_service_client.get_blob_client(
                     container=self.container_name,
@@ -1,5 +1,7 @@
+import asyncio
 import os
 from io import FileIO
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -70,3 +72,27 @@ async def test_store_upload_file(azure_blob_storage: AzureBlobFileStorage):
 
     container_url = f"{blob_service_client.url}{azure_blob_storage.container_name}"  # type: ignore
     assert url == f"{container_url}/{blob_name}"
+
+
+async def test_shared_blob_service_client():
+    connection_string = (
+        "DefaultEndpointsProtocol=http;AccountName=shared;AccountKey=a2V5;BlobEndpoint=http://127.0.0.1:10000/shared;"
+    )
+    storages = [AzureBlobFileStorage(connection_string, "container") for _ in range(2)]
+
+    clients = [await s._get_blob_service_client() for s in storages]  # pyright: ignore[reportPrivateUsage]
+    assert clients[0] is clients[1]
+    await clients[0].close()
+
+
+async def test_blob_service_client_closed_on_loop_change():
+    storage = AzureBlobFileStorage("DefaultEndpointsProtocol=http;AccountName=loop;", "container")
+    clients = [AsyncMock(), AsyncMock()]
+
+    with patch.object(storage, "_build_blob_service_client", side_effect=clients):
+        # Client created in another event loop
+        await asyncio.to_thread(asyncio.run, storage._get_blob_service_client())  # pyright: ignore[reportPrivateUsage]
+        assert await storage._get_blob_service_client() is clients[1]  # pyright: ignore[reportPrivateUsage]
+
+    clients[0].close.assert_awaited_once()
+    clients[1].close.assert_not_awaited()
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, AsyncIterator, Literal, NotRequired, Sequence, TypedDict, cast, override
 
 from clickhouse_connect.driver import create_async_client  # pyright: ignore[reportUnknownVariableType]
@@ -10,6 +11,7 @@ from pydantic import BaseModel
 
 from core.domain.agent_run import AgentRun
 from core.domain.errors import InternalError
+from core.domain.run_cursor import RunCursor
 from core.domain.search_query import (
     SearchQuery,
 )
@@ -18,12 +20,17 @@ from core.domain.task_run_query import SerializableTaskRunField, SerializableTas
 from core.storage import ObjectNotFoundException, TaskTuple
 from core.storage.clickhouse.models.runs import FIELD_TO_COLUMN, ClickhouseRun
 from core.storage.clickhouse.models.utils import data_and_columns, id_lower_bound
-from core.storage.clickhouse.query_builder import Q, W, WhereAndClause
+from core.storage.clickhouse.query_builder import Q, W, WhereAndClause, WSubquery
+from core.storage.clickhouse.run_batch_writer import ClickhouseRunBatchWriter
+from core.storage.clickhouse.run_cache import ClickhouseRunCache
 from core.storage.task_run_storage import RunAggregate, TaskRunStorage, TokenCounts, WeeklyRunAggregate
 
 
 class ClickhouseClient(TaskRunStorage):
     _client_pools: dict[str, AsyncClient] = {}
+    # Batched run inserts are opt-in, see enable_run_batching
+    _run_batch_writer_kwargs: dict[str, Any] | None = None
+    _run_batch_writers: dict[str, ClickhouseRunBatchWriter] = {}
 
     @classmethod
     async def get_shared_client(cls, connection_string: str) -> AsyncClient:
@@ -31,10 +38,44 @@ class ClickhouseClient(TaskRunStorage):
             cls._client_pools[connection_string] = await create_async_client(dsn=connection_string)
         return cls._client_pools[connection_string]
 
-    def __init__(self, connection_string: str, tenant_uid: int):
+    @classmethod
+    def enable_run_batching(
+        cls,
+        max_rows: int = 500,
+        max_bytes: int = 8 * 1024 * 1024,
+        flush_interval_seconds: float = 1,
+    ):
+        """Store runs through a per process batch writer instead of one insert per run.
+        Should be called at process startup, and close_run_batch_writers at shutdown"""
+        cls._run_batch_writer_kwargs = {
+            "max_rows": max_rows,
+            "max_bytes": max_bytes,
+            "flush_interval_seconds": flush_interval_seconds,
+        }
+
+    @classmethod
+    async def close_run_batch_writers(cls):
+        writers = list(cls._run_batch_writers.values())
+        cls._run_batch_writers = {}
+        await asyncio.gather(*(w.close() for w in writers))
+
+    def _run_batch_writer(self) -> ClickhouseRunBatchWriter | None:
+        if self._run_batch_writer_kwargs is None:
+            return None
+        if self.connection_string not in self._run_batch_writers:
+            self._run_batch_writers[self.connection_string] = ClickhouseRunBatchWriter(
+                partial(self.get_shared_client, self.connection_string),
+                # The insert is synchronous since the batching is done on our side
+                settings={"async_insert": 0},
+                **self._run_batch_writer_kwargs,
+            )
+        return self._run_batch_writers[self.connection_string]
+
+    def __init__(self, connection_string: str, tenant_uid: int, run_cache: ClickhouseRunCache | None = None):
         self.connection_string = connection_string
         self._client: AsyncClient | None = None
         self.tenant_uid = tenant_uid
+        self._run_cache = run_cache
         self._logger = logging.getLogger(__name__)
 
     async def client(self) -> AsyncClient:
@@ -75,6 +116,27 @@ class ClickhouseClient(TaskRunStorage):
         client = await self.client()
         return await client.query(query, column_formats=column_formats, parameters=parameters)  # pyright: ignore[reportUnknownMemberType]
 
+    async def query_column_blocks(
+        self,
+        query: str,
+        parameters: list[Any] | dict[str, Any] | None = None,
+    ) -> AsyncIterator[tuple[Sequence[str], Sequence[Sequence[Any]]]]:
+        """Stream the result of a query as column oriented blocks, yielding the column names and
+        the columns of each block.
+
+        The async client only opens the stream in its executor, reading from the stream is blocking
+        so every block is also fetched in the executor to avoid blocking the event loop."""
+        client = await self.client()
+        stream = await client.query_column_block_stream(query, parameters=parameters)  # pyright: ignore[reportUnknownMemberType]
+        loop = asyncio.get_running_loop()
+        with stream:
+            column_names: Sequence[str] = stream.source.column_names  # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
+            while True:
+                block: Sequence[Sequence[Any]] | None = await loop.run_in_executor(client.executor, next, stream, None)
+                if block is None:
+                    return
+                yield column_names, block
+
     class InsertSettings(TypedDict):
         async_insert: NotRequired[Literal[0, 1]]
         wait_for_async_insert: NotRequired[Literal[0, 1]]
@@ -95,6 +157,12 @@ class ClickhouseClient(TaskRunStorage):
     @override
     async def store_task_run(self, task_run: AgentRun, settings: InsertSettings | None = None):
         clickhouse_run = ClickhouseRun.from_domain(self.tenant_uid, task_run)
+        if not settings and (writer := self._run_batch_writer()):
+            # Waiting for the batch to be inserted so that failures are propagated
+            await (await writer.add(clickhouse_run))
+            await self._fill_run_cache(task_run, clickhouse_run)
+            return task_run
+
         data, columns = data_and_columns(clickhouse_run)
         client = await self.client()
 
@@ -106,8 +174,24 @@ class ClickhouseClient(TaskRunStorage):
             data=[data],
             settings=cast(dict[str, Any], settings),
         )
+        await self._fill_run_cache(task_run, clickhouse_run)
         return task_run
 
+    async def _fill_run_cache(self, task_run: AgentRun, clickhouse_run: ClickhouseRun):
+        if not self._run_cache:
+            return
+        properties = task_run.group.properties
+        # Only filling the cache for runs that are looked up by default, see AbstractRunner._should_use_cache
+        if properties.temperature != 0 or properties.enabled_tools:
+            return
+        # Mimicking the columns selected by fetch_cached_run
+        not_heavy = clickhouse_run.model_copy(update={field: None for field in ClickhouseRun.heavy_fields()})
+        await self._run_cache.set(
+            clickhouse_run.cache_hash,
+            clickhouse_run.task_schema_id,
+            not_heavy.to_domain(task_run.task_id),
+        )
+
     @classmethod
     def _default_order_by(cls):
         return [
@@ -127,22 +211,33 @@ class ClickhouseClient(TaskRunStorage):
         timeout_ms: int = 60_000,
         include: set[SerializableTaskRunField] | None = None,
         exclude: set[SerializableTaskRunField] | None = None,
+        cursor: RunCursor | None = None,
         unique_by_conversation: bool = True,
     ):
-        columns = ClickhouseRun.select_in_search(include=include, exclude=exclude)
+        columns = ClickhouseRun.with_cursor_columns(ClickhouseRun.select_in_search(include=include, exclude=exclude))
         where = await self._search_where(task_uid, search_fields)
+        if cursor:
+            if unique_by_conversation:
+                # The limit by only applies to the current page so conversations that were
+                # already returned on a previous page are excluded explicitly
+                where &= WSubquery(
+                    "conversation_id",
+                    "runs",
+                    self._with_tenant(where & ClickhouseRun.where_up_to_cursor(cursor)),
+                    negate=True,
+                )
+            where &= ClickhouseRun.where_after_cursor(cursor)
+            offset = 0
 
         async with asyncio.timeout(timeout_ms):
-            result = await self._runs(
+            async for row in self._stream_runs(
                 task_id=task_uid[0] if task_uid else None,
                 select=columns,
                 where=where,
                 limit=limit,
                 offset=offset,
                 unique_by_conversation=unique_by_conversation,
-            )
-
-            for row in result:
+            ):
                 yield row
 
     def _with_tenant(self, w: W | None) -> W:
@@ -174,7 +269,7 @@ class ClickhouseClient(TaskRunStorage):
             settings={"mutations_sync": sync},
         )
 
-    async def _runs(
+    async def _stream_runs(
         self,
         task_id: str | None,
         select: Sequence[str] | None = None,
@@ -184,7 +279,8 @@ class ClickhouseClient(TaskRunStorage):
         order_by: Sequence[str] | None = None,
         distincts: Sequence[str] | None = None,
         unique_by_conversation: bool = False,
-    ):
+    ) -> AsyncIterator[AgentRun]:
+        """Yield runs as the result blocks arrive, runs are only mapped when consumed"""
         q, parameters = Q(
             "runs",
             select=select,
@@ -200,16 +296,34 @@ class ClickhouseClient(TaskRunStorage):
 
         # print("\n", q, parameters, "\n")
 
-        result = await self.query(
-            q,
-            parameters=parameters,
-        )
-
-        def _map_row(row: Sequence[Any]):
-            zipped: dict[str, Any] = dict(zip(result.column_names, row))  # pyright: ignore [reportUnknownArgumentType, reportUnknownMemberType]
-            return ClickhouseRun.model_validate(zipped).to_domain(task_id or "")
+        async for column_names, columns in self.query_column_blocks(q, parameters=parameters):
+            for row in zip(*columns):
+                yield ClickhouseRun.from_trusted_row(column_names, row).to_domain(task_id or "")
 
-        return [_map_row(row) for row in result.result_rows]
+    async def _runs(
+        self,
+        task_id: str | None,
+        select: Sequence[str] | None = None,
+        where: W | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_by: Sequence[str] | None = None,
+        distincts: Sequence[str] | None = None,
+        unique_by_conversation: bool = False,
+    ):
+        return [
+            r
+            async for r in self._stream_runs(
+                task_id,
+                select=select,
+                where=where,
+                limit=limit,
+                offset=offset,
+                order_by=order_by,
+                distincts=distincts,
+                unique_by_conversation=unique_by_conversation,
+            )
+        ]
 
     async def _search_where(self, task_id: TaskTuple | None, search_fields: list[SearchQuery] | None):
         w = W("task_uid", type="UInt32", value=task_id[1]) if task_id else WhereAndClause([])
@@ -272,6 +386,11 @@ class ClickhouseClient(TaskRunStorage):
                 input_hash=task_input_hash,
             )
 
+            # The cache only contains successful runs
+            run_cache = self._run_cache if success_only else None
+            if run_cache and (run := await run_cache.get(cache_hash, task_schema_id)):
+                return run
+
             w = W("cache_hash", type="String", value=cache_hash)
             w &= W("task_schema_id", type="UInt16", value=task_schema_id)
             if success_only:
@@ -280,6 +399,8 @@ class ClickhouseClient(TaskRunStorage):
             result = await self._runs(task_id[0], ClickhouseRun.select_not_heavy(), w, limit=1)
             if not result:
                 return None
+            if run_cache:
+                await run_cache.set(cache_hash, task_schema_id, result[0])
             return result[0]
 
     @override
@@ -319,22 +440,27 @@ class ClickhouseClient(TaskRunStorage):
     ) -> AsyncIterator[AgentRun]:
         async with asyncio.timeout(timeout_ms):
             w = ClickhouseRun.where_for_query(self.tenant_uid, task_uid, query)
-            columns = ClickhouseRun.columns(query.include_fields, query.exclude_fields)
+            offset = query.offset
+            if query.cursor:
+                w &= ClickhouseRun.where_after_cursor(query.cursor)
+                offset = None
+            columns = ClickhouseRun.with_cursor_columns(
+                ClickhouseRun.columns(query.include_fields, query.exclude_fields),
+            )
 
             if query.unique_by:
                 distincts = [FIELD_TO_COLUMN.get(ub, ub) for ub in query.unique_by]
             else:
                 distincts = None
 
-            result = await self._runs(
+            async for row in self._stream_runs(
                 query.task_id or "",
                 columns,
                 w,
                 limit=query.limit,
-                offset=query.offset,
+                offset=offset,
                 distincts=distincts,
-            )
-            for row in result:
+            ):
                 yield row
 
     @override
@@ -413,17 +539,13 @@ class ClickhouseClient(TaskRunStorage):
                 total_cost_usd=ClickhouseRun.from_cost_millionth_usd(row[2]),
             )
 
-    @override
-    async def aggregate_runs(
+    def _aggregate_runs_where(
         self,
         task_id: TaskTuple,
         task_schema_id: int,
         task_input_hashes: set[str],
         group_ids: set[str] | None,
     ):
-        # Group reviews by version id
-        # - first we filter when reviews is not 0
-        # - then we group by version id
         w = (
             W("tenant_uid", type="UInt32", value=self.tenant_uid)
             & W("task_uid", type="UInt32", value=task_id[1])
@@ -434,7 +556,20 @@ class ClickhouseClient(TaskRunStorage):
         if group_ids:
             w &= W("version_id", type="String", value=group_ids)
 
-        raw, parameters = w.to_sql_req()
+        return w.to_sql_req()
+
+    @override
+    async def aggregate_runs(
+        self,
+        task_id: TaskTuple,
+        task_schema_id: int,
+        task_input_hashes: set[str],
+        group_ids: set[str] | None,
+    ):
+        # Group reviews by version id
+        # - first we filter when reviews is not 0
+        # - then we group by version id
+        raw, parameters = self._aggregate_runs_where(task_id, task_schema_id, task_input_hashes, group_ids)
 
         # See ClickhouseRun._review_clause for the mapping
         sql = f"""
@@ -463,6 +598,44 @@ class ClickhouseClient(TaskRunStorage):
             for row in res.result_rows
         }
 
+    @override
+    async def aggregate_runs_by_input_hash(
+        self,
+        task_id: TaskTuple,
+        task_schema_id: int,
+        task_input_hashes: set[str],
+        group_ids: set[str] | None,
+    ):
+        raw, parameters = self._aggregate_runs_where(task_id, task_schema_id, task_input_hashes, group_ids)
+
+        sql = f"""
+        SELECT
+            version_id,
+            input_hash,
+            avg(cost_millionth_usd) AS average_cost_millionth_usd,
+            avg(duration_ds) AS average_duration_ds,
+            count() AS total_run_count,
+            sum(if(error_payload != '', 1, 0)) AS failed_run_count,
+            groupArray(eval_hash) AS eval_hashes
+        FROM runs
+        WHERE {raw}
+        GROUP BY version_id, input_hash
+        """
+
+        res = await self.query(sql, parameters=parameters)
+
+        out: dict[str, dict[str, RunAggregate]] = {}
+        for row in res.result_rows:
+            by_input = out.setdefault(row[0].rstrip(b"\x00").decode(), {})
+            by_input[row[1].rstrip(b"\x00").decode()] = RunAggregate(
+                average_cost_usd=ClickhouseRun.from_cost_millionth_usd(row[2]),
+                average_duration_seconds=ClickhouseRun.from_duration_ds(row[3]),
+                total_run_count=row[4],
+                failed_run_count=row[5],
+                eval_hashes=[r.decode() for r in row[6]],
+            )
+        return out
+
     @override
     async def run_count_by_version_id(
         self,
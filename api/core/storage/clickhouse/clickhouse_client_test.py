@@ -16,6 +16,7 @@ from core.domain.fields.internal_reasoning_steps import InternalReasoningStep
 from core.domain.llm_completion import LLMCompletion
 from core.domain.llm_usage import LLMUsage
 from core.domain.models import Provider
+from core.domain.run_cursor import RunCursor
 from core.domain.search_query import (
     SearchField,
     SearchOperation,
@@ -33,6 +34,7 @@ from core.storage.clickhouse.clickhouse_client import (
     ClickhouseClient,
 )
 from core.storage.clickhouse.models.runs import ClickhouseRun
+from core.storage.clickhouse.run_cache import ClickhouseRunCache
 from core.storage.mongo.models.task_run_document import TaskRunDocument
 from core.storage.task_run_storage import RunAggregate, WeeklyRunAggregate
 from core.utils.fields import datetime_factory
@@ -210,6 +212,85 @@ class TestSearchTaskRun:
         r = await self._search(clickhouse_client, [])
         assert r == [str(_uuid7(1)), str(_uuid7(3)), str(_uuid7(4)), str(_uuid7(6))]
 
+    async def test_search_cursor(self, clickhouse_client: ClickhouseClient):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        runs = [
+            task_run_ser(
+                id=str(uuid7(ms=lambda i=i: int(now.timestamp() * 1000) + i)),
+                created_at=now + datetime.timedelta(milliseconds=i),
+                task_uid=1,
+                conversation_id=str(uuid7()),
+            )
+            for i in range(3)
+        ]
+        await clickhouse_client.insert_models(
+            "runs",
+            [ClickhouseRun.from_domain(1, r) for r in runs],
+            {"async_insert": 0, "wait_for_async_insert": 0},
+        )
+
+        page = [r async for r in clickhouse_client.search_task_runs(("", 1), [], limit=2, offset=0)]
+        assert [r.id for r in page] == [runs[2].id, runs[1].id]
+
+        page = [
+            r
+            async for r in clickhouse_client.search_task_runs(
+                ("", 1),
+                [],
+                limit=2,
+                offset=0,
+                cursor=RunCursor.from_run(page[-1]),
+            )
+        ]
+        assert [r.id for r in page] == [runs[0].id]
+
+    async def test_search_cursor_unique_by_conversation(self, clickhouse_client: ClickhouseClient):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        conversation_ids = [str(uuid7()) for _ in range(2)]
+        # Runs 3 and 1 belong to the same conversation as the first page
+        runs = [
+            task_run_ser(
+                id=str(uuid7(ms=lambda i=i: int(now.timestamp() * 1000) + i)),
+                created_at=now + datetime.timedelta(milliseconds=i),
+                task_uid=1,
+                conversation_id=conversation_ids[i % 2],
+            )
+            for i in range(4)
+        ]
+        await clickhouse_client.insert_models(
+            "runs",
+            [ClickhouseRun.from_domain(1, r) for r in runs],
+            {"async_insert": 0, "wait_for_async_insert": 0},
+        )
+
+        page = [r async for r in clickhouse_client.search_task_runs(("", 1), [], limit=1, offset=0)]
+        assert [r.id for r in page] == [runs[3].id]
+
+        page = [
+            r
+            async for r in clickhouse_client.search_task_runs(
+                ("", 1),
+                [],
+                limit=1,
+                offset=0,
+                cursor=RunCursor.from_run(page[-1]),
+            )
+        ]
+        assert [r.id for r in page] == [runs[2].id]
+
+        page = [
+            r
+            async for r in clickhouse_client.search_task_runs(
+                ("", 1),
+                [],
+                limit=1,
+                offset=0,
+                cursor=RunCursor.from_run(page[-1]),
+            )
+        ]
+        # Both conversations were already returned
+        assert page == []
+
     async def test_count(self, clickhouse_client: ClickhouseClient):
         await self._insert_runs(
             clickhouse_client,
@@ -557,6 +638,23 @@ class TestFetchCachedRun:
         assert fetched_run.id == str(uuid)
         assert fetched_run.llm_completions is None
 
+    async def test_fetch_cached_run_with_run_cache(self, clickhouse_client: ClickhouseClient):
+        """Runs stored through the client are served from the run cache"""
+        client = ClickhouseClient(
+            clickhouse_client.connection_string,
+            tenant_uid=1,
+            run_cache=ClickhouseRunCache(redis_client=None),
+        )
+        run = task_run_ser(id=str(uuid7()), task_uid=1, task_input={"name": "test"}, task_output={"output": 1})
+        await client.store_task_run(run)
+        # Removing the run from clickhouse to make sure it is not queried
+        await clickhouse_client.command("TRUNCATE TABLE runs;")
+
+        fetched_run = await client.fetch_cached_run(_TASK_TUPLE, 1, run.task_input_hash, run.group.id, None)
+        assert fetched_run
+        assert fetched_run.id == run.id
+        assert fetched_run.llm_completions is None
+
     async def test_fetch_cached_run_ordered(self, clickhouse_client: ClickhouseClient):
         """Check that the most recent run is returned for cache"""
 
@@ -1,8 +1,8 @@
 import json
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from datetime import date, datetime
-from typing import Annotated, Any
+from typing import Annotated, Any, Self
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ValidationError, field_serializer, field_validator
@@ -16,6 +16,7 @@ from core.domain.llm_completion import LLMCompletion
 from core.domain.llm_usage import LLMUsage
 from core.domain.models import Provider
 from core.domain.models.models import Model
+from core.domain.run_cursor import RunCursor
 from core.domain.search_query import (
     SearchField,
     SearchOperation,
@@ -144,6 +145,26 @@ FIELD_TO_COLUMN: dict[SerializableTaskRunField, str] = {
 
 CLICKHOUSE_RUN_VERSION = 6
 
+# Columns for which the value returned by clickhouse needs no parsing. Integer columns only
+# have bound checks, which always pass for values that were inserted in a column of that size
+_TRUSTED_COLUMNS = {
+    "tenant_uid",
+    "task_uid",
+    "created_at_date",
+    "task_schema_id",
+    "version_model",
+    "version_iteration",
+    "version_temperature_percent",
+    "input_preview",
+    "output_preview",
+    "duration_ds",
+    "overhead_ms",
+    "cost_millionth_usd",
+    "input_token_count",
+    "output_token_count",
+    "is_active",
+}
+
 
 class ClickhouseRun(BaseModel):
     tenant_uid: Annotated[int, validate_int(MAX_UINT_32)] = 0
@@ -571,6 +592,23 @@ class ClickhouseRun(BaseModel):
             llm_completions=safe_map_optional(run.llm_completions, cls._LLMCompletion.from_domain, logger=_logger),
         )
 
+    @classmethod
+    def from_trusted_row(cls, column_names: Sequence[str], row: Sequence[Any]) -> Self:
+        """Build a run from a row returned by clickhouse, skipping validation for columns
+        that are already decoded to their final type by the driver."""
+        trusted: dict[str, Any] = {}
+        untrusted: dict[str, Any] = {}
+        for column, value in zip(column_names, row):
+            if column in _TRUSTED_COLUMNS:
+                trusted[column] = value
+            else:
+                untrusted[column] = value
+        run = cls.model_validate(untrusted)
+        # Validation is not triggered on assignment
+        run.__dict__.update(trusted)
+        run.__pydantic_fields_set__.update(trusted)
+        return run
+
     def to_domain(self, task_id: str) -> AgentRun:
         tool_call_requests, tool_calls = self.split_tool_calls()
 
@@ -774,10 +812,53 @@ class ClickhouseRun(BaseModel):
             }
         return [f for f in cls.model_fields.keys() if f not in exclude_fields]
 
+    @classmethod
+    def with_cursor_columns(cls, columns: list[str]) -> list[str]:
+        """Make sure the columns needed to build the cursor of the next page are selected"""
+        if "*" in columns:
+            return columns
+        return [*columns, *(c for c in ("run_uuid", "task_uid") if c not in columns)]
+
     @classmethod
     def select_not_heavy(cls):
         return [f for f in cls.model_fields.keys() if f not in cls.heavy_fields()]
 
+    @classmethod
+    def _cursor_key(cls, cursor: RunCursor):
+        try:
+            run_uuid = UUID(cursor.run_id)
+        except ValueError:
+            raise BadRequestError("Invalid cursor")
+        created_at_date = cursor.created_at.date()
+        return created_at_date, (created_at_date, cursor.task_uid, run_uuid.int)
+
+    @classmethod
+    def where_after_cursor(cls, cursor: RunCursor):
+        """Clause that selects runs strictly after the cursor in the default
+        (created_at_date, task_uid, run_uuid) descending order"""
+        created_at_date, key = cls._cursor_key(cursor)
+
+        # The separate date bound is what allows clickhouse to skip granules using the primary key
+        return W("created_at_date", operator="<=", type="Date", value=created_at_date) & W(
+            "(created_at_date, task_uid, run_uuid)",
+            operator="<",
+            type="Tuple(Date, UInt32, UInt128)",
+            value=key,
+        )
+
+    @classmethod
+    def where_up_to_cursor(cls, cursor: RunCursor):
+        """Clause that selects the runs up to and including the cursor in the default
+        (created_at_date, task_uid, run_uuid) descending order, i-e the runs of the previous pages"""
+        created_at_date, key = cls._cursor_key(cursor)
+
+        return W("created_at_date", operator=">=", type="Date", value=created_at_date) & W(
+            "(created_at_date, task_uid, run_uuid)",
+            operator=">=",
+            type="Tuple(Date, UInt32, UInt128)",
+            value=key,
+        )
+
     @classmethod
     def where_by_id(cls, task_uid: int, id: str):
         try:
@@ -4,11 +4,12 @@ from typing import get_args
 import pytest
 
 from core.domain.agent_run import AgentRun
-from core.domain.errors import InternalError
+from core.domain.errors import BadRequestError, InternalError
 from core.domain.fields.internal_reasoning_steps import InternalReasoningStep
 from core.domain.llm_completion import LLMCompletion
 from core.domain.llm_usage import LLMUsage
 from core.domain.models import Provider
+from core.domain.run_cursor import RunCursor
 from core.domain.search_query import (
     ReviewSearchOptions,
     SearchField,
@@ -147,6 +148,53 @@ class TestClickhouseRunsValidate:
         assert run.output == {}
 
 
+class TestFromTrustedRow:
+    def test_matches_validation(self):
+        payload = {
+            "created_at_date": date(2025, 2, 24),
+            "run_uuid": 2104046675861711478702752072517678960,
+            "task_schema_id": 1,
+            "task_uid": 2522560864,
+            "tenant_uid": 1393228554,
+            "updated_at": datetime(2025, 2, 24, 19, 50, 21),
+            "version_id": b"a74516065162c912e8216bef6d2f1c29",
+            "version_iteration": 2,
+            "version_model": "claude-3-5-sonnet-20240620",
+            "version_temperature_percent": 0,
+            "output": '{"a": 1}',
+            "cost_millionth_usd": 10,
+        }
+        run = ClickhouseRun.from_trusted_row(list(payload.keys()), list(payload.values()))
+        assert run == ClickhouseRun.model_validate(payload)
+        assert run.model_fields_set == ClickhouseRun.model_validate(payload).model_fields_set
+
+
+class TestWhereAfterCursor:
+    def test_where_after_cursor(self):
+        run_uuid = uuid7()
+        cursor = RunCursor(c=datetime(2025, 2, 24, 19, 50, 21), t=3, r=str(run_uuid))
+        sql, params = ClickhouseRun.where_after_cursor(cursor).to_sql_req()
+        assert (
+            sql
+            == "created_at_date <= {v0:Date} AND (created_at_date, task_uid, run_uuid) < {v1:Tuple(Date, UInt32, UInt128)}"
+        )
+        assert params == {"v0": date(2025, 2, 24), "v1": (date(2025, 2, 24), 3, run_uuid.int)}
+
+    def test_invalid_run_id(self):
+        with pytest.raises(BadRequestError):
+            ClickhouseRun.where_after_cursor(RunCursor(c=datetime(2025, 2, 24), t=3, r="not_a_uuid"))
+
+    def test_where_up_to_cursor(self):
+        run_uuid = uuid7()
+        cursor = RunCursor(c=datetime(2025, 2, 24, 19, 50, 21), t=3, r=str(run_uuid))
+        sql, params = ClickhouseRun.where_up_to_cursor(cursor).to_sql_req()
+        assert (
+            sql
+            == "created_at_date >= {v0:Date} AND (created_at_date, task_uid, run_uuid) >= {v1:Tuple(Date, UInt32, UInt128)}"
+        )
+        assert params == {"v0": date(2025, 2, 24), "v1": (date(2025, 2, 24), 3, run_uuid.int)}
+
+
 class TestDomainSanity:
     def test_metadata(self):
         run = task_run_ser(id=str(uuid7()), task_uid=1, task_schema_id=1, metadata={"a": {"b": "c"}, "c": "d"})
@@ -230,6 +278,19 @@ class TestRunColumns:
             assert column in fields
 
 
+class TestWithCursorColumns:
+    def test_adds_cursor_columns(self):
+        assert ClickhouseRun.with_cursor_columns(ClickhouseRun.columns(include={"task_output"})) == [
+            "output",
+            "run_uuid",
+            "task_uid",
+        ]
+
+    def test_no_duplicates(self):
+        assert ClickhouseRun.with_cursor_columns(["task_uid", "run_uuid"]) == ["task_uid", "run_uuid"]
+        assert ClickhouseRun.with_cursor_columns(["*"]) == ["*"]
+
+
 class TestSelectNotHeavy:
     def test_select_not_heavy(self):
         columns = set(ClickhouseRun.select_not_heavy())
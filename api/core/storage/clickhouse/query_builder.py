@@ -273,6 +273,23 @@ class WJSONArray(W):
         return f"arrayExists(x -> {sub[0]}, {extract_fn})", sub[1]
 
 
+class WSubquery(W):
+    """Clause that checks whether a key is in the values of the same column selected by a subquery"""
+
+    def __init__(self, key: str, table: str, where: W, negate: bool = False):
+        super().__init__(key, None, "NOT IN" if negate else "IN", None)
+        self._table = table
+        self._where = where
+
+    @override
+    def to_sql(self, param_start: int = 0, key: str | None = None) -> tuple[str, dict[str, Any]] | None:
+        key = key or self._key
+        sub = self._where.to_sql(param_start)
+        if not sub:
+            return None
+        return f"{key} {self._operator} (SELECT {key} FROM {self._table} WHERE {sub[0]})", sub[1]
+
+
 class WhereAndClause(W):
     def __init__(self, clauses: list[W]) -> None:
         self.clauses = clauses
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from core.storage.clickhouse.query_builder import WJSON, Q, W, WJSONArray
+from core.storage.clickhouse.query_builder import WJSON, Q, W, WJSONArray, WSubquery
 
 
 class TestToSQL:
@@ -96,6 +96,20 @@ class TestToSQL:
         assert sql[0] == "status NOT IN ({v0_0:String}, {v0_1:String})"
         assert sql[1] == {"v0_0": "active", "v0_1": "pending"}
 
+    def test_subquery(self) -> None:
+        w = W("tenant_uid", 1, type="UInt32") & WSubquery(
+            "conversation_id",
+            "runs",
+            W("tenant_uid", 1, type="UInt32") & W("task_uid", 2, type="UInt32"),
+            negate=True,
+        )
+        sql = w.to_sql_req()
+        assert sql[0] == (
+            "tenant_uid = {v0:UInt32} AND conversation_id NOT IN "
+            "(SELECT conversation_id FROM runs WHERE tenant_uid = {v1:UInt32} AND task_uid = {v2:UInt32})"
+        )
+        assert sql[1] == {"v0": 1, "v1": 1, "v2": 2}
+
 
 class TestJsonExtractedKey:
     def test_simple_key(self):
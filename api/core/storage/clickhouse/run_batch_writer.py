@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
+
+from clickhouse_connect.driver.asyncclient import AsyncClient
+
+from core.storage.clickhouse.models.runs import ClickhouseRun
+from core.storage.clickhouse.models.utils import data_and_columns
+from core.utils.timed_buffer import TimedBuffer
+
+_logger = logging.getLogger(__name__)
+
+
+def _estimate_size(value: Any) -> int:
+    match value:
+        case str() | bytes():
+            return len(value)
+        case list() | tuple():
+            return sum(_estimate_size(v) for v in value)  # pyright: ignore [reportUnknownVariableType]
+        case dict():
+            return sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())  # pyright: ignore [reportUnknownVariableType]
+        case _:
+            return 8
+
+
+class _PendingRow(NamedTuple):
+    columns: tuple[str, ...]
+    data: list[Any]
+    size: int
+    future: asyncio.Future[None]
+
+
+class ClickhouseRunBatchWriter:
+    """Collects runs and inserts them in batches, flushing when the batch reaches a row count
+    or an estimated byte size, or at a fixed interval.
+
+    Rows are grouped by their set of columns, since None values are omitted to let Clickhouse
+    use the column defaults, and each group is sent as a single columnar insert.
+    Every added run gets a future that resolves once its batch is inserted, so that callers
+    still learn about insert failures."""
+
+    def __init__(
+        self,
+        client: Callable[[], Awaitable[AsyncClient]],
+        max_rows: int = 500,
+        max_bytes: int = 8 * 1024 * 1024,
+        flush_interval_seconds: float = 1,
+        settings: dict[str, Any] | None = None,
+    ):
+        self._client = client
+        self._settings = settings or {}
+        self._buffer = TimedBuffer[_PendingRow](
+            self._flush,
+            max_buffer_length=max_rows,
+            send_interval_seconds=flush_interval_seconds,
+            max_buffer_size=max_bytes,
+            item_size=lambda row: row.size,
+        )
+        self._started = False
+
+    async def _insert_group(self, columns: tuple[str, ...], rows: list[_PendingRow]):
+        # Transposing rows into columns
+        data = [list(column) for column in zip(*(row.data for row in rows))]
+        try:
+            client = await self._client()
+            await client.insert(
+                table="runs",
+                column_names=list(columns),
+                data=data,
+                column_oriented=True,
+                settings=self._settings,
+            )
+        except Exception as e:
+            _logger.exception("Failed to insert run batch", extra={"row_count": len(rows)})
+            for row in rows:
+                if not row.future.done():
+                    row.future.set_exception(e)
+            return
+
+        for row in rows:
+            if not row.future.done():
+                row.future.set_result(None)
+
+    async def _flush(self, rows: list[_PendingRow]):
+        groups: dict[tuple[str, ...], list[_PendingRow]] = {}
+        for row in rows:
+            groups.setdefault(row.columns, []).append(row)
+
+        await asyncio.gather(*(self._insert_group(columns, group) for columns, group in groups.items()))
+
+    async def add(self, run: ClickhouseRun) -> asyncio.Future[None]:
+        """Add a run to the current batch. The returned future resolves once the run is inserted."""
+        if not self._started:
+            self._started = True
+            await self._buffer.start()
+
+        data, columns = data_and_columns(run)
+        future = asyncio.get_running_loop().create_future()
+        await self._buffer.add(_PendingRow(tuple(columns), data, _estimate_size(data), future))
+        return future
+
+    async def close(self):
+        """Stop the periodic flush and insert whatever is left in the buffer"""
+        await self._buffer.close()
+        await self._buffer.purge()
+        self._started = False
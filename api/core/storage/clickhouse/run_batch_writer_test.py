@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from clickhouse_connect.driver.asyncclient import AsyncClient
+
+from core.storage.clickhouse.models.runs import ClickhouseRun
+from core.storage.clickhouse.run_batch_writer import ClickhouseRunBatchWriter
+from core.utils.uuid import uuid7
+
+
+@pytest.fixture
+def mock_client():
+    return Mock(spec=AsyncClient, insert=AsyncMock())
+
+
+def _writer(mock_client: Mock, **kwargs: Any):
+    async def _client():
+        return mock_client
+
+    return ClickhouseRunBatchWriter(_client, **kwargs)
+
+
+def _run(**kwargs: Any):
+    return ClickhouseRun(tenant_uid=1, task_uid=2, run_uuid=uuid7(), **kwargs)
+
+
+class TestClickhouseRunBatchWriter:
+    async def test_flush_on_max_rows(self, mock_client: Mock):
+        writer = _writer(mock_client, max_rows=2, flush_interval_seconds=100)
+
+        futures = [await writer.add(_run()) for _ in range(2)]
+        await asyncio.wait_for(asyncio.gather(*futures), 1)
+
+        mock_client.insert.assert_awaited_once()
+        kwargs = mock_client.insert.call_args.kwargs
+        assert kwargs["column_oriented"] is True
+        tenant_uid_idx = kwargs["column_names"].index("tenant_uid")
+        # Data is columnar
+        assert kwargs["data"][tenant_uid_idx] == [1, 1]
+        await writer.close()
+
+    async def test_flush_on_max_bytes(self, mock_client: Mock):
+        writer = _writer(mock_client, max_bytes=100, flush_interval_seconds=100)
+
+        future = await writer.add(_run(input_preview="a" * 200))
+        await asyncio.wait_for(future, 1)
+
+        mock_client.insert.assert_awaited_once()
+        await writer.close()
+
+    async def test_groups_by_columns(self, mock_client: Mock):
+        writer = _writer(mock_client, max_rows=3, flush_interval_seconds=100)
+
+        futures = [await writer.add(_run()), await writer.add(_run(author_uid=1)), await writer.add(_run())]
+        await asyncio.wait_for(asyncio.gather(*futures), 1)
+
+        # None values are excluded so the second run has an extra column
+        assert mock_client.insert.await_count == 2
+        await writer.close()
+
+    async def test_failure_is_propagated(self, mock_client: Mock):
+        mock_client.insert.side_effect = ValueError("boom")
+        writer = _writer(mock_client, max_rows=1, flush_interval_seconds=100)
+
+        future = await writer.add(_run())
+        with pytest.raises(ValueError, match="boom"):
+            await asyncio.wait_for(future, 1)
+        await writer.close()
+
+    async def test_close_drains(self, mock_client: Mock):
+        writer = _writer(mock_client, flush_interval_seconds=100)
+
+        future = await writer.add(_run())
+        assert not future.done()
+
+        await writer.close()
+
+        assert future.done()
+        mock_client.insert.assert_awaited_once()
@@ -0,0 +1,91 @@
+import logging
+import os
+from datetime import timedelta
+
+from redis.asyncio import Redis
+
+from core.domain.agent_run import AgentRun
+from core.utils.coroutines import capture_errors
+from core.utils.lru.lru_cache import TLRUCache
+
+_logger = logging.getLogger(__name__)
+
+
+class ClickhouseRunCache:
+    """A two tier cache of the successful runs returned by fetch_cached_run, keyed by cache hash.
+
+    A small in-process LRU sits on top of redis so that hot deterministic inputs are served
+    without a network round trip. Both tiers are filled when a run is stored and when a run is
+    found in Clickhouse. Runs are copied on the way out since callers mutate them."""
+
+    def __init__(
+        self,
+        redis_client: Redis | None,
+        ttl_seconds: float = 3600,
+        local_capacity: int = 1000,
+        local_ttl_seconds: float = 60,
+        max_entry_bytes: int = 256 * 1024,
+    ):
+        self._redis_client = redis_client
+        self._ttl_seconds = ttl_seconds
+        local_ttl = timedelta(seconds=min(local_ttl_seconds, ttl_seconds))
+        self._local = TLRUCache[str, AgentRun](local_capacity, ttl=lambda _k, _v: local_ttl)
+        self._max_entry_bytes = max_entry_bytes
+
+    @classmethod
+    def _key(cls, cache_hash: str, task_schema_id: int):
+        return f"run_cache:{cache_hash}:{task_schema_id}"
+
+    async def get(self, cache_hash: str, task_schema_id: int) -> AgentRun | None:
+        key = self._key(cache_hash, task_schema_id)
+        if run := self._local.get(key):
+            return run.model_copy(deep=True)
+
+        if not self._redis_client:
+            return None
+
+        with capture_errors(_logger, "Failed to read run from cache"):
+            raw: bytes | None = await self._redis_client.get(key)  # pyright: ignore [reportUnknownMemberType]
+            if raw is None:
+                return None
+            run = AgentRun.model_validate_json(raw)
+            self._local[key] = run
+            return run.model_copy(deep=True)
+        return None
+
+    async def set(self, cache_hash: str, task_schema_id: int, run: AgentRun):
+        # Failed runs are never returned from the cache
+        if run.error or run.task_output is None:
+            return
+        key = self._key(cache_hash, task_schema_id)
+        with capture_errors(_logger, "Failed to store run in cache"):
+            serialized = run.model_dump_json()
+            if len(serialized) > self._max_entry_bytes:
+                return
+            self._local[key] = run.model_copy(deep=True)
+            if self._redis_client:
+                await self._redis_client.set(key, serialized, ex=int(self._ttl_seconds))  # pyright: ignore [reportUnknownMemberType]
+
+
+def _build_shared_run_cache() -> ClickhouseRunCache | None:
+    # A TTL of 0 disables the cache altogether
+    ttl_seconds = float(os.environ.get("RUN_CACHE_TTL_SECONDS", "3600"))
+    if ttl_seconds <= 0:
+        return None
+
+    from core.utils.redis_cache import shared_redis_client
+
+    return ClickhouseRunCache(
+        redis_client=shared_redis_client,
+        ttl_seconds=ttl_seconds,
+        local_capacity=int(os.environ.get("RUN_CACHE_LOCAL_CAPACITY", "1000")),
+        local_ttl_seconds=float(os.environ.get("RUN_CACHE_LOCAL_TTL_SECONDS", "60")),
+        max_entry_bytes=int(os.environ.get("RUN_CACHE_MAX_ENTRY_BYTES", str(256 * 1024))),
+    )
+
+
+_shared_run_cache = _build_shared_run_cache()
+
+
+def shared_run_cache() -> ClickhouseRunCache | None:
+    return _shared_run_cache
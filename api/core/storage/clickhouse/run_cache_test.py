@@ -0,0 +1,58 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.domain.error_response import ErrorResponse
+from core.storage.clickhouse.run_cache import ClickhouseRunCache
+from tests.models import task_run_ser
+
+
+@pytest.fixture
+def mock_redis():
+    mock = AsyncMock()
+    mock.get.return_value = None
+    return mock
+
+
+@pytest.fixture
+def run_cache(mock_redis: AsyncMock):
+    return ClickhouseRunCache(redis_client=mock_redis, ttl_seconds=10, local_capacity=2)
+
+
+class TestGetSet:
+    async def test_local_hit(self, run_cache: ClickhouseRunCache, mock_redis: AsyncMock):
+        run = task_run_ser(id="run_1")
+        await run_cache.set("hash", 1, run)
+        mock_redis.set.assert_awaited_once_with("run_cache:hash:1", run.model_dump_json(), ex=10)
+
+        cached = await run_cache.get("hash", 1)
+        assert cached == run
+        # Runs are copied on the way out
+        assert cached is not run
+        mock_redis.get.assert_not_called()
+
+        assert await run_cache.get("hash", 2) is None
+
+    async def test_redis_hit(self, run_cache: ClickhouseRunCache, mock_redis: AsyncMock):
+        run = task_run_ser(id="run_1")
+        mock_redis.get.return_value = run.model_dump_json().encode()
+
+        assert await run_cache.get("hash", 1) == run
+        # The local tier is filled
+        assert await run_cache.get("hash", 1) == run
+        mock_redis.get.assert_awaited_once_with("run_cache:hash:1")
+
+    async def test_redis_failure(self, run_cache: ClickhouseRunCache, mock_redis: AsyncMock):
+        mock_redis.get.side_effect = Exception("redis is down")
+        assert await run_cache.get("hash", 1) is None
+
+    async def test_failed_runs_are_not_stored(self, run_cache: ClickhouseRunCache, mock_redis: AsyncMock):
+        await run_cache.set("hash", 1, task_run_ser(error=ErrorResponse.Error(message="error")))
+        mock_redis.set.assert_not_called()
+        assert await run_cache.get("hash", 1) is None
+
+    async def test_oversized_runs_are_not_stored(self, mock_redis: AsyncMock):
+        run_cache = ClickhouseRunCache(redis_client=mock_redis, max_entry_bytes=10)
+        await run_cache.set("hash", 1, task_run_ser())
+        mock_redis.set.assert_not_called()
+        assert await run_cache.get("hash", 1) is None
@@ -4,6 +4,7 @@ from redis.asyncio import Redis
 
 from core.domain.events import EventRouter
 from core.storage.clickhouse.clickhouse_client import ClickhouseClient
+from core.storage.clickhouse.run_cache import shared_run_cache
 from core.storage.key_value_storage import KeyValueStorage
 from core.storage.mongo.mongo_storage import MongoStorage
 from core.storage.mongo.mongo_types import AsyncClient
@@ -39,6 +40,7 @@ class CombinedStorage(MongoStorage):
             ClickhouseClient(
                 connection_string=clickhouse_dsn,
                 tenant_uid=tenant_uid,
+                run_cache=shared_run_cache(),
             )
             if clickhouse_dsn
             else None
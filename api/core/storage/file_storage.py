@@ -1,5 +1,12 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import NamedTuple, Protocol
 
+from core.domain.metrics import send_gauge
+from core.utils.background import add_background_task
+
 
 class FileData(NamedTuple):
     contents: bytes
@@ -13,3 +20,36 @@ class CouldNotStoreFileError(Exception):
 
 class FileStorage(Protocol):
     async def store_file(self, file: FileData, folder_path: str) -> str: ...
+
+
+class UploadLimiter:
+    """Bounds the number of concurrent uploads of a file storage so that a job storing many files
+    does not exhaust the connection pool. The time spent waiting for a slot and the number of active
+    and waiting uploads are sent as metrics."""
+
+    def __init__(self, storage: str, max_concurrent_uploads: int):
+        self._storage = storage
+        self._semaphore = asyncio.Semaphore(max_concurrent_uploads)
+        self.active = 0
+        self.waiting = 0
+
+    async def _send_metrics(self, start: float):
+        await send_gauge("file_storage_upload_wait", time.time() - start, timestamp=start, storage=self._storage)
+        await send_gauge("file_storage_uploads", self.active, storage=self._storage, state="active")
+        await send_gauge("file_storage_uploads", self.waiting, storage=self._storage, state="waiting")
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        start = time.time()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            add_background_task(self._send_metrics(start))
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
@@ -0,0 +1,24 @@
+import asyncio
+
+from core.storage.file_storage import UploadLimiter
+
+
+class TestUploadLimiter:
+    async def test_bounds_concurrent_uploads(self):
+        limiter = UploadLimiter("test", max_concurrent_uploads=2)
+        max_active = 0
+
+        max_waiting = 0
+
+        async def _upload():
+            nonlocal max_active, max_waiting
+            async with limiter.slot():
+                max_active = max(max_active, limiter.active)
+                await asyncio.sleep(0.01)
+                max_waiting = max(max_waiting, limiter.waiting)
+
+        await asyncio.gather(*(_upload() for _ in range(5)))
+        assert max_active == 2
+        assert max_waiting == 3
+        assert limiter.active == 0
+        assert limiter.waiting == 0
@@ -145,6 +145,11 @@ def reviews_benchmark_col(base_storage: MongoStorage):
     return base_storage._review_benchmarks_collection  # pyright: ignore [reportPrivateUsage]
 
 
+@pytest.fixture(scope="function")
+def review_benchmark_slices_col(base_storage: MongoStorage):
+    return base_storage._review_benchmark_slices_collection  # pyright: ignore [reportPrivateUsage]
+
+
 @pytest.fixture(scope="function")
 def task_deployments_col(base_storage: MongoStorage):
     return base_storage._task_deployments_collection  # pyright: ignore [reportPrivateUsage]
@@ -174,6 +179,7 @@ def all_collections(
     input_evaluations_col: AsyncCollection,
     reviews_col: AsyncCollection,
     reviews_benchmark_col: AsyncCollection,
+    review_benchmark_slices_col: AsyncCollection,
     task_deployments_col: AsyncCollection,
     task_group_semvers_col: AsyncCollection,
     changelogs_col: AsyncCollection,
@@ -197,6 +203,7 @@ def all_collections(
         input_evaluations_col,
         reviews_col,
         reviews_benchmark_col,
+        review_benchmark_slices_col,
         task_deployments_col,
         task_group_semvers_col,
         changelogs_col,
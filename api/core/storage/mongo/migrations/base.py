@@ -109,6 +109,10 @@ class AbstractMigration(ABC):
     def _review_benchmarks_collection(self) -> AsyncCollection:
         return self.storage._review_benchmarks_collection  # pyright: ignore [reportPrivateUsage]
 
+    @property
+    def _review_benchmark_slices_collection(self) -> AsyncCollection:
+        return self.storage._review_benchmark_slices_collection  # pyright: ignore [reportPrivateUsage]
+
     @property
     def _task_deployments_collection(self) -> AsyncCollection:
         return self.storage._task_deployments_collection  # pyright: ignore [reportPrivateUsage]
@@ -57,6 +57,9 @@ from core.storage.mongo.migrations.migrations.m2025_05_01_tools_indices import A
 from core.storage.mongo.migrations.migrations.m2025_05_05_add_org_slack_and_hashed_key_indices import (
     AddOrgSlackAndHashedKeyIndicesMigration,
 )
+from core.storage.mongo.migrations.migrations.m2025_05_20_review_benchmark_slices import (
+    AddReviewBenchmarkSlicesIndicesMigration,
+)
 from core.storage.mongo.mongo_storage import MongoStorage
 
 MIGRATIONS: list[type[AbstractMigration]] = [
@@ -93,6 +96,7 @@ MIGRATIONS: list[type[AbstractMigration]] = [
     FixOrgIndexMigration,
     AddToolsIndicesMigration,
     AddOrgSlackAndHashedKeyIndicesMigration,
+    AddReviewBenchmarkSlicesIndicesMigration,
 ]
 
 
@@ -0,0 +1,21 @@
+from core.storage.mongo.migrations.base import AbstractMigration
+
+
+class AddReviewBenchmarkSlicesIndicesMigration(AbstractMigration):
+    async def apply(self):
+        await self._review_benchmark_slices_collection.create_index(
+            [
+                ("tenant", 1),
+                ("task_id", 1),
+                ("task_schema_id", 1),
+                ("generation", 1),
+                ("input_hash", 1),
+                ("iteration", 1),
+            ],
+            name="by_generation_input_hash_iteration_unique",
+            unique=True,
+            background=True,
+        )
+
+    async def rollback(self):
+        await self._review_benchmark_slices_collection.drop_index("by_generation_input_hash_iteration_unique")
@@ -29,6 +29,10 @@ class TaskReviewBenchmarkDocument(BaseDocumentWithID, TaskIdAndSchemaMixin):
 
         updated_at: datetime | None = None
 
+        # Whether the slices per input hash of the version are stored in the current slices generation,
+        # false when the version was added after the last reconciliation
+        has_input_slices: bool = False
+
         def to_domain(self) -> ReviewBenchmark.VersionAggregation:
             return ReviewBenchmark.VersionAggregation(
                 iteration=self.iteration,
@@ -48,6 +52,13 @@ class TaskReviewBenchmarkDocument(BaseDocumentWithID, TaskIdAndSchemaMixin):
 
     is_loading_new_ai_reviewer: bool = False
 
+    aggregates_revision: int = 0
+    reconciled_at: datetime | None = None
+    # The generation of the slices that match the aggregates, replaced at every reconciliation
+    slices_generation: str | None = None
+    # Input hashes whose slices are being written, mapped to the revision of the aggregates that include them
+    pending_slices: dict[str, int] = Field(default_factory=dict)
+
     results: list[VersionAggregation] = Field(default_factory=list)
 
     def to_domain(self) -> ReviewBenchmark:
@@ -57,3 +68,13 @@ class TaskReviewBenchmarkDocument(BaseDocumentWithID, TaskIdAndSchemaMixin):
             is_loading_new_ai_reviewer=self.is_loading_new_ai_reviewer,
             results=[VersionAggregation.to_domain() for VersionAggregation in self.results],
         )
+
+
+class TaskReviewBenchmarkSliceDocument(BaseDocumentWithID, TaskIdAndSchemaMixin):
+    """The contribution of the runs of a single input hash to the aggregates of a benchmarked version"""
+
+    generation: str = ""
+    iteration: int = 0
+    input_hash: str = ""
+    # Values of a RunReviewSlice
+    slice: list[int | float] = Field(default_factory=list)
@@ -11,6 +11,7 @@ from core.domain.fields.internal_reasoning_steps import InternalReasoningStep
 from core.domain.llm_completion import LLMCompletion as DLLMCompletion
 from core.domain.llm_usage import LLMUsage
 from core.domain.models import Provider
+from core.domain.run_cursor import RunCursor
 from core.domain.search_query import SearchQuery
 from core.domain.task_group import TaskGroup
 from core.domain.task_group_properties import TaskGroupProperties
@@ -21,6 +22,7 @@ from core.utils.fields import datetime_factory
 from core.utils.iter_utils import safe_map_optional
 
 from ..utils import (
+    add_filter,
     projection,
     query_set_filter,
 )
@@ -322,8 +324,27 @@ class TaskRunDocument(BaseDocumentWithStrID):
             for key, value in query.metadata.items():
                 filter[f"metadata.{key}"] = value
 
+        if query.cursor:
+            cls.add_cursor_filter(filter, query.cursor)
+
         return filter
 
+    @classmethod
+    def add_cursor_filter(cls, filter: dict[str, Any], cursor: RunCursor):
+        """Restricts the filter to the runs strictly after the cursor in the (created_at, _id)
+        descending order. Any existing range on the creation date is preserved"""
+        # Upper bound for the index scan, the $or below is what enforces the position of the cursor
+        filter.setdefault("created_at", {}).setdefault("$lte", cursor.created_at)
+        # Runs that share the creation date of the cursor are ordered by id
+        add_filter(
+            filter,
+            "$or",
+            [
+                {"created_at": {"$lt": cursor.created_at}},
+                {"created_at": cursor.created_at, "_id": {"$lt": cursor.run_id}},
+            ],
+        )
+
     @classmethod
     def build_project(
         cls,
@@ -340,8 +361,9 @@ class TaskRunDocument(BaseDocumentWithStrID):
         )
 
     @classmethod
-    def build_sort(cls, query: SerializableTaskRunQuery) -> tuple[str, int] | None:
-        return ("created_at", -1)
+    def build_sort(cls, query: SerializableTaskRunQuery) -> list[tuple[str, int]]:
+        # The id breaks ties between runs created at the same time so that cursors are stable
+        return [("created_at", -1), ("_id", -1)]
 
     # @classmethod
     # def _build_array_length_filter(cls, search_field: FieldQuery) -> dict[str, Any]:
@@ -1,3 +1,7 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from core.domain.run_cursor import RunCursor
 from core.storage.mongo.models.task_run_document import TaskRunDocument
 from tests import models
 
@@ -9,3 +13,20 @@ def test_resource_conversion_sanity() -> None:
     converted = schema.to_resource()
 
     assert task_run_resource == converted
+
+
+def test_add_cursor_filter_preserves_date_range() -> None:
+    created_after = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    created_before = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    cursor = RunCursor(c=datetime(2025, 2, 1, tzinfo=timezone.utc), t=1, r="run_id")
+    filter: dict[str, Any] = {"created_at": {"$gt": created_after, "$lte": created_before}}
+
+    TaskRunDocument.add_cursor_filter(filter, cursor)
+
+    assert filter == {
+        "created_at": {"$gt": created_after, "$lte": created_before},
+        "$or": [
+            {"created_at": {"$lt": cursor.created_at}},
+            {"created_at": cursor.created_at, "_id": {"$lt": "run_id"}},
+        ],
+    }
@@ -49,6 +49,7 @@ from core.storage.mongo.partials.task_groups import MongoTaskGroupStorage
 from core.storage.mongo.partials.task_inputs import MongoTaskInputStorage
 from core.storage.mongo.partials.task_variants import MongoTaskVariantsStorage
 from core.storage.mongo.partials.transcriptions import MongoTranscriptionStorage
+from core.storage.mongo.run_group_cache import shared_run_group_cache
 from core.storage.task_group_storage import TaskGroupStorage
 from core.storage.task_input_storage import TaskInputsStorage
 from core.storage.task_run_storage import TaskRunStorage
@@ -65,6 +66,8 @@ logger = logging.getLogger(__name__)
 
 
 class MongoStorage(BackendStorage):
+    run_group_cache = shared_run_group_cache()
+
     def __init__(
         self,
         tenant: str,
@@ -149,6 +152,10 @@ class MongoStorage(BackendStorage):
     def _review_benchmarks_collection(self) -> AsyncCollection:
         return self._get_collection("task_run_review_benchmarks")
 
+    @property
+    def _review_benchmark_slices_collection(self) -> AsyncCollection:
+        return self._get_collection("task_run_review_benchmark_slices")
+
     @property
     def _task_schemas_collection(self) -> AsyncCollection:
         return self._get_collection("task_schemas")
@@ -263,7 +270,11 @@ class MongoStorage(BackendStorage):
 
     @property
     def review_benchmarks(self):
-        return MongoReviewsBenchmarkStorage(self._tenant_tuple, self._review_benchmarks_collection)
+        return MongoReviewsBenchmarkStorage(
+            self._tenant_tuple,
+            self._review_benchmarks_collection,
+            self._review_benchmark_slices_collection,
+        )
 
     @property
     def task_deployments(self):
@@ -543,7 +554,10 @@ class MongoStorage(BackendStorage):
         run_is_external: bool,
         user: Optional[UserIdentifier],
         disable_autosave: bool | None = None,
+        from_run_group_cache: bool = False,
     ) -> TaskGroupDocument:
+        """from_run_group_cache allows returning a cached group, that only contains the fields
+        stored with a run"""
         if not group.hash or not group.task_id or not group.properties or not group.tenant:
             raise ValueError("Invalid group")
 
@@ -565,9 +579,20 @@ class MongoStorage(BackendStorage):
                 # in between the 2 steps below
                 return None
 
+        if (
+            from_run_group_cache
+            and self.run_group_cache
+            and (
+                cached := self.run_group_cache.get_group(self._tenant, group.task_id, group.task_schema_id, group.hash)
+            )
+        ):
+            return cached
+
         # If the group exists with the provided hash, then we can just return it
         existing = await _find_group()
         if existing:
+            if self.run_group_cache:
+                self.run_group_cache.set_group(self._tenant, existing)
             return existing
         if run_is_external:
             # When the run is external (aka the tenant that created the run is not the current tenant)
@@ -650,6 +675,8 @@ class MongoStorage(BackendStorage):
             ),
         )
 
+        if self.run_group_cache:
+            self.run_group_cache.set_group(self._tenant, group)
         return group
 
     # TODO: remove this method when we can get rid of the CLI
@@ -688,12 +715,17 @@ class MongoStorage(BackendStorage):
             logger.warning("Task schema id not found, storing task")
             task, _ = await self.store_task_resource(task)
 
+        if not task.task_uid and self.run_group_cache:
+            task.task_uid = self.run_group_cache.get_task_uid(self._tenant, task.task_id) or 0
+
         if not task.task_uid:
             # This is always true for now, we should re-enable this warning when all task variants have a uid
             # logger.warning("Task uid not found, fetching task info")
             try:
                 info = await self.tasks.get_task_info(task.task_id)
                 task.task_uid = info.uid
+                if self.run_group_cache:
+                    self.run_group_cache.set_task_uid(self._tenant, task.task_id, info.uid)
             except ObjectNotFoundException:
                 logger.exception("Task info not found, skipping task uid assignment", extra={"task_id": task.task_id})
 
@@ -710,7 +742,12 @@ class MongoStorage(BackendStorage):
             resource=run.group,
         )
         group.tenant_uid = self._tenant_uid
-        group = await self._get_or_create_run_group(group, run_is_external=run_is_external, user=user)
+        group = await self._get_or_create_run_group(
+            group,
+            run_is_external=run_is_external,
+            user=user,
+            from_run_group_cache=True,
+        )
 
         run.group = group.to_resource()
         run.is_active = source.is_active if source else None
@@ -977,6 +1014,7 @@ class MongoStorage(BackendStorage):
         await self._input_evaluations_collection.delete_many({"task_id": task_id, **self._tenant_filter()})
         await self._reviews_collection.delete_many({"task_id": task_id, **self._tenant_filter()})
         await self._review_benchmarks_collection.delete_many({"task_id": task_id, **self._tenant_filter()})
+        await self._review_benchmark_slices_collection.delete_many({"task_id": task_id, **self._tenant_filter()})
         await self._task_deployments_collection.delete_many({"task_id": task_id, **self._tenant_filter()})
         await self._task_group_semvers_collection.delete_many({"task_id": task_id, **self._tenant_filter()})
         await self._feedback_collection.delete_many({"task_id": task_id, **self._tenant_uid_filter()})
@@ -114,7 +114,7 @@ class AsyncCollection(Protocol):
 
     async def distinct(self, key: str, filter: dict[str, Any], hint: str | None = None) -> list[Any]: ...
 
-    async def bulk_write(self, operations: list[Any]) -> BulkWriteResult: ...
+    async def bulk_write(self, operations: list[Any], ordered: bool = True) -> BulkWriteResult: ...
 
 
 class AsyncDatabase(Protocol):
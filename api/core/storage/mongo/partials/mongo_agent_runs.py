@@ -7,6 +7,7 @@ from typing_extensions import Any, override
 
 from core.domain.agent_run import AgentRun, AgentRunBase
 from core.domain.errors import OperationTimeout
+from core.domain.run_cursor import RunCursor
 from core.domain.search_query import SearchQuery
 from core.domain.task_evaluation import TaskEvaluation
 from core.domain.task_run_aggregate_per_day import TaskRunAggregatePerDay
@@ -35,14 +36,14 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
             _set["updated_at"] = datetime.now(timezone.utc)
         return update
 
-    @override
-    async def aggregate_runs(
+    def _aggregate_runs_pipeline(
         self,
         task_id: TaskTuple,
         task_schema_id: int,
         task_input_hashes: set[str],
         group_ids: set[str] | None,
-    ):
+        group_by: dict[str, str] | str,
+    ) -> list[dict[str, Any]]:
         filter = {
             "task.id": task_id[0],
             "task.schema_id": task_schema_id,
@@ -51,11 +52,12 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
             filter["task_input_hash"] = query_set_filter(task_input_hashes, True)
         if group_ids:
             filter["group.hash"] = query_set_filter(group_ids, True)
-        pipeline = [
+        return [
             {"$match": filter},
             {
                 "$project": {
                     "version_id": "$group.hash",
+                    "task_input_hash": 1,
                     "status": 1,
                     "cost_usd": 1,
                     "duration_seconds": 1,
@@ -64,7 +66,7 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
             },
             {
                 "$group": {
-                    "_id": "$version_id",
+                    "_id": group_by,
                     "total_run_count": {"$sum": 1},
                     "failed_run_count": {"$sum": {"$cond": [{"$eq": ["$status", "failure"]}, 1, 0]}},
                     "average_cost_usd": {"$avg": "$cost_usd"},
@@ -74,8 +76,38 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
             },
         ]
 
+    @override
+    async def aggregate_runs(
+        self,
+        task_id: TaskTuple,
+        task_schema_id: int,
+        task_input_hashes: set[str],
+        group_ids: set[str] | None,
+    ):
+        pipeline = self._aggregate_runs_pipeline(task_id, task_schema_id, task_input_hashes, group_ids, "$version_id")
         return {doc.pop("_id"): cast(RunAggregate, doc) async for doc in self._aggregate(pipeline, timeout_ms=30_000)}
 
+    @override
+    async def aggregate_runs_by_input_hash(
+        self,
+        task_id: TaskTuple,
+        task_schema_id: int,
+        task_input_hashes: set[str],
+        group_ids: set[str] | None,
+    ):
+        pipeline = self._aggregate_runs_pipeline(
+            task_id,
+            task_schema_id,
+            task_input_hashes,
+            group_ids,
+            {"version_id": "$version_id", "task_input_hash": "$task_input_hash"},
+        )
+        out: dict[str, dict[str, RunAggregate]] = {}
+        async for doc in self._aggregate(pipeline, timeout_ms=30_000):
+            key = doc.pop("_id")
+            out.setdefault(key["version_id"], {})[key["task_input_hash"]] = cast(RunAggregate, doc)
+        return out
+
     # ------------------------------------------------------------------
     # Utils
 
@@ -203,20 +235,24 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
         timeout_ms: int = 60_000,
         include: set[SerializableTaskRunField] | None = None,
         exclude: set[SerializableTaskRunField] | None = None,
+        cursor: RunCursor | None = None,
     ) -> AsyncIterator[AgentRun]:
         filter = TaskRunDocument.build_search_filter(self._tenant, task_uid[0], search_fields)
         project = projection(self._search_run_include())
+        if cursor:
+            TaskRunDocument.add_cursor_filter(filter, cursor)
+            offset = 0
 
         try:
-            cursor = self._find(
+            docs = self._find(
                 filter,
                 projection=project,
-                sort=[("created_at", -1)],
+                sort=[("created_at", -1), ("_id", -1)],
                 skip=offset,
                 limit=limit,
                 timeout_ms=timeout_ms,
             )
-            async for doc in cursor:
+            async for doc in docs:
                 yield doc.to_resource()
         except ExecutionTimeout as e:
             raise OperationTimeout() from e
@@ -362,7 +398,7 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
         project: dict[str, Any] | None,
         limit: int | None,
         offset: int | None,
-        sort_by: tuple[str, int] | None,
+        sort_by: list[tuple[str, int]],
         timeout_ms: int | None = None,
     ):
         def _map_unique_by(unique_by: TaskRunQueryUniqueBy):
@@ -377,7 +413,7 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
 
         pipeline: list[dict[str, Any]] = [
             {"$match": filter},
-            {"$sort": {"created_at": -1} if not sort_by else {sort_by[0]: sort_by[1]}},
+            {"$sort": dict(sort_by)},
             {"$group": {"_id": group_id, "doc": {"$first": "$$ROOT"}}},
             {"$replaceRoot": {"newRoot": "$doc"}},
         ]
@@ -404,8 +440,14 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
     ) -> AsyncIterator[AgentRun]:
         filter = TaskRunDocument.build_filter(self._tenant, query)
 
-        project = TaskRunDocument.build_project(include=query.include_fields, exclude=query.exclude_fields)
+        # The creation date is always needed to build the cursor of the next page
+        project = TaskRunDocument.build_project(
+            include={*query.include_fields, "created_at"} if query.include_fields else None,
+            exclude=query.exclude_fields - {"created_at"} if query.exclude_fields else query.exclude_fields,
+        )
         sort_by = TaskRunDocument.build_sort(query)
+        # The cursor is already part of the filter
+        offset = None if query.cursor else query.offset
 
         # TODO: test
         if query.unique_by:
@@ -414,7 +456,7 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
                 query.unique_by,
                 project,
                 query.limit,
-                query.offset,
+                offset,
                 sort_by,
                 timeout_ms=timeout_ms,
             )
@@ -423,8 +465,8 @@ class MongoTaskRunStorage(PartialStorage[TaskRunDocument], TaskRunStorage):
                 filter,
                 projection=project,
                 limit=query.limit,
-                skip=query.offset,
-                sort=[sort_by] if sort_by else None,
+                skip=offset,
+                sort=sort_by,
                 hint=hint,
                 timeout_ms=timeout_ms,
             )
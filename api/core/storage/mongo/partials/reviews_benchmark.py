@@ -1,22 +1,33 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from datetime import datetime
 from typing import Any
 
+from bson import ObjectId
+from pymongo import DeleteOne, UpdateOne
+
 from core.domain.errors import BadRequestError
 from core.domain.task_group_properties import TaskGroupProperties
 from core.storage import ObjectNotFoundException, TenantTuple
-from core.storage.mongo.models.task_review_benchmarks import TaskReviewBenchmarkDocument
+from core.storage.mongo.models.task_review_benchmarks import (
+    TaskReviewBenchmarkDocument,
+    TaskReviewBenchmarkSliceDocument,
+)
 from core.storage.mongo.mongo_types import AsyncCollection
 from core.storage.mongo.partials.base_partial_storage import PartialStorage
 from core.storage.mongo.utils import dump_model
-from core.storage.review_benchmark_storage import RunReviewAggregateWithIteration
+from core.storage.review_benchmark_storage import (
+    ReviewBenchmarkAggregationState,
+    RunReviewAggregateWithIteration,
+    RunReviewSlice,
+)
 
 _BY_TASK_SCHEMA_UNIQUE = "by_task_schema_unique"
 
 
 class MongoReviewsBenchmarkStorage(PartialStorage[TaskReviewBenchmarkDocument]):
-    def __init__(self, tenant: TenantTuple, collection: AsyncCollection):
+    def __init__(self, tenant: TenantTuple, collection: AsyncCollection, slices_collection: AsyncCollection):
         super().__init__(tenant=tenant, collection=collection, document_type=TaskReviewBenchmarkDocument)
+        self._slices_collection = slices_collection
 
     async def get_review_benchmark(self, task_id: str, task_schema_id: int):
         document = await self._find_one(
@@ -91,39 +102,240 @@ class MongoReviewsBenchmarkStorage(PartialStorage[TaskReviewBenchmarkDocument]):
             throw_on_not_found=False,
         )
 
+    def _slices_filter(self, task_id: str, task_schema_id: int, generation: str | None, **kwargs: Any):
+        return self._tenant_filter(
+            {"task_id": task_id, "task_schema_id": task_schema_id, "generation": generation, **kwargs},
+        )
+
+    async def _insert_slices(
+        self,
+        task_id: str,
+        task_schema_id: int,
+        generation: str,
+        slices: Mapping[int, Mapping[str, RunReviewSlice]],
+    ):
+        docs = [
+            dump_model(
+                TaskReviewBenchmarkSliceDocument(
+                    tenant=self._tenant,
+                    tenant_uid=self._tenant_uid,
+                    task_id=task_id,
+                    task_schema_id=task_schema_id,
+                    generation=generation,
+                    iteration=iteration,
+                    input_hash=h,
+                    slice=list(s),
+                ),
+            )
+            for iteration, iteration_slices in slices.items()
+            for h, s in iteration_slices.items()
+        ]
+        if docs:
+            await self._slices_collection.insert_many(docs, ordered=False)
+
     async def update_benchmark(
         self,
         task_id: str,
         task_schema_id: int,
         aggregates: Iterable[RunReviewAggregateWithIteration],
         now: datetime,
-    ):
+        slices: Mapping[int, Mapping[str, RunReviewSlice]] | None = None,
+        revision: int | None = None,
+    ) -> bool:
         sets: dict[str, Any] = {}
         array_filters: list[dict[str, Any]] = []
 
         for i, agg in enumerate(aggregates):
-            # Only updating fields that have not been updated since "now"
-            array_filters.append(
-                {
-                    f"r{i}.iteration": agg["iteration"],
-                    "$or": [
-                        {f"r{i}.updated_at": {"$exists": False}},
-                        {f"r{i}.updated_at": {"$lt": now}},
-                    ],
-                },
-            )
+            if slices is not None:
+                # The revision guards the whole update against concurrent deltas
+                array_filters.append({f"r{i}.iteration": agg["iteration"]})
+            else:
+                # Only updating fields that have not been updated since "now"
+                array_filters.append(
+                    {
+                        f"r{i}.iteration": agg["iteration"],
+                        "$or": [
+                            {f"r{i}.updated_at": {"$exists": False}},
+                            {f"r{i}.updated_at": {"$lt": now}},
+                        ],
+                    },
+                )
 
             for k, v in self._updates_for_aggregates(agg, f"$[r{i}]", now):
                 # Can't use list comprehension here since we have nested loops
                 sets[k] = v  # noqa: PERF403
 
-        await self._update_one(
-            {"task_id": task_id, "task_schema_id": task_schema_id},
-            {"$set": sets},
-            array_filters=array_filters,
-            hint=_BY_TASK_SCHEMA_UNIQUE,
+            if slices is not None:
+                sets[f"results.$[r{i}].has_input_slices"] = agg["iteration"] in slices
+
+        if slices is None:
+            await self._update_one(
+                {"task_id": task_id, "task_schema_id": task_schema_id},
+                {"$set": sets},
+                array_filters=array_filters,
+                hint=_BY_TASK_SCHEMA_UNIQUE,
+            )
+            return True
+
+        # Slices are written to a new generation that only becomes visible once the benchmark points to it
+        generation = str(ObjectId())
+        await self._insert_slices(task_id, task_schema_id, generation, slices)
+
+        sets["reconciled_at"] = now
+        sets["slices_generation"] = generation
+        sets["pending_slices"] = {}
+        filter: dict[str, Any] = {"task_id": task_id, "task_schema_id": task_schema_id}
+        if revision is not None:
+            filter["aggregates_revision"] = revision
+        try:
+            previous = await self._find_one_and_update(
+                filter,
+                {"$set": sets, "$inc": {"aggregates_revision": 1}},
+                projection={"slices_generation": 1},
+                array_filters=array_filters,
+                hint=_BY_TASK_SCHEMA_UNIQUE,
+            )
+        except ObjectNotFoundException:
+            # The aggregates were updated while the slices were computed
+            await self._slices_collection.delete_many(self._slices_filter(task_id, task_schema_id, generation))
+            return False
+        # Only removing the generation that was replaced, a concurrent reconciliation
+        # may have already pointed the benchmark to its own generation
+        if previous.slices_generation:
+            await self._slices_collection.delete_many(
+                self._slices_filter(task_id, task_schema_id, previous.slices_generation),
+            )
+        return True
+
+    @classmethod
+    def _total_slice(cls, result: TaskReviewBenchmarkDocument.VersionAggregation):
+        return RunReviewSlice.from_aggregate(
+            RunReviewAggregateWithIteration(
+                iteration=result.iteration,
+                in_progress_review_count=result.in_progress_review_count,
+                positive_review_count=result.positive_review_count,
+                positive_user_review_count=result.positive_user_review_count,
+                negative_review_count=result.negative_review_count,
+                negative_user_review_count=result.negative_user_review_count,
+                unsure_review_count=result.unsure_review_count,
+                average_cost_usd=result.average_cost_usd,
+                average_duration_seconds=result.average_duration_seconds,
+                total_run_count=result.total_run_count or 0,
+                failed_run_count=result.run_failed_count,
+            ),
         )
 
+    async def get_aggregates_revision(self, task_id: str, task_schema_id: int) -> int | None:
+        try:
+            document = await self._find_one_doc(
+                {"task_id": task_id, "task_schema_id": task_schema_id},
+                projection={"aggregates_revision": 1},
+                hint=_BY_TASK_SCHEMA_UNIQUE,
+            )
+        except ObjectNotFoundException:
+            return None
+        return document.get("aggregates_revision", 0)
+
+    async def get_aggregation_state(self, task_id: str, task_schema_id: int, input_hash: str):
+        try:
+            document = await self._find_one(
+                {"task_id": task_id, "task_schema_id": task_schema_id},
+                projection={"results.run_in_progress_ids": 0},
+                hint=_BY_TASK_SCHEMA_UNIQUE,
+            )
+        except ObjectNotFoundException:
+            return None
+
+        by_iteration: dict[int, RunReviewSlice] = {}
+        if document.slices_generation:
+            cursor = self._slices_collection.find(
+                self._slices_filter(task_id, task_schema_id, document.slices_generation, input_hash=input_hash),
+                projection={"iteration": 1, "slice": 1},
+            )
+            async for doc in cursor:
+                by_iteration[doc["iteration"]] = RunReviewSlice._make(doc["slice"])
+
+        return ReviewBenchmarkAggregationState(
+            revision=document.aggregates_revision,
+            reconciled_at=document.reconciled_at,
+            totals={r.iteration: self._total_slice(r) for r in document.results},
+            slices={
+                r.iteration: ({input_hash: by_iteration[r.iteration]} if r.iteration in by_iteration else {})
+                if r.has_input_slices
+                else None
+                for r in document.results
+            },
+            slices_pending=input_hash in document.pending_slices,
+        )
+
+    async def apply_aggregate_deltas(
+        self,
+        task_id: str,
+        task_schema_id: int,
+        revision: int,
+        aggregates: Iterable[RunReviewAggregateWithIteration],
+        slices: Mapping[int, Mapping[str, RunReviewSlice | None]],
+        now: datetime,
+    ) -> bool:
+        sets: dict[str, Any] = {}
+        array_filters: list[dict[str, Any]] = []
+
+        for i, agg in enumerate(aggregates):
+            array_filters.append({f"r{i}.iteration": agg["iteration"]})
+            for k, v in self._updates_for_aggregates(agg, f"$[r{i}]", now):
+                sets[k] = v  # noqa: PERF403
+
+        # The hashes stay pending until their slices are written so that concurrent deltas
+        # do not compute a difference with a slice that does not match the aggregates
+        hashes = {h for iteration_slices in slices.values() for h in iteration_slices}
+        for h in hashes:
+            sets[f"pending_slices.{h}"] = revision + 1
+
+        try:
+            document = await self._find_one_and_update(
+                {"task_id": task_id, "task_schema_id": task_schema_id, "aggregates_revision": revision},
+                {"$set": sets, "$inc": {"aggregates_revision": 1}},
+                projection={"slices_generation": 1},
+                return_document=True,
+                array_filters=array_filters,
+                hint=_BY_TASK_SCHEMA_UNIQUE,
+            )
+        except ObjectNotFoundException:
+            return False
+
+        operations: list[UpdateOne | DeleteOne] = []
+        for iteration, iteration_slices in slices.items():
+            for h, s in iteration_slices.items():
+                filter = self._slices_filter(
+                    task_id,
+                    task_schema_id,
+                    document.slices_generation,
+                    input_hash=h,
+                    iteration=iteration,
+                )
+                if s is None:
+                    operations.append(DeleteOne(filter))
+                else:
+                    operations.append(
+                        UpdateOne(
+                            filter,
+                            {"$set": {"slice": list(s)}, "$setOnInsert": {"tenant_uid": self._tenant_uid}},
+                            upsert=True,
+                        ),
+                    )
+        if operations:
+            await self._slices_collection.bulk_write(operations, ordered=False)
+
+        # A later delta on the same hash owns the pending marker once it has bumped the revision
+        for h in hashes:
+            await self._update_one(
+                {"task_id": task_id, "task_schema_id": task_schema_id, f"pending_slices.{h}": revision + 1},
+                {"$unset": {f"pending_slices.{h}": ""}},
+                hint=_BY_TASK_SCHEMA_UNIQUE,
+                throw_on_not_found=False,
+            )
+        return True
+
     async def mark_as_loading_new_ai_reviewer(
         self,
         task_id: str,
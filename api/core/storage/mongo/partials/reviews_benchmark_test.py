@@ -13,7 +13,7 @@ from core.storage.mongo.mongo_storage import MongoStorage
 from core.storage.mongo.mongo_types import AsyncCollection
 from core.storage.mongo.partials.reviews_benchmark import MongoReviewsBenchmarkStorage
 from core.storage.mongo.utils import dump_model
-from core.storage.review_benchmark_storage import RunReviewAggregateWithIteration
+from core.storage.review_benchmark_storage import RunReviewAggregateWithIteration, RunReviewSlice
 
 
 @pytest.fixture(scope="function")
@@ -372,6 +372,108 @@ class TestUpdateBenchmark:
         assert found.results[0].positive_review_count == 2
         assert found.results[1].positive_review_count == 0
 
+    async def test_incremental_updates(
+        self,
+        reviews_benchmark_storage: MongoReviewsBenchmarkStorage,
+        inserted_benchmark: TaskReviewBenchmarkDocument,
+        review_benchmark_slices_col: AsyncCollection,
+    ):
+        task_id, task_schema_id = inserted_benchmark.task_id, inserted_benchmark.task_schema_id
+        state = await reviews_benchmark_storage.get_aggregation_state(task_id, task_schema_id, "a")
+        assert state
+        assert state.revision == 0
+        assert state.reconciled_at is None
+        assert state.slices == {1: None, 2: None}
+
+        now = datetime(2022, 1, 2, tzinfo=timezone.utc)
+        slice_a = RunReviewSlice(total_run_count=1, total_cost_usd=2.5, positive_review_count=1)
+        slice_c = RunReviewSlice(total_run_count=1)
+        await reviews_benchmark_storage.update_benchmark(
+            task_id,
+            task_schema_id,
+            aggregates=[slice_a.add(slice_c).to_aggregate(1)],
+            now=now,
+            slices={1: {"a": slice_a, "c": slice_c}},
+        )
+
+        state = await reviews_benchmark_storage.get_aggregation_state(task_id, task_schema_id, "a")
+        assert state
+        assert state.revision == 1
+        assert state.reconciled_at == now
+        assert state.totals[1] == slice_a.add(slice_c)
+        # Only the slices of the requested hash are returned
+        assert state.slices == {1: {"a": slice_a}, 2: None}
+        assert not state.slices_pending
+
+        slice_b = RunReviewSlice(total_run_count=1, negative_review_count=1)
+        total = slice_c.add(slice_b)
+        assert await reviews_benchmark_storage.apply_aggregate_deltas(
+            task_id,
+            task_schema_id,
+            revision=1,
+            aggregates=[total.to_aggregate(1)],
+            slices={1: {"a": None, "b": slice_b}},
+            now=now,
+        )
+        # The revision has changed so the same delta can not be applied twice
+        assert not await reviews_benchmark_storage.apply_aggregate_deltas(
+            task_id,
+            task_schema_id,
+            revision=1,
+            aggregates=[total.to_aggregate(1)],
+            slices={1: {"b": slice_b}},
+            now=now,
+        )
+
+        state = await reviews_benchmark_storage.get_aggregation_state(task_id, task_schema_id, "b")
+        assert state
+        assert state.revision == 2
+        assert state.totals[1] == total
+        assert state.slices[1] == {"b": slice_b}
+        assert not state.slices_pending
+
+        state = await reviews_benchmark_storage.get_aggregation_state(task_id, task_schema_id, "a")
+        assert state
+        assert state.slices[1] == {}
+
+        found = await reviews_benchmark_storage.get_review_benchmark(task_id, task_schema_id)
+        assert found.results[0].total_run_count == 2
+        assert found.results[0].average_cost_usd is None
+        assert found.results[0].negative_review_count == 1
+
+        doc = await reviews_benchmark_storage._collection.find_one({"task_id": task_id})  # pyright: ignore [reportPrivateUsage]
+        assert doc
+        assert "input_slices" not in doc["results"][0]
+        assert doc["pending_slices"] == {}
+        generation = doc["slices_generation"]
+        assert {d["input_hash"] async for d in review_benchmark_slices_col.find({"task_id": task_id})} == {"b", "c"}
+
+        # A reconciliation that started before the delta is discarded
+        assert not await reviews_benchmark_storage.update_benchmark(
+            task_id,
+            task_schema_id,
+            aggregates=[slice_a.to_aggregate(1)],
+            now=datetime(2022, 1, 3, tzinfo=timezone.utc),
+            slices={1: {"a": slice_a}},
+            revision=1,
+        )
+        assert {d["input_hash"] async for d in review_benchmark_slices_col.find({"task_id": task_id})} == {"b", "c"}
+
+        # Reconciling again replaces the previous generation
+        assert await reviews_benchmark_storage.update_benchmark(
+            task_id,
+            task_schema_id,
+            aggregates=[slice_a.to_aggregate(1)],
+            now=datetime(2022, 1, 3, tzinfo=timezone.utc),
+            slices={1: {"a": slice_a}},
+            revision=2,
+        )
+        assert await reviews_benchmark_storage.get_aggregates_revision(task_id, task_schema_id) == 3
+        slice_docs = [d async for d in review_benchmark_slices_col.find({"task_id": task_id})]
+        assert len(slice_docs) == 1
+        assert slice_docs[0]["input_hash"] == "a"
+        assert slice_docs[0]["generation"] != generation
+
 
 class TestGetBenchmarkVersions:
     async def test_get_benchmark_versions(
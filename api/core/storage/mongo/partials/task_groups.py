@@ -1,14 +1,15 @@
 import asyncio
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from typing import Any
 
 from bson import ObjectId
+from pymongo import UpdateOne
 
 from core.domain.errors import DuplicateValueError, InternalError
 from core.domain.major_minor import MajorMinor
 from core.domain.task_group import TaskGroup, TaskGroupFields, TaskGroupIdentifier, TaskGroupQuery
-from core.domain.task_group_update import TaskGroupUpdate
+from core.domain.task_group_update import TaskGroupRunStats, TaskGroupUpdate
 from core.domain.users import UserIdentifier
 from core.domain.version_major import VersionMajor
 from core.storage import ObjectNotFoundException
@@ -88,6 +89,29 @@ class MongoTaskGroupStorage(PartialStorage[TaskGroupDocument]):
             {"$inc": {"run_count": increment}},
         )
 
+    async def bulk_update_run_stats(self, stats: Sequence[TaskGroupRunStats]) -> None:
+        operations: list[UpdateOne] = []
+        for stat in stats:
+            update: dict[str, Any] = {}
+            if stat.run_count:
+                update["$inc"] = {"run_count": stat.run_count}
+            if stat.last_active_at:
+                # Batches can be flushed out of order
+                update["$max"] = {"last_active_at": stat.last_active_at}
+            if not update:
+                continue
+            operations.append(
+                UpdateOne(
+                    self._tenant_filter(
+                        self._task_group_by_iteration_filter(stat.task_id, stat.task_schema_id, stat.iteration),
+                    ),
+                    update,
+                ),
+            )
+        if not operations:
+            return
+        await self._collection.bulk_write(operations, ordered=False)
+
     async def _update_task_group(
         self,
         filter: dict[str, Any],
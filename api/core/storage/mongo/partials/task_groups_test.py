@@ -10,7 +10,7 @@ from pymongo.errors import DuplicateKeyError
 from core.domain.major_minor import MajorMinor
 from core.domain.message import Message
 from core.domain.task_group import TaskGroupQuery
-from core.domain.task_group_update import TaskGroupUpdate
+from core.domain.task_group_update import TaskGroupRunStats, TaskGroupUpdate
 from core.storage import ObjectNotFoundException
 from core.storage.mongo.conftest import TENANT
 from core.storage.mongo.models.task_group import TaskGroupDocument
@@ -165,6 +165,40 @@ class TestUpdateTaskGroup:
         assert doc["notes"] == "Re-added notes"
 
 
+class TestBulkUpdateRunStats:
+    async def test_bulk_update_run_stats(
+        self,
+        task_groups_storage: MongoTaskGroupStorage,
+        task_run_group_col: AsyncCollection,
+    ):
+        last_active_at = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        await task_run_group_col.insert_many(
+            [
+                dump_model(_task_group(iteration=1, alias="a1", run_count=1)),
+                dump_model(_task_group(iteration=2, alias="a2", last_active_at=last_active_at)),
+                dump_model(_task_group(iteration=1, alias="a3", tenant="other")),
+            ],
+        )
+
+        await task_groups_storage.bulk_update_run_stats(
+            [
+                TaskGroupRunStats(TASK_ID, 1, 1, run_count=2, last_active_at=last_active_at),
+                # An older last active date does not override the stored one
+                TaskGroupRunStats(TASK_ID, 1, 2, run_count=1, last_active_at=datetime(2025, 1, 1, tzinfo=timezone.utc)),
+            ],
+        )
+
+        group1 = await task_groups_storage.get_task_group_by_iteration(TASK_ID, 1, 1)
+        assert group1.run_count == 3
+        assert group1.last_active_at == last_active_at
+        group2 = await task_groups_storage.get_task_group_by_iteration(TASK_ID, 1, 2)
+        assert group2.run_count == 1
+        assert group2.last_active_at == last_active_at
+        # Other tenants are not updated
+        other = await task_run_group_col.find_one({"tenant": "other"})
+        assert other and other["run_count"] == 0
+
+
 class TestAddBenchmarkForDataset:
     @pytest.fixture(scope="function", autouse=True)
     async def inserted_groups(self, task_groups_storage: MongoTaskGroupStorage, task_run_group_col: AsyncCollection):
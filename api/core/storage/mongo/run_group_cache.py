@@ -0,0 +1,68 @@
+import os
+from datetime import timedelta
+
+from core.storage.mongo.models.task_group import TaskGroupDocument
+from core.utils.lru.lru_cache import TLRUCache
+
+# tenant, task id, task schema id, hash
+RunGroupKey = tuple[str, str, int, str]
+
+
+class RunGroupCache:
+    """A process level cache of the values that are resolved for every stored run: the group document
+    by hash and the task uid by task id.
+
+    Only groups that have an iteration are cached and only with the fields that are stored with a run
+    (hash, alias, iteration, properties and tags), which never change once the iteration is assigned.
+    Other fields like the major and minor, aliases, is_favorite or notes are updated afterwards so cached
+    groups must not be returned outside of run storage. Cached documents are shared and must not be mutated."""
+
+    def __init__(self, capacity: int = 10_000, ttl_seconds: float = 3600):
+        ttl = timedelta(seconds=ttl_seconds)
+        self._groups = TLRUCache[RunGroupKey, TaskGroupDocument](capacity, ttl=lambda _k, _v: ttl)
+        self._task_uids = TLRUCache[tuple[str, str], int](capacity, ttl=lambda _k, _v: ttl)
+
+    def get_group(self, tenant: str, task_id: str, task_schema_id: int, hash: str) -> TaskGroupDocument | None:
+        return self._groups.get((tenant, task_id, task_schema_id, hash))
+
+    def set_group(self, tenant: str, group: TaskGroupDocument):
+        if not group.task_id or not group.hash or not group.iteration or group.is_external:
+            return
+        cached = TaskGroupDocument(
+            tenant=group.tenant,
+            tenant_uid=group.tenant_uid,
+            hash=group.hash,
+            task_id=group.task_id,
+            task_schema_id=group.task_schema_id,
+            iteration=group.iteration,
+            alias=group.alias,
+            properties=group.properties,
+            tags=group.tags,
+            similarity_hash=group.similarity_hash,
+        )
+        cached.id = group.id
+        self._groups[(tenant, group.task_id, group.task_schema_id, group.hash)] = cached
+
+    def get_task_uid(self, tenant: str, task_id: str) -> int | None:
+        return self._task_uids.get((tenant, task_id))
+
+    def set_task_uid(self, tenant: str, task_id: str, task_uid: int):
+        if task_uid:
+            self._task_uids[(tenant, task_id)] = task_uid
+
+
+def _build_shared_run_group_cache() -> RunGroupCache | None:
+    capacity = int(os.environ.get("RUN_GROUP_CACHE_SIZE", "10000"))
+    if capacity <= 0:
+        return None
+    return RunGroupCache(
+        capacity=capacity,
+        ttl_seconds=float(os.environ.get("RUN_GROUP_CACHE_TTL_SECONDS", "3600")),
+    )
+
+
+_shared_run_group_cache = _build_shared_run_group_cache()
+
+
+def shared_run_group_cache() -> RunGroupCache | None:
+    return _shared_run_group_cache
@@ -0,0 +1,50 @@
+from core.storage.mongo.models.task_group import TaskGroupDocument
+from core.storage.mongo.run_group_cache import RunGroupCache
+
+
+def _group(**kwargs: object) -> TaskGroupDocument:
+    return TaskGroupDocument.model_validate(
+        {"hash": "hash", "alias": "alias", "task_id": "task_id", "task_schema_id": 1, "iteration": 1, **kwargs},
+    )
+
+
+class TestRunGroupCache:
+    def test_get_group(self):
+        cache = RunGroupCache()
+        group = _group(properties={"model": "gpt-4o"}, tags=["model=gpt-4o"])
+        cache.set_group("tenant", group)
+
+        cached = cache.get_group("tenant", "task_id", 1, "hash")
+        assert cached == group
+        assert cache.get_group("other", "task_id", 1, "hash") is None
+        assert cache.get_group("tenant", "task_id", 2, "hash") is None
+
+    def test_only_run_fields_are_cached(self):
+        cache = RunGroupCache()
+        cache.set_group("tenant", _group(major=1, minor=2, aliases=["production"], is_favorite=True, notes="notes"))
+
+        cached = cache.get_group("tenant", "task_id", 1, "hash")
+        assert cached
+        assert cached.alias == "alias"
+        assert cached.iteration == 1
+        assert cached.major is None
+        assert cached.minor is None
+        assert cached.aliases is None
+        assert cached.is_favorite is None
+        assert cached.notes is None
+
+    def test_groups_without_iteration_are_not_cached(self):
+        cache = RunGroupCache()
+        cache.set_group("tenant", _group(iteration=0))
+        cache.set_group("tenant", _group(is_external=True))
+
+        assert cache.get_group("tenant", "task_id", 1, "hash") is None
+
+    def test_task_uid(self):
+        cache = RunGroupCache()
+        cache.set_task_uid("tenant", "task_id", 12)
+        cache.set_task_uid("tenant", "other_task_id", 0)
+
+        assert cache.get_task_uid("tenant", "task_id") == 12
+        assert cache.get_task_uid("tenant", "other_task_id") is None
+        assert cache.get_task_uid("other", "task_id") is None
@@ -1,6 +1,6 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from datetime import datetime
-from typing import Protocol, TypedDict
+from typing import NamedTuple, Protocol, TypedDict
 
 from core.domain.review_benchmark import ReviewBenchmark
 from core.domain.task_group_properties import TaskGroupProperties
@@ -21,6 +21,78 @@ class RunReviewAggregateWithIteration(TypedDict):
     failed_run_count: int | None
 
 
+class RunReviewSlice(NamedTuple):
+    """The contribution of the runs of a single input hash to the aggregate of a version.
+
+    Costs and durations are stored as sums so that slices can be added to and subtracted from
+    the version aggregates."""
+
+    total_run_count: int = 0
+    failed_run_count: int = 0
+    total_cost_usd: float = 0
+    total_duration_seconds: float = 0
+    in_progress_review_count: int = 0
+    positive_review_count: int = 0
+    positive_user_review_count: int = 0
+    negative_review_count: int = 0
+    negative_user_review_count: int = 0
+    unsure_review_count: int = 0
+
+    def add(self, other: "RunReviewSlice | None", factor: int = 1) -> "RunReviewSlice":
+        if other is None:
+            return self
+        return RunReviewSlice._make(a + factor * b for a, b in zip(self, other))
+
+    def has_reviews(self) -> bool:
+        return any(self[4:])
+
+    @classmethod
+    def from_aggregate(cls, agg: RunReviewAggregateWithIteration) -> "RunReviewSlice":
+        total_run_count = agg["total_run_count"] or 0
+        return cls(
+            total_run_count=total_run_count,
+            failed_run_count=agg["failed_run_count"] or 0,
+            total_cost_usd=(agg["average_cost_usd"] or 0) * total_run_count,
+            total_duration_seconds=(agg["average_duration_seconds"] or 0) * total_run_count,
+            in_progress_review_count=agg["in_progress_review_count"] or 0,
+            positive_review_count=agg["positive_review_count"] or 0,
+            positive_user_review_count=agg["positive_user_review_count"] or 0,
+            negative_review_count=agg["negative_review_count"] or 0,
+            negative_user_review_count=agg["negative_user_review_count"] or 0,
+            unsure_review_count=agg["unsure_review_count"] or 0,
+        )
+
+    def to_aggregate(self, iteration: int) -> RunReviewAggregateWithIteration:
+        return RunReviewAggregateWithIteration(
+            iteration=iteration,
+            in_progress_review_count=self.in_progress_review_count,
+            positive_review_count=self.positive_review_count,
+            positive_user_review_count=self.positive_user_review_count,
+            negative_review_count=self.negative_review_count,
+            negative_user_review_count=self.negative_user_review_count,
+            unsure_review_count=self.unsure_review_count,
+            average_cost_usd=self.total_cost_usd / self.total_run_count if self.total_run_count else None,
+            average_duration_seconds=self.total_duration_seconds / self.total_run_count
+            if self.total_run_count
+            else None,
+            total_run_count=self.total_run_count,
+            failed_run_count=self.failed_run_count,
+        )
+
+
+class ReviewBenchmarkAggregationState(NamedTuple):
+    # Incremented every time the aggregates are written, used for optimistic concurrency
+    revision: int
+    # The last time all versions were aggregated from scratch
+    reconciled_at: datetime | None
+    totals: dict[int, RunReviewSlice]
+    # Slices of the requested input hash for each iteration. None if the iteration was not aggregated
+    # since it was added to the benchmark
+    slices: dict[int, dict[str, RunReviewSlice] | None]
+    # True when the slices of the input hash are still being written by a concurrent update
+    slices_pending: bool = False
+
+
 class ReviewBenchmarkStorage(Protocol):
     async def get_benchmark_versions(
         self,
@@ -56,4 +128,38 @@ class ReviewBenchmarkStorage(Protocol):
         task_schema_id: int,
         aggregates: Iterable[RunReviewAggregateWithIteration],
         now: datetime,
-    ): ...
+        # When provided, the slices of each iteration are replaced and the benchmark is marked as reconciled
+        slices: Mapping[int, Mapping[str, RunReviewSlice]] | None = None,
+        # When provided with slices, the update is only applied if the aggregates revision has not changed
+        revision: int | None = None,
+    ) -> bool:
+        """Returns False if the revision of the benchmark has changed"""
+        ...
+
+    async def get_aggregates_revision(self, task_id: str, task_schema_id: int) -> int | None:
+        """Returns None if the benchmark does not exist"""
+        ...
+
+    async def get_aggregation_state(
+        self,
+        task_id: str,
+        task_schema_id: int,
+        input_hash: str,
+    ) -> ReviewBenchmarkAggregationState | None:
+        """Returns the aggregates with only the slices of the input hash.
+        Returns None if the benchmark does not exist"""
+        ...
+
+    async def apply_aggregate_deltas(
+        self,
+        task_id: str,
+        task_schema_id: int,
+        revision: int,
+        aggregates: Iterable[RunReviewAggregateWithIteration],
+        # Slices to replace per iteration and input hash, None removes the slice
+        slices: Mapping[int, Mapping[str, RunReviewSlice | None]],
+        now: datetime,
+    ) -> bool:
+        """Writes the aggregates and slices only if the revision of the benchmark has not changed.
+        Returns False otherwise"""
+        ...
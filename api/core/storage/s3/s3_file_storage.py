@@ -2,17 +2,43 @@ import asyncio
 import hashlib
 import logging
 import mimetypes
-from typing import override
+from typing import Any, override
 from urllib.parse import urlparse
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-from core.storage.file_storage import CouldNotStoreFileError, FileData, FileStorage
+from core.storage.file_storage import CouldNotStoreFileError, FileData, FileStorage, UploadLimiter
+
+# boto3 clients are thread safe so a single client is shared by all storages with the same connection string
+# and pool size
+_shared_clients: dict[tuple[str, int], Any] = {}
+
+
+def _s3_client(connection_string: str, host: str, max_connections: int) -> Any:
+    if client := _shared_clients.get((connection_string, max_connections)):
+        return client
+    parsed = urlparse(connection_string)
+    client = boto3.client(
+        "s3",
+        endpoint_url=host,
+        aws_access_key_id=parsed.username,
+        aws_secret_access_key=parsed.password,
+        config=Config(max_pool_connections=max_connections),
+    )
+    _shared_clients[(connection_string, max_connections)] = client
+    return client
 
 
 class S3FileStorage(FileStorage):
-    def __init__(self, connection_string: str, bucket_name: str | None = None):
+    def __init__(
+        self,
+        connection_string: str,
+        bucket_name: str | None = None,
+        max_connections: int = 100,
+        max_concurrent_uploads: int = 20,
+    ):
         parsed = urlparse(connection_string)
         host = parsed.hostname
         port = parsed.port
@@ -22,12 +48,10 @@ class S3FileStorage(FileStorage):
             self.host += f":{port}"
         self.bucket_name = bucket_name or parsed.path.lstrip("/")
         self._logger = logging.getLogger(__name__)
-        self._s3_client = boto3.client(
-            "s3",
-            endpoint_url=self.host,
-            aws_access_key_id=parsed.username,
-            aws_secret_access_key=parsed.password,
-        )
+        self._s3_client = _s3_client(connection_string, self.host, max_connections)
+        # Uploads run in threads so they are also bounded by the connection pool size to avoid
+        # threads blocking while waiting for a connection
+        self._upload_limiter = UploadLimiter("s3", min(max_concurrent_uploads, max_connections))
 
     def _put_object(self, key: str, body: bytes, content_type: str):
         self._s3_client.put_object(
@@ -45,13 +69,14 @@ class S3FileStorage(FileStorage):
         key = f"{folder_path}/{content_hash}{extension or ''}"
 
         try:
-            await asyncio.get_running_loop().run_in_executor(
-                None,
-                self._put_object,
-                key,
-                file.contents,
-                file.content_type or "application/octet-stream",
-            )
+            async with self._upload_limiter.slot():
+                await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    self._put_object,
+                    key,
+                    file.contents,
+                    file.content_type or "application/octet-stream",
+                )
 
             return f"{self.host}/{self.bucket_name}/{key}"
         except ClientError as e:
@@ -62,3 +62,15 @@ async def test_store_file(s3_file_storage: S3FileStorage):
         content = await client.get(url)
         assert content.status_code == 200
         assert content.content == b"Hello, world!"
+
+
+def test_shared_client_per_pool_size():
+    connection_string = "s3://minio:miniosecret@localhost:9000/shared?secure=false"
+    storages = [
+        S3FileStorage(connection_string, max_connections=10),
+        S3FileStorage(connection_string, max_connections=10),
+        S3FileStorage(connection_string, max_connections=20),
+    ]
+    clients = [s._s3_client for s in storages]  # pyright: ignore[reportPrivateUsage]
+    assert clients[0] is clients[1]
+    assert clients[0] is not clients[2]
@@ -1,8 +1,8 @@
-from collections.abc import AsyncIterator, Iterable
+from collections.abc import AsyncIterator, Iterable, Sequence
 from typing import Protocol
 
 from core.domain.task_group import TaskGroup, TaskGroupFields, TaskGroupIdentifier, TaskGroupQuery
-from core.domain.task_group_update import TaskGroupUpdate
+from core.domain.task_group_update import TaskGroupRunStats, TaskGroupUpdate
 from core.domain.users import UserIdentifier
 from core.domain.version_major import VersionMajor
 
@@ -20,6 +20,10 @@ class TaskGroupStorage(Protocol):
 
     async def increment_run_count(self, task_id: str, task_schema_id: int, iteration: int, increment: int): ...
 
+    async def bulk_update_run_stats(self, stats: Sequence[TaskGroupRunStats]) -> None:
+        """Increment the run counts and update the last active dates of multiple groups at once"""
+        ...
+
     # TODO[versionv1]: this method is deprecated, use update_task_group_by_id instead
     async def update_task_group(
         self,
@@ -3,6 +3,7 @@ from datetime import date, datetime
 from typing import Any, AsyncIterator, NamedTuple, NotRequired, Protocol, TypedDict
 
 from core.domain.agent_run import AgentRun
+from core.domain.run_cursor import RunCursor
 from core.domain.search_query import SearchQuery
 from core.domain.task_run_aggregate_per_day import TaskRunAggregatePerDay
 from core.domain.task_run_query import SerializableTaskRunField, SerializableTaskRunQuery
@@ -68,9 +69,11 @@ class TaskRunStorage(TaskRunSystemStorage):
         timeout_ms: int = 60_000,
         include: set[SerializableTaskRunField] | None = None,
         exclude: set[SerializableTaskRunField] | None = None,
+        cursor: RunCursor | None = None,
     ) -> AsyncIterator[AgentRun]:
         """Search task runs based on the provided query.
         When no include or exclude fields are provided, the AgentRun contains the same fields as the AgentRunBase
+        When a cursor is provided, the offset is ignored and only runs after the cursor are returned
         """
         ...
 
@@ -101,6 +104,16 @@ class TaskRunStorage(TaskRunSystemStorage):
         """
         ...
 
+    async def aggregate_runs_by_input_hash(
+        self,
+        task_id: TaskTuple,
+        task_schema_id: int,
+        task_input_hashes: set[str],
+        group_ids: set[str] | None,
+    ) -> dict[str, dict[str, RunAggregate]]:
+        """Same as aggregate_runs but grouped by version_id and then by input hash"""
+        ...
+
     async def store_task_run(self, task_run: AgentRun) -> AgentRun: ...
 
     async def fetch_task_run_resource(
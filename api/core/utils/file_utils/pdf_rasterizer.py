@@ -0,0 +1,113 @@
+import asyncio
+import base64
+import hashlib
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+
+def rasterize_pdf(pdf_data: bytes, dpi: int) -> list[str]:
+    """Converts each page of a PDF to a base64 encoded JPEG. Runs in a worker process so it
+    only relies on its arguments."""
+    from pdf2image import convert_from_bytes  # pyright: ignore[reportUnknownVariableType]
+
+    images = convert_from_bytes(pdf_file=pdf_data, fmt="jpg", dpi=dpi)
+
+    pages: list[str] = []
+    for image in images:
+        buffer = BytesIO()
+        image.save(
+            buffer,
+            format="JPEG",
+            quality=60,
+            optimize=True,
+            progressive=True,
+        )
+        pages.append(base64.b64encode(buffer.getvalue()).decode("utf-8"))
+    return pages
+
+
+class PDFRasterizer:
+    """Rasterizes PDFs into page images in a dedicated process pool, so that neither the rasterization
+    nor the JPEG encoding hold the GIL of the API process.
+
+    The number of conversions that are queued or running is bounded by max_pending. Pages are cached
+    by the sha256 of the PDF and the DPI so that retries, provider fallbacks and repeated documents
+    reuse the images. The cache is bounded by the total size of the cached pages since a single
+    document can have hundreds of pages. When max_workers is 0, conversions run in a thread instead.
+
+    A worker that dies, e.g. killed by the OOM killer, breaks the whole pool, which is then rebuilt
+    for the next conversions."""
+
+    def __init__(self, max_workers: int, max_pending: int = 16, max_cache_bytes: int = 64 * 1024 * 1024):
+        self._max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._semaphore = asyncio.Semaphore(max_pending)
+        self._cache = OrderedDict[tuple[str, int], list[str]]()
+        self._cache_bytes = 0
+        self._max_cache_bytes = max_cache_bytes
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs an event loop and threads is not safe
+            self._executor = ProcessPoolExecutor(self._max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def _rasterize(self, pdf_data: bytes, dpi: int) -> list[str]:
+        async with self._semaphore:
+            if not self._max_workers:
+                return await asyncio.to_thread(rasterize_pdf, pdf_data, dpi)
+            executor = self._get_executor()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(executor, rasterize_pdf, pdf_data, dpi)
+            except BrokenProcessPool:
+                # Concurrent conversions fail with the same pool, only the first one replaces it
+                if self._executor is executor:
+                    self.close()
+                raise
+
+    def _cache_pages(self, key: tuple[str, int], pages: list[str]):
+        size = sum(len(page) for page in pages)
+        if size > self._max_cache_bytes:
+            return
+        if previous := self._cache.pop(key, None):
+            self._cache_bytes -= sum(len(page) for page in previous)
+        self._cache[key] = pages
+        self._cache_bytes += size
+        while self._cache_bytes > self._max_cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= sum(len(page) for page in evicted)
+
+    async def to_images(self, pdf_data: bytes, dpi: int = 150) -> list[str]:
+        """Returns the base64 encoded JPEG of each page of the PDF"""
+        key = (hashlib.sha256(pdf_data).hexdigest(), dpi)
+        if (pages := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            return pages
+
+        pages = await self._rasterize(pdf_data, dpi)
+        self._cache_pages(key, pages)
+        return pages
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _build_shared_pdf_rasterizer() -> PDFRasterizer:
+    return PDFRasterizer(
+        max_workers=int(os.environ.get("PDF_RASTERIZER_PROCESSES", "2")),
+        max_pending=int(os.environ.get("PDF_RASTERIZER_MAX_PENDING", "16")),
+        max_cache_bytes=int(os.environ.get("PDF_RASTERIZER_MAX_CACHE_BYTES", str(64 * 1024 * 1024))),
+    )
+
+
+_shared_pdf_rasterizer = _build_shared_pdf_rasterizer()
+
+
+def shared_pdf_rasterizer() -> PDFRasterizer:
+    return _shared_pdf_rasterizer
@@ -0,0 +1,75 @@
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, patch
+
+import pytest
+from PIL import Image
+
+from core.utils.file_utils.pdf_rasterizer import PDFRasterizer
+
+
+@pytest.fixture
+def rasterizer():
+    return PDFRasterizer(max_workers=0)
+
+
+class TestToImages:
+    @patch("pdf2image.convert_from_bytes")
+    async def test_pages_are_cached(self, mock_convert: Mock, rasterizer: PDFRasterizer):
+        mock_convert.return_value = [Image.new("RGB", (10, 10), color="red"), Image.new("RGB", (10, 10))]
+
+        pages = await rasterizer.to_images(b"pdf", dpi=150)
+        assert len(pages) == 2
+        assert await rasterizer.to_images(b"pdf", dpi=150) == pages
+        mock_convert.assert_called_once()
+
+        # Different DPI or document are not cached
+        await rasterizer.to_images(b"pdf", dpi=72)
+        await rasterizer.to_images(b"other", dpi=150)
+        assert mock_convert.call_count == 3
+
+    @patch("pdf2image.convert_from_bytes")
+    async def test_errors_are_not_cached(self, mock_convert: Mock, rasterizer: PDFRasterizer):
+        mock_convert.side_effect = [Exception("Invalid PDF"), [Image.new("RGB", (10, 10))]]
+
+        with pytest.raises(Exception, match="Invalid PDF"):
+            await rasterizer.to_images(b"pdf")
+        assert len(await rasterizer.to_images(b"pdf")) == 1
+
+    @patch("pdf2image.convert_from_bytes")
+    async def test_cache_bounded_by_bytes(self, mock_convert: Mock):
+        mock_convert.return_value = [Image.new("RGB", (10, 10))]
+        page_size = len((await PDFRasterizer(max_workers=0).to_images(b"pdf"))[0])
+        mock_convert.reset_mock()
+
+        # Room for 2 single page documents
+        rasterizer = PDFRasterizer(max_workers=0, max_cache_bytes=page_size * 2)
+        await rasterizer.to_images(b"pdf1")
+        await rasterizer.to_images(b"pdf2")
+        await rasterizer.to_images(b"pdf1")
+        assert mock_convert.call_count == 2
+
+        # pdf2 is the least recently used
+        await rasterizer.to_images(b"pdf3")
+        await rasterizer.to_images(b"pdf1")
+        assert mock_convert.call_count == 3
+        await rasterizer.to_images(b"pdf2")
+        assert mock_convert.call_count == 4
+
+        # Documents bigger than the cache are not cached
+        mock_convert.return_value = [Image.new("RGB", (10, 10))] * 3
+        await rasterizer.to_images(b"pdf4")
+        await rasterizer.to_images(b"pdf4")
+        assert mock_convert.call_count == 6
+
+
+class TestExecutor:
+    async def test_broken_pool_is_rebuilt(self):
+        rasterizer = PDFRasterizer(max_workers=1)
+        broken = Mock()
+        broken.submit.side_effect = BrokenProcessPool()
+        rasterizer._executor = broken  # pyright: ignore[reportPrivateUsage]
+
+        with pytest.raises(BrokenProcessPool):
+            await rasterizer.to_images(b"pdf")
+        broken.shutdown.assert_called_once()
+        assert rasterizer._executor is None  # pyright: ignore[reportPrivateUsage]
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from redis.asyncio import Redis
+
+from core.utils.coroutines import capture_errors
+
+_logger = logging.getLogger(__name__)
+
+
+async def publish_json(redis_client: Redis, channel: str, payload: dict[str, Any]):
+    with capture_errors(_logger, "Failed to publish message"):
+        await redis_client.publish(channel, json.dumps(payload))  # pyright: ignore [reportUnknownMemberType]
+
+
+class RedisSubscriber:
+    """Listens to a redis pub/sub channel in the background and calls the handler
+    with every JSON payload received. The subscription is re-established on failure"""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        channel: str,
+        on_message: Callable[[dict[str, Any]], None],
+        on_reset: Callable[[], None] | None = None,
+    ):
+        self._redis_client = redis_client
+        self._channel = channel
+        self._on_message = on_message
+        # Called when the subscription is (re)established since messages may have been missed
+        self._on_reset = on_reset
+        self._task: asyncio.Task[None] | None = None
+
+    def _handle_message(self, message: dict[str, Any]):
+        if message.get("type") != "message":
+            return
+        with capture_errors(_logger, "Failed to handle pub/sub message"):
+            self._on_message(json.loads(message["data"]))
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis_client.pubsub()  # pyright: ignore [reportUnknownMemberType]
+                await pubsub.subscribe(self._channel)  # pyright: ignore [reportUnknownMemberType]
+                try:
+                    async for message in pubsub.listen():  # pyright: ignore [reportUnknownMemberType]
+                        self._handle_message(message)  # pyright: ignore [reportUnknownArgumentType]
+                finally:
+                    await pubsub.aclose()  # pyright: ignore [reportUnknownMemberType]
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _logger.exception("Pub/sub listener failed, restarting", extra={"channel": self._channel})
+                if self._on_reset:
+                    self._on_reset()
+                await asyncio.sleep(1)
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -1,6 +1,6 @@
 import logging
 import re
-from typing import Any, AsyncIterator, Optional, Protocol, Union
+from typing import Any, AsyncIterator, NamedTuple, Optional, Protocol, Union
 
 from pydantic import BaseModel
 
@@ -44,6 +44,10 @@ _ESCAPED_CHARS = {
 _outside_of_quotes_chars = set("{]}],-0123456789.nulltruefalse")
 # A non whitespace char that is valid after a closing quote
 _post_quote_chars = set(",}]\\")
+# Chars that interrupt a run of plain characters within quotes
+_quoted_run_end = re.compile(r'["\\]')
+_non_space = re.compile(r"\S")
+_spaces = re.compile(r"\s+")
 
 
 def should_ignore_outside_quotes(c: str) -> bool:
@@ -68,6 +72,8 @@ class JSONStreamParser:
     def __init__(self, is_tolerant: bool = True) -> None:
         # To keep track of the key path
         self.path_stack: list[Union[str, int]] = []
+        # The key path at each level of the path stack, to avoid joining the whole stack on every change
+        self._key_paths: list[str] = []
         # To keep track of the current object or array, true if object
         self._dict_stack: list[bool] = []
         self.key_path: str = ""
@@ -85,6 +91,8 @@ class JSONStreamParser:
         self._pending_surrogate: int | None = None
         self.is_tolerant = is_tolerant
         self._leftover_buffer = ""
+        # Position of the next char to process in the leftover buffer
+        self._next_pos = 0
         self._last_char = ""
 
         self.ignore_outside_quotes = should_ignore_outside_quotes if is_tolerant else is_space
@@ -97,17 +105,19 @@ class JSONStreamParser:
             raise self._exception("Cannot increment array index when not in an array")
         if isinstance(self.path_stack[-1], int):
             self.path_stack[-1] += 1
-            self._reset_key_path()
+            self._key_paths.pop()
+            self._push_key_path(self.path_stack[-1])
             return True
         return False
 
-    def _reset_key_path(self) -> None:
-        self.key_path = ".".join([str(a) for a in self.path_stack])
+    def _push_key_path(self, key: Union[str, int]) -> None:
+        self.key_path = f"{self._key_paths[-1]}.{key}" if self._key_paths else str(key)
+        self._key_paths.append(self.key_path)
 
     def _add_path(self, key: Union[str, int]) -> None:
         self.is_value = False
         self.path_stack.append(key)
-        self._reset_key_path()
+        self._push_key_path(key)
 
     def _pop_path(self, res: Optional[list[tuple[str, Any]]]) -> None:
         if self.is_value:
@@ -116,7 +126,8 @@ class JSONStreamParser:
             self.path_stack.pop()
         except IndexError:
             raise self._exception("Cannot pop path stack when it is empty")
-        self._reset_key_path()
+        self._key_paths.pop()
+        self.key_path = self._key_paths[-1] if self._key_paths else ""
 
     def _finish_current_chain(self, res: Optional[list[tuple[str, Any]]], force: bool = False) -> None:
         """Finish the current chain and append it to the res list if provided"""
@@ -263,11 +274,28 @@ class JSONStreamParser:
         self._unicode_buffer = ""
 
     def _next_non_space_char(self) -> str:
-        for c in self._leftover_buffer:
-            if not is_space(c):
-                return c
+        if m := _non_space.search(self._leftover_buffer, self._next_pos):
+            return m.group()
         raise _WaitForChunksError()
 
+    def _consume_run(self, buffer: str, pos: int) -> int:
+        """Processes at once a run of chars that do not change the state of the parser, i-e plain
+        chars within quotes or spaces outside of quotes. Returns the number of consumed chars"""
+        if self.is_within_quotes:
+            c = buffer[pos]
+            if self.is_escaping or self._unicode_chars_left is not None or c == '"' or c == "\\":
+                return 0
+            run_end = m.start() if (m := _quoted_run_end.search(buffer, pos)) else len(buffer)
+            self._flush_pending_surrogate()
+            self.current_chain += buffer[pos:run_end]
+            self._last_char = buffer[run_end - 1]
+            return run_end - pos
+
+        if m := _spaces.match(buffer, pos):
+            # Spaces outside of quotes are always ignored
+            return m.end() - pos
+        return 0
+
     def _process_chunk_inner_loop(self, c: str, res: list[tuple[str, Any]], i: int):  # noqa: C901
         # Returns true if the character was processed, false if the character was ignored
         if c == '"':
@@ -363,7 +391,7 @@ class JSONStreamParser:
     def raw_completion(self) -> str:
         return "".join(self.aggregate)
 
-    def process_chunk(self, chunk: str) -> list[tuple[str, Any]] | None:
+    def process_chunk(self, chunk: str) -> list[tuple[str, Any]] | None:  # noqa: C901
         self.aggregate.append(chunk)
 
         if self.is_done:
@@ -381,27 +409,41 @@ class JSONStreamParser:
         res: list[tuple[str, Any]] = []
         i = 0
 
-        self._leftover_buffer += chunk
+        # The buffer is scanned by index instead of being sliced for every char
+        buffer = self._leftover_buffer + chunk
+        self._leftover_buffer = buffer
+        pos = 0
+        end = len(buffer)
 
-        while self._leftover_buffer:
-            c = self._leftover_buffer[0]
-            self._leftover_buffer = self._leftover_buffer[1:]
+        while pos < end:
+            if consumed := self._consume_run(buffer, pos):
+                i += consumed
+                pos += consumed
+                continue
 
+            c = buffer[pos]
+            self._next_pos = pos + 1
             try:
                 processed = self._process_chunk_inner_loop(c, res=res, i=i)
             except _WaitForChunksError:
                 # We need to wait for more data so we break here
-                # The current character was not processed, so we add it back to the buffer
-                self._leftover_buffer = f"{c}{self._leftover_buffer}"
+                # The current character was not processed, so we keep it in the buffer
+                self._leftover_buffer = buffer[pos:]
+                self._next_pos = 0
                 return res or None
             except _JsonEnd:
                 self.is_done = True
+                pos += 1
                 break
 
+            pos += 1
             i += 1
             if processed:
                 self._last_char = c
 
+        self._leftover_buffer = buffer[pos:]
+        self._next_pos = 0
+
         if self.is_value:
             chain = self._send_current_chain()
             if chain:
@@ -413,42 +455,109 @@ def format_model_for_sse(data: BaseModel):
     return f"data: {data.model_dump_json(exclude_none=True)}\n\n"
 
 
-async def standard_wrap_sse(
+class SSEEvent(NamedTuple):
+    data: bytes
+    event: bytes | None = None
+    id: bytes | None = None
+
+
+class SSEDecoder:
+    """Incremental decoder of server sent events.
+
+    Bytes are accumulated in a bytearray and only the bytes received since the last line break are
+    scanned when a chunk is fed, so the cost of decoding is linear in the size of the stream.
+    Lines can end with LF or CRLF. Multiple data lines are joined with a LF, comments and unknown
+    fields are ignored.
+
+    When line_events is set, each data line is dispatched as its own event without waiting for a
+    blank line, for providers that do not always separate their events."""
+
+    def __init__(self, line_events: bool = False) -> None:
+        self._line_events = line_events
+        self._buffer = bytearray()
+        # Position from which to look for the next line break
+        self._scan_pos = 0
+        self._data: list[bytes] = []
+        self._event: bytes | None = None
+        self._id: bytes | None = None
+
+    @property
+    def pending_data(self) -> bytes:
+        """Data that was received but not dispatched as an event"""
+        return b"\n".join([*self._data, bytes(self._buffer)]).strip()
+
+    def _dispatch(self, events: list[SSEEvent]) -> None:
+        if self._data:
+            events.append(SSEEvent(b"\n".join(self._data), self._event, self._id))
+        self._data = []
+        self._event = None
+        self._id = None
+
+    def _process_line(self, line: memoryview, events: list[SSEEvent]) -> None:
+        if not line:
+            self._dispatch(events)
+            return
+        if line[0] == ord(":"):
+            # Comment
+            return
+        raw = line.tobytes()
+        field, sep, value = raw.partition(b":")
+        if sep and value.startswith(b" "):
+            value = value[1:]
+        match field:
+            case b"data" if self._line_events:
+                events.append(SSEEvent(value, self._event, self._id))
+            case b"data":
+                self._data.append(value)
+            case b"event":
+                self._event = value
+            case b"id":
+                self._id = value
+            case _:
+                pass
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        """Adds a chunk to the buffer and returns the events that were completed by it"""
+        self._buffer += chunk
+        events: list[SSEEvent] = []
+        line_start = 0
+        with memoryview(self._buffer) as view:
+            while (line_end := self._buffer.find(b"\n", self._scan_pos)) != -1:
+                self._scan_pos = line_end + 1
+                if line_end > line_start and self._buffer[line_end - 1] == ord("\r"):
+                    line_end -= 1
+                self._process_line(view[line_start:line_end], events)
+                line_start = self._scan_pos
+        # Only the incomplete line is kept
+        del self._buffer[:line_start]
+        self._scan_pos = len(self._buffer)
+        return events
+
+
+async def decode_sse(
     raw: AsyncIterator[bytes],
-    termination_chars: bytes = b"\n\n",
     logger: logging.Logger = _logger,
-) -> AsyncIterator[bytes]:
-    data = b""
-    in_data = False
+    line_events: bool = False,
+) -> AsyncIterator[SSEEvent]:
+    decoder = SSEDecoder(line_events=line_events)
     async for chunk in raw:
-        data += chunk
-        if not in_data:
-            if data.startswith(b"data: "):
-                data = data[6:]
-                in_data = True
-            else:
-                # We will wait for the next chunk, we might be in the middle
-                # of 'data: '
-                continue
+        for event in decoder.feed(chunk):
+            yield event
 
-        # Splitting the chunk by separator
-        splits = re.split(rb"(?:\r?\n){2}data: ", data)
-        if len(splits) > 1:
-            # Yielding the rest of the splits except the last one
-            for data in splits[0:-1]:
-                yield data
-            # The last split could be incomplete
-            data = splits[-1]
-
-        if data.endswith(termination_chars):
-            yield data[: -len(termination_chars)]
-            data = b""
-            in_data = False
-
-    if data:
+    if data := decoder.pending_data:
         logger.warning("Data left after processing", extra={"data": data})
 
 
+async def standard_wrap_sse(
+    raw: AsyncIterator[bytes],
+    logger: logging.Logger = _logger,
+    line_events: bool = False,
+) -> AsyncIterator[bytes]:
+    """Yields the data of each event in a server sent event stream"""
+    async for event in decode_sse(raw, logger, line_events):
+        yield event.data
+
+
 class RawStreamParser:
     def __init__(self) -> None:
         self.aggregate: list[str] = []
@@ -6,7 +6,7 @@ import pytest
 from core.utils.dicts import set_at_keypath_str
 from tests.utils import fixtures_json, mock_aiter
 
-from .streams import JSONStreamError, JSONStreamParser, standard_wrap_sse
+from .streams import JSONStreamError, JSONStreamParser, SSEDecoder, SSEEvent, standard_wrap_sse
 
 
 def _agg_stream(splits: list[str], is_tolerant: bool = False) -> list[tuple[str, Any]]:
@@ -285,6 +285,17 @@ def test_all_splits_in_json(cut_idx: int):
     assert parsed == _PARSED_JSON
 
 
+@pytest.mark.parametrize("chunk_size", [7, 64, 4096])
+def test_large_payload_chunk_sizes(chunk_size: int) -> None:
+    # Long strings and indentation are consumed in runs, the result should not depend on the chunking
+    raw = fixtures_json("runs", "run_doc_1.json")
+    # Metadata keys contain dots which can't be represented in a key path
+    raw.pop("metadata")
+    raw_json = json.dumps(raw, indent=2)
+    chunks = [raw_json[i : i + chunk_size] for i in range(0, len(raw_json), chunk_size)]
+    assert _stream_to_dict({}, chunks) == raw
+
+
 def test_surrogate_pair_split() -> None:
     chunks = ['{"a": "\\ud83', 'd\\ude00"}']
     parsed = _stream_to_dict({}, chunks)
@@ -409,3 +420,32 @@ class TestWrapSSE:
         )
         chunks = [chunk async for chunk in standard_wrap_sse(iter)]
         assert chunks == [b"1", b"2"]
+
+
+class TestSSEDecoder:
+    _EXAMPLE = b'event: message\nid: 1\ndata: {"a":\ndata: 1}\n\n: keep-alive\n\nretry: 10\r\ndata: 2\r\n\r\n'
+
+    def test_fields(self):
+        decoder = SSEDecoder()
+        assert decoder.feed(self._EXAMPLE) == [
+            SSEEvent(b'{"a":\n1}', b"message", b"1"),
+            SSEEvent(b"2"),
+        ]
+        assert decoder.pending_data == b""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5])
+    def test_split_chunks(self, chunk_size: int):
+        decoder = SSEDecoder()
+        events: list[SSEEvent] = []
+        for i in range(0, len(self._EXAMPLE), chunk_size):
+            events.extend(decoder.feed(self._EXAMPLE[i : i + chunk_size]))
+        assert events == SSEDecoder().feed(self._EXAMPLE)
+
+    def test_pending_data(self):
+        decoder = SSEDecoder()
+        assert decoder.feed(b"data: 1\ndata: 2") == []
+        assert decoder.pending_data == b"1\ndata: 2"
+
+    def test_line_events(self):
+        decoder = SSEDecoder(line_events=True)
+        assert decoder.feed(b"event: a\ndata: 1\ndata: 2\n") == [SSEEvent(b"1", b"a"), SSEEvent(b"2", b"a")]
@@ -12,9 +12,15 @@ class TimedBuffer(Generic[_T]):
         purge_fn: Callable[[list[_T]], Coroutine[Any, Any, None]],
         max_buffer_length: int = 50,
         send_interval_seconds: float = 30,
+        max_buffer_size: int | None = None,
+        item_size: Callable[[_T], int] | None = None,
     ):
         self._purge_fn = purge_fn
         self._buffer: list[_T] = []
+        # Optional size based purge, e.g. in bytes
+        self._max_buffer_size = max_buffer_size
+        self._item_size = item_size
+        self._buffer_size = 0
         self._buffer_lock = asyncio.Lock()
         self._max_buffer_length = max_buffer_length
         self._send_interval_seconds = send_interval_seconds
@@ -52,6 +58,7 @@ class TimedBuffer(Generic[_T]):
         async with self._buffer_lock:
             current = self._buffer
             self._buffer = []
+            self._buffer_size = 0
         if not current:
             return
         await self._purge_fn(current)
@@ -59,6 +66,10 @@ class TimedBuffer(Generic[_T]):
     async def add(self, item: _T):
         async with self._buffer_lock:
             self._buffer.append(item)
+            if self._item_size:
+                self._buffer_size += self._item_size(item)
         # Purging the buffer if it is too big
-        if len(self._buffer) >= self._max_buffer_length:
+        if len(self._buffer) >= self._max_buffer_length or (
+            self._max_buffer_size is not None and self._buffer_size >= self._max_buffer_size
+        ):
             self._add_task(self.purge())
@@ -1,6 +1,14 @@
+from collections.abc import Iterable
+from functools import cache
+
 from tiktoken import Encoding, encoding_for_model, get_encoding
 
+# Texts above this size should be tokenized in a worker thread. tiktoken releases the GIL while encoding
+# so this keeps the event loop responsive when counting the tokens of long completions
+OFF_LOOP_MIN_CHARS = 20_000
+
 
+@cache
 def _get_tiktoken_encoding(model: str) -> Encoding:
     try:
         encoding = encoding_for_model(model)
@@ -14,3 +22,9 @@ def tokens_from_string(completion: str, model: str) -> int:
     encoding = _get_tiktoken_encoding(model)
 
     return len(encoding.encode(completion))
+
+
+def count_tokens_many(texts: Iterable[str], model: str) -> list[int]:
+    encoding = _get_tiktoken_encoding(model)
+
+    return [len(encoding.encode(text)) for text in texts]
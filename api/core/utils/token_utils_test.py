@@ -0,0 +1,17 @@
+from unittest.mock import Mock, patch
+
+from core.utils.token_utils import _get_tiktoken_encoding, count_tokens_many, tokens_from_string
+
+
+class TestTokensFromString:
+    def test_encoding_is_loaded_once(self):
+        _get_tiktoken_encoding.cache_clear()
+        encoding = Mock()
+        encoding.encode.side_effect = lambda text: text.split()  # pyright: ignore[reportUnknownLambdaType]
+
+        with patch("core.utils.token_utils.encoding_for_model", return_value=encoding) as mock_encoding_for_model:
+            assert tokens_from_string("hello world", "gpt-4o") == 2
+            assert count_tokens_many(["a b c", "d"], "gpt-4o") == [3, 1]
+
+        mock_encoding_for_model.assert_called_once_with("gpt-4o")
+        _get_tiktoken_encoding.cache_clear()
@@ -0,0 +1,46 @@
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from pathlib import Path
+from typing import Any, TypeVar
+
+from rich import print
+
+_T = TypeVar("_T")
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "api" / "tests" / "fixtures"
+
+
+def best_of(fn: Callable[[], Any], iterations: int) -> float:
+    """The shortest duration of fn in seconds over the iterations, the least affected by noise"""
+    best = float("inf")
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def timed(awaitable: Awaitable[_T]) -> tuple[float, _T]:
+    """The duration in seconds of the awaitable and its result"""
+    start = time.perf_counter()
+    res = await awaitable
+    return time.perf_counter() - start, res
+
+
+def print_input(name: str, description: str):
+    print(f"[bold]{name}[/bold]: {description}")
+
+
+def print_duration(name: str, duration: float, details: str = ""):
+    print(f"  {name:>10}: {duration * 1000:8.1f}ms {details}".rstrip())
+
+
+def compare(
+    candidates: Mapping[str, Callable[[], Any]],
+    iterations: int,
+    details: Callable[[float], str] | None = None,
+):
+    """Prints the best_of duration of each candidate, with details computed from the duration"""
+    for name, fn in candidates.items():
+        duration = best_of(fn, iterations)
+        print_duration(name, duration, details(duration) if details else "")
@@ -0,0 +1,87 @@
+"""Benchmark of the order insensitive list comparison of the field based evaluator.
+
+Lists of objects are compared to a shuffled copy, which matches, and to a shuffled copy where one
+item was changed, which does not match and requires the matching to explore every candidate.
+
+PYTHONPATH=./api poetry run python -m scripts.benchmarks.field_based_compare --sizes 5,10,20,50,100,200
+"""
+
+import asyncio
+import random
+from typing import Annotated, Any
+
+import typer
+from rich import print
+
+from core.domain.field_based_evaluation_config import (
+    ArrayComparisonOptions,
+    FieldBasedEvaluationConfig,
+)
+from core.domain.task_io import SerializableTaskIO
+from core.domain.task_variant import SerializableTaskVariant
+from core.evaluators.field_based_compare import FieldBasedCompare
+from core.utils.schemas import JsonSchema
+
+from ._timing import timed
+
+_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "quantity": {"type": "integer"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+}
+
+_SCHEMA = {"type": "array", "items": _ITEM_SCHEMA}
+
+
+def _evaluator() -> FieldBasedCompare:
+    io = SerializableTaskIO.from_json_schema({"type": "object", "properties": {"items": _SCHEMA}})
+    return FieldBasedCompare(
+        SerializableTaskVariant(id="", task_id="", name="", input_schema=io, output_schema=io),
+        config=FieldBasedEvaluationConfig(options=ArrayComparisonOptions(ignore_order=True)),
+        name="benchmark",
+        id="benchmark",
+    )
+
+
+def _items(size: int) -> list[dict[str, Any]]:
+    return [{"name": f"Item {i}", "quantity": i % 7, "tags": [f"tag{i % 3}", f"tag{i % 5}"]} for i in range(size)]
+
+
+async def _measure(evaluator: FieldBasedCompare, expected: list[Any], actual: list[Any]) -> tuple[float, bool]:
+    duration, errors = await timed(
+        evaluator.compare(expected, actual, ArrayComparisonOptions(ignore_order=True), JsonSchema(_SCHEMA)),
+    )
+    return duration, not errors
+
+
+async def _run(sizes: list[int], seed: int):
+    random.seed(seed)
+    evaluator = _evaluator()
+
+    print(f"{'size':>6} {'match':>12} {'mismatch':>12}")
+    for size in sizes:
+        expected = _items(size)
+        shuffled = random.sample(expected, size)
+        match_duration, matched = await _measure(evaluator, expected, shuffled)
+
+        mismatched = [*shuffled]
+        mismatched[random.randrange(size)] = {"name": "Other", "quantity": -1, "tags": []}
+        mismatch_duration, mismatch_matched = await _measure(evaluator, expected, mismatched)
+
+        if not matched or mismatch_matched:
+            print("[red]Unexpected comparison result[/red]")
+        print(f"{size:>6} {match_duration * 1000:10.1f}ms {mismatch_duration * 1000:10.1f}ms")
+
+
+def _main(
+    sizes: Annotated[str, typer.Option(help="Comma separated list sizes")] = "5,10,20,50,100,200",
+    seed: Annotated[int, typer.Option()] = 0,
+):
+    asyncio.run(_run([int(s) for s in sizes.split(",")], seed))
+
+
+if __name__ == "__main__":
+    typer.run(_main)
@@ -0,0 +1,79 @@
+"""Micro benchmark of the JSONStreamParser on large completions streamed in small chunks.
+
+Completions are JSON files that are re-serialized with an indent, as models usually do, and split
+in chunks of a few characters to mimic streamed deltas. When a baseline revision is provided, the
+parser from that revision is benchmarked as well and both parsers must produce the same updates.
+
+PYTHONPATH=./api poetry run python -m scripts.benchmarks.json_stream_parser --baseline-rev HEAD~1
+"""
+
+import json
+import subprocess
+import types
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Annotated, Any
+
+import typer
+from rich import print
+
+from core.utils.streams import JSONStreamParser
+
+from ._timing import FIXTURES_DIR, compare, print_input
+
+_DEFAULT_COMPLETIONS = [
+    FIXTURES_DIR / "runs" / "run_doc_1.json",
+    FIXTURES_DIR / "uptime" / "openai_status_components.json",
+]
+
+
+def _load_parser_at_revision(rev: str) -> Callable[[], Any]:
+    source = subprocess.check_output(["git", "show", f"{rev}:api/core/utils/streams.py"], text=True)
+    module = types.ModuleType(f"streams_{rev}")
+    exec(compile(source, f"streams@{rev}", "exec"), module.__dict__)  # noqa: S102
+    return module.JSONStreamParser
+
+
+def _chunks(completion: str, chunk_size: int) -> list[str]:
+    return [completion[i : i + chunk_size] for i in range(0, len(completion), chunk_size)]
+
+
+def _run(parser_cls: Callable[[], Any], chunks: list[str]) -> list[tuple[str, Any]]:
+    parser = parser_cls()
+    updates: list[tuple[str, Any]] = []
+    for chunk in chunks:
+        if res := parser.process_chunk(chunk):
+            updates.extend(res)
+    return updates
+
+
+def _main(
+    completions: Annotated[list[Path] | None, typer.Argument()] = None,
+    baseline_rev: Annotated[str | None, typer.Option()] = None,
+    chunk_size: Annotated[int, typer.Option()] = 8,
+    iterations: Annotated[int, typer.Option()] = 5,
+):
+    parsers: dict[str, Callable[[], Any]] = {"current": JSONStreamParser}
+    if baseline_rev:
+        parsers[baseline_rev] = _load_parser_at_revision(baseline_rev)
+
+    for path in completions or _DEFAULT_COMPLETIONS:
+        completion = json.dumps(json.loads(path.read_text()), indent=2)
+        chunks = _chunks(completion, chunk_size)
+        print_input(path.name, f"{len(completion) / 1024:.0f}KB in {len(chunks)} chunks")
+
+        expected = _run(JSONStreamParser, chunks)
+        for name, parser_cls in parsers.items():
+            if _run(parser_cls, chunks) != expected:
+                print(f"  [red]{name} produced different updates[/red]")
+
+        compare(
+            {name: partial(_run, parser_cls, chunks) for name, parser_cls in parsers.items()},
+            iterations,
+            lambda duration: f"{len(completion) / duration / 1024 / 1024:6.2f}MB/s",
+        )
+
+
+if __name__ == "__main__":
+    typer.run(_main)
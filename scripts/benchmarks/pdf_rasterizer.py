@@ -0,0 +1,75 @@
+"""Benchmark of the rasterization of PDFs for models that do not support PDF inputs.
+
+Each document is converted concurrently, as parallel runs would, once in threads and once in the
+process pool of the PDFRasterizer. Conversions are then repeated to measure the page image cache.
+Requires poppler to be installed.
+
+PYTHONPATH=./api poetry run python -m scripts.benchmarks.pdf_rasterizer --concurrency 8
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from core.utils.file_utils.pdf_rasterizer import PDFRasterizer
+
+from ._timing import FIXTURES_DIR, print_duration, print_input, timed
+
+_DEFAULT_DOCUMENTS = [FIXTURES_DIR / "files" / "MSFT_SEC.pdf"]
+
+
+async def _convert_all(rasterizer: PDFRasterizer, documents: list[bytes]) -> float:
+    duration, _ = await timed(asyncio.gather(*(rasterizer.to_images(document) for document in documents)))
+    return duration
+
+
+async def _ticks_during(coro_duration: float) -> int:
+    """Counts how often the event loop was able to run while conversions were in progress,
+    a measure of how much the conversions block the loop"""
+    ticks = 0
+    end = time.perf_counter() + coro_duration
+    while time.perf_counter() < end:
+        await asyncio.sleep(0.001)
+        ticks += 1
+    return ticks
+
+
+async def _benchmark(name: str, rasterizer: PDFRasterizer, documents: list[bytes]):
+    conversion = asyncio.create_task(_convert_all(rasterizer, documents))
+    ticks = 0
+    while not conversion.done():
+        ticks += await _ticks_during(0.05)
+    cold = conversion.result()
+    cached = await _convert_all(rasterizer, documents)
+    print_duration(name, cold, f"cold, {cached * 1000:6.1f}ms cached, {ticks} loop ticks")
+
+
+async def _run(documents: list[Path], concurrency: int, workers: int):
+    for path in documents:
+        # Distinct documents so that the cache is not hit during the cold run
+        contents = [path.read_bytes() + f"\n%{i}".encode() for i in range(concurrency)]
+        pages = await PDFRasterizer(max_workers=0).to_images(contents[0])
+        print_input(path.name, f"{len(pages)} pages x {concurrency} documents")
+
+        await _benchmark("threads", PDFRasterizer(max_workers=0, max_pending=concurrency), contents)
+
+        processes = PDFRasterizer(max_workers=workers, max_pending=concurrency)
+        # Spawning the workers is not part of the measure
+        await processes.to_images(path.read_bytes())
+        await _benchmark("processes", processes, contents)
+        processes.close()
+
+
+def _main(
+    documents: Annotated[list[Path] | None, typer.Argument()] = None,
+    concurrency: Annotated[int, typer.Option()] = 4,
+    workers: Annotated[int, typer.Option()] = 2,
+):
+    asyncio.run(_run(documents or _DEFAULT_DOCUMENTS, concurrency, workers))
+
+
+if __name__ == "__main__":
+    typer.run(_main)
@@ -0,0 +1,98 @@
+"""Micro benchmark of the validation of partial outputs during a streaming run.
+
+An output is generated from the examples of an output schema, streamed in small chunks and
+re-built with the JSONStreamParser. Each partial output is then validated, as the runner does for
+every chunk, once with jsonschema.validate and once with the compiled validators of the task IO.
+
+PYTHONPATH=./api poetry run python -m scripts.benchmarks.task_io_validation
+"""
+
+import functools
+import json
+from collections.abc import Callable
+from copy import deepcopy
+from pathlib import Path
+from typing import Annotated, Any
+
+import typer
+from jsonschema import validate
+
+from core.domain.task_io import SerializableTaskIO
+from core.utils.dicts import set_at_keypath_str
+from core.utils.schemas import make_optional
+from core.utils.streams import JSONStreamParser
+
+from ._timing import FIXTURES_DIR, compare, print_input
+
+_DEFAULT_SCHEMA = FIXTURES_DIR / "jsonschemas" / "schema_1.json"
+
+
+def _example(schema: dict[str, Any], defs: dict[str, Any], array_size: int) -> Any:
+    if ref := schema.get("$ref"):
+        return _example(defs[ref.split("/")[-1]], defs, array_size)
+    if examples := schema.get("examples"):
+        return examples[0]
+    if "enum" in schema:
+        return schema["enum"][0]
+    if sub := schema.get("anyOf") or schema.get("oneOf"):
+        return _example(sub[0], defs, array_size)
+    t = schema.get("type")
+    if isinstance(t, list):
+        t = next((x for x in t if x != "null"), None)
+    match t:
+        case "object":
+            return {k: _example(v, defs, array_size) for k, v in schema.get("properties", {}).items()}
+        case "array":
+            return [_example(schema.get("items", {}), defs, array_size) for _ in range(array_size)]
+        case "integer" | "number":
+            return 1
+        case "boolean":
+            return True
+        case _:
+            return "lorem ipsum dolor sit amet"
+
+
+def _partial_outputs(output: Any, chunk_size: int) -> list[dict[str, Any]]:
+    raw = json.dumps(output)
+    parser = JSONStreamParser()
+    partial: dict[str, Any] = {}
+    partials: list[dict[str, Any]] = []
+    for i in range(0, len(raw), chunk_size):
+        for update in parser.process_chunk(raw[i : i + chunk_size]) or []:
+            set_at_keypath_str(partial, *update)
+        partials.append(deepcopy(partial))
+    return partials
+
+
+def _validate_all(fn: Callable[[dict[str, Any]], None], partials: list[dict[str, Any]]):
+    for partial in partials:
+        fn(partial)
+
+
+def _main(
+    schemas: Annotated[list[Path] | None, typer.Argument()] = None,
+    chunk_size: Annotated[int, typer.Option()] = 8,
+    array_size: Annotated[int, typer.Option()] = 3,
+    iterations: Annotated[int, typer.Option()] = 5,
+):
+    for path in schemas or [_DEFAULT_SCHEMA]:
+        task_io = SerializableTaskIO.from_json_schema(json.loads(path.read_text()), streamline=True)
+        output = _example(task_io.json_schema, task_io.json_schema.get("$defs", {}), array_size)
+        task_io.enforce(output)
+        partials = _partial_outputs(output, chunk_size)
+        print_input(path.name, f"{len(json.dumps(output))} chars in {len(partials)} chunks")
+
+        optional_schema = make_optional(task_io.json_schema)
+        candidates: dict[str, Callable[[dict[str, Any]], None]] = {
+            "validate": lambda o: validate(o, optional_schema),
+            "compiled": lambda o: task_io.enforce(o, partial=True),
+        }
+        compare(
+            {name: functools.partial(_validate_all, fn, partials) for name, fn in candidates.items()},
+            iterations,
+            lambda duration: f"{duration / len(partials) * 1e6:8.1f}us/chunk",
+        )
+
+
+if __name__ == "__main__":
+    typer.run(_main)